@@ -0,0 +1,69 @@
+"""Pronunciation dictionary (lexicon) builder for MFA.
+
+MFA dictionaries are plain text: one orthographic word followed by its
+space-separated phones per line. We use the WLC transliteration as the
+orthographic form and split the profile's IPA string into phones.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Iterable, List, Mapping, Tuple
+
+from hb_align.text.wlc_loader import TextChapter, WordToken
+
+PROFILE_FIELDS: Mapping[str, str] = {
+    "modern": "ipa_modern",
+    "ashkenazi": "ipa_ashkenazi",
+    "sephardi": "ipa_sephardi",
+}
+_STRESS_MARKS = {"ˈ", "ˌ"}
+_LENGTH_MARKS = {"ː", "ˑ"}
+
+
+def ipa_to_phones(ipa: str) -> List[str]:
+    """Split an IPA string into phones, keeping length marks and diacritics attached."""
+
+    phones: List[str] = []
+    for ch in unicodedata.normalize("NFC", ipa):
+        if ch.isspace() or ch in _STRESS_MARKS:
+            continue
+        if phones and (ch in _LENGTH_MARKS or unicodedata.combining(ch)):
+            phones[-1] += ch
+        else:
+            phones.append(ch)
+    return phones
+
+
+def token_pronunciation(token: WordToken, profile: str) -> str:
+    field_name = PROFILE_FIELDS.get(profile)
+    if field_name is None:
+        raise ValueError(f"Unknown pronunciation profile: {profile}")
+    return str(getattr(token, field_name))
+
+
+def build_lexicon(text_chapter: TextChapter, profile: str) -> List[Tuple[str, str]]:
+    """Return unique (word, phones) entries for every token in the chapter."""
+
+    seen: set[Tuple[str, str]] = set()
+    entries: List[Tuple[str, str]] = []
+    for token in text_chapter.iter_words():
+        phones = " ".join(ipa_to_phones(token_pronunciation(token, profile)))
+        entry = (token.translit, phones)
+        if phones and entry not in seen:
+            seen.add(entry)
+            entries.append(entry)
+    return entries
+
+
+def render_lexicon(entries: Iterable[Tuple[str, str]]) -> str:
+    return "".join(f"{word}\t{phones}\n" for word, phones in entries)
+
+
+__all__ = [
+    "PROFILE_FIELDS",
+    "build_lexicon",
+    "ipa_to_phones",
+    "render_lexicon",
+    "token_pronunciation",
+]
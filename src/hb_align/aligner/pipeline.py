@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 
 from hb_align.audio import chunker
 from hb_align.text.wlc_loader import TextChapter
+from hb_align.utils import events, tracing
 
 
 def run_alignment_pipeline(
@@ -20,6 +22,7 @@ def run_alignment_pipeline(
     cache_manager: Any,
     working_dir: Path,
     logger: Any | None = None,
+    mfa_jobs: int | None = None,
 ) -> Dict[str, Any]:
     """Execute the core alignment pipeline.
 
@@ -32,30 +35,115 @@ def run_alignment_pipeline(
     Integration tests stub MFA execution, so this implementation focuses on the
     orchestration glue and summary calculation. Real MFA invocation will be
     handled in `_run_mfa_for_chunk` during later tasks.
+
+    Each step is timed as a span on the active tracer (see `utils.tracing`).
+    ``mfa_jobs`` caps MFA's own parallelism (`mfa align -j`) so concurrent
+    chapters in a batch do not oversubscribe the host.
     """
 
-    chunk_windows = chunker.plan_chunks(
-        audio_duration_ms,
-        chunk_size_sec=chunk_size_sec,
-        overlap_sec=chunk_overlap_sec,
+    chunk_windows = plan_chapter_chunks(
+        audio_duration_ms, chunk_size_sec=chunk_size_sec, chunk_overlap_sec=chunk_overlap_sec
+    )
+    chunk_alignments = align_chunks(
+        chunk_windows,
+        text_chapter=text_chapter,
+        profile=profile,
+        mfa_runner=mfa_runner,
+        cache_manager=cache_manager,
+        working_dir=working_dir,
+        logger=logger,
+        mfa_jobs=mfa_jobs,
     )
+    return stitch_alignment(text_chapter, chunk_windows, chunk_alignments, profile=profile)
+
+
+def plan_chapter_chunks(
+    audio_duration_ms: int, *, chunk_size_sec: int, chunk_overlap_sec: int
+) -> List[chunker.ChunkWindow]:
+    """Plan chunk windows, emitting a `chunk_planned` event per window."""
+
+    with tracing.span("chunk_planning"):
+        chunk_windows = chunker.plan_chunks(
+            audio_duration_ms,
+            chunk_size_sec=chunk_size_sec,
+            overlap_sec=chunk_overlap_sec,
+        )
+    return announce_chunks(chunk_windows)
+
+
+def announce_chunks(chunk_windows: Sequence[chunker.ChunkWindow]) -> List[chunker.ChunkWindow]:
+    """Emit a `chunk_planned` event per window of an already computed plan."""
 
-    chunk_alignments: List[chunker.ChunkAlignment] = []
     for index, window in enumerate(chunk_windows):
-        alignment = _run_mfa_for_chunk(
-            chunk_window=window,
-            chunk_index=index,
-            text_chapter=text_chapter,
-            profile=profile,
-            mfa_runner=mfa_runner,
-            cache_manager=cache_manager,
-            working_dir=working_dir,
-            logger=logger,
+        events.emit(
+            "chunk_planned",
+            chunk_id=window.chunk_id,
+            index=index,
+            count=len(chunk_windows),
+            start_ms=window.start_ms,
+            end_ms=window.end_ms,
         )
-        chunk_alignments.append(alignment)
+    return list(chunk_windows)
 
-    stitched_words = chunker.stitch_chunk_alignments(chunk_alignments)
-    chunk_map = chunker.chunk_map_to_dict(chunk_windows)
+
+def align_chunks(
+    chunk_windows: Sequence[chunker.ChunkWindow],
+    *,
+    text_chapter: TextChapter,
+    profile: str,
+    mfa_runner: Any,
+    cache_manager: Any,
+    working_dir: Path,
+    logger: Any | None = None,
+    mfa_jobs: int | None = None,
+) -> List[chunker.ChunkAlignment]:
+    """Run MFA for every chunk window (the CPU-heavy step).
+
+    Emits a `chunk_aligned` event with the word count and wall time per chunk.
+    """
+
+    chunk_alignments: List[chunker.ChunkAlignment] = []
+    with tracing.span("align", chunks=len(chunk_windows)):
+        for index, window in enumerate(chunk_windows):
+            started = time.perf_counter()
+            with tracing.span("mfa_chunk", chunk_id=window.chunk_id):
+                alignment = _run_mfa_for_chunk(
+                    chunk_window=window,
+                    chunk_index=index,
+                    text_chapter=text_chapter,
+                    profile=profile,
+                    mfa_runner=mfa_runner,
+                    cache_manager=cache_manager,
+                    working_dir=working_dir,
+                    logger=logger,
+                    num_jobs=mfa_jobs,
+                )
+            chunk_alignments.append(alignment)
+            events.emit(
+                "chunk_aligned",
+                chunk_id=window.chunk_id,
+                index=index,
+                count=len(chunk_windows),
+                words=len(alignment.words),
+                duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            )
+    return chunk_alignments
+
+
+def stitch_alignment(
+    text_chapter: TextChapter,
+    chunk_windows: Sequence[chunker.ChunkWindow],
+    chunk_alignments: Sequence[chunker.ChunkAlignment],
+    *,
+    profile: str,
+) -> Dict[str, Any]:
+    """Merge chunk alignments and compute the chapter summary."""
+
+    with tracing.span("stitching"):
+        stitched_words = chunker.stitch_chunk_alignments(
+            chunk_alignments, tokens=[token.hebrew for token in text_chapter.iter_words()]
+        )
+        chunk_map = chunker.chunk_map_to_dict(chunk_windows)
 
     expected_words = text_chapter.word_count
     aligned_word_count = len(stitched_words)
@@ -71,8 +159,8 @@ def run_alignment_pipeline(
     }
 
     return {
-        "chunks": chunk_windows,
-        "chunk_alignments": chunk_alignments,
+        "chunks": list(chunk_windows),
+        "chunk_alignments": list(chunk_alignments),
         "aligned_words": stitched_words,
         "chunk_map": chunk_map,
         "summary": summary,
@@ -80,9 +168,14 @@ def run_alignment_pipeline(
 
 
 def _run_mfa_for_chunk(*_, **__) -> chunker.ChunkAlignment:  # pragma: no cover - stub
-    """Placeholder helper for MFA execution (stubbed in tests)."""
+    """Placeholder helper for MFA execution (stubbed in tests).
+
+    The implementation should open `tracing.span("parse")` around TextGrid
+    parsing so it shows up nested under the chunk's `mfa_chunk` span, and pass
+    ``num_jobs`` through to `MfaRunner.align_corpus`.
+    """
 
     raise NotImplementedError("Chunk alignment helper not implemented yet")
 
 
-__all__ = ["run_alignment_pipeline"]
+__all__ = ["align_chunks", "plan_chapter_chunks", "run_alignment_pipeline", "stitch_alignment"]
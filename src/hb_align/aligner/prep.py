@@ -0,0 +1,245 @@
+"""Chapter preparation shared by `process`, `batch` and `cache warm`.
+
+Everything MFA needs before alignment starts is derived here and memoized in
+the `CacheManager`:
+
+* audio checksum (memoized per path + size + mtime in a stat index)
+* duration probe and normalized 16 kHz mono WAV (keyed by audio checksum only)
+* chunk plan and per-profile lexicon (keyed by the full alignment cache key)
+
+Missing ffmpeg/ffprobe degrade gracefully: durations fall back to the text
+heuristic and normalization is skipped with a note.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+from hb_align.aligner import lexicon
+from hb_align.audio import chunker, probe
+from hb_align.text.wlc_loader import TextChapter
+from hb_align.utils.cache import CacheManager, build_cache_key
+
+NORMALIZED_AUDIO_NAME = "normalized.wav"
+CHUNK_MAP_NAME = "chunk-map.json"
+LEXICON_NAME = "lexicon.dict"
+_STAT_INDEX_DIR = ".stat-index"
+
+
+@dataclass(frozen=True)
+class PreparedChapter:
+    audio_path: Path
+    book: str
+    chapter: int
+    tradition: str
+    audio_checksum: str
+    duration_ms: int
+    duration_source: str
+    cache_key: str
+    audio_key: str
+    chunks: Tuple[chunker.ChunkWindow, ...]
+    lexicon_path: Path
+    normalized_audio: Path | None
+    cache_status: str
+    notes: Tuple[str, ...] = field(default_factory=tuple)
+
+
+def audio_cache_key(audio_checksum: str, *, sample_rate: int = probe.DEFAULT_SAMPLE_RATE) -> str:
+    """Cache key for tradition-independent audio artifacts (probe + normalized WAV)."""
+
+    payload = f"audio|{audio_checksum.lower()}|{sample_rate}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chapter_cache_key(
+    *,
+    audio_checksum: str,
+    text_chapter: TextChapter,
+    tradition: str,
+    chunk_size_sec: int,
+    chunk_overlap_sec: int,
+) -> str:
+    return build_cache_key(
+        audio_checksum=audio_checksum,
+        text_version=text_chapter.text_version,
+        tradition=tradition,
+        chunk_size_sec=chunk_size_sec,
+        chunk_overlap_sec=chunk_overlap_sec,
+        extra={"book": text_chapter.book, "chapter": str(text_chapter.chapter)},
+    )
+
+
+def cached_checksum(audio_path: Path, cache_manager: CacheManager) -> str:
+    """Return the audio checksum, reusing it while the file's size and mtime are unchanged."""
+
+    resolved = Path(audio_path).resolve()
+    stat = resolved.stat()
+    index_name = hashlib.sha1(str(resolved).encode("utf-8")).hexdigest() + ".json"  # noqa: S324
+    index_path = cache_manager.root / _STAT_INDEX_DIR / index_name
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if index_path.exists():
+        try:
+            record = json.loads(index_path.read_text(encoding="utf-8"))
+        except ValueError:
+            record = {}
+        if record.get("signature") == signature and record.get("sha256"):
+            return str(record["sha256"])
+    checksum = probe.compute_checksum(resolved)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(
+        json.dumps({"path": str(resolved), "signature": signature, "sha256": checksum}),
+        encoding="utf-8",
+    )
+    return checksum
+
+
+def estimate_duration_ms(input_path: Path, text_chapter: TextChapter) -> int:
+    """Fallback heuristic used when the duration cannot be probed."""
+
+    words = max(text_chapter.word_count, 1)
+    base_estimate = words * 500  # ≈0.5s per word
+    min_duration = 60_000  # 60 seconds safety net
+    try:
+        size_bytes = input_path.stat().st_size
+        # Assume ~32 KB per minute @128 kbps. Convert bytes to ms heuristically.
+        approx_from_size = int((size_bytes / 4096) * 1000)
+    except OSError:
+        approx_from_size = 0
+    return max(base_estimate, approx_from_size, min_duration)
+
+
+def prepare_chapter(
+    *,
+    audio_path: Path,
+    text_chapter: TextChapter,
+    tradition: str,
+    chunk_size_sec: int,
+    chunk_overlap_sec: int,
+    cache_manager: CacheManager,
+    normalize: bool = True,
+    ffmpeg: str = "ffmpeg",
+    ffprobe: str = "ffprobe",
+) -> PreparedChapter:
+    """Compute (or reuse from cache) every alignment prerequisite for one chapter."""
+
+    notes: List[str] = []
+    checksum = cached_checksum(audio_path, cache_manager)
+    audio_key = audio_cache_key(checksum)
+    audio_meta = dict(cache_manager.read_metadata(audio_key) or {})
+    hits = 0
+
+    if "duration_ms" in audio_meta:
+        hits += 1
+    else:
+        probed = probe.probe_duration_ms(audio_path, ffprobe=ffprobe)
+        audio_meta.update(
+            {
+                "audio_checksum": checksum,
+                "book": text_chapter.book,
+                "chapter": text_chapter.chapter,
+                "duration_ms": probed if probed else estimate_duration_ms(audio_path, text_chapter),
+                "duration_source": "probe" if probed else "estimate",
+                "sample_rate": probe.DEFAULT_SAMPLE_RATE,
+            }
+        )
+        cache_manager.write_metadata(audio_key, audio_meta)
+    duration_ms = int(audio_meta["duration_ms"])
+
+    normalized: Path | None = cache_manager.artifact_path(audio_key, NORMALIZED_AUDIO_NAME)
+    if normalized.exists():
+        hits += 1
+    elif not normalize:
+        normalized = None
+    elif not probe.ffmpeg_available(ffmpeg):
+        normalized = None
+        notes.append("ffmpeg not available; normalization skipped")
+    else:
+        probe.normalize_audio(audio_path, normalized, ffmpeg=ffmpeg)
+
+    key = chapter_cache_key(
+        audio_checksum=checksum,
+        text_chapter=text_chapter,
+        tradition=tradition,
+        chunk_size_sec=chunk_size_sec,
+        chunk_overlap_sec=chunk_overlap_sec,
+    )
+    chunk_map_text = cache_manager.read_text_artifact(key, CHUNK_MAP_NAME)
+    if chunk_map_text is not None:
+        hits += 1
+        chunks = tuple(
+            chunker.ChunkWindow(
+                chunk_id=item["chunk_id"],
+                start_ms=int(item["start_ms"]),
+                end_ms=int(item["end_ms"]),
+                overlap_ms=int(item["overlap_ms"]),
+            )
+            for item in json.loads(chunk_map_text)
+        )
+    else:
+        chunks = tuple(
+            chunker.plan_chunks(duration_ms, chunk_size_sec=chunk_size_sec, overlap_sec=chunk_overlap_sec)
+        )
+        cache_manager.write_text_artifact(
+            key, CHUNK_MAP_NAME, json.dumps(chunker.chunk_map_to_dict(chunks), indent=2)
+        )
+
+    lexicon_path = cache_manager.stored_artifact_path(key, LEXICON_NAME)
+    if lexicon_path is not None:
+        hits += 1
+    else:
+        entries = lexicon.build_lexicon(text_chapter, tradition)
+        lexicon_path = cache_manager.write_text_artifact(key, LEXICON_NAME, lexicon.render_lexicon(entries))
+
+    if cache_manager.read_metadata(key) is None:
+        cache_manager.write_metadata(
+            key,
+            {
+                "book": text_chapter.book,
+                "chapter": text_chapter.chapter,
+                "tradition": tradition,
+                "text_version": text_chapter.text_version,
+                "audio_checksum": checksum,
+                "audio_key": audio_key,
+                "chunk_size_sec": chunk_size_sec,
+                "chunk_overlap_sec": chunk_overlap_sec,
+            },
+        )
+
+    expected_hits = 3 + (normalized is not None)
+    if hits == 0:
+        status = "miss"
+    elif hits >= expected_hits:
+        status = "hit"
+    else:
+        status = "partial"
+
+    return PreparedChapter(
+        audio_path=Path(audio_path),
+        book=text_chapter.book,
+        chapter=text_chapter.chapter,
+        tradition=tradition,
+        audio_checksum=checksum,
+        duration_ms=duration_ms,
+        duration_source=str(audio_meta.get("duration_source", "estimate")),
+        cache_key=key,
+        audio_key=audio_key,
+        chunks=chunks,
+        lexicon_path=lexicon_path,
+        normalized_audio=normalized,
+        cache_status=status,
+        notes=tuple(notes),
+    )
+
+
+__all__ = [
+    "PreparedChapter",
+    "audio_cache_key",
+    "cached_checksum",
+    "chapter_cache_key",
+    "estimate_duration_ms",
+    "prepare_chapter",
+]
@@ -0,0 +1,386 @@
+"""Alignment artifact writers: `alignments.csv`, `alignments.json` and a columnar sidecar.
+
+Every chapter word from the WLC text gets one row (data-model.md
+§WordAlignment); words the aligner did not place keep `start_ms`/`end_ms` of
+`-1` and confidence `0`. Stitched words are paired with text words in order.
+
+`alignments.hbcol` holds the same table in a form readers can memory-map
+instead of parsing text:
+
+    magic "HBCOL\\0\\0\\0" | u32 schema version | u32 header bytes | header JSON
+    | padding to 8 | column blocks (8-byte aligned, little-endian)
+
+The JSON header names the book/chapter/text version, the row count and each
+column's dtype and byte offset. Integer and float columns are stored as-is
+(`<i4` timestamps, `<f4` confidence); strings (word text, transliteration,
+verse ids, chunk ids) are stored once in a string table (`<u4` offsets plus a
+UTF-8 blob) and referenced by `<i4` ids, so `read_columnar` only has to decode
+the distinct values.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import struct
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from hb_align.audio.chunker import AlignedWord, as_timeline
+from hb_align.text.wlc_loader import TextChapter
+
+SIDECAR_NAME = "alignments.hbcol"
+SIDECAR_SUFFIX = ".hbcol"
+SCHEMA_VERSION = 1
+MISSING_MS = -1
+CSV_COLUMNS = (
+    "book",
+    "chapter",
+    "verse",
+    "word_index",
+    "token_index",
+    "word_text",
+    "translit",
+    "start_ms",
+    "end_ms",
+    "confidence",
+    "chunk_id",
+)
+
+_MAGIC = b"HBCOL\0\0\0"
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 8
+_NUMERIC = {
+    "word_index": "<i4",
+    "token_index": "<i4",
+    "start_ms": "<i4",
+    "end_ms": "<i4",
+    "confidence": "<f4",
+}
+_STRING_COLUMNS = ("verse", "word_text", "translit", "chunk_id")
+_OPTIONAL_COLUMNS = ("token_index", "translit", "chunk_id")
+
+
+class ColumnarFormatError(ValueError):
+    """The file is not a readable `alignments.hbcol` sidecar."""
+
+
+@dataclass
+class AlignmentTable:
+    """One chapter's WordAlignment rows as columns.
+
+    String columns hold `<i4` ids into `strings`; `strings[0]` is `""`.
+    """
+
+    book: str
+    chapter: int
+    text_version: str
+    columns: Mapping[str, np.ndarray]
+    strings: Sequence[str]
+
+    def __len__(self) -> int:
+        return len(self.columns["word_index"])
+
+    def text(self, column: str) -> np.ndarray:
+        """Decoded values of a string column (object array)."""
+
+        table = np.asarray(self.strings, dtype=object)
+        return table[np.asarray(self.columns[column])]
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        strings = self.strings
+        columns = {name: np.asarray(values).tolist() for name, values in self.columns.items()}
+        for index in range(len(self)):
+            yield {
+                "book": self.book,
+                "chapter": self.chapter,
+                "verse": strings[columns["verse"][index]],
+                "word_index": columns["word_index"][index],
+                "token_index": columns["token_index"][index],
+                "word_text": strings[columns["word_text"][index]],
+                "translit": strings[columns["translit"][index]],
+                "start_ms": columns["start_ms"][index],
+                "end_ms": columns["end_ms"][index],
+                "confidence": round(columns["confidence"][index], 4),
+                "chunk_id": strings[columns["chunk_id"][index]] or None,
+            }
+
+
+def build_alignment_table(
+    text_chapter: TextChapter, aligned_words: Sequence[AlignedWord]
+) -> AlignmentTable:
+    interned: Dict[str, int] = {"": 0}
+    strings: List[str] = [""]
+
+    def intern(value: str) -> int:
+        index = interned.get(value)
+        if index is None:
+            index = interned[value] = len(strings)
+            strings.append(value)
+        return index
+
+    count = text_chapter.word_count
+    columns: Dict[str, np.ndarray] = {
+        name: np.full(count, MISSING_MS if name in ("start_ms", "end_ms") else 0, dtype=dtype)
+        for name, dtype in _NUMERIC.items()
+    }
+    for name in _STRING_COLUMNS:
+        columns[name] = np.zeros(count, dtype="<i4")
+    row = 0
+    for verse in text_chapter.verses:
+        verse_id = intern(verse.verse)
+        for token in verse.tokens:
+            columns["word_index"][row] = row
+            columns["token_index"][row] = token.index
+            columns["verse"][row] = verse_id
+            columns["word_text"][row] = intern(token.hebrew)
+            columns["translit"][row] = intern(token.translit)
+            row += 1
+    placed = as_timeline(aligned_words)
+    if len(placed) and bool((placed.word_index >= 0).all()):
+        # Stitched against the text: each word lands on its own token's row.
+        keep = placed.word_index < count
+        rows = placed.word_index[keep]
+    else:
+        keep = np.arange(len(placed)) < count
+        rows = np.flatnonzero(keep)
+    if rows.size:
+        chunk_index = placed.chunk_index[keep]
+        columns["start_ms"][rows] = placed.start_ms[keep]
+        columns["end_ms"][rows] = placed.end_ms[keep]
+        columns["confidence"][rows] = placed.confidence[keep]
+        # Intern chunk ids in order of first appearance, as a row-by-row pass would.
+        used, first_rows = np.unique(chunk_index, return_index=True)
+        chunk_strings = np.zeros(len(placed.chunk_ids), dtype="<i4")
+        for position in used[np.argsort(first_rows)].tolist():
+            chunk_strings[position] = intern(placed.chunk_ids[position])
+        columns["chunk_id"][rows] = chunk_strings[chunk_index]
+    return AlignmentTable(
+        book=text_chapter.book,
+        chapter=text_chapter.chapter,
+        text_version=text_chapter.text_version,
+        columns=columns,
+        strings=strings,
+    )
+
+
+def write_alignments_csv(table: AlignmentTable, path: Path) -> Path:
+    with _atomic_open(path, encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(CSV_COLUMNS), lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(table.iter_rows())
+    return path
+
+
+def write_alignments_json(table: AlignmentTable, path: Path) -> Path:
+    with _atomic_open(path, encoding="utf-8") as handle:
+        json.dump(list(table.iter_rows()), handle, ensure_ascii=False, indent=2)
+    return path
+
+
+def write_columnar(table: AlignmentTable, path: Path) -> Path:
+    blob = b"".join(value.encode("utf-8") for value in table.strings)
+    offsets = np.zeros(len(table.strings) + 1, dtype="<u4")
+    np.cumsum([len(value.encode("utf-8")) for value in table.strings], out=offsets[1:])
+    blocks: List[Tuple[str, bytes]] = [
+        (name, np.ascontiguousarray(table.columns[name], dtype=dtype).tobytes())
+        for name, dtype in (*_NUMERIC.items(), *((name, "<i4") for name in _STRING_COLUMNS))
+    ]
+    blocks += [("string_offsets", offsets.tobytes()), ("string_data", blob)]
+    dtypes = {
+        **_NUMERIC,
+        **dict.fromkeys(_STRING_COLUMNS, "<i4"),
+        "string_offsets": "<u4",
+        "string_data": "|u1",
+    }
+
+    # Block offsets depend on the header length and vice versa; re-render until
+    # the data start no longer moves (two passes in practice).
+    def render(data_start: int) -> Tuple[bytes, List[Dict[str, Any]]]:
+        layout = []
+        cursor = data_start
+        for name, payload in blocks:
+            layout.append(
+                {"name": name, "dtype": dtypes[name], "offset": cursor, "nbytes": len(payload)}
+            )
+            cursor = _aligned(cursor + len(payload))
+        header = {
+            "book": table.book,
+            "chapter": table.chapter,
+            "text_version": table.text_version,
+            "rows": len(table),
+            "strings": len(table.strings),
+            "columns": layout,
+        }
+        return json.dumps(header, ensure_ascii=False, sort_keys=True).encode("utf-8"), layout
+
+    data_start = 0
+    while True:
+        header, layout = render(data_start)
+        needed = _aligned(_PREAMBLE.size + len(header))
+        if needed <= data_start:
+            break
+        data_start = needed
+    with _atomic_open(path, "wb") as handle:
+        handle.write(_PREAMBLE.pack(_MAGIC, SCHEMA_VERSION, len(header)))
+        handle.write(header)
+        for entry, (_, payload) in zip(layout, blocks, strict=True):
+            handle.write(b"\0" * (entry["offset"] - handle.tell()))
+            handle.write(payload)
+    return path
+
+
+def read_columnar(path: Path) -> AlignmentTable:
+    """Memory-map a sidecar; numeric columns are zero-copy views into the file."""
+
+    try:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    except ValueError as exc:  # empty file
+        raise ColumnarFormatError(f"{path}: {exc}") from exc
+    if len(buffer) < _PREAMBLE.size:
+        raise ColumnarFormatError(f"{path}: truncated header")
+    magic, version, header_len = _PREAMBLE.unpack(buffer[: _PREAMBLE.size].tobytes())
+    if magic != _MAGIC:
+        raise ColumnarFormatError(f"{path}: not an alignment sidecar")
+    if version != SCHEMA_VERSION:
+        raise ColumnarFormatError(f"{path}: schema version {version} (expected {SCHEMA_VERSION})")
+    try:
+        header = json.loads(buffer[_PREAMBLE.size : _PREAMBLE.size + header_len].tobytes())
+        views = {
+            entry["name"]: buffer[entry["offset"] : entry["offset"] + entry["nbytes"]].view(
+                entry["dtype"]
+            )
+            for entry in header["columns"]
+        }
+        offsets = views.pop("string_offsets").tolist()
+        data = views.pop("string_data").tobytes()
+        strings = [data[start:end].decode("utf-8") for start, end in pairwise(offsets)]
+    except (KeyError, ValueError) as exc:
+        raise ColumnarFormatError(f"{path}: {exc}") from exc
+    if any(len(values) != header["rows"] for values in views.values()):
+        raise ColumnarFormatError(f"{path}: column lengths do not match the row count")
+    return AlignmentTable(
+        book=header["book"],
+        chapter=header["chapter"],
+        text_version=header["text_version"],
+        columns=views,
+        strings=strings,
+    )
+
+
+def read_alignment_table(path: Path) -> AlignmentTable:
+    """Any alignment export as a table: the sidecar when it is fresh, else parsed CSV/JSON.
+
+    Text exports may omit `token_index`, `translit` and `chunk_id`; empty
+    timestamps become `-1`. Raises `ColumnarFormatError` for rows that are not
+    alignment rows and `FileNotFoundError` for a missing path.
+    """
+
+    sidecar = path if path.suffix == SIDECAR_SUFFIX else sidecar_for(path)
+    if sidecar is not None:
+        return read_columnar(sidecar)
+    if path.suffix.lower() == ".json":
+        rows = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(rows, list):
+            raise ColumnarFormatError(f"{path}: expected a JSON array of word rows")
+        return _table_from_rows(rows, source=path)
+    with path.open(encoding="utf-8", newline="") as handle:
+        return _table_from_rows(
+            csv.DictReader(line for line in handle if not line.startswith("#")), source=path
+        )
+
+
+def _table_from_rows(rows: Iterable[Mapping[str, Any]], *, source: Path) -> AlignmentTable:
+    interned: Dict[str, int] = {"": 0}
+    strings: List[str] = [""]
+    values: Dict[str, List[Any]] = {name: [] for name in (*_NUMERIC, *_STRING_COLUMNS)}
+    book, chapter = "", 0
+    try:
+        for row in rows:
+            book, chapter = str(row["book"]), int(row["chapter"])
+            for name in _NUMERIC:
+                raw = row.get(name) if name in _OPTIONAL_COLUMNS else row[name]
+                if raw in (None, ""):
+                    raw = MISSING_MS if name in ("start_ms", "end_ms") else 0
+                values[name].append(float(raw) if name == "confidence" else int(float(raw)))
+            for name in _STRING_COLUMNS:
+                raw = row.get(name) if name in _OPTIONAL_COLUMNS else row[name]
+                text = "" if raw is None else str(raw)
+                index = interned.get(text)
+                if index is None:
+                    index = interned[text] = len(strings)
+                    strings.append(text)
+                values[name].append(index)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ColumnarFormatError(f"{source}: not an alignment row ({exc})") from exc
+    columns = {
+        name: np.asarray(data, dtype=_NUMERIC.get(name, "<i4")) for name, data in values.items()
+    }
+    return AlignmentTable(
+        book=book, chapter=chapter, text_version="", columns=columns, strings=strings
+    )
+
+
+def sidecar_for(path: Path) -> Path | None:
+    """The fresh sidecar next to an `alignments.csv/json`, if any."""
+
+    sidecar = path.with_name(SIDECAR_NAME)
+    try:
+        if sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            return sidecar
+    except OSError:
+        pass
+    return None
+
+
+def write_alignment_outputs(table: AlignmentTable, chapter_dir: Path) -> Dict[str, Path]:
+    """Write CSV, JSON and then the sidecar (last, so it is never older than the text files)."""
+
+    return {
+        "alignments_csv": write_alignments_csv(table, chapter_dir / "alignments.csv"),
+        "alignments_json": write_alignments_json(table, chapter_dir / "alignments.json"),
+        "alignments_columnar": write_columnar(table, chapter_dir / SIDECAR_NAME),
+    }
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+@contextmanager
+def _atomic_open(path: Path, mode: str = "w", **kwargs: Any) -> Iterator[IO[Any]]:
+    """Open a sibling temp file and rename it over *path* once the block succeeds."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp, mode, **kwargs) as handle:
+            yield handle
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+__all__ = [
+    "CSV_COLUMNS",
+    "SCHEMA_VERSION",
+    "SIDECAR_NAME",
+    "SIDECAR_SUFFIX",
+    "AlignmentTable",
+    "ColumnarFormatError",
+    "build_alignment_table",
+    "read_alignment_table",
+    "read_columnar",
+    "sidecar_for",
+    "write_alignment_outputs",
+    "write_alignments_csv",
+    "write_alignments_json",
+    "write_columnar",
+]
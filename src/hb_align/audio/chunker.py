@@ -3,16 +3,25 @@
 These helpers keep chunk size/overlap constraints consistent with the design
 spec so all pipelines share the same behaviour. They operate purely on timing
 metadata to keep them testable without heavy audio dependencies.
+
+A stitched chapter is a `StitchedTimeline`: parallel numpy columns that the
+writers and indexes consume directly, with `AlignedWord` objects created only
+when a caller indexes or iterates it.
 """
 
 from __future__ import annotations
 
+import unicodedata
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from itertools import pairwise
+from typing import Dict, Iterable, List, Sequence, Tuple, Union, overload
+
+import numpy as np
 
 MAX_CHUNK_SECONDS = 50
 MAX_OVERLAP_SECONDS = 5
 DEFAULT_OVERLAP_TOLERANCE_MS = 750
+DEFAULT_ALIGNMENT_BAND = 16
 
 
 @dataclass(frozen=True)
@@ -48,6 +57,7 @@ class AlignedWord:
     end_ms: int
     confidence: float
     chunk_id: str
+    word_index: int = -1
 
 
 def plan_chunks(
@@ -105,34 +115,384 @@ def chunk_map_to_dict(chunks: Sequence[ChunkWindow]) -> List[dict]:
     ]
 
 
+class StitchedTimeline(Sequence[AlignedWord]):
+    """Stitched words as columns; indexing builds an `AlignedWord` on demand.
+
+    `chunk_index` points into `chunk_ids`; `word_index` is each word's global
+    token index, or -1 for timelines stitched without the chapter text.
+    `unmatched` counts recognized words dropped because they matched no
+    token. Slicing returns another timeline over views of the same columns.
+    """
+
+    def __init__(
+        self,
+        text: Sequence[str],
+        start_ms: np.ndarray,
+        end_ms: np.ndarray,
+        confidence: np.ndarray,
+        chunk_index: np.ndarray,
+        chunk_ids: Sequence[str],
+        word_index: np.ndarray | None = None,
+        unmatched: int = 0,
+    ) -> None:
+        self.text = text
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.confidence = confidence
+        self.chunk_index = chunk_index
+        self.chunk_ids = tuple(chunk_ids)
+        self.word_index = (
+            np.full(len(start_ms), -1, dtype=np.int64) if word_index is None else word_index
+        )
+        self.unmatched = unmatched
+
+    @classmethod
+    def from_words(cls, words: Iterable[AlignedWord]) -> "StitchedTimeline":
+        words = list(words)
+        chunk_ids: Dict[str, int] = {}
+        return cls(
+            [word.text for word in words],
+            np.fromiter((word.start_ms for word in words), np.int64, len(words)),
+            np.fromiter((word.end_ms for word in words), np.int64, len(words)),
+            np.fromiter((word.confidence for word in words), np.float64, len(words)),
+            np.fromiter(
+                (chunk_ids.setdefault(word.chunk_id, len(chunk_ids)) for word in words),
+                np.int32,
+                len(words),
+            ),
+            list(chunk_ids),
+            np.fromiter((word.word_index for word in words), np.int64, len(words)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_ms)
+
+    @overload
+    def __getitem__(self, index: int) -> AlignedWord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "StitchedTimeline": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[AlignedWord, "StitchedTimeline"]:
+        if isinstance(index, slice):
+            return StitchedTimeline(
+                self.text[index],
+                self.start_ms[index],
+                self.end_ms[index],
+                self.confidence[index],
+                self.chunk_index[index],
+                self.chunk_ids,
+                self.word_index[index],
+                self.unmatched,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("timeline index out of range")
+        return AlignedWord(
+            text=self.text[index],
+            start_ms=int(self.start_ms[index]),
+            end_ms=int(self.end_ms[index]),
+            confidence=float(self.confidence[index]),
+            chunk_id=self.chunk_ids[self.chunk_index[index]],
+            word_index=int(self.word_index[index]),
+        )
+
+
+def as_timeline(words: Sequence[AlignedWord]) -> StitchedTimeline:
+    """*words* as a `StitchedTimeline`, converting plain sequences of `AlignedWord`."""
+
+    return words if isinstance(words, StitchedTimeline) else StitchedTimeline.from_words(words)
+
+
 def stitch_chunk_alignments(
     chunks: Iterable[ChunkAlignment],
     *,
     overlap_tolerance_ms: int = DEFAULT_OVERLAP_TOLERANCE_MS,
-) -> List[AlignedWord]:
-    """Merge chunk-scoped word timings into a continuous timeline."""
-
-    merged: List[AlignedWord] = []
-    sorted_chunks = sorted(chunks, key=lambda c: c.chunk.start_ms)
-    for chunk_alignment in sorted_chunks:
-        offset = chunk_alignment.chunk.start_ms
-        for word in chunk_alignment.words:
-            absolute = AlignedWord(
-                text=word.text,
-                start_ms=offset + word.start_ms,
-                end_ms=offset + word.end_ms,
-                confidence=word.confidence,
-                chunk_id=chunk_alignment.chunk.chunk_id,
+    tokens: Sequence[str] | None = None,
+    band: int = DEFAULT_ALIGNMENT_BAND,
+) -> StitchedTimeline:
+    """Merge chunk-scoped word timings into a continuous timeline in linear time.
+
+    Chunks are consumed in start order (sorted only if they arrive out of
+    order) and their words copied into columns preallocated for the total
+    word count. Where a chunk overlaps what is already stitched, the whole
+    overlap zone is resolved as a unit: the tail words reaching into the chunk
+    and the chunk's words starting before that tail ends are merged in one
+    pass. Each word is copied once and visited in at most two zones.
+
+    Without *tokens*, a pair starting within `overlap_tolerance_ms` of each
+    other with intersecting spans is one word, read from the more confident
+    chunk. That cannot tell a repeated word from a duplicate, so given the
+    chapter's canonical *tokens* (in text order) each chunk's words are first
+    aligned to them with `_align_to_tokens`, anchored where the overlap zone
+    starts, and the zone is merged by token index instead: the same index is
+    one word, and words matching no token are dropped.
+    """
+
+    ordered = list(chunks)
+    if any(a.chunk.start_ms > b.chunk.start_ms for a, b in pairwise(ordered)):
+        ordered.sort(key=lambda alignment: alignment.chunk.start_ms)
+    total = sum(len(alignment.words) for alignment in ordered)
+    text: List[str] = [""] * total
+    start = np.empty(total, dtype=np.int64)
+    end = np.empty(total, dtype=np.int64)
+    confidence = np.empty(total, dtype=np.float64)
+    chunk_index = np.empty(total, dtype=np.int32)
+    word_index = np.full(total, -1, dtype=np.int64)
+    token_keys = [_token_key(token) for token in tokens] if tokens is not None else None
+    unmatched = 0
+    size = 0
+
+    for index, alignment in enumerate(ordered):
+        words = alignment.words
+        count = len(words)
+        if not count:
+            continue
+        offset = alignment.chunk.start_ms
+        w_start = np.fromiter((word.start_ms for word in words), np.int64, count) + offset
+        w_end = np.fromiter((word.end_ms for word in words), np.int64, count) + offset
+        w_conf = np.fromiter((word.confidence for word in words), np.float64, count)
+        w_text = [word.text for word in words]
+        w_index = np.full(count, -1, dtype=np.int64)
+        if count > 1 and bool((w_start[1:] < w_start[:-1]).any()):
+            order = np.argsort(w_start, kind="stable")
+            w_start, w_end, w_conf = w_start[order], w_end[order], w_conf[order]
+            w_text = [w_text[position] for position in order.tolist()]
+
+        # Overlap zone: stitched words still sounding when this chunk's first word starts ...
+        tail = size
+        while tail > 0 and end[tail - 1] >= w_start[0]:
+            tail -= 1
+
+        if token_keys is not None:
+            if tail < size:
+                anchor = int(word_index[tail])
+            else:
+                anchor = int(word_index[size - 1]) + 1 if size else 0
+            w_index = _align_to_tokens(
+                [_token_key(word) for word in w_text], token_keys, anchor, band
             )
-            if merged:
-                prev = merged[-1]
-                overlap = prev.end_ms - absolute.start_ms
-                if overlap >= 0 and overlap <= overlap_tolerance_ms:
-                    if absolute.confidence > prev.confidence:
-                        merged[-1] = absolute
+            keep = w_index >= 0
+            if not keep.all():
+                unmatched += count - int(keep.sum())
+                w_start, w_end, w_conf = w_start[keep], w_end[keep], w_conf[keep]
+                w_index = w_index[keep]
+                w_text = [word for word, kept in zip(w_text, keep.tolist(), strict=True) if kept]
+                count = len(w_text)
+                if not count:
                     continue
-            merged.append(absolute)
-    return merged
+            # ... or, by token, stitched words from this chunk's first token on,
+            # and this chunk's words up to the last token already stitched.
+            tail = size
+            while tail > 0 and word_index[tail - 1] >= w_index[0]:
+                tail -= 1
+            head = 0
+            if tail < size:
+                head = int(np.searchsorted(w_index, word_index[size - 1], side="right"))
+        else:
+            head = 0
+            if tail < size:
+                # ... and this chunk's words that start before those end.
+                head = int(np.searchsorted(w_start, end[tail:size].max(), side="right"))
+
+        if head:
+            if token_keys is not None:
+                zone = _merge_by_token(
+                    (word_index[tail:size].tolist(), confidence[tail:size].tolist()),
+                    (w_index[:head].tolist(), w_conf[:head].tolist()),
+                )
+            else:
+                zone = _resolve_overlap(
+                    (
+                        start[tail:size].tolist(),
+                        end[tail:size].tolist(),
+                        confidence[tail:size].tolist(),
+                    ),
+                    (w_start[:head].tolist(), w_end[:head].tolist(), w_conf[:head].tolist()),
+                    overlap_tolerance_ms,
+                )
+            previous = (
+                text[tail:size],
+                start[tail:size].copy(),
+                end[tail:size].copy(),
+                confidence[tail:size].copy(),
+                chunk_index[tail:size].copy(),
+                word_index[tail:size].copy(),
+            )
+            size = tail
+            for side, position in zone:
+                if side:
+                    text[size] = w_text[position]
+                    start[size], end[size] = w_start[position], w_end[position]
+                    confidence[size], chunk_index[size] = w_conf[position], index
+                    word_index[size] = w_index[position]
+                else:
+                    text[size] = previous[0][position]
+                    start[size], end[size] = previous[1][position], previous[2][position]
+                    confidence[size], chunk_index[size] = (
+                        previous[3][position],
+                        previous[4][position],
+                    )
+                    word_index[size] = previous[5][position]
+                size += 1
+
+        rest = count - head
+        text[size : size + rest] = w_text[head:]
+        start[size : size + rest] = w_start[head:]
+        end[size : size + rest] = w_end[head:]
+        confidence[size : size + rest] = w_conf[head:]
+        chunk_index[size : size + rest] = index
+        word_index[size : size + rest] = w_index[head:]
+        size += rest
+
+    return StitchedTimeline(
+        text[:size],
+        start[:size],
+        end[:size],
+        confidence[:size],
+        chunk_index[:size],
+        [alignment.chunk.chunk_id for alignment in ordered],
+        word_index[:size],
+        unmatched,
+    )
+
+
+_Zone = Tuple[List[int], List[int], List[float]]
+
+# Traceback moves of `_align_to_tokens`.
+_MATCH, _SKIP_TOKEN, _SKIP_WORD = 1, 2, 3
+
+
+def _token_key(text: str) -> str:
+    """*text* without points and accents, so a recognized word compares to its token."""
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if unicodedata.category(ch) not in ("Mn", "Sk"))
+
+
+def _align_to_tokens(
+    words: Sequence[str], tokens: Sequence[str], anchor: int, band: int
+) -> np.ndarray:
+    """Global token index of each of *words*, or -1 where a word matches no token.
+
+    A semi-global edit distance between *words* and the tokens from *anchor*
+    on: skipping tokens before the first word or after the last is free, a
+    skipped word or token costs 1 and a differing match 1. Only cells with
+    `|token - (anchor + word)| <= band` are evaluated, so time and traceback
+    memory are O(len(words) * band). Ties prefer matches, then the path
+    ending nearest the diagonal. The path may also stop early, each word
+    after it costing 1: once the band runs past the last token (an outro
+    after the chapter text) the remaining words match none.
+    """
+
+    m = len(words)
+    lo = max(0, anchor - band)
+    window = tokens[lo : anchor + m + band + 1]
+    n = len(window)
+    width = 2 * band + 1
+    shift = anchor - lo - band  # row i's slot k holds window column j = i + shift + k
+    infinity = m + n + 1
+    moves = np.zeros((m + 1, width), dtype=np.int8)
+    row = [0 if 0 <= shift + k <= n else infinity for k in range(width)]
+    # Where the path stops: (cost with the words after row i skipped, i, k).
+    end = (m, 0, 0)
+    for i in range(1, m + 1):
+        word = words[i - 1]
+        current = [infinity] * width
+        for k in range(width):
+            j = i + shift + k
+            if j < 0 or j > n:
+                continue
+            best, move = infinity, 0
+            if j > 0 and row[k] < infinity:
+                best, move = row[k] + (word != window[j - 1]), _MATCH
+            if k > 0 and current[k - 1] + 1 < best:
+                best, move = current[k - 1] + 1, _SKIP_TOKEN
+            if k + 1 < width and row[k + 1] + 1 < best:
+                best, move = row[k + 1] + 1, _SKIP_WORD
+            current[k], moves[i, k] = best, move
+        row = current
+        low = min(row)
+        if low >= infinity:
+            break
+        # Stopping early only wins outright; a full path wins ties.
+        if low + m - i < end[0] or (i == m and low <= end[0]):
+            k = min((abs(slot - band), slot) for slot in range(width) if row[slot] == low)[1]
+            end = (low + m - i, i, k)
+
+    _, i, k = end
+    result = np.full(m, -1, dtype=np.int64)
+    while i > 0:
+        move = moves[i, k]
+        if move == _MATCH:
+            result[i - 1] = lo + i + shift + k - 1
+            i -= 1
+        elif move == _SKIP_TOKEN:
+            k -= 1
+        elif move == _SKIP_WORD:
+            i -= 1
+            k += 1
+        else:
+            break
+    return result
+
+
+def _merge_by_token(
+    stitched: Tuple[List[int], List[float]], incoming: Tuple[List[int], List[float]]
+) -> List[Tuple[int, int]]:
+    """Order of an overlap zone's words by token index, as `_resolve_overlap` returns it.
+
+    Words sharing a token index are one word; the more confident reading is kept.
+    """
+
+    a_index, a_conf = stitched
+    b_index, b_conf = incoming
+    picks: List[Tuple[int, int]] = []
+    i = j = 0
+    while i < len(a_index) and j < len(b_index):
+        if a_index[i] == b_index[j]:
+            picks.append((1, j) if b_conf[j] > a_conf[i] else (0, i))
+            i += 1
+            j += 1
+        elif a_index[i] < b_index[j]:
+            picks.append((0, i))
+            i += 1
+        else:
+            picks.append((1, j))
+            j += 1
+    picks.extend((0, position) for position in range(i, len(a_index)))
+    picks.extend((1, position) for position in range(j, len(b_index)))
+    return picks
+
+
+def _resolve_overlap(stitched: _Zone, incoming: _Zone, tolerance_ms: int) -> List[Tuple[int, int]]:
+    """Order of an overlap zone's words as `(side, position)`; side 0 is stitched, 1 incoming.
+
+    A two-pointer merge in start order; matched pairs keep the more confident reading.
+    """
+
+    a_start, a_end, a_conf = stitched
+    b_start, b_end, b_conf = incoming
+    picks: List[Tuple[int, int]] = []
+    i = j = 0
+    while i < len(a_start) and j < len(b_start):
+        same_word = abs(a_start[i] - b_start[j]) <= tolerance_ms and max(
+            a_start[i], b_start[j]
+        ) <= min(a_end[i], b_end[j])
+        if same_word:
+            picks.append((1, j) if b_conf[j] > a_conf[i] else (0, i))
+            i += 1
+            j += 1
+        elif a_start[i] <= b_start[j]:
+            picks.append((0, i))
+            i += 1
+        else:
+            picks.append((1, j))
+            j += 1
+    picks.extend((0, position) for position in range(i, len(a_start)))
+    picks.extend((1, position) for position in range(j, len(b_start)))
+    return picks
 
 
 __all__ = [
@@ -140,6 +500,8 @@ __all__ = [
     "WordSegment",
     "ChunkAlignment",
     "AlignedWord",
+    "StitchedTimeline",
+    "as_timeline",
     "plan_chunks",
     "chunk_map_to_dict",
     "stitch_chunk_alignments",
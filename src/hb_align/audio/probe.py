@@ -0,0 +1,110 @@
+"""Audio probing and normalization helpers (checksums, duration, ffmpeg).
+
+ffmpeg/ffprobe are optional at import time; callers get `None` from probes or an
+`AudioToolError` from conversions when the binaries are not installed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import shutil
+import subprocess
+import wave
+from pathlib import Path
+
+DEFAULT_SAMPLE_RATE = 16_000
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class AudioToolError(RuntimeError):
+    """Raised when ffmpeg is unavailable or fails to convert audio."""
+
+
+def compute_checksum(path: Path | str) -> str:
+    """Return the SHA256 of the file contents, streamed in 1 MiB blocks."""
+
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probe_duration_ms(path: Path | str, *, ffprobe: str = "ffprobe") -> int | None:
+    """Return the audio duration in ms, or None when it cannot be determined."""
+
+    source = Path(path)
+    if source.suffix.lower() == ".wav":
+        with contextlib.suppress(wave.Error, EOFError, OSError):
+            with wave.open(str(source), "rb") as handle:
+                frames = handle.getnframes()
+                rate = handle.getframerate()
+                if rate:
+                    return int(frames * 1000 / rate)
+    executable = shutil.which(ffprobe)
+    if not executable:
+        return None
+    completed = subprocess.run(  # noqa: S603 (controlled command)
+        [executable, "-v", "error", "-show_entries", "format=duration", "-of", "json", str(source)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        return None
+    try:
+        seconds = float(json.loads(completed.stdout)["format"]["duration"])
+    except (KeyError, ValueError, TypeError):
+        return None
+    return int(seconds * 1000)
+
+
+def ffmpeg_available(ffmpeg: str = "ffmpeg") -> bool:
+    return shutil.which(ffmpeg) is not None
+
+
+def normalize_audio(
+    source: Path | str,
+    target: Path | str,
+    *,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    ffmpeg: str = "ffmpeg",
+) -> Path:
+    """Convert *source* to mono 16-bit PCM WAV at *sample_rate* (MFA input format)."""
+
+    return _run_ffmpeg(
+        ["-i", str(source), "-ac", "1", "-ar", str(sample_rate), "-sample_fmt", "s16"],
+        Path(target),
+        ffmpeg=ffmpeg,
+    )
+
+
+def _run_ffmpeg(args: list[str], target: Path, *, ffmpeg: str) -> Path:
+    executable = shutil.which(ffmpeg)
+    if not executable:
+        raise AudioToolError("ffmpeg executable not found. Install ffmpeg per quickstart.md.")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(target.name + ".partial.wav")
+    completed = subprocess.run(  # noqa: S603 (controlled command)
+        [executable, "-y", "-v", "error", *args, str(partial)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        partial.unlink(missing_ok=True)
+        raise AudioToolError(f"ffmpeg failed (exit {completed.returncode}): {completed.stderr.strip()}")
+    partial.replace(target)
+    return target
+
+
+__all__ = [
+    "DEFAULT_SAMPLE_RATE",
+    "AudioToolError",
+    "compute_checksum",
+    "ffmpeg_available",
+    "normalize_audio",
+    "probe_duration_ms",
+]
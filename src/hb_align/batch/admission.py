@@ -0,0 +1,214 @@
+"""CPU-budget-aware admission control for batch runs (NFR-003).
+
+A fixed `--parallel` either leaves a large host idle or pushes a small one past
+the 80% CPU budget. `AdmissionController` instead samples system CPU
+utilization (`/proc/stat`) and the 1-minute load average on a background
+thread and adjusts how many chapters may align at once, AIMD style:
+
+* above the target it backs off multiplicatively (×¾, at least one slot);
+* below it, and only while every slot is busy, it adds one slot when one more
+  chapter's estimated share (current CPU% ÷ running chapters) still fits under
+  the target and the load average does not exceed the core count;
+* after each change it waits `settle_samples` samples before deciding again,
+  since MFA takes a while to ramp up.
+
+Chapters take a slot with `acquire`/`try_acquire` and give it back with
+`release`; `mfa_jobs()` spreads the cores over the current limit the same way
+`mfa_jobs_for` does for a fixed `--parallel`. Every change lands in `timeline`
+so the manifest shows how concurrency moved over the run.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hb_align.batch.runner import mfa_jobs_for
+from hb_align.utils.resources import read_system_cpu_times, system_cpu_pct
+
+DEFAULT_CPU_TARGET = 80.0
+DEFAULT_INTERVAL_S = 2.0
+DEFAULT_SETTLE_SAMPLES = 2
+_DECREASE_FACTOR = 0.75
+_EWMA_ALPHA = 0.5
+
+
+def _load1() -> Optional[float]:
+    try:
+        return os.getloadavg()[0]
+    except OSError:
+        return None
+
+
+class AdmissionController:
+    """Dynamic concurrency limit that holds system CPU near `target_pct`."""
+
+    def __init__(
+        self,
+        *,
+        target_pct: float = DEFAULT_CPU_TARGET,
+        max_limit: int,
+        min_limit: int = 1,
+        initial: Optional[int] = None,
+        cpu_count: Optional[int] = None,
+        interval_s: float = DEFAULT_INTERVAL_S,
+        settle_samples: int = DEFAULT_SETTLE_SAMPLES,
+        cpu_reader: Callable[[], Optional[Tuple[int, int]]] = read_system_cpu_times,
+        load_reader: Callable[[], Optional[float]] = _load1,
+    ) -> None:
+        if not 0 < target_pct <= 100:
+            raise ValueError("target_pct must be in (0, 100]")
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive")
+        self.target_pct = target_pct
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.interval_s = interval_s
+        self._settle_samples = max(0, settle_samples)
+        self._cpu_reader = cpu_reader
+        self._load_reader = load_reader
+        self._limit = min(self.max_limit, max(self.min_limit, initial or self.min_limit))
+        self._running = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at = time.monotonic()
+        self._last_cpu = cpu_reader()
+        self._smoothed: Optional[float] = None
+        self._cooldown = 0
+        self._cpu_samples: List[float] = []
+        self._timeline: List[Dict[str, Any]] = []
+        self._record("initial", cpu_pct=None, load1=None)
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return self._limit
+
+    @property
+    def running(self) -> int:
+        with self._cond:
+            return self._running
+
+    @property
+    def timeline(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            return [dict(entry) for entry in self._timeline]
+
+    def mfa_jobs(self) -> int:
+        return mfa_jobs_for(self.limit, self.cpu_count)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._running >= self._limit:
+                self._cond.wait()
+            self._running += 1
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self._running >= self._limit:
+                return False
+            self._running += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self._running = max(0, self._running - 1)
+            self._cond.notify_all()
+
+    def sample(self) -> Optional[float]:
+        """Take one CPU/load reading and adjust the limit; returns the smoothed CPU%."""
+
+        current = self._cpu_reader()
+        cpu_pct = system_cpu_pct(self._last_cpu, current)
+        self._last_cpu = current
+        if cpu_pct is None:
+            return None
+        load1 = self._load_reader()
+        with self._cond:
+            self._cpu_samples.append(cpu_pct)
+            smoothed = cpu_pct if self._smoothed is None else (
+                _EWMA_ALPHA * cpu_pct + (1 - _EWMA_ALPHA) * self._smoothed
+            )
+            self._smoothed = smoothed
+            if self._cooldown > 0:
+                self._cooldown -= 1
+                return smoothed
+            limit = self._limit
+            if smoothed > self.target_pct and limit > self.min_limit:
+                new_limit = max(self.min_limit, min(limit - 1, int(limit * _DECREASE_FACTOR)))
+                self._change(new_limit, "decrease", smoothed, load1)
+            elif limit < self.max_limit and self._running >= limit and self._has_headroom(smoothed, load1):
+                self._change(limit + 1, "increase", smoothed, load1)
+        return smoothed
+
+    def start(self) -> "AdmissionController":
+        self._thread = threading.Thread(target=self._run, name="hb-align-admission", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "AdmissionController":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def summary(self) -> Dict[str, Any]:
+        """Manifest payload: target, bounds, observed CPU and the concurrency timeline."""
+
+        with self._cond:
+            samples = list(self._cpu_samples)
+            limits = [entry["limit"] for entry in self._timeline]
+            return {
+                "cpu_target_pct": self.target_pct,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "final_limit": self._limit,
+                "peak_limit": max(limits),
+                "avg_cpu_pct": round(sum(samples) / len(samples), 2) if samples else None,
+                "max_cpu_pct": round(max(samples), 2) if samples else None,
+                "samples": len(samples),
+                "timeline": [dict(entry) for entry in self._timeline],
+            }
+
+    def _has_headroom(self, cpu_pct: float, load1: Optional[float]) -> bool:
+        if load1 is not None and load1 > self.cpu_count:
+            return False
+        per_chapter = cpu_pct / max(1, self._running)
+        return cpu_pct + per_chapter <= self.target_pct
+
+    def _change(self, new_limit: int, reason: str, cpu_pct: float, load1: Optional[float]) -> None:
+        self._limit = new_limit
+        self._cooldown = self._settle_samples
+        self._record(reason, cpu_pct=cpu_pct, load1=load1)
+        self._cond.notify_all()
+
+    def _record(self, reason: str, *, cpu_pct: Optional[float], load1: Optional[float]) -> None:
+        entry: Dict[str, Any] = {
+            "t_s": round(time.monotonic() - self._started_at, 3),
+            "limit": self._limit,
+            "mfa_jobs": mfa_jobs_for(self._limit, self.cpu_count),
+            "reason": reason,
+        }
+        if cpu_pct is not None:
+            entry["cpu_pct"] = round(cpu_pct, 2)
+        if load1 is not None:
+            entry["load1"] = round(load1, 2)
+        self._timeline.append(entry)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+
+__all__ = ["DEFAULT_CPU_TARGET", "AdmissionController"]
@@ -0,0 +1,47 @@
+"""Input discovery for batch-style commands (`batch`, `cache warm`)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from hb_align.text.references import infer_reference_from_filename
+
+DEFAULT_PATTERN = "*.mp3"
+
+
+@dataclass(frozen=True)
+class ChapterFile:
+    path: Path
+    book: str
+    chapter: int
+
+    @property
+    def file_name(self) -> str:
+        return self.path.name
+
+
+def discover_chapter_files(
+    input_dir: Path,
+    *,
+    pattern: str = DEFAULT_PATTERN,
+    book: Optional[str] = None,
+) -> Tuple[List[ChapterFile], List[Path]]:
+    """Return (resolvable chapter files, unresolvable paths) sorted by filename."""
+
+    if not input_dir.is_dir():
+        raise FileNotFoundError(f"Input directory not found: {input_dir}")
+    resolved: List[ChapterFile] = []
+    unresolved: List[Path] = []
+    for path in sorted(p for p in input_dir.glob(pattern) if p.is_file()):
+        inferred_book, chapter = infer_reference_from_filename(path)
+        chosen_book = book or inferred_book
+        if not chosen_book or chapter is None:
+            unresolved.append(path)
+            continue
+        resolved.append(ChapterFile(path=path, book=chosen_book, chapter=chapter))
+    return resolved, unresolved
+
+
+__all__ = ["DEFAULT_PATTERN", "ChapterFile", "discover_chapter_files"]
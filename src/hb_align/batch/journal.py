@@ -0,0 +1,124 @@
+"""Append-only NDJSON journal of batch item state transitions.
+
+Every transition (`pending → running → success/failed`) is appended as one
+JSON line and fsync'd, so a crash loses at most the line being written.
+`replay_journal` folds the log back into per-item state (later lines win, a
+torn final line is ignored) and `JournalReplay.to_manifest` compacts it into
+the `manifest.json` schema. Writing a line per event keeps batch I/O linear
+in the number of chapters instead of rewriting the manifest every time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, Mapping, Optional
+
+from hb_align.batch.manifest import BatchItem, BatchManifest, utc_now
+
+JOURNAL_SUFFIX = ".journal.ndjson"
+TERMINAL_STATES = ("success", "failed")
+
+
+def journal_path_for(manifest_path: Path | str) -> Path:
+    """`manifest.json` → `manifest.journal.ndjson` (same directory)."""
+
+    path = Path(manifest_path)
+    return path.with_name(path.stem + JOURNAL_SUFFIX)
+
+
+class BatchJournal:
+    """Writer side of the journal; safe to share between threads of one process."""
+
+    def __init__(self, path: Path | str, *, truncate: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: Optional[IO[str]] = self.path.open("w" if truncate else "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, event: str, **fields: Any) -> None:
+        line = json.dumps({"event": event, "ts": utc_now(), **fields}, ensure_ascii=False)
+        with self._lock:
+            if self._handle is None:
+                raise ValueError("Journal is closed")
+            self._handle.write(line + "\n")
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+
+    def record_item(self, item: BatchItem, *, state: Optional[str] = None) -> None:
+        payload = item.to_dict()
+        payload["status"] = state or item.status
+        self.record("item", **payload)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@dataclass
+class JournalReplay:
+    batch_id: Optional[str] = None
+    input_dir: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    items: Dict[str, BatchItem] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_manifest(self) -> BatchManifest:
+        manifest = BatchManifest(input_dir=self.input_dir or "")
+        if self.batch_id:
+            manifest.batch_id = self.batch_id
+        if self.started_at:
+            manifest.started_at = self.started_at
+        manifest.completed_at = self.completed_at
+        manifest.items = sorted(self.items.values(), key=lambda item: (item.book, item.chapter, item.file_name))
+        manifest.extra.update(self.extra)
+        return manifest
+
+
+def replay_journal(path: Path | str) -> JournalReplay:
+    replay = JournalReplay()
+    with Path(path).open(encoding="utf-8") as handle:
+        for raw_line in handle:
+            try:
+                event = json.loads(raw_line)
+            except ValueError:
+                continue  # torn write from a crash; everything before it is intact
+            _apply(replay, event)
+    return replay
+
+
+def _apply(replay: JournalReplay, event: Mapping[str, Any]) -> None:
+    kind = event.get("event")
+    if kind in ("batch_started", "batch_resumed"):
+        replay.batch_id = replay.batch_id or event.get("batch_id")
+        replay.input_dir = event.get("input_dir") or replay.input_dir
+        replay.started_at = replay.started_at or event.get("ts")
+        replay.completed_at = None
+        replay.extra.update(event.get("extra") or {})
+    elif kind == "batch_completed":
+        replay.completed_at = event.get("ts")
+        replay.extra.update(event.get("extra") or {})
+    elif kind == "item":
+        payload = {key: value for key, value in event.items() if key not in ("event", "ts")}
+        previous = replay.items.get(payload.get("file_name", ""))
+        if previous is not None and payload.get("status") == "running":
+            # A `running` line only changes the state; keep estimates from `pending`.
+            previous.status = payload["status"]
+            return
+        item = BatchItem.from_dict(payload)
+        replay.items[item.file_name] = item
+
+
+__all__ = ["BatchJournal", "JournalReplay", "journal_path_for", "replay_journal"]
@@ -0,0 +1,240 @@
+"""Batch manifest model and writer (contracts/batch.md § Manifest Schema)."""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, MutableMapping, Optional, Sequence
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest file cannot be parsed (`INVALID_MANIFEST`)."""
+
+
+ITEM_STATES = ("pending", "running", "success", "failed")
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class BatchItem:
+    file_name: str
+    book: str
+    chapter: int
+    status: str = "pending"
+    exit_code: Optional[int] = None
+    coverage_pct: Optional[float] = None
+    confidence_avg: Optional[float] = None
+    runtime_ms: Optional[int] = None
+    estimated_duration_ms: Optional[int] = None
+    estimated_chunks: Optional[int] = None
+    cache_key: Optional[str] = None
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+    artifacts: Dict[str, str] = field(default_factory=dict)
+    # Full per-chapter summary.json payload; feeds metrics, not written to the manifest.
+    summary: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "file_name": self.file_name,
+            "book": self.book,
+            "chapter": self.chapter,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "artifacts": dict(self.artifacts),
+        }
+        for name in (
+            "coverage_pct",
+            "confidence_avg",
+            "runtime_ms",
+            "estimated_duration_ms",
+            "estimated_chunks",
+            "cache_key",
+            "error_code",
+            "error_message",
+        ):
+            value = getattr(self, name)
+            if value is not None:
+                payload[name] = value
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "BatchItem":
+        known = {name for name in cls.__dataclass_fields__ if name != "summary"}
+        return cls(**{key: value for key, value in payload.items() if key in known})
+
+
+@dataclass
+class BatchManifest:
+    input_dir: str
+    batch_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    started_at: str = field(default_factory=utc_now)
+    completed_at: Optional[str] = None
+    items: List[BatchItem] = field(default_factory=list)
+    extra: MutableMapping[str, Any] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        finished = [item for item in self.items if item.status in ("success", "failed")]
+        runtimes = [item.runtime_ms for item in finished if item.runtime_ms is not None]
+        coverages = [item.coverage_pct for item in finished if item.coverage_pct is not None]
+        confidences = [item.confidence_avg for item in finished if item.confidence_avg]
+        return {
+            "total": len(self.items),
+            "success": sum(1 for item in self.items if item.status == "success"),
+            "failed": sum(1 for item in self.items if item.status == "failed"),
+            "pending": sum(1 for item in self.items if item.status not in ("success", "failed")),
+            "avg_runtime_ms": round(sum(runtimes) / len(runtimes)) if runtimes else 0,
+            "avg_coverage_pct": round(sum(coverages) / len(coverages), 3) if coverages else 0.0,
+            "avg_confidence": round(sum(confidences) / len(confidences), 3) if confidences else 0.0,
+        }
+
+    def validate(self) -> None:
+        """Manifest integrity (data-model.md): one item per file, known states.
+
+        `summary()` is derived from `items`, so unique items are what keep the
+        totals equal to the sum of the items.
+        """
+
+        seen: set[str] = set()
+        for item in self.items:
+            if item.file_name in seen:
+                raise ManifestError(f"Duplicate manifest item {item.file_name}")
+            if item.status not in ITEM_STATES:
+                raise ManifestError(f"Unknown status {item.status!r} for {item.file_name}")
+            seen.add(item.file_name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "batch_id": self.batch_id,
+            "input_dir": self.input_dir,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "summary": self.summary(),
+            "items": [item.to_dict() for item in self.items],
+        }
+        payload.update(self.extra)
+        return payload
+
+    def write(self, path: Path | str) -> Path:
+        """Write the manifest atomically (temp file + rename).
+
+        The temp name is unique per writer: `--worker` processes on different
+        hosts may rewrite the same manifest on a shared filesystem.
+        """
+
+        self.validate()
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        temp.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, target)
+        return target
+
+
+def load_manifest(path: Path | str) -> BatchManifest:
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        items = [BatchItem.from_dict(item) for item in payload.get("items", [])]
+        known = {"batch_id", "input_dir", "started_at", "completed_at", "summary", "items"}
+        manifest = BatchManifest(
+            input_dir=str(payload["input_dir"]),
+            batch_id=str(payload["batch_id"]),
+            started_at=str(payload["started_at"]),
+            completed_at=payload.get("completed_at"),
+            items=items,
+            extra={key: value for key, value in payload.items() if key not in known},
+        )
+        manifest.validate()
+        recorded = (payload.get("summary") or {}).get("total")
+        if recorded is not None and recorded != len(items):
+            raise ManifestError(f"summary.total is {recorded} but the manifest lists {len(items)} items")
+        return manifest
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise ManifestError(f"Invalid batch manifest {path}: {exc}") from exc
+
+
+def merge_manifests(manifests: Sequence[BatchManifest], *, allow_partial: bool = False) -> BatchManifest:
+    """Combine `batch --shard i/n` manifests into one manifest for the whole job set.
+
+    Shards must agree on the input directory, shard count and partition plan
+    (`plan_digest`), list disjoint files and, unless *allow_partial*, cover
+    every shard index and every planned file (`plan_files`). The merged
+    manifest spans the earliest start to the latest completion (open while
+    any shard is) and records the shards it was built from under `shards`.
+    """
+
+    if not manifests:
+        raise ManifestError("Nothing to merge")
+    input_dirs = {manifest.input_dir for manifest in manifests}
+    if len(input_dirs) > 1:
+        raise ManifestError(f"Shards come from different input directories: {sorted(input_dirs)}")
+
+    shards: List[Dict[str, Any]] = []
+    for manifest in manifests:
+        shard = dict((manifest.extra.get("scheduling") or {}).get("shard") or {})
+        if not shard:
+            raise ManifestError(f"Manifest {manifest.batch_id} was not written by `batch --shard`")
+        shards.append({"batch_id": manifest.batch_id, **shard})
+    counts = {shard["count"] for shard in shards}
+    if len(counts) > 1:
+        raise ManifestError(f"Shards disagree on the shard count: {sorted(counts)}")
+    count = counts.pop()
+    indices = [shard["index"] for shard in shards]
+    duplicates = sorted({index for index in indices if indices.count(index) > 1})
+    if duplicates:
+        raise ManifestError(f"Shard(s) {duplicates} given more than once")
+    missing = sorted(set(range(1, count + 1)) - set(indices))
+    if missing and not allow_partial:
+        raise ManifestError(f"Missing shard(s) {missing} of {count}")
+    digests = {shard.get("plan_digest") for shard in shards}
+    if len(digests) > 1:
+        raise ManifestError("Shards were partitioned from different files or estimates")
+    planned = shards[0].get("plan_files")
+
+    items: Dict[str, BatchItem] = {}
+    for manifest in manifests:
+        for item in manifest.items:
+            if item.file_name in items:
+                raise ManifestError(f"{item.file_name} appears in more than one shard")
+            items[item.file_name] = item
+    if planned is not None:
+        unplanned = sorted(set(items) - set(planned))
+        if unplanned:
+            raise ManifestError(f"Shards list files outside the plan: {unplanned}")
+        uncovered = sorted(set(planned) - set(items))
+        if uncovered and not missing:
+            raise ManifestError(f"No shard lists {uncovered}")
+
+    completed = [manifest.completed_at for manifest in manifests]
+    merged = BatchManifest(
+        input_dir=input_dirs.pop(),
+        started_at=min(manifest.started_at for manifest in manifests),
+        completed_at=None if None in completed or missing else max(c for c in completed if c),
+        items=sorted(items.values(), key=lambda item: (item.book, item.chapter, item.file_name)),
+    )
+    merged.extra["shards"] = sorted(
+        ({key: value for key, value in shard.items() if key != "plan_files"} for shard in shards),
+        key=lambda shard: shard["index"],
+    )
+    if missing:
+        merged.extra["missing_shards"] = missing
+    merged.validate()
+    return merged
+
+
+__all__ = [
+    "ITEM_STATES",
+    "BatchItem",
+    "BatchManifest",
+    "ManifestError",
+    "load_manifest",
+    "merge_manifests",
+    "utc_now",
+]
@@ -0,0 +1,173 @@
+"""Process pool that survives a dying worker.
+
+When a worker dies mid-job (the OOM killer, a crash in native code) its
+`ProcessPoolExecutor` is broken for good: every job in flight fails with
+`BrokenProcessPool`, not only the one the dead worker was running, and every
+later submit raises it too. `WorkerPool` swaps in a fresh executor and reruns
+the jobs that were in flight, one at a time, holding back new submissions
+meanwhile. A job that breaks the pool again while it is the only one running
+is the culprit: its future raises `BrokenProcessPool`, and it is the only one
+that does. Every other future resolves as if nothing had happened, including
+a job that was merely submitted to a pool whose workers were already dead.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, List, Optional, Sequence, Set, Tuple
+
+
+@dataclass(eq=False)
+class _Task:
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: Future[Any] = field(default_factory=Future)
+    generation: int = -1  # executor it runs on; -1 for a suspect
+    breaks: int = 0  # pool breaks it was in flight for
+    inner: Optional[Future[Any]] = None  # the executor's future for the current attempt
+
+
+class WorkerPool:
+    """`submit`/`shutdown` facade over a self-replacing `ProcessPoolExecutor`."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Sequence[Any] = (),
+        mp_context: Any = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self._initializer = initializer
+        self._initargs = tuple(initargs)
+        self._mp_context = mp_context
+        self._lock = threading.RLock()
+        self._executor = self._new_executor()
+        self._generation = 0
+        self._running: Set[_Task] = set()
+        self._suspects: Deque[_Task] = deque()  # in flight when a pool broke
+        self._held: Deque[_Task] = deque()  # submitted while suspects rerun
+        self._closed = False
+        self.replacements = 0
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The executor currently in use (replaced after every break)."""
+
+        return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+        task = _Task(fn, args)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot submit to a WorkerPool after shutdown")
+            if self._suspects or self._isolating():
+                self._held.append(task)
+            else:
+                self._start(task)
+        return task.future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._closed = True
+            waiting = list(self._suspects) + list(self._held)
+            self._suspects.clear()
+            self._held.clear()
+            executor = self._executor
+        for task in waiting:
+            task.future.cancel()
+        executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._mp_context,
+            initializer=self._initializer,
+            initargs=self._initargs,
+        )
+
+    def _isolating(self) -> bool:
+        return any(task.generation == -1 for task in self._running)
+
+    def _start(self, task: _Task, *, alone: bool = False) -> None:
+        try:
+            inner = self._executor.submit(task.fn, *task.args)
+        except BrokenProcessPool:
+            # Broke before this task started, so it is not a suspect.
+            self._replace()
+            inner = self._executor.submit(task.fn, *task.args)
+        # A suspect rerunning alone keeps generation -1 so `_isolating` sees it.
+        task.generation = -1 if alone else self._generation
+        task.inner = inner
+        self._running.add(task)
+        generation = self._generation
+        inner.add_done_callback(lambda done: self._settle(task, generation, done))
+
+    def _replace(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        self._generation += 1
+        self.replacements += 1
+
+    def _settle(self, task: _Task, generation: int, inner: Future[Any]) -> None:
+        outcome: List[Tuple[_Task, Future[Any]]] = []
+        with self._lock:
+            if task not in self._running or inner is not task.inner:
+                return  # an earlier notice of this break already made it a suspect
+            broken = not inner.cancelled() and isinstance(inner.exception(), BrokenProcessPool)
+            if broken and not self._closed:
+                if generation == self._generation:
+                    self._replace()
+                victims = [other for other in self._running if other.generation == task.generation]
+                for other in victims:
+                    self._running.discard(other)
+                    other.breaks += 1
+                if len(victims) == 1 and task.breaks > 1:
+                    outcome.append((task, inner))
+                else:
+                    for other in victims:
+                        other.generation = -1
+                        self._suspects.append(other)
+            else:
+                self._running.discard(task)
+                outcome.append((task, inner))
+            self._pump()
+        for settled, done in outcome:
+            _copy_outcome(done, settled.future)
+
+    def _pump(self) -> None:
+        if self._closed:
+            return
+        if self._suspects:
+            if not self._running:
+                self._start(self._suspects.popleft(), alone=True)
+            return
+        if not self._isolating():
+            while self._held:
+                self._start(self._held.popleft())
+
+
+def _copy_outcome(source: Future[Any], target: Future[Any]) -> None:
+    try:
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+    except InvalidStateError:
+        pass  # the caller cancelled its future meanwhile
+
+
+__all__ = ["WorkerPool"]
@@ -0,0 +1,105 @@
+"""Resume helpers for `hb-align batch --resume` (T032).
+
+Prior state comes from the batch journal when present (it survives crashes),
+otherwise from a completed `manifest.json`. A chapter is skipped only when it
+previously succeeded, every recorded artifact still exists, and its cache key
+still matches the current audio checksum, WLC text version and chunk settings;
+everything else is queued again.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from hb_align.aligner import prep
+from hb_align.batch.discovery import ChapterFile
+from hb_align.batch.journal import JournalReplay, journal_path_for, replay_journal
+from hb_align.batch.manifest import BatchItem, ManifestError, load_manifest
+from hb_align.batch.runner import BatchSettings
+from hb_align.text import wlc_loader
+from hb_align.utils.cache import CacheManager
+
+
+def load_prior_state(manifest_path: Path) -> Tuple[JournalReplay, bool]:
+    """Return (prior state, whether it came from the journal).
+
+    Raises `ManifestError` when neither a journal nor a valid manifest exists.
+    """
+
+    journal = journal_path_for(manifest_path)
+    if journal.exists():
+        return replay_journal(journal), True
+    if not manifest_path.exists():
+        raise ManifestError(f"Nothing to resume: neither {manifest_path} nor {journal} exists")
+    manifest = load_manifest(manifest_path)
+    replay = JournalReplay(
+        batch_id=manifest.batch_id,
+        input_dir=manifest.input_dir,
+        started_at=manifest.started_at,
+        items={item.file_name: item for item in manifest.items},
+        extra=dict(manifest.extra),
+    )
+    return replay, False
+
+
+def is_reusable(
+    item: BatchItem,
+    chapter_file: ChapterFile,
+    settings: BatchSettings,
+    cache_manager: CacheManager,
+    *,
+    wlc_root: Path | None = None,
+) -> bool:
+    if item.status != "success" or not item.cache_key or not item.artifacts:
+        return False
+    if not all(Path(path).exists() for path in item.artifacts.values()):
+        return False
+    return current_cache_key(chapter_file, settings, cache_manager, wlc_root=wlc_root) == item.cache_key
+
+
+def current_cache_key(
+    chapter_file: ChapterFile,
+    settings: BatchSettings,
+    cache_manager: CacheManager,
+    *,
+    wlc_root: Path | None = None,
+) -> str | None:
+    """The key a run of *chapter_file* would get now, or None if its audio or text is unreadable."""
+
+    try:
+        checksum = prep.cached_checksum(chapter_file.path, cache_manager)
+        text_chapter = wlc_loader.load_chapter(chapter_file.book, chapter_file.chapter, root=wlc_root)
+    except (OSError, ValueError):
+        return None
+    return prep.chapter_cache_key(
+        audio_checksum=checksum,
+        text_chapter=text_chapter,
+        tradition=settings.tradition,
+        chunk_size_sec=settings.chunk_size_sec,
+        chunk_overlap_sec=settings.chunk_overlap_sec,
+    )
+
+
+def split_resumable(
+    chapter_files: Sequence[ChapterFile],
+    prior: JournalReplay,
+    settings: BatchSettings,
+    cache_manager: CacheManager,
+    *,
+    wlc_root: Path | None = None,
+) -> Tuple[Dict[str, BatchItem], List[ChapterFile]]:
+    """Partition discovered files into (reusable prior items by name, files to run)."""
+
+    reused: Dict[str, BatchItem] = {}
+    remaining: List[ChapterFile] = []
+    for chapter_file in chapter_files:
+        item = prior.items.get(chapter_file.file_name)
+        if item is not None and is_reusable(item, chapter_file, settings, cache_manager, wlc_root=wlc_root):
+            reused[chapter_file.file_name] = item
+        else:
+            remaining.append(chapter_file)
+    return reused, remaining
+
+
+__all__ = ["current_cache_key", "is_reusable", "load_prior_state", "split_resumable"]
@@ -0,0 +1,318 @@
+"""Parallel batch runner with longest-processing-time-first scheduling (T029).
+
+Each chapter's cost is estimated up front as probed audio duration × planned
+chunk count, and chapters are dispatched longest-first. The runner keeps at
+most `parallel` chapters in flight and hands the next queued chapter to
+whichever worker finishes first, so short chapters fill in behind long ones
+instead of being pre-assigned (a plain `executor.map` would let the pool's
+internal call queue grab work ahead of time).
+
+MFA parallelises internally too (`mfa align -j`), so each chapter gets
+`cpu_count // parallel` MFA jobs to keep the total near the core count.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, Mapping, Sequence
+
+from hb_align.audio import chunker, probe
+from hb_align.batch.discovery import ChapterFile
+from hb_align.batch.manifest import BatchItem
+from hb_align.batch.pool import WorkerPool
+from hb_align.utils import events
+from hb_align.utils.config import install_config_snapshot, load_config
+
+if TYPE_CHECKING:
+    from hb_align.batch.admission import AdmissionController
+
+# Assume ~128 kbps MP3 (16 bytes per ms) when the duration cannot be probed.
+_BYTES_PER_MS_FALLBACK = 16
+
+
+@dataclass(frozen=True)
+class BatchSettings:
+    output_dir: Path
+    tradition: str = "modern"
+    chunk_size_sec: int = 50
+    chunk_overlap_sec: int = 5
+    coverage_threshold: float = 95.0
+    cache_dir: Path | None = None
+    mfa_jobs: int = 1
+    ffprobe: str = "ffprobe"
+
+
+@dataclass(frozen=True)
+class ChapterJob:
+    chapter_file: ChapterFile
+    duration_ms: int
+    chunk_count: int
+
+    @property
+    def cost(self) -> int:
+        return self.duration_ms * self.chunk_count
+
+    @property
+    def file_name(self) -> str:
+        return self.chapter_file.file_name
+
+    def pending_item(self) -> BatchItem:
+        return BatchItem(
+            file_name=self.file_name,
+            book=self.chapter_file.book,
+            chapter=self.chapter_file.chapter,
+            estimated_duration_ms=self.duration_ms,
+            estimated_chunks=self.chunk_count,
+        )
+
+
+def default_parallel(cpu_count: int | None = None) -> int:
+    """Contract default: `min(3, cpu // 2)`, at least 1."""
+
+    cpus = cpu_count or os.cpu_count() or 1
+    return max(1, min(3, cpus // 2))
+
+
+def mfa_jobs_for(parallel: int, cpu_count: int | None = None) -> int:
+    """MFA `-j` per chapter so that `parallel × jobs` stays within the core count."""
+
+    cpus = cpu_count or os.cpu_count() or 1
+    return max(1, cpus // max(1, parallel))
+
+
+def estimate_job(chapter_file: ChapterFile, settings: BatchSettings) -> ChapterJob:
+    duration_ms = probe.probe_duration_ms(chapter_file.path, ffprobe=settings.ffprobe)
+    if not duration_ms:
+        try:
+            duration_ms = max(1, chapter_file.path.stat().st_size // _BYTES_PER_MS_FALLBACK)
+        except OSError:
+            duration_ms = 1
+    chunks = chunker.plan_chunks(
+        duration_ms, chunk_size_sec=settings.chunk_size_sec, overlap_sec=settings.chunk_overlap_sec
+    )
+    return ChapterJob(chapter_file=chapter_file, duration_ms=duration_ms, chunk_count=len(chunks))
+
+
+def estimate_jobs(
+    chapter_files: Sequence[ChapterFile], settings: BatchSettings, *, workers: int = 4
+) -> List[ChapterJob]:
+    """Estimate every chapter's cost; probing is subprocess/I/O bound, so threads suffice."""
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(lambda item: estimate_job(item, settings), chapter_files))
+
+
+def schedule_longest_first(jobs: Iterable[ChapterJob]) -> List[ChapterJob]:
+    return sorted(jobs, key=lambda job: (-job.cost, job.file_name))
+
+
+def partition_longest_first(jobs: Iterable[ChapterJob], count: int) -> List[List[ChapterJob]]:
+    """Split *jobs* into *count* shards of near-equal estimated cost.
+
+    Greedy LPT: jobs in longest-first order each go to the currently lightest
+    shard (lowest index on ties). Only the estimates and file names decide the
+    result, so every host computes the same partition for the same inputs.
+    """
+
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    shards: List[List[ChapterJob]] = [[] for _ in range(count)]
+    loads = [(0, index) for index in range(count)]
+    heapq.heapify(loads)
+    for job in schedule_longest_first(jobs):
+        load, index = heapq.heappop(loads)
+        shards[index].append(job)
+        heapq.heappush(loads, (load + job.cost, index))
+    return shards
+
+
+def plan_digest(jobs: Iterable[ChapterJob]) -> str:
+    """Digest of the file names and estimates a partition was computed from.
+
+    Shards whose digests differ (a file added, a cost estimated differently)
+    may overlap or leave chapters out; `merge_manifests` refuses them.
+    """
+
+    digest = hashlib.sha256()
+    for job in sorted(jobs, key=lambda job: job.file_name):
+        digest.update(f"{job.file_name}\t{job.cost}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def shard_jobs(jobs: Iterable[ChapterJob], index: int, count: int) -> List[ChapterJob]:
+    """Jobs of shard *index* (1-based, as in `--shard 3/8`) out of *count*."""
+
+    if not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and {count}")
+    return partition_longest_first(jobs, count)[index - 1]
+
+
+def init_worker(config_snapshot: str, events_destination: str | None = None) -> None:
+    """Pool initializer: pin the parent's config and open the worker's event stream."""
+
+    install_config_snapshot(config_snapshot)
+    events.install_event_stream(events_destination)
+
+
+def worker_initargs() -> tuple[str, str | None]:
+    return load_config().to_snapshot(), events.active_destination()
+
+
+def run_chapter(job: ChapterJob, settings: BatchSettings) -> BatchItem:
+    """Run the `process` pipeline for one chapter; never raises."""
+
+    from hb_align.cli import process as process_cli
+
+    started = time.perf_counter()
+    try:
+        result = process_cli._run_process_pipeline(
+            input_path=job.chapter_file.path,
+            book=job.chapter_file.book,
+            chapter=job.chapter_file.chapter,
+            tradition=settings.tradition,
+            output_dir=settings.output_dir,
+            chunk_size=settings.chunk_size_sec,
+            chunk_overlap=settings.chunk_overlap_sec,
+            coverage_threshold=settings.coverage_threshold,
+            dry_run=False,
+            cache_dir=settings.cache_dir,
+            export_metrics=False,
+            mfa_jobs=settings.mfa_jobs,
+        )
+    except Exception as exc:  # noqa: BLE001 - recorded per item in the manifest
+        return failed_item(job, exc, runtime_ms=round((time.perf_counter() - started) * 1000))
+    return item_from_result(job, result, settings, runtime_ms=round((time.perf_counter() - started) * 1000))
+
+
+def item_from_result(
+    job: ChapterJob, result: Mapping[str, Any], settings: BatchSettings, *, runtime_ms: int
+) -> BatchItem:
+    """Manifest item for a finished `process` run (exit code 0 or 2)."""
+
+    item = job.pending_item()
+    summary = dict(result.get("summary") or {})
+    item.summary = summary
+    item.runtime_ms = runtime_ms
+    item.exit_code = int(result.get("exit_code", 0))
+    item.status = "success" if item.exit_code == 0 else "failed"
+    item.coverage_pct = summary.get("coverage_pct")
+    item.confidence_avg = summary.get("avg_confidence")
+    item.cache_key = summary.get("cache_key")
+    item.artifacts = {name: str(path) for name, path in (result.get("artifacts") or {}).items()}
+    if item.exit_code == 2:
+        item.error_code = "COVERAGE_BELOW_THRESHOLD"
+        item.error_message = f"Coverage {item.coverage_pct or 0:.1f}% < {settings.coverage_threshold:g}%"
+    return item
+
+
+def failed_item(
+    job: ChapterJob, exc: BaseException, *, runtime_ms: int | None = None, error_code: str | None = None
+) -> BatchItem:
+    """Manifest item for a chapter that raised; the error code defaults from the exception type."""
+
+    from hb_align.aligner.mfa_runner import MfaRunnerError
+
+    item = job.pending_item()
+    item.status = "failed"
+    item.exit_code = 3
+    item.error_code = error_code or ("MFA_FAILED" if isinstance(exc, MfaRunnerError) else "PROCESS_ERROR")
+    item.error_message = str(exc) or type(exc).__name__
+    item.runtime_ms = runtime_ms
+    return item
+
+
+def run_batch(
+    jobs: Sequence[ChapterJob],
+    settings: BatchSettings,
+    *,
+    parallel: int = 1,
+    stop_on_fail: bool = False,
+    on_start: Callable[[ChapterJob], None] | None = None,
+    on_result: Callable[[BatchItem], None] | None = None,
+    admission: "AdmissionController | None" = None,
+) -> List[BatchItem]:
+    """Run *jobs* longest-first; returns finished items followed by any left pending.
+
+    `on_start` fires when a chapter is handed to a worker and `on_result` when
+    it finishes, both in the calling process. With an `admission` controller,
+    `parallel` is only the ceiling: chapters start while it grants slots, and
+    each gets MFA jobs for the limit in force at that moment. A chapter that
+    kills its worker is recorded as WORKER_CRASHED; the `WorkerPool` reruns the
+    chapters that shared the broken pool with it.
+    """
+
+    queue: Deque[ChapterJob] = deque(schedule_longest_first(jobs))
+    finished: List[BatchItem] = []
+
+    def record(item: BatchItem) -> bool:
+        finished.append(item)
+        if on_result:
+            on_result(item)
+        return stop_on_fail and item.status == "failed"
+
+    if parallel <= 1 or len(queue) <= 1:
+        while queue:
+            job = queue.popleft()
+            if on_start:
+                on_start(job)
+            if record(run_chapter(job, settings)):
+                break
+        return finished + [job.pending_item() for job in queue]
+
+    stopping = False
+    with WorkerPool(parallel, initializer=init_worker, initargs=worker_initargs()) as pool:
+        running: Dict[Future[BatchItem], ChapterJob] = {}
+
+        def refill() -> None:
+            while queue and not stopping and len(running) < parallel:
+                if admission is not None and not admission.try_acquire():
+                    break
+                job = queue.popleft()
+                if on_start:
+                    on_start(job)
+                job_settings = settings if admission is None else replace(settings, mfa_jobs=admission.mfa_jobs())
+                running[pool.submit(run_chapter, job, job_settings)] = job
+
+        timeout = admission.interval_s if admission is not None else None
+        refill()
+        while running:
+            # With admission control, wake up periodically to pick up a raised limit.
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                if admission is not None:
+                    admission.release()
+                try:
+                    item = future.result()
+                except Exception as exc:  # noqa: BLE001 - recorded per item in the manifest
+                    code = "WORKER_CRASHED" if isinstance(exc, BrokenProcessPool) else None
+                    item = failed_item(job, exc, error_code=code)
+                stopping = record(item) or stopping
+            refill()
+    return finished + [job.pending_item() for job in queue]
+
+
+__all__ = [
+    "BatchSettings",
+    "ChapterJob",
+    "default_parallel",
+    "estimate_job",
+    "estimate_jobs",
+    "failed_item",
+    "item_from_result",
+    "mfa_jobs_for",
+    "partition_longest_first",
+    "plan_digest",
+    "run_batch",
+    "run_chapter",
+    "schedule_longest_first",
+    "shard_jobs",
+]
@@ -0,0 +1,441 @@
+"""Staged batch pipeline: prep → align → finalize with bounded queues.
+
+`run_batch` runs each chapter end to end inside one worker, so a worker's
+cores sit idle while it probes, hashes and normalizes audio, and again while
+it stitches and writes artifacts. `StagedBatch` splits the chapter into three
+stages with their own worker counts:
+
+* **prep** (threads, I/O and ffmpeg bound): WLC text, checksum, probe,
+  normalization and chunk planning;
+* **align** (a process pool of `parallel` workers, CPU bound): MFA per chunk;
+* **finalize** (threads, I/O bound): stitching, coverage gate and artifacts.
+
+Stages hand work over through bounded `StageQueue`s, so prep runs at most a
+queue's worth of chapters ahead of MFA (bounding scratch disk use) and a slow
+disk back-pressures alignment instead of piling up results in memory. Each
+queue records its depth and how long producers stalled on a full queue and
+consumers waited on an empty one; `StagedBatch.stats()` reports them for the
+manifest and Prometheus. With an `AdmissionController`, `parallel` is only the
+ceiling: align workers take a slot from it before submitting a chapter.
+
+The align pool is a `WorkerPool`: a chapter that kills its worker fails alone
+as WORKER_CRASHED, and the chapters aligning beside it are rerun on a fresh
+pool. Resource usage is sampled in the align worker, where MFA runs, and the
+stopped sampler travels back with the alignment for `summary.json`.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from hb_align.aligner import pipeline, prep
+from hb_align.audio import chunker
+from hb_align.batch.manifest import BatchItem
+from hb_align.batch.pool import WorkerPool
+from hb_align.batch.runner import (
+    BatchSettings,
+    ChapterJob,
+    failed_item,
+    init_worker,
+    item_from_result,
+    schedule_longest_first,
+    worker_initargs,
+)
+from hb_align.text import wlc_loader
+from hb_align.text.references import chapter_output_dir
+from hb_align.utils import CacheManager, CacheStats, events, load_config, tracing
+from hb_align.utils.resources import ResourceSampler
+from hb_align.utils.tracing import Span, Tracer
+
+if TYPE_CHECKING:
+    from hb_align.batch.admission import AdmissionController
+    from hb_align.utils.prometheus import AlignmentMetricsExporter
+
+DEFAULT_PREP_WORKERS = 2
+DEFAULT_FINALIZE_WORKERS = 2
+STAGES = ("prep", "align", "finalize")
+
+_DONE = object()
+
+
+class StageQueue:
+    """Bounded FIFO between two stages that records depth and blocking time."""
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self._queue: "queue.Queue[Any]" = queue.Queue(self.maxsize)
+        self._lock = threading.Lock()
+        self._items = 0
+        self._max_depth = 0
+        self._depth_total = 0
+        self._put_stall_ns = 0
+        self._get_wait_ns = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, item: Any) -> None:
+        started = time.perf_counter_ns()
+        self._queue.put(item)
+        stalled = time.perf_counter_ns() - started
+        depth = self._queue.qsize()
+        with self._lock:
+            self._put_stall_ns += stalled
+            if item is not _DONE:
+                self._items += 1
+                self._depth_total += depth
+                self._max_depth = max(self._max_depth, depth)
+
+    def get(self) -> Any:
+        started = time.perf_counter_ns()
+        item = self._queue.get()
+        with self._lock:
+            self._get_wait_ns += time.perf_counter_ns() - started
+        return item
+
+    def stats(self) -> Dict[str, Any]:
+        """`put_stall_ms`: producers blocked on a full queue; `get_wait_ms`: consumers starved."""
+
+        with self._lock:
+            return {
+                "capacity": self.maxsize,
+                "items": self._items,
+                "depth": self.depth,
+                "max_depth": self._max_depth,
+                "avg_depth": round(self._depth_total / self._items, 3) if self._items else 0.0,
+                "put_stall_ms": round(self._put_stall_ns / 1_000_000),
+                "get_wait_ms": round(self._get_wait_ns / 1_000_000),
+            }
+
+
+@dataclass(frozen=True)
+class AlignOutcome:
+    chunk_alignments: List[chunker.ChunkAlignment]
+    spans: List[Span]
+    origin_ns: int
+    sampler: ResourceSampler | None = None
+
+
+def align_prepared(
+    text_chapter: wlc_loader.TextChapter,
+    chunk_windows: Sequence[chunker.ChunkWindow],
+    settings: BatchSettings,
+    working_dir: Path,
+) -> AlignOutcome:
+    """Align stage body; runs in a pool worker and ships its spans and sampler back to the parent."""
+
+    from hb_align.cli import process as process_cli
+
+    config = load_config()
+    tracer = Tracer()
+    sampler = process_cli._start_resource_sampler(config, tracer)
+    try:
+        with tracer.activate(), events.bind(book=text_chapter.book, chapter=text_chapter.chapter):
+            alignments = pipeline.align_chunks(
+                chunk_windows,
+                text_chapter=text_chapter,
+                profile=settings.tradition,
+                mfa_runner=None,
+                cache_manager=CacheManager.from_config(config, root=settings.cache_dir),
+                working_dir=working_dir,
+                mfa_jobs=settings.mfa_jobs,
+            )
+    finally:
+        if sampler is not None:
+            sampler.stop()
+    return AlignOutcome(
+        chunk_alignments=alignments, spans=tracer.spans, origin_ns=tracer.origin_ns, sampler=sampler
+    )
+
+
+@dataclass
+class _ChapterWork:
+    job: ChapterJob
+    text_chapter: wlc_loader.TextChapter
+    prepared: prep.PreparedChapter
+    chunk_windows: List[chunker.ChunkWindow]
+    chapter_dir: Path
+    tracer: Tracer
+    cache_stats: CacheStats | None = None
+    sampler: ResourceSampler | None = None
+    service_ns: int = 0
+    chunk_alignments: List[chunker.ChunkAlignment] = field(default_factory=list)
+
+    @property
+    def runtime_ms(self) -> int:
+        return round(self.service_ns / 1_000_000)
+
+
+class _Countdown:
+    """Runs `on_zero` once the last of `count` workers of a stage has exited."""
+
+    def __init__(self, count: int, on_zero: Callable[[], None]) -> None:
+        self._remaining = count
+        self._on_zero = on_zero
+        self._lock = threading.Lock()
+
+    def done(self) -> None:
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            self._on_zero()
+
+
+class StagedBatch:
+    """Run chapter jobs through the prep → align → finalize pipeline."""
+
+    def __init__(
+        self,
+        settings: BatchSettings,
+        *,
+        parallel: int = 1,
+        prep_workers: int = DEFAULT_PREP_WORKERS,
+        finalize_workers: int = DEFAULT_FINALIZE_WORKERS,
+        queue_size: Optional[int] = None,
+        admission: "AdmissionController | None" = None,
+        exporter: "AlignmentMetricsExporter | None" = None,
+    ) -> None:
+        self.settings = settings
+        self.admission = admission
+        self.exporter = exporter
+        self.workers = {
+            "prep": max(1, prep_workers),
+            "align": max(1, parallel),
+            "finalize": max(1, finalize_workers),
+        }
+        size = queue_size or self.workers["align"]
+        self.prep_queue = StageQueue("prep_to_align", size)
+        self.finalize_queue = StageQueue("align_to_finalize", size)
+        self._busy_ns = dict.fromkeys(STAGES, 0)
+        self._busy_lock = threading.Lock()
+        self._callback_errors: List[str] = []
+
+    def stats(self) -> Dict[str, Any]:
+        with self._busy_lock:
+            busy_ms = {stage: round(total / 1_000_000) for stage, total in self._busy_ns.items()}
+        return {
+            "workers": dict(self.workers),
+            "queues": {q.name: q.stats() for q in (self.prep_queue, self.finalize_queue)},
+            "busy_ms": busy_ms,
+            "callback_errors": list(self._callback_errors),
+        }
+
+    def run(
+        self,
+        jobs: Sequence[ChapterJob],
+        *,
+        stop_on_fail: bool = False,
+        on_start: Callable[[ChapterJob], None] | None = None,
+        on_result: Callable[[BatchItem], None] | None = None,
+    ) -> List[BatchItem]:
+        """Run *jobs* longest-first; returns finished items followed by any left pending.
+
+        `on_start` fires when a chapter enters prep and `on_result` when it
+        finishes or fails in any stage; calls are serialized in this process.
+        A callback that raises (a journal write or metrics flush hitting
+        `OSError`) is recorded under `callback_errors` in `stats()` instead of
+        killing the stage thread, which would leave the other stages blocked.
+        """
+
+        ordered = schedule_longest_first(jobs)
+        backlog: Deque[ChapterJob] = deque(ordered)
+        finished: List[BatchItem] = []
+        backlog_lock = threading.Lock()
+        report_lock = threading.Lock()
+        stopping = threading.Event()
+
+        def next_job() -> Optional[ChapterJob]:
+            with backlog_lock:
+                if stopping.is_set() or not backlog:
+                    return None
+                job = backlog.popleft()
+            if on_start:
+                with report_lock:
+                    callback(on_start, job, job.file_name)
+            return job
+
+        def report(item: BatchItem) -> None:
+            with report_lock:
+                finished.append(item)
+                if on_result:
+                    callback(on_result, item, item.file_name)
+                if stop_on_fail and item.status == "failed":
+                    stopping.set()
+
+        def callback(hook: Callable[[Any], None], argument: Any, file_name: str) -> None:
+            try:
+                hook(argument)
+            except Exception as exc:  # noqa: BLE001 - the batch must keep draining
+                self._callback_errors.append(f"{file_name}: {type(exc).__name__}: {exc}")
+
+        def prep_worker() -> None:
+            try:
+                while (job := next_job()) is not None:
+                    started = time.perf_counter_ns()
+                    try:
+                        work = self._prepare(job)
+                    except Exception as exc:  # noqa: BLE001 - recorded per item in the manifest
+                        elapsed = self._charge("prep", started)
+                        report(failed_item(job, exc, runtime_ms=round(elapsed / 1_000_000)))
+                        continue
+                    work.service_ns += self._charge("prep", started)
+                    self.prep_queue.put(work)
+            finally:
+                prep_done.done()
+
+        def align_worker() -> None:
+            try:
+                while (work := self.prep_queue.get()) is not _DONE:
+                    if stopping.is_set():
+                        continue  # drained so prep never blocks; the chapter stays pending
+                    settings = self.settings
+                    if self.admission is not None:
+                        self.admission.acquire()
+                        settings = replace(settings, mfa_jobs=self.admission.mfa_jobs())
+                    started = time.perf_counter_ns()
+                    try:
+                        outcome = pool.submit(
+                            align_prepared, work.text_chapter, work.chunk_windows, settings, work.chapter_dir
+                        ).result()
+                    except Exception as exc:  # noqa: BLE001 - recorded per item in the manifest
+                        work.service_ns += self._charge("align", started)
+                        code = "WORKER_CRASHED" if isinstance(exc, BrokenProcessPool) else None
+                        report(failed_item(work.job, exc, runtime_ms=work.runtime_ms, error_code=code))
+                        continue
+                    finally:
+                        if self.admission is not None:
+                            self.admission.release()
+                    work.service_ns += self._charge("align", started)
+                    work.tracer.add_spans(outcome.spans, outcome.origin_ns)
+                    work.chunk_alignments = outcome.chunk_alignments
+                    work.sampler = outcome.sampler
+                    self.finalize_queue.put(work)
+            finally:
+                align_done.done()
+
+        def finalize_worker() -> None:
+            while (work := self.finalize_queue.get()) is not _DONE:
+                started = time.perf_counter_ns()
+                try:
+                    result = self._finalize(work)
+                except Exception as exc:  # noqa: BLE001 - recorded per item in the manifest
+                    work.service_ns += self._charge("finalize", started)
+                    report(failed_item(work.job, exc, runtime_ms=work.runtime_ms))
+                    continue
+                work.service_ns += self._charge("finalize", started)
+                report(item_from_result(work.job, result, self.settings, runtime_ms=work.runtime_ms))
+
+        prep_done = _Countdown(
+            self.workers["prep"], lambda: _close(self.prep_queue, self.workers["align"])
+        )
+        align_done = _Countdown(
+            self.workers["align"], lambda: _close(self.finalize_queue, self.workers["finalize"])
+        )
+
+        with WorkerPool(self.workers["align"], initializer=init_worker, initargs=worker_initargs()) as pool:
+            # Fork every pool worker before the stage threads exist.
+            pool.submit(_warm_up).result()
+            threads = [
+                threading.Thread(target=target, name=f"hb-align-{stage}-{index}", daemon=True)
+                for stage, target in (("prep", prep_worker), ("align", align_worker), ("finalize", finalize_worker))
+                for index in range(self.workers[stage])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        done = {item.file_name for item in finished}
+        return finished + [job.pending_item() for job in ordered if job.file_name not in done]
+
+    def _prepare(self, job: ChapterJob) -> _ChapterWork:
+        settings = self.settings
+        chapter_file = job.chapter_file
+        config = load_config()
+        text_chapter = wlc_loader.load_chapter(chapter_file.book, chapter_file.chapter, root=config.wlc_root)
+        chapter_dir = chapter_output_dir(settings.output_dir, chapter_file.book, chapter_file.chapter)
+        chapter_dir.mkdir(parents=True, exist_ok=True)
+        tracer = Tracer()
+        cache_manager = CacheManager.from_config(config, root=settings.cache_dir)
+        with tracer.activate(), events.bind(
+            book=chapter_file.book, chapter=chapter_file.chapter, file_name=chapter_file.file_name
+        ):
+            events.emit("chapter_started", tradition=settings.tradition)
+            with tracing.span("prepare"):
+                prepared = prep.prepare_chapter(
+                    audio_path=chapter_file.path,
+                    text_chapter=text_chapter,
+                    tradition=settings.tradition,
+                    chunk_size_sec=settings.chunk_size_sec,
+                    chunk_overlap_sec=settings.chunk_overlap_sec,
+                    cache_manager=cache_manager,
+                    normalize=False,  # nothing downstream reads it; `cache warm` can still add it
+                )
+            events.emit("cache", status=prepared.cache_status)
+            chunk_windows = pipeline.announce_chunks(prepared.chunks)
+        return _ChapterWork(
+            job=job,
+            text_chapter=text_chapter,
+            prepared=prepared,
+            chunk_windows=list(chunk_windows),
+            chapter_dir=chapter_dir,
+            tracer=tracer,
+            cache_stats=cache_manager.stats,
+        )
+
+    def _finalize(self, work: _ChapterWork) -> Dict[str, object]:
+        from hb_align.cli import process as process_cli
+
+        chapter_file = work.job.chapter_file
+        with work.tracer.activate(), events.bind(
+            book=chapter_file.book, chapter=chapter_file.chapter, file_name=chapter_file.file_name
+        ):
+            pipeline_result = pipeline.stitch_alignment(
+                work.text_chapter, work.chunk_windows, work.chunk_alignments, profile=self.settings.tradition
+            )
+            return process_cli._finalize_chapter(
+                text_chapter=work.text_chapter,
+                prepared=work.prepared,
+                pipeline_result=pipeline_result,
+                chapter_dir=work.chapter_dir,
+                coverage_threshold=self.settings.coverage_threshold,
+                tracer=work.tracer,
+                sampler=work.sampler,
+                exporter=self.exporter,
+                cache_stats=work.cache_stats,
+            )
+
+    def _charge(self, stage: str, started_ns: int) -> int:
+        elapsed = time.perf_counter_ns() - started_ns
+        with self._busy_lock:
+            self._busy_ns[stage] += elapsed
+        return elapsed
+
+
+def _close(stage_queue: StageQueue, consumers: int) -> None:
+    for _ in range(consumers):
+        stage_queue.put(_DONE)
+
+
+def _warm_up() -> None:
+    return None
+
+
+__all__ = [
+    "DEFAULT_FINALIZE_WORKERS",
+    "DEFAULT_PREP_WORKERS",
+    "AlignOutcome",
+    "StageQueue",
+    "StagedBatch",
+    "align_prepared",
+]
@@ -0,0 +1,108 @@
+"""Cache warm-up: precompute every alignment prerequisite for a batch (no MFA).
+
+Each chapter file is prepared once per requested tradition in a process pool.
+Audio-level artifacts (checksum, probe, normalized WAV) are shared between
+traditions, so only the first tradition pays for them.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+from hb_align.aligner import prep
+from hb_align.batch.discovery import ChapterFile
+from hb_align.text import wlc_loader
+from hb_align.utils.cache import CacheManager, CompressionPolicy
+
+
+@dataclass(frozen=True)
+class WarmSettings:
+    cache_dir: Path
+    traditions: Sequence[str]
+    chunk_size_sec: int
+    chunk_overlap_sec: int
+    compression: CompressionPolicy = field(default_factory=CompressionPolicy)
+    normalize: bool = True
+    wlc_root: Path | None = None
+
+
+@dataclass
+class WarmResult:
+    file_name: str
+    status: str
+    cache_keys: List[str] = field(default_factory=list)
+    cache_status: List[str] = field(default_factory=list)
+    duration_ms: int = 0
+    chunk_count: int = 0
+    notes: List[str] = field(default_factory=list)
+    error_message: str | None = None
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def warm_chapter(chapter_file: ChapterFile, settings: WarmSettings) -> WarmResult:
+    """Prepare one chapter for every tradition; never raises."""
+
+    result = WarmResult(file_name=chapter_file.file_name, status="success")
+    try:
+        manager = CacheManager(settings.cache_dir, compression=settings.compression)
+        text_chapter = wlc_loader.load_chapter(
+            chapter_file.book, chapter_file.chapter, root=settings.wlc_root
+        )
+        for tradition in settings.traditions:
+            prepared = prep.prepare_chapter(
+                audio_path=chapter_file.path,
+                text_chapter=text_chapter,
+                tradition=tradition,
+                chunk_size_sec=settings.chunk_size_sec,
+                chunk_overlap_sec=settings.chunk_overlap_sec,
+                cache_manager=manager,
+                normalize=settings.normalize,
+            )
+            result.cache_keys.append(prepared.cache_key)
+            result.cache_status.append(prepared.cache_status)
+            result.duration_ms = prepared.duration_ms
+            result.chunk_count = len(prepared.chunks)
+            result.notes.extend(note for note in prepared.notes if note not in result.notes)
+    except Exception as exc:  # noqa: BLE001 - surfaced per file in the report
+        result.status = "failed"
+        result.error_message = str(exc)
+    return result
+
+
+def warm_cache(
+    chapter_files: Sequence[ChapterFile],
+    settings: WarmSettings,
+    *,
+    workers: int = 1,
+    on_result: Callable[[WarmResult], None] | None = None,
+) -> List[WarmResult]:
+    """Warm the cache for all chapter files, in parallel when workers > 1."""
+
+    results: List[WarmResult] = []
+    if workers <= 1 or len(chapter_files) <= 1:
+        for chapter_file in chapter_files:
+            result = warm_chapter(chapter_file, settings)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(warm_chapter, item, settings) for item in chapter_files]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    results.sort(key=lambda item: item.file_name)
+    return results
+
+
+__all__ = ["WarmResult", "WarmSettings", "default_workers", "warm_cache", "warm_chapter"]
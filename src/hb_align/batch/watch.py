@@ -0,0 +1,375 @@
+"""Watch-folder ingestion for `hb-align watch`.
+
+Change notification uses inotify on Linux (through `ctypes`, so no extra
+dependency) and a stat-signature poll elsewhere. Neither rescans the folder
+every cycle: inotify names the files that changed, and the poller lists the
+directory only when its mtime moves (a file was created, renamed or deleted),
+plus a slow full pass every `rescan_s` seconds for files rewritten in place.
+Between listings only the files still settling are stat'ed again.
+
+A reported file becomes a candidate and is handed over only after its
+(size, mtime) signature has stayed the same for `settle_s` seconds, so an
+upload in progress is never picked up half-written. A settled file whose
+chapter output already carries the cache key it would get now (audio
+checksum, WLC text version, tradition, chunking) is skipped; everything else
+runs the `process` pipeline on a process pool that stays up for the whole
+watch, exactly as `batch` runs a chapter. The pool is a `WorkerPool`, so a
+chapter that kills its worker fails alone as WORKER_CRASHED and the chapters
+running beside it are rerun on a fresh pool.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+import time
+from concurrent.futures import Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from hb_align.batch.discovery import DEFAULT_PATTERN, ChapterFile
+from hb_align.batch.manifest import BatchItem
+from hb_align.batch.pool import WorkerPool
+from hb_align.batch.resume import current_cache_key
+from hb_align.batch.runner import (
+    BatchSettings,
+    ChapterJob,
+    estimate_job,
+    failed_item,
+    init_worker,
+    run_chapter,
+    worker_initargs,
+)
+from hb_align.text.references import chapter_output_dir, infer_reference_from_filename
+from hb_align.utils.cache import CacheManager
+from hb_align.utils.config import load_config
+
+DEFAULT_SETTLE_S = 5.0
+DEFAULT_INTERVAL_S = 1.0
+DEFAULT_RESCAN_S = 60.0
+
+Signature = Tuple[int, int]
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _signature(path: Path) -> Optional[Signature]:
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+
+class InotifyWatcher:
+    """Names of entries changed in one directory, from the kernel's inotify queue."""
+
+    kind = "inotify"
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        try:
+            init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except AttributeError:
+            raise OSError("inotify is not available on this platform")
+        self._fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if add_watch(self._fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Block up to *timeout* seconds; return the names reported meanwhile."""
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        names: Set[str] = set()
+        if not readable:
+            return names
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                if mask & _IN_Q_OVERFLOW:
+                    names.update(os.listdir(self.directory))  # events were lost: list once
+                elif length:
+                    names.add(os.fsdecode(data[offset : offset + length].rstrip(b"\0")))
+                offset += length
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollWatcher:
+    """Stat-based fallback: lists the directory only when its mtime changes."""
+
+    kind = "poll"
+
+    def __init__(self, directory: Path, *, rescan_s: float = DEFAULT_RESCAN_S) -> None:
+        self.directory = directory
+        self.rescan_s = rescan_s
+        self._dir_mtime = directory.stat().st_mtime_ns
+        self._next_rescan = time.monotonic() + rescan_s
+
+    def changes(self, timeout: float) -> Set[str]:
+        time.sleep(timeout)
+        mtime = self.directory.stat().st_mtime_ns
+        now = time.monotonic()
+        if mtime == self._dir_mtime and now < self._next_rescan:
+            return set()
+        self._dir_mtime = mtime
+        self._next_rescan = now + self.rescan_s
+        return set(os.listdir(self.directory))
+
+    def close(self) -> None:
+        return None
+
+
+def open_watcher(
+    directory: Path, *, use_inotify: bool = True, rescan_s: float = DEFAULT_RESCAN_S
+) -> "InotifyWatcher | PollWatcher":
+    if use_inotify:
+        try:
+            return InotifyWatcher(directory)
+        except OSError:
+            pass
+    return PollWatcher(directory, rescan_s=rescan_s)
+
+
+class SettleTracker:
+    """Debounces reported files until their stat signature stops changing."""
+
+    def __init__(
+        self, directory: Path, *, pattern: str = DEFAULT_PATTERN, settle_s: float = DEFAULT_SETTLE_S
+    ) -> None:
+        self.directory = directory
+        self.pattern = pattern
+        self.settle_s = settle_s
+        self._known: Dict[str, Signature] = {}
+        self._pending: Dict[str, Tuple[Signature, float]] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def observe(self, names: Iterable[str], now: float) -> None:
+        for name in names:
+            if not fnmatch(name, self.pattern):
+                continue
+            signature = _signature(self.directory / name)
+            if signature is None:  # deleted or renamed away
+                self._known.pop(name, None)
+                self._pending.pop(name, None)
+            elif signature != self._known.get(name) and name not in self._pending:
+                self._pending[name] = (signature, now)
+
+    def settled(self, now: float) -> List[str]:
+        """Pending files unchanged for `settle_s`; they count as seen from now on."""
+
+        ready: List[str] = []
+        for name, (previous, since) in list(self._pending.items()):
+            signature = _signature(self.directory / name)
+            if signature is None:
+                del self._pending[name]
+            elif signature != previous:
+                self._pending[name] = (signature, now)
+            elif now - since >= self.settle_s:
+                del self._pending[name]
+                self._known[name] = signature
+                ready.append(name)
+        return sorted(ready)
+
+    def defer(self, name: str, now: float) -> None:
+        """Hand *name* out again later (it settled while its previous run was in flight)."""
+
+        signature = self._known.pop(name, None)
+        if signature is not None:
+            self._pending[name] = (signature, now)
+
+
+@dataclass
+class WatchStats:
+    watcher: str
+    started: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    unresolved: int = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def output_is_current(
+    chapter_file: ChapterFile,
+    settings: BatchSettings,
+    cache_manager: CacheManager,
+    *,
+    wlc_root: Path | None = None,
+) -> bool:
+    """True when the chapter's `summary.json` was produced from this audio with these settings."""
+
+    summary_path = (
+        chapter_output_dir(settings.output_dir, chapter_file.book, chapter_file.chapter)
+        / "summary.json"
+    )
+    try:
+        recorded = json.loads(summary_path.read_text(encoding="utf-8")).get("cache_key")
+    except (OSError, ValueError, AttributeError):
+        return False
+    return bool(recorded) and recorded == current_cache_key(
+        chapter_file, settings, cache_manager, wlc_root=wlc_root
+    )
+
+
+def watch_folder(
+    input_dir: Path,
+    settings: BatchSettings,
+    *,
+    pattern: str = DEFAULT_PATTERN,
+    book: Optional[str] = None,
+    parallel: int = 1,
+    settle_s: float = DEFAULT_SETTLE_S,
+    interval_s: float = DEFAULT_INTERVAL_S,
+    rescan_s: float = DEFAULT_RESCAN_S,
+    use_inotify: bool = True,
+    once: bool = False,
+    stop: Optional[threading.Event] = None,
+    wlc_root: Path | None = None,
+    on_ready: Callable[[str], None] | None = None,
+    on_skip: Callable[[Path, str], None] | None = None,
+    on_start: Callable[[ChapterJob], None] | None = None,
+    on_result: Callable[[BatchItem], None] | None = None,
+) -> WatchStats:
+    """Process recordings as they land in *input_dir* until *stop* is set.
+
+    Files already present are handled first. With `once`, return as soon as
+    nothing is settling or running instead of waiting for new files.
+    `on_ready` receives the watcher kind (`inotify` or `poll`); `on_skip`
+    receives a file's path and the reason (`unchanged` or `unresolved`).
+    """
+
+    if not input_dir.is_dir():
+        raise FileNotFoundError(f"Input directory not found: {input_dir}")
+    stop = stop or threading.Event()
+    cache_manager = CacheManager.from_config(load_config(), root=settings.cache_dir)
+    tracker = SettleTracker(input_dir, pattern=pattern, settle_s=settle_s)
+    watcher = open_watcher(input_dir, use_inotify=use_inotify, rescan_s=rescan_s)
+    stats = WatchStats(watcher=watcher.kind)
+    running: Dict[Future[BatchItem], ChapterJob] = {}
+
+    def finish(future: Future[BatchItem]) -> None:
+        job = running.pop(future)
+        try:
+            item = future.result()
+        except Exception as exc:  # noqa: BLE001 - recorded like any failed chapter
+            code = "WORKER_CRASHED" if isinstance(exc, BrokenProcessPool) else None
+            item = failed_item(job, exc, error_code=code)
+        if item.status == "success":
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+        if on_result:
+            on_result(item)
+
+    pool = WorkerPool(max(1, parallel), initializer=init_worker, initargs=worker_initargs())
+
+    try:
+        tracker.observe(os.listdir(input_dir), time.monotonic())
+        if on_ready:
+            on_ready(watcher.kind)
+        while not stop.is_set():
+            now = time.monotonic()
+            in_flight = {job.file_name for job in running.values()}
+            for name in tracker.settled(now):
+                if name in in_flight:
+                    tracker.defer(name, now)
+                    continue
+                chapter_file = _chapter_file(input_dir / name, book)
+                if chapter_file is None:
+                    stats.unresolved += 1
+                    if on_skip:
+                        on_skip(input_dir / name, "unresolved")
+                    continue
+                if output_is_current(chapter_file, settings, cache_manager, wlc_root=wlc_root):
+                    stats.skipped += 1
+                    if on_skip:
+                        on_skip(chapter_file.path, "unchanged")
+                    continue
+                job = estimate_job(chapter_file, settings)
+                stats.started += 1
+                if on_start:
+                    on_start(job)
+                running[pool.submit(run_chapter, job, settings)] = job
+            for future in [future for future in running if future.done()]:
+                finish(future)
+            if once and not running and not tracker.pending:
+                break
+            tracker.observe(watcher.changes(interval_s), time.monotonic())
+        # Stopping: let chapters already handed to the pool finish and report.
+        wait(running)
+        for future in list(running):
+            finish(future)
+    finally:
+        pool.shutdown()
+        watcher.close()
+    return stats
+
+
+def _chapter_file(path: Path, book: Optional[str]) -> Optional[ChapterFile]:
+    inferred_book, chapter = infer_reference_from_filename(path)
+    chosen = book or inferred_book
+    if not chosen or chapter is None:
+        return None
+    return ChapterFile(path=path, book=chosen, chapter=chapter)
+
+
+__all__ = [
+    "DEFAULT_INTERVAL_S",
+    "DEFAULT_RESCAN_S",
+    "DEFAULT_SETTLE_S",
+    "InotifyWatcher",
+    "PollWatcher",
+    "SettleTracker",
+    "WatchStats",
+    "open_watcher",
+    "output_is_current",
+    "watch_folder",
+]
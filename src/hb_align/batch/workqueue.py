@@ -0,0 +1,389 @@
+"""Shared-filesystem work queue for multi-host batch runs (`batch --worker`).
+
+Every host mounts the same share; the queue is a directory on it:
+
+    queue.json                          batch id, input dir, scheduling; written
+                                        last, so its presence means "ready"
+    pending/00003-genesis-002.wav.json  one job per file, rank prefix = longest-first
+    leased/00003-genesis-002.wav.json@<worker>
+                                        jobs claimed by a worker
+    done/genesis-002.wav.json           manifest item of a finished chapter
+
+A worker claims a job by renaming it from `pending/` into `leased/`; rename is
+atomic on local filesystems and on NFS, so exactly one worker wins and the
+others move on to the next file. While a chapter runs, a heartbeat thread
+touches the worker's lease files. A lease whose newest timestamp (mtime or
+ctime, which a rename also bumps) is older than the TTL belongs to a dead or
+partitioned worker; any worker may reclaim it by renaming it back into
+`pending/`, and after `max_attempts` expiries the chapter is recorded as
+failed (`WORKER_CRASHED`) rather than retried forever. The reclaimer stages
+the job as `pending/.reap-<job>@<worker>` while it bumps the attempt count;
+a staged file that outlives the TTL is reclaimed the same way.
+
+Results are written to `done/` before the lease is released, and a worker that
+claims a job already present in `done/` drops it, so a chapter whose lease
+expired mid-run is at worst processed twice (artifacts are deterministic),
+never lost. The manifest is compacted from `done/` by whichever worker finds
+the queue drained.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from hb_align.batch.discovery import ChapterFile
+from hb_align.batch.manifest import BatchItem, BatchManifest, utc_now
+from hb_align.batch.pool import WorkerPool
+from hb_align.batch.runner import (
+    BatchSettings,
+    ChapterJob,
+    failed_item,
+    init_worker,
+    run_chapter,
+    schedule_longest_first,
+    worker_initargs,
+)
+
+DEFAULT_LEASE_TTL_S = 120.0
+DEFAULT_POLL_S = 1.0
+DEFAULT_MAX_ATTEMPTS = 3
+META_FILE = "queue.json"
+_OWNER_SEP = "@"
+_REAP_PREFIX = ".reap-"
+
+
+def default_worker_id() -> str:
+    host = socket.gethostname().replace(_OWNER_SEP, "_").replace(os.sep, "_")
+    return f"{host}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+@dataclass(frozen=True)
+class Lease:
+    path: Path
+    name: str
+    job: ChapterJob
+    attempts: int
+
+
+class WorkQueue:
+    """One worker's handle on a queue directory."""
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        worker_id: Optional[str] = None,
+        lease_ttl_s: float = DEFAULT_LEASE_TTL_S,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        if lease_ttl_s <= 0:
+            raise ValueError("lease_ttl_s must be positive")
+        self.root = Path(root)
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_ttl_s = lease_ttl_s
+        self.max_attempts = max(1, max_attempts)
+        self.pending_dir = self.root / "pending"
+        self.leased_dir = self.root / "leased"
+        self.done_dir = self.root / "done"
+        self._held: set[Path] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return (self.root / META_FILE).exists()
+
+    def meta(self) -> Dict[str, Any]:
+        return json.loads((self.root / META_FILE).read_text(encoding="utf-8"))
+
+    def initialize(
+        self,
+        jobs: Sequence[ChapterJob],
+        *,
+        batch_id: str,
+        input_dir: str,
+        extra: Mapping[str, Any] | None = None,
+    ) -> bool:
+        """Publish *jobs* once; returns False when another worker is (or was) doing it."""
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        try:
+            (self.root / ".init").mkdir()
+        except FileExistsError:
+            return False
+        for directory in (self.pending_dir, self.leased_dir, self.done_dir):
+            directory.mkdir(exist_ok=True)
+        for rank, job in enumerate(schedule_longest_first(jobs)):
+            _write_json(self.pending_dir / f"{rank:05d}-{job.file_name}.json", _job_to_dict(job))
+        _write_json(
+            self.root / META_FILE,
+            {
+                "batch_id": batch_id,
+                "input_dir": input_dir,
+                "started_at": utc_now(),
+                "total": len(jobs),
+                "extra": dict(extra or {}),
+            },
+        )
+        return True
+
+    def wait_ready(self, *, timeout_s: float = 600.0, poll_s: float = DEFAULT_POLL_S) -> None:
+        deadline = time.monotonic() + timeout_s
+        while not self.ready:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Queue {self.root} was not initialized within {timeout_s:g}s")
+            time.sleep(poll_s)
+
+    def claim(self) -> Optional[Lease]:
+        """Lease the highest-ranked pending job, or return None when nothing is claimable."""
+
+        for entry in _visible(self.pending_dir):
+            target = self.leased_dir / f"{entry}{_OWNER_SEP}{self.worker_id}"
+            try:
+                os.rename(self.pending_dir / entry, target)
+            except FileNotFoundError:
+                continue  # another worker won this one
+            try:
+                os.utime(target)  # the rename kept the enqueue mtime; start the lease clock now
+                payload = json.loads(target.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                continue  # a reaper moved it before the lease clock started; treat as lost
+            job = _job_from_dict(payload)
+            if (self.done_dir / f"{job.file_name}.json").exists():
+                target.unlink(missing_ok=True)  # finished by a worker whose lease had expired
+                continue
+            with self._lock:
+                self._held.add(target)
+            return Lease(path=target, name=entry, job=job, attempts=int(payload.get("attempts", 0)))
+        return None
+
+    def heartbeat(self) -> None:
+        with self._lock:
+            held = list(self._held)
+        for path in held:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass  # reclaimed by another worker; `complete` still records the result
+
+    def complete(self, lease: Lease, item: BatchItem) -> bool:
+        """Record *item* in `done/` and release the lease; False if the lease had been reclaimed."""
+
+        payload = item.to_dict()
+        payload["worker"] = self.worker_id
+        _write_json(self.done_dir / f"{item.file_name}.json", payload)
+        with self._lock:
+            self._held.discard(lease.path)
+        try:
+            lease.path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def reap_expired(self, *, now: Optional[float] = None) -> List[str]:
+        """Return expired leases to `pending/` (or fail them after `max_attempts`)."""
+
+        now = time.time() if now is None else now
+        reaped: List[str] = []
+        candidates = [(self.leased_dir / entry, entry) for entry in _visible(self.leased_dir)]
+        # A reaper that died mid-update leaves its staged copy behind; the rename
+        # bumped its ctime, so it expires like the lease it came from.
+        candidates += [
+            (self.pending_dir / entry, entry[len(_REAP_PREFIX) :])
+            for entry in sorted(os.listdir(self.pending_dir))
+            if entry.startswith(_REAP_PREFIX)
+        ]
+        for path, entry in candidates:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if max(stat.st_mtime, stat.st_ctime) + self.lease_ttl_s > now:
+                continue
+            name, _, owner = entry.rpartition(_OWNER_SEP)
+            staging = self.pending_dir / f"{_REAP_PREFIX}{name}{_OWNER_SEP}{self.worker_id}"
+            try:
+                os.rename(path, staging)  # hidden from `claim` while we update it
+            except FileNotFoundError:
+                continue  # the owner finished or another worker reaped it first
+            payload = json.loads(staging.read_text(encoding="utf-8"))
+            payload["attempts"] = int(payload.get("attempts", 0)) + 1
+            if payload["attempts"] >= self.max_attempts:
+                item = failed_item(
+                    _job_from_dict(payload),
+                    RuntimeError(f"lease expired {payload['attempts']} times (last holder {owner})"),
+                    error_code="WORKER_CRASHED",
+                )
+                self.complete(Lease(path=staging, name=name, job=_job_from_dict(payload), attempts=0), item)
+            else:
+                staging.write_text(json.dumps(payload), encoding="utf-8")
+                os.rename(staging, self.pending_dir / name)
+            reaped.append(name)
+        return reaped
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "pending": sum(1 for entry in os.listdir(self.pending_dir) if not entry.startswith(".tmp")),
+            "leased": len(_visible(self.leased_dir)),
+            "done": len(_visible(self.done_dir)),
+        }
+
+    def is_drained(self) -> bool:
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    def to_manifest(self) -> BatchManifest:
+        """Compact `done/` (plus whatever is still queued) into the manifest schema."""
+
+        meta = self.meta()
+        items: Dict[str, BatchItem] = {}
+        workers: set[str] = set()
+        for entry in _visible(self.done_dir):
+            payload = json.loads((self.done_dir / entry).read_text(encoding="utf-8"))
+            if payload.get("worker"):
+                workers.add(payload["worker"])
+            item = BatchItem.from_dict(payload)
+            items[item.file_name] = item
+        for directory, status in ((self.leased_dir, "running"), (self.pending_dir, "pending")):
+            for entry in _visible(directory):
+                try:
+                    payload = json.loads((directory / entry).read_text(encoding="utf-8"))
+                except (FileNotFoundError, ValueError):
+                    continue  # moved while listing
+                job = _job_from_dict(payload)
+                if job.file_name not in items:
+                    item = job.pending_item()
+                    item.status = status
+                    items[item.file_name] = item
+        manifest = BatchManifest(
+            input_dir=meta["input_dir"],
+            batch_id=meta["batch_id"],
+            started_at=meta["started_at"],
+            items=sorted(items.values(), key=lambda item: (item.book, item.chapter, item.file_name)),
+        )
+        manifest.extra.update(meta.get("extra") or {})
+        manifest.extra["workers"] = sorted(workers)
+        if self.is_drained():
+            manifest.completed_at = utc_now()
+        return manifest
+
+
+class _Heartbeat:
+    def __init__(self, queue: WorkQueue, interval_s: float) -> None:
+        self._queue = queue
+        self._interval = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="hb-align-lease-heartbeat", daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._queue.heartbeat()
+
+
+def drain(
+    queue: WorkQueue,
+    settings: BatchSettings,
+    *,
+    parallel: int = 1,
+    poll_s: float = DEFAULT_POLL_S,
+    stop_on_fail: bool = False,
+    on_start: Callable[[ChapterJob], None] | None = None,
+    on_result: Callable[[BatchItem], None] | None = None,
+) -> List[BatchItem]:
+    """Claim and run chapters until the queue is drained; returns this worker's items.
+
+    A worker keeps polling while other workers hold leases so it can take over
+    theirs if they expire. With `stop_on_fail` only this worker stops claiming.
+    A chapter that kills its pool worker is completed as WORKER_CRASHED; the
+    `WorkerPool` reruns the chapters that were in flight beside it.
+    """
+
+    finished: List[BatchItem] = []
+    stopping = False
+    with WorkerPool(
+        max(1, parallel), initializer=init_worker, initargs=worker_initargs()
+    ) as pool, _Heartbeat(queue, queue.lease_ttl_s / 4):
+        running: Dict[Future[BatchItem], Lease] = {}
+        while True:
+            while not stopping and len(running) < parallel and (lease := queue.claim()) is not None:
+                if on_start:
+                    on_start(lease.job)
+                running[pool.submit(run_chapter, lease.job, settings)] = lease
+            if running:
+                done, _ = wait(running, timeout=poll_s, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lease = running.pop(future)
+                    try:
+                        item = future.result()
+                    except Exception as exc:  # noqa: BLE001 - recorded per item in the manifest
+                        code = "WORKER_CRASHED" if isinstance(exc, BrokenProcessPool) else None
+                        item = failed_item(lease.job, exc, error_code=code)
+                    queue.complete(lease, item)
+                    finished.append(item)
+                    if on_result:
+                        on_result(item)
+                    stopping = stopping or (stop_on_fail and item.status == "failed")
+            elif stopping or queue.is_drained():
+                break
+            else:
+                time.sleep(poll_s)  # remaining leases belong to other workers
+            queue.reap_expired()
+    return finished
+
+
+def _visible(directory: Path) -> List[str]:
+    try:
+        return sorted(entry for entry in os.listdir(directory) if not entry.startswith("."))
+    except FileNotFoundError:
+        return []
+
+
+def _write_json(path: Path, payload: Mapping[str, Any]) -> None:
+    temp = path.with_name(f".tmp-{path.name}-{uuid.uuid4().hex[:8]}")
+    temp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(temp, path)
+
+
+def _job_to_dict(job: ChapterJob, attempts: int = 0) -> Dict[str, Any]:
+    return {
+        "path": str(job.chapter_file.path.resolve()),
+        "book": job.chapter_file.book,
+        "chapter": job.chapter_file.chapter,
+        "duration_ms": job.duration_ms,
+        "chunk_count": job.chunk_count,
+        "attempts": attempts,
+    }
+
+
+def _job_from_dict(payload: Mapping[str, Any]) -> ChapterJob:
+    return ChapterJob(
+        chapter_file=ChapterFile(path=Path(payload["path"]), book=payload["book"], chapter=int(payload["chapter"])),
+        duration_ms=int(payload["duration_ms"]),
+        chunk_count=int(payload["chunk_count"]),
+    )
+
+
+__all__ = [
+    "DEFAULT_LEASE_TTL_S",
+    "Lease",
+    "WorkQueue",
+    "default_worker_id",
+    "drain",
+]
@@ -2,39 +2,55 @@
 
 from __future__ import annotations
 
-import importlib
-from typing import Callable
-
 import typer
 
-CommandRegistrar = Callable[[typer.Typer], None]
+from hb_align.cli.lazy import LazyCommand, lazy_group
+
+# Command modules import heavy dependencies (aligner pipeline, WLC loader, YAML
+# profiles, pandas), so only their names and one-line help live here. The
+# module is imported when the command is invoked; keep `help` in sync with the
+# command's docstring (tests/unit/test_cli_startup.py checks this).
+LAZY_COMMANDS = {
+    "process": LazyCommand(
+        "hb_align.cli.process", "Align a single chapter recording to the canonical WLC text."
+    ),
+    "review": LazyCommand(
+        "hb_align.cli.review", "Summarize low-confidence words in an alignment export."
+    ),
+    "batch": LazyCommand("hb_align.cli.batch", "Align every chapter recording in a directory."),
+    "watch": LazyCommand(
+        "hb_align.cli.batch",
+        "Align chapter recordings as they land in a drop directory.",
+        registrar_name="register_watch",
+    ),
+    "lookup": LazyCommand(
+        "hb_align.cli.lookup", "Find the verse and word at a timestamp, or where a verse starts."
+    ),
+    "serve": LazyCommand(
+        "hb_align.cli.serve", "Answer verse/timestamp queries over HTTP from one warm process."
+    ),
+    "merge": LazyCommand("hb_align.cli.merge", "Combine batch shard manifests into one manifest.json."),
+    "cache": LazyCommand(
+        "hb_align.cli.cache", "Manage the MFA artifact cache (export, import, warm)."
+    ),
+    "daemon": LazyCommand(
+        "hb_align.cli.daemon",
+        "Run a warm alignment job server and submit chapters to it (start, submit, status, stop).",
+    ),
+}
 
 app = typer.Typer(
+    cls=lazy_group(LAZY_COMMANDS),
     context_settings={"help_option_names": ["-h", "--help"]},
     add_completion=False,
+    no_args_is_help=True,
     help="CLI surface for Hebrew Bible audio/text alignment workflows.",
 )
 
 
-def _register(module_path: str, registrar_name: str = "register") -> None:
-    """Import *module_path* and invoke its registrar with the global app.
-
-    Keeping registration lazy avoids import errors before dependencies (MFA, numpy, etc.)
-    are installed and keeps startup costs low while we build out the CLI.
-    """
-
-    module = importlib.import_module(module_path)
-    registrar: CommandRegistrar = getattr(module, registrar_name)
-    registrar(app)
-
-
-def _register_commands() -> None:
-    _register("hb_align.cli.process")
-    _register("hb_align.cli.review")
-    _register("hb_align.cli.batch")
-
-
-_register_commands()
+@app.callback()
+def _root() -> None:
+    """CLI surface for Hebrew Bible audio/text alignment workflows."""
 
 
 def main() -> None:
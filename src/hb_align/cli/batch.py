@@ -1,24 +1,598 @@
-"""Stub `hb-align batch` command wiring."""
+"""`hb-align batch` command implementation (T031)."""
 
 from __future__ import annotations
 
+import os
+import signal
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import replace
 from pathlib import Path
+from typing import Dict, Iterable, NoReturn, Optional, Sequence, Tuple
 
 import typer
 
-_NOT_IMPLEMENTED_MSG = "`hb-align batch` will land with User Story 3 (tasks T027–T033)."
+from hb_align.batch.admission import AdmissionController
+from hb_align.batch.discovery import DEFAULT_PATTERN, ChapterFile, discover_chapter_files
+from hb_align.batch.journal import BatchJournal, JournalReplay, journal_path_for, replay_journal
+from hb_align.batch.manifest import BatchItem, ManifestError
+from hb_align.batch.resume import load_prior_state, split_resumable
+from hb_align.batch.runner import (
+    BatchSettings,
+    ChapterJob,
+    default_parallel,
+    estimate_jobs,
+    mfa_jobs_for,
+    partition_longest_first,
+    plan_digest,
+    run_batch,
+    schedule_longest_first,
+)
+from hb_align.batch.stages import DEFAULT_FINALIZE_WORKERS, DEFAULT_PREP_WORKERS, StagedBatch
+from hb_align.batch.watch import DEFAULT_INTERVAL_S, DEFAULT_SETTLE_S, watch_folder
+from hb_align.batch.workqueue import DEFAULT_LEASE_TTL_S, WorkQueue, drain
+from hb_align.text.references import chapter_output_dir
+from hb_align.utils import CacheManager, events, load_config
+from hb_align.utils.prometheus import AlignmentMetricsExporter
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_CHUNK_OVERLAP = 5
+DEFAULT_COVERAGE_THRESHOLD = 95.0
 
 
 def register(app: typer.Typer) -> None:
     @app.command("batch")
-    def batch_command(  # pragma: no cover - stub command
-        input_dir: Path = typer.Argument(..., help="Directory containing chapter audio files."),
-        parallel: int = typer.Option(
-            1, "--parallel", min=1, help="Maximum number of concurrent alignments."
+    def batch_command(
+        input_dir: Path = typer.Option(..., "--input-dir", help="Directory containing chapter audio files."),
+        pattern: str = typer.Option(DEFAULT_PATTERN, "--pattern", help="Glob filter for filenames."),
+        parallel: Optional[int] = typer.Option(
+            None,
+            "--parallel",
+            help="Maximum concurrent chapters (default min(3, cpu/2); with --cpu-target, the core count).",
+        ),
+        cpu_target: Optional[float] = typer.Option(
+            None,
+            "--cpu-target",
+            min=10.0,
+            max=100.0,
+            help="Adapt concurrency to hold system CPU near this percentage (e.g. 80).",
+        ),
+        tradition: str = typer.Option("modern", "--tradition", help="Pronunciation profile."),
+        output_dir: Path = typer.Option(
+            Path("./output"), "--output-dir", help="Directory root for artifacts."
+        ),
+        cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Cache root."),
+        book: Optional[str] = typer.Option(None, "--book", help="Override book for all files."),
+        chunk_size: int = typer.Option(DEFAULT_CHUNK_SIZE, "--chunk-size", min=10, max=60),
+        chunk_overlap: int = typer.Option(DEFAULT_CHUNK_OVERLAP, "--chunk-overlap", min=0, max=10),
+        coverage_threshold: float = typer.Option(
+            DEFAULT_COVERAGE_THRESHOLD, "--coverage-threshold", min=50.0, max=99.0
+        ),
+        staged: bool = typer.Option(
+            True,
+            "--pipeline/--no-pipeline",
+            help="Overlap prep, MFA and artifact writing across chapters (staged engine).",
+        ),
+        prep_workers: int = typer.Option(
+            DEFAULT_PREP_WORKERS, "--prep-workers", min=1, help="Prep-stage threads (probe/normalize)."
+        ),
+        finalize_workers: int = typer.Option(
+            DEFAULT_FINALIZE_WORKERS, "--finalize-workers", min=1, help="Finalize-stage threads (stitch/write)."
         ),
         stop_on_fail: bool = typer.Option(
             False, "--stop-on-fail", help="Abort processing when a chapter fails."
         ),
+        resume: Optional[Path] = typer.Option(
+            None,
+            "--resume",
+            help="Manifest of an earlier (possibly crashed) batch to continue; valid chapters are skipped.",
+        ),
+        shard: Optional[str] = typer.Option(
+            None,
+            "--shard",
+            metavar="I/N",
+            callback=_parse_shard,
+            help="Process only shard I of N (cost-balanced, identical on every host); merge with `hb-align merge`.",
+        ),
+        worker: bool = typer.Option(
+            False,
+            "--worker",
+            help="Drain a shared work queue with other workers (any host mounting the same output tree).",
+        ),
+        queue_dir: Optional[Path] = typer.Option(
+            None, "--queue-dir", help="Work-queue directory for --worker (default: next to the manifest)."
+        ),
+        lease_ttl: float = typer.Option(
+            DEFAULT_LEASE_TTL_S,
+            "--lease-ttl",
+            min=5.0,
+            help="Seconds without a heartbeat before another worker reclaims a chapter.",
+        ),
+        prom_file: Optional[Path] = typer.Option(
+            None,
+            "--prom-file",
+            help="Update a Prometheus textfile-collector .prom file after every chapter.",
+        ),
+        json_events: bool = typer.Option(
+            False, "--json", help="Stream NDJSON progress events to stdout (human output goes to stderr)."
+        ),
+        events_path: Optional[str] = typer.Option(
+            None, "--events", help="Stream NDJSON progress events to a file or unix socket (unix:/path)."
+        ),
     ) -> None:
-        typer.secho(_NOT_IMPLEMENTED_MSG, fg=typer.colors.YELLOW)
-        raise typer.Exit(code=1)
+        """Align every chapter recording in a directory."""
+
+        config = load_config()
+        config.ensure_directories()
+        cpu_count = os.cpu_count() or 1
+        if parallel is not None:
+            workers = parallel
+        elif cpu_target is not None:
+            workers = cpu_count
+        else:
+            workers = default_parallel(cpu_count)
+        if not 1 <= workers <= cpu_count:
+            _fail(f"INVALID_PARALLELISM: --parallel must be between 1 and {cpu_count}")
+        if chunk_overlap >= chunk_size:
+            _fail("--chunk-overlap must be smaller than --chunk-size")
+        try:
+            chapter_files, unresolved = discover_chapter_files(input_dir, pattern=pattern, book=book)
+        except FileNotFoundError as exc:
+            _fail(f"INPUT_DIR_NOT_FOUND: {exc}")
+        for path in unresolved:
+            typer.secho(f"Skipping {path.name}: cannot infer book/chapter", fg=typer.colors.YELLOW, err=True)
+
+        settings = BatchSettings(
+            output_dir=output_dir,
+            tradition=tradition,
+            chunk_size_sec=chunk_size,
+            chunk_overlap_sec=chunk_overlap,
+            coverage_threshold=coverage_threshold,
+            cache_dir=cache_dir,
+            mfa_jobs=mfa_jobs_for(workers, cpu_count),
+        )
+        manifest_path = resume or _manifest_path(
+            output_dir, (item.book for item in chapter_files), shard=shard
+        )
+        prom_path = prom_file or config.prom_textfile
+        exporter = AlignmentMetricsExporter(prom_path, job="batch") if prom_path else None
+        with events.event_output(json_stdout=json_events, destination=events_path):
+            if worker:
+                if shard is not None:
+                    _fail("--worker cannot be combined with --shard; workers share one queue instead")
+                if resume is not None:
+                    _fail("--worker cannot be combined with --resume; a work queue resumes by itself")
+                _run_worker(
+                    WorkQueue(queue_dir or manifest_path.parent / "queue", lease_ttl_s=lease_ttl),
+                    chapter_files,
+                    settings,
+                    input_dir=input_dir,
+                    parallel=workers,
+                    stop_on_fail=stop_on_fail,
+                    manifest_path=manifest_path,
+                    exporter=exporter,
+                )
+            estimated: Dict[str, ChapterJob] = {}
+            shard_info: Dict[str, object] = {}
+            if shard is not None:
+                # Partition the full job set so every shard sees the same split.
+                planned = estimate_jobs(chapter_files, settings, workers=workers)
+                shards = partition_longest_first(planned, shard[1])
+                estimated = {job.file_name: job for job in shards[shard[0] - 1]}
+                chapter_files = [item for item in chapter_files if item.file_name in estimated]
+                shard_info = {
+                    "index": shard[0],
+                    "count": shard[1],
+                    "files": len(estimated),
+                    "cost_by_shard": [sum(job.cost for job in jobs) for jobs in shards],
+                    "plan_digest": plan_digest(planned),
+                    "plan_files": sorted(job.file_name for job in planned),
+                }
+            prior: Optional[JournalReplay] = None
+            from_journal = False
+            reused: Dict[str, BatchItem] = {}
+            if resume is not None:
+                try:
+                    prior, from_journal = load_prior_state(resume)
+                except ManifestError as exc:
+                    _fail(f"INVALID_MANIFEST: {exc}")
+                reused, chapter_files = split_resumable(
+                    chapter_files,
+                    prior,
+                    settings,
+                    CacheManager.from_config(config, root=cache_dir),
+                    wlc_root=config.wlc_root,
+                )
+                typer.secho(
+                    f"Resuming batch {prior.batch_id}: {len(reused)} chapters still valid, "
+                    f"{len(chapter_files)} to run"
+                )
+
+            unestimated = [item for item in chapter_files if item.file_name not in estimated]
+            jobs = schedule_longest_first(
+                [estimated[item.file_name] for item in chapter_files if item.file_name in estimated]
+                + estimate_jobs(unestimated, settings, workers=workers)
+            )
+            admission = (
+                AdmissionController(
+                    target_pct=cpu_target,
+                    max_limit=workers,
+                    initial=min(workers, default_parallel(cpu_count)),
+                    cpu_count=cpu_count,
+                )
+                if cpu_target is not None
+                else None
+            )
+            if admission is not None:
+                settings = replace(settings, mfa_jobs=admission.mfa_jobs())
+            engine = (
+                StagedBatch(
+                    settings,
+                    parallel=workers,
+                    prep_workers=prep_workers,
+                    finalize_workers=finalize_workers,
+                    admission=admission,
+                    exporter=exporter,
+                )
+                if staged
+                else None
+            )
+            scheduling = {
+                "strategy": "longest-first",
+                "engine": "staged" if engine is not None else "per-chapter",
+                "parallel": workers,
+                "mfa_jobs": settings.mfa_jobs,
+                "order": [job.file_name for job in jobs],
+            }
+            if shard_info:
+                scheduling["shard"] = shard_info
+            if admission is not None:
+                scheduling["cpu_target_pct"] = cpu_target
+                typer.secho(
+                    f"[hb-align] Batch start: {input_dir} (parallel≤{workers}, start {admission.limit}, "
+                    f"cpu target {cpu_target:g}%)"
+                )
+            else:
+                typer.secho(f"[hb-align] Batch start: {input_dir} (parallel={workers}, mfa -j {settings.mfa_jobs})")
+            started = time.perf_counter()
+            with BatchJournal(journal_path_for(manifest_path), truncate=prior is None) as journal:
+                if prior is None:
+                    batch_id = str(uuid.uuid4())
+                    journal.record(
+                        "batch_started",
+                        batch_id=batch_id,
+                        input_dir=str(input_dir),
+                        extra={"scheduling": scheduling},
+                    )
+                else:
+                    batch_id = prior.batch_id
+                    journal.record(
+                        "batch_resumed",
+                        batch_id=batch_id,
+                        input_dir=str(input_dir),
+                        extra={"scheduling": scheduling},
+                    )
+                    if not from_journal:
+                        for item in reused.values():
+                            journal.record_item(item)
+                for job in jobs:
+                    journal.record_item(job.pending_item())
+                events.emit(
+                    "batch_started",
+                    batch_id=batch_id,
+                    input_dir=str(input_dir),
+                    total=len(jobs),
+                    reused=len(reused),
+                    engine=scheduling["engine"],
+                    parallel=workers,
+                )
+
+                def start(job: ChapterJob) -> None:
+                    journal.record("item", file_name=job.file_name, status="running")
+                    events.emit("item_started", file_name=job.file_name, est_chunks=job.chunk_count)
+
+                def report(item: BatchItem) -> None:
+                    journal.record_item(item)
+                    _emit_item(item)
+                    _echo_item(item)
+                    if exporter is not None:
+                        if engine is None or not item.summary:  # staged finalize folds in summaries
+                            _observe_item(exporter, item)
+                        if engine is not None:
+                            exporter.observe_pipeline(engine.stats())
+                        exporter.flush()
+
+                with admission or nullcontext():
+                    if engine is not None:
+                        engine.run(jobs, stop_on_fail=stop_on_fail, on_start=start, on_result=report)
+                    else:
+                        run_batch(
+                            jobs,
+                            settings,
+                            parallel=workers,
+                            stop_on_fail=stop_on_fail,
+                            on_start=start,
+                            on_result=report,
+                            admission=admission,
+                        )
+                wall_seconds = time.perf_counter() - started
+                completed: Dict[str, object] = {"wall_ms": round(wall_seconds * 1000)}
+                if admission is not None:
+                    completed["admission"] = admission.summary()
+                if engine is not None:
+                    completed["pipeline"] = engine.stats()
+                    if exporter is not None:
+                        exporter.observe_pipeline(completed["pipeline"])
+                        exporter.flush()
+                journal.record("batch_completed", extra=completed)
+
+            manifest = replay_journal(journal.path).to_manifest()
+            manifest_path = manifest.write(manifest_path)
+
+            summary = manifest.summary()
+            events.emit("batch_completed", wall_ms=round(wall_seconds * 1000), **summary)
+            typer.secho(
+                f"Summary: total={summary['total']} success={summary['success']} "
+                f"failed={summary['failed']} duration={_format_duration(wall_seconds)}"
+            )
+            typer.secho(f"Manifest: {manifest_path}")
+            exit_code = 5 if summary["failed"] or summary["pending"] else 0
+            raise typer.Exit(code=exit_code)
+
+
+def register_watch(app: typer.Typer) -> None:
+    @app.command("watch")
+    def watch_command(
+        input_dir: Path = typer.Option(..., "--input-dir", help="Drop directory to watch for chapter audio."),
+        pattern: str = typer.Option(DEFAULT_PATTERN, "--pattern", help="Glob filter for filenames."),
+        parallel: Optional[int] = typer.Option(
+            None, "--parallel", min=1, help="Maximum concurrent chapters (default min(3, cpu/2))."
+        ),
+        tradition: str = typer.Option("modern", "--tradition", help="Pronunciation profile."),
+        output_dir: Path = typer.Option(
+            Path("./output"), "--output-dir", help="Directory root for artifacts."
+        ),
+        cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Cache root."),
+        book: Optional[str] = typer.Option(None, "--book", help="Override book for all files."),
+        chunk_size: int = typer.Option(DEFAULT_CHUNK_SIZE, "--chunk-size", min=10, max=60),
+        chunk_overlap: int = typer.Option(DEFAULT_CHUNK_OVERLAP, "--chunk-overlap", min=0, max=10),
+        coverage_threshold: float = typer.Option(
+            DEFAULT_COVERAGE_THRESHOLD, "--coverage-threshold", min=50.0, max=99.0
+        ),
+        settle: float = typer.Option(
+            DEFAULT_SETTLE_S,
+            "--settle",
+            min=0.0,
+            help="Seconds a file's size and mtime must stay unchanged before it is processed.",
+        ),
+        interval: float = typer.Option(
+            DEFAULT_INTERVAL_S, "--interval", min=0.05, help="Seconds between checks for settled files."
+        ),
+        poll: bool = typer.Option(False, "--poll", help="Poll file stats instead of using inotify."),
+        once: bool = typer.Option(
+            False, "--once", help="Process what is in the directory, wait for uploads to settle, then exit."
+        ),
+        prom_file: Optional[Path] = typer.Option(
+            None,
+            "--prom-file",
+            help="Update a Prometheus textfile-collector .prom file after every chapter.",
+        ),
+        json_events: bool = typer.Option(
+            False, "--json", help="Stream NDJSON progress events to stdout (human output goes to stderr)."
+        ),
+        events_path: Optional[str] = typer.Option(
+            None, "--events", help="Stream NDJSON progress events to a file or unix socket (unix:/path)."
+        ),
+    ) -> None:
+        """Align chapter recordings as they land in a drop directory."""
+
+        config = load_config()
+        config.ensure_directories()
+        workers = parallel or default_parallel()
+        if chunk_overlap >= chunk_size:
+            _fail("--chunk-overlap must be smaller than --chunk-size")
+        if not input_dir.is_dir():
+            _fail(f"INPUT_DIR_NOT_FOUND: Input directory not found: {input_dir}")
+        settings = BatchSettings(
+            output_dir=output_dir,
+            tradition=tradition,
+            chunk_size_sec=chunk_size,
+            chunk_overlap_sec=chunk_overlap,
+            coverage_threshold=coverage_threshold,
+            cache_dir=cache_dir,
+            mfa_jobs=mfa_jobs_for(workers),
+        )
+        prom_path = prom_file or config.prom_textfile
+        exporter = AlignmentMetricsExporter(prom_path, job="watch") if prom_path else None
+        stop = threading.Event()
+
+        def ready(kind: str) -> None:
+            typer.secho(
+                f"[hb-align] Watching {input_dir} ({kind}, parallel={workers}, settle {settle:g}s)"
+            )
+            events.emit("watch_started", input_dir=str(input_dir), watcher=kind, parallel=workers)
+
+        def skip(path: Path, reason: str) -> None:
+            events.emit("item_skipped", file_name=path.name, reason=reason)
+            detail = "cannot infer book/chapter" if reason == "unresolved" else "outputs are current"
+            typer.secho(f"Skipping {path.name}: {detail}", fg=typer.colors.YELLOW, err=True)
+
+        def start(job: ChapterJob) -> None:
+            events.emit("item_started", file_name=job.file_name, est_chunks=job.chunk_count)
+
+        def report(item: BatchItem) -> None:
+            _emit_item(item)
+            _echo_item(item)
+            if exporter is not None:
+                _observe_item(exporter, item)
+                exporter.flush()
+
+        # The first Ctrl-C (or SIGTERM) stops watching and lets running chapters finish.
+        previous = {signum: signal.signal(signum, lambda *_: stop.set()) for signum in (signal.SIGINT, signal.SIGTERM)}
+        started = time.perf_counter()
+        try:
+            with events.event_output(json_stdout=json_events, destination=events_path):
+                stats = watch_folder(
+                    input_dir,
+                    settings,
+                    pattern=pattern,
+                    book=book,
+                    parallel=workers,
+                    settle_s=settle,
+                    interval_s=interval,
+                    use_inotify=not poll,
+                    once=once,
+                    stop=stop,
+                    wlc_root=config.wlc_root,
+                    on_ready=ready,
+                    on_skip=skip,
+                    on_start=start,
+                    on_result=report,
+                )
+                wall_seconds = time.perf_counter() - started
+                events.emit("watch_stopped", wall_ms=round(wall_seconds * 1000), **stats.to_dict())
+                typer.secho(
+                    f"Summary: processed={stats.started} success={stats.succeeded} failed={stats.failed} "
+                    f"skipped={stats.skipped + stats.unresolved} duration={_format_duration(wall_seconds)}"
+                )
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        raise typer.Exit(code=5 if stats.failed else 0)
+
+
+def _run_worker(
+    queue: WorkQueue,
+    chapter_files: Sequence[ChapterFile],
+    settings: BatchSettings,
+    *,
+    input_dir: Path,
+    parallel: int,
+    stop_on_fail: bool,
+    manifest_path: Path,
+    exporter: AlignmentMetricsExporter | None,
+) -> NoReturn:
+    """`--worker` mode: publish the job set if nobody has yet, then drain the queue."""
+
+    if not queue.ready:
+        jobs = estimate_jobs(chapter_files, settings, workers=parallel)
+        scheduling = {
+            "strategy": "longest-first",
+            "engine": "work-queue",
+            "order": [job.file_name for job in schedule_longest_first(jobs)],
+        }
+        published = queue.initialize(
+            jobs, batch_id=str(uuid.uuid4()), input_dir=str(input_dir), extra={"scheduling": scheduling}
+        )
+        if published:
+            typer.secho(f"[hb-align] Queued {len(jobs)} chapters in {queue.root}")
+        try:
+            queue.wait_ready()
+        except TimeoutError as exc:
+            _fail(f"QUEUE_NOT_READY: {exc}")
+
+    def report(item: BatchItem) -> None:
+        _emit_item(item)
+        _echo_item(item)
+        if exporter is not None:
+            _observe_item(exporter, item)
+            exporter.flush()
+
+    typer.secho(f"[hb-align] Worker {queue.worker_id} draining {queue.root} (parallel={parallel})")
+    events.emit("worker_started", worker_id=queue.worker_id, queue_dir=str(queue.root), parallel=parallel)
+    started = time.perf_counter()
+    mine = drain(queue, settings, parallel=parallel, stop_on_fail=stop_on_fail, on_result=report)
+    wall_seconds = time.perf_counter() - started
+
+    manifest = queue.to_manifest()
+    manifest.write(manifest_path)
+    summary = manifest.summary()
+    events.emit(
+        "worker_completed",
+        worker_id=queue.worker_id,
+        processed=len(mine),
+        wall_ms=round(wall_seconds * 1000),
+        **summary,
+    )
+    typer.secho(
+        f"Worker: processed={len(mine)} duration={_format_duration(wall_seconds)}; "
+        f"queue: total={summary['total']} success={summary['success']} failed={summary['failed']} "
+        f"pending={summary['pending']}"
+    )
+    typer.secho(f"Manifest: {manifest_path}")
+    raise typer.Exit(code=5 if summary["failed"] or summary["pending"] else 0)
+
+
+def _emit_item(item: BatchItem) -> None:
+    events.emit(
+        "item_finished",
+        file_name=item.file_name,
+        status=item.status,
+        exit_code=item.exit_code,
+        coverage_pct=item.coverage_pct,
+        runtime_ms=item.runtime_ms,
+        error_code=item.error_code,
+    )
+
+
+def _observe_item(exporter: AlignmentMetricsExporter, item: BatchItem) -> None:
+    if item.summary:
+        exporter.observe_summary(item.summary)
+    else:
+        exporter.observe_failure((item.error_code or "error").lower())
+
+
+def _manifest_path(
+    output_dir: Path, books: Iterable[str], *, shard: Optional[Tuple[int, int]] = None
+) -> Path:
+    """`<output>/<book>/manifest.json` for single-book batches, else `<output>/manifest.json`.
+
+    Shards write `manifest.shard-03-of-08.json` alongside, for `hb-align merge`.
+    """
+
+    books = set(books)
+    name = "manifest.json"
+    if shard is not None:
+        width = len(str(shard[1]))
+        name = f"manifest.shard-{shard[0]:0{width}d}-of-{shard[1]}.json"
+    if len(books) == 1:
+        return chapter_output_dir(output_dir, books.pop(), 1).parent / name
+    return output_dir / name
+
+
+def _parse_shard(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    if value is None:
+        return None
+    index, sep, count = value.partition("/")
+    try:
+        parsed = (int(index), int(count))
+    except ValueError:
+        parsed = (0, 0)
+    if not sep or parsed[1] < 1 or not 1 <= parsed[0] <= parsed[1]:
+        raise typer.BadParameter("expected I/N with 1 <= I <= N, e.g. 3/8")
+    return parsed
+
+
+def _echo_item(item: BatchItem) -> None:
+    if item.status == "success":
+        details = f"{item.coverage_pct or 0:.1f}% coverage"
+        if item.confidence_avg:
+            details += f", {item.confidence_avg:.2f} confidence"
+        typer.secho(f"✔ {item.file_name} ({details})", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"✖ {item.file_name} ({item.error_message})", fg=typer.colors.RED)
+
+
+def _format_duration(seconds: float) -> str:
+    whole = int(seconds)
+    return f"{whole // 3600:02d}:{whole % 3600 // 60:02d}:{whole % 60:02d}"
+
+
+def _fail(message: str) -> NoReturn:
+    typer.secho(message, fg=typer.colors.RED, err=True)
+    raise typer.Exit(code=3)
+
+
+__all__ = ["register", "register_watch"]
@@ -0,0 +1,154 @@
+"""`hb-align cache` command group (export/import of cache packs, warm-up)."""
+
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, List, Optional
+
+import typer
+
+from hb_align.utils import CacheManager, load_config
+from hb_align.utils.cache_pack import CachePackError, PackSelector, export_pack, import_pack
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_CHUNK_OVERLAP = 5
+
+_STDIO_PATH = "-"
+
+
+def register(app: typer.Typer) -> None:
+    cache_app = typer.Typer(
+        help="Manage the MFA artifact cache (export, import, warm).",
+        no_args_is_help=True,
+    )
+
+    @cache_app.command("export")
+    def export_command(
+        output: str = typer.Argument(..., help="Pack file to write ('-' for stdout)."),
+        book: Optional[str] = typer.Option(None, "--book", help="Only entries for this book."),
+        tradition: Optional[str] = typer.Option(
+            None, "--tradition", help="Only entries for this pronunciation profile."
+        ),
+        key_prefix: Optional[str] = typer.Option(
+            None, "--key-prefix", help="Only entries whose cache key starts with this prefix."
+        ),
+        cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Cache root."),
+    ) -> None:
+        """Write selected cache entries into one streaming pack with a checksum manifest."""
+
+        manager = _cache_manager(cache_dir)
+        selector = PackSelector(book=book, tradition=tradition, key_prefix=key_prefix)
+        with _open_binary(output, "wb") as stream:
+            report = export_pack(manager, stream, selector)
+        typer.secho(
+            f"Exported {len(report.entries)} entries ({report.files} files, {report.bytes} bytes)",
+            fg=typer.colors.GREEN,
+            err=output == _STDIO_PATH,
+        )
+
+    @cache_app.command("import")
+    def import_command(
+        pack: str = typer.Argument(..., help="Pack file to read ('-' for stdin)."),
+        cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Cache root."),
+    ) -> None:
+        """Import a cache pack, verifying checksums and skipping existing entries."""
+
+        if pack != _STDIO_PATH and not Path(pack).exists():
+            typer.secho(f"Cache pack not found: {pack}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        manager = _cache_manager(cache_dir)
+        try:
+            with _open_binary(pack, "rb") as stream:
+                report = import_pack(manager, stream)
+        except CachePackError as exc:
+            typer.secho(str(exc), fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        typer.secho(
+            f"Imported {len(report.entries)} entries ({report.files} files, {report.bytes} bytes); "
+            f"skipped {len(report.skipped)} existing",
+            fg=typer.colors.GREEN,
+        )
+
+    @cache_app.command("warm")
+    def warm_command(
+        input_dir: Path = typer.Option(..., "--input-dir", help="Directory of chapter audio files."),
+        pattern: str = typer.Option("*.mp3", "--pattern", help="Glob filter for filenames."),
+        book: Optional[str] = typer.Option(None, "--book", help="Override book for all files."),
+        traditions: List[str] = typer.Option(
+            ["modern"], "--tradition", help="Pronunciation profile(s) to prepare lexicons for."
+        ),
+        chunk_size: int = typer.Option(DEFAULT_CHUNK_SIZE, "--chunk-size", min=10, max=60),
+        chunk_overlap: int = typer.Option(DEFAULT_CHUNK_OVERLAP, "--chunk-overlap", min=0, max=10),
+        workers: Optional[int] = typer.Option(
+            None, "--workers", min=1, help="Parallel workers (default: cpu_count - 1)."
+        ),
+        normalize: bool = typer.Option(
+            True, "--normalize/--no-normalize", help="Produce normalized 16 kHz WAVs."
+        ),
+        cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Cache root."),
+    ) -> None:
+        """Precompute checksums, durations, normalized audio, chunk plans and lexicons (no MFA)."""
+
+        from hb_align.batch.discovery import discover_chapter_files
+        from hb_align.batch.warmup import WarmSettings, default_workers, warm_cache
+
+        if chunk_overlap >= chunk_size:
+            typer.secho("--chunk-overlap must be smaller than --chunk-size", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        try:
+            chapter_files, unresolved = discover_chapter_files(input_dir, pattern=pattern, book=book)
+        except FileNotFoundError as exc:
+            typer.secho(str(exc), fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        for path in unresolved:
+            typer.secho(f"Skipping {path.name}: cannot infer book/chapter", fg=typer.colors.YELLOW, err=True)
+
+        manager = _cache_manager(cache_dir)
+        settings = WarmSettings(
+            cache_dir=manager.root,
+            traditions=tuple(traditions),
+            chunk_size_sec=chunk_size,
+            chunk_overlap_sec=chunk_overlap,
+            compression=manager.compression,
+            normalize=normalize,
+        )
+
+        def report(result) -> None:  # noqa: ANN001
+            if result.status == "success":
+                typer.secho(
+                    f"✔ {result.file_name} ({', '.join(result.cache_status)}; "
+                    f"{result.chunk_count} chunks)",
+                    fg=typer.colors.GREEN,
+                )
+            else:
+                typer.secho(f"✖ {result.file_name}: {result.error_message}", fg=typer.colors.RED)
+
+        results = warm_cache(
+            chapter_files, settings, workers=workers or default_workers(), on_result=report
+        )
+        failed = sum(1 for item in results if item.status != "success")
+        notes = sorted({note for item in results for note in item.notes})
+        for note in notes:
+            typer.secho(f"Note: {note}", fg=typer.colors.YELLOW)
+        typer.secho(f"Warmed {len(results) - failed}/{len(results)} chapters into {manager.root}")
+        raise typer.Exit(code=5 if failed else 0)
+
+    app.add_typer(cache_app, name="cache")
+
+
+def _cache_manager(cache_dir: Optional[Path]) -> CacheManager:
+    return CacheManager.from_config(load_config(), root=cache_dir)
+
+
+@contextmanager
+def _open_binary(path: str, mode: str) -> Iterator[IO[bytes]]:
+    if path == _STDIO_PATH:
+        yield sys.stdout.buffer if "w" in mode else sys.stdin.buffer
+        return
+    with open(path, mode) as handle:
+        yield handle
+
+
+__all__ = ["register"]
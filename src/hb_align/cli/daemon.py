@@ -0,0 +1,198 @@
+"""`hb-align daemon` command group: a warm job server and its thin client.
+
+Only the client is imported here, so `daemon submit` starts in a fraction of
+the time `process` needs; the server and the aligner load with `daemon start`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import typer
+
+from hb_align.daemon import client
+
+# Same defaults as `process`; the daemon validates the job again.
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_CHUNK_OVERLAP = 5
+DEFAULT_COVERAGE_THRESHOLD = 95.0
+
+
+def register(app: typer.Typer) -> None:
+    daemon_app = typer.Typer(
+        help="Run a warm alignment job server and submit chapters to it (start, submit, status, stop).",
+        no_args_is_help=True,
+    )
+
+    @daemon_app.command("start")
+    def start_command(
+        socket_path: Optional[Path] = typer.Option(
+            None, "--socket", help="Unix socket to listen on (default $HB_ALIGN_DAEMON_SOCKET)."
+        ),
+        workers: Optional[int] = typer.Option(
+            None, "--workers", min=1, help="Warm worker processes (default min(3, cpu // 2))."
+        ),
+        text_cache_size: int = typer.Option(
+            256, "--text-cache-size", min=1, help="Parsed WLC chapters kept in memory (LRU)."
+        ),
+    ) -> None:
+        """Start the job server in the foreground (Ctrl-C or `daemon stop` to quit)."""
+
+        from hb_align.batch.runner import default_parallel
+        from hb_align.daemon.server import run_daemon
+
+        path = socket_path or client.default_socket_path()
+
+        def ready(server: Any) -> None:
+            typer.secho(
+                f"Daemon ready on unix:{path} with {server.workers} warm worker(s)", err=True
+            )
+
+        try:
+            stats = run_daemon(
+                path,
+                workers=workers or default_parallel(),
+                text_cache_size=text_cache_size,
+                on_ready=ready,
+            )
+        except OSError as exc:
+            typer.secho(f"DAEMON_BIND_FAILED: {exc}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        jobs, texts = stats["jobs"], stats["text_cache"]
+        typer.secho(
+            f"Ran {jobs['completed']} job(s), {jobs['failed']} failed; "
+            f"text cache hits {texts['hits']}, misses {texts['misses']}",
+            err=True,
+        )
+
+    @daemon_app.command("submit", context_settings={"allow_interspersed_args": True})
+    def submit_command(
+        input_path: Path = typer.Argument(..., help="Path to the book-chapter audio file."),
+        book: Optional[str] = typer.Option(None, "--book", help="Override detected book name."),
+        chapter: Optional[int] = typer.Option(
+            None, "--chapter", min=1, help="Override detected chapter number."
+        ),
+        tradition: str = typer.Option(
+            "modern", "--tradition", help="Pronunciation profile (modern|ashkenazi|sephardi)."
+        ),
+        output_dir: Path = typer.Option(
+            Path("./output"), "--output-dir", help="Directory root for artifacts."
+        ),
+        chunk_size: int = typer.Option(
+            DEFAULT_CHUNK_SIZE, "--chunk-size", min=10, max=60, help="Chunk size in seconds (<=60)."
+        ),
+        chunk_overlap: int = typer.Option(
+            DEFAULT_CHUNK_OVERLAP,
+            "--chunk-overlap",
+            min=0,
+            max=10,
+            help="Chunk overlap in seconds (< chunk-size).",
+        ),
+        coverage_threshold: float = typer.Option(
+            DEFAULT_COVERAGE_THRESHOLD,
+            "--coverage-threshold",
+            min=50.0,
+            max=99.0,
+            help="Coverage % required for success (default 95).",
+        ),
+        cache_dir: Optional[Path] = typer.Option(
+            None, "--cache-dir", help="Cache root (default: the daemon's)."
+        ),
+        socket_path: Optional[Path] = typer.Option(
+            None, "--socket", help="Daemon socket (default $HB_ALIGN_DAEMON_SOCKET)."
+        ),
+        json_events: bool = typer.Option(
+            False, "--json", help="Stream NDJSON progress events and the result to stdout."
+        ),
+    ) -> None:
+        """Run one chapter on the daemon and print its summary; exits with the job's code."""
+
+        # Paths are resolved here: the daemon runs in its own working directory.
+        job = {
+            "input_path": os.path.abspath(input_path),
+            "book": book,
+            "chapter": chapter,
+            "tradition": tradition,
+            "output_dir": os.path.abspath(output_dir),
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "coverage_threshold": coverage_threshold,
+            "cache_dir": os.path.abspath(cache_dir) if cache_dir else None,
+        }
+
+        def on_event(event: Dict[str, Any]) -> None:
+            if json_events:
+                typer.echo(json.dumps(event, ensure_ascii=False))
+            elif event["event"] == "job_accepted":
+                typer.secho(f"Submitted {event['job_id']}", err=True)
+
+        try:
+            result = client.submit(
+                socket_path or client.default_socket_path(), job, on_event=on_event
+            )
+        except client.DaemonError as exc:
+            typer.secho(f"{exc.code}: {exc}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+
+        exit_code = int(result.get("exit_code", 3))
+        if json_events:
+            typer.echo(json.dumps(result, ensure_ascii=False))
+        elif result.get("error"):
+            typer.secho(
+                f"{result.get('error_code')}: {result['error']}", fg=typer.colors.RED, err=True
+            )
+        else:
+            _echo_result(result, exit_code)
+        raise typer.Exit(code=exit_code)
+
+    @daemon_app.command("status")
+    def status_command(
+        socket_path: Optional[Path] = typer.Option(None, "--socket", help="Daemon socket."),
+    ) -> None:
+        """Print the daemon's job counters and cache statistics as JSON."""
+
+        try:
+            reply = client.status(socket_path or client.default_socket_path())
+        except client.DaemonError as exc:
+            typer.secho(f"{exc.code}: {exc}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        reply.pop("op", None)
+        typer.echo(json.dumps(reply, indent=2))
+
+    @daemon_app.command("stop")
+    def stop_command(
+        socket_path: Optional[Path] = typer.Option(None, "--socket", help="Daemon socket."),
+    ) -> None:
+        """Stop the daemon once the jobs it is running finish."""
+
+        try:
+            client.shutdown(socket_path or client.default_socket_path())
+        except client.DaemonError as exc:
+            typer.secho(f"{exc.code}: {exc}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+        typer.secho("Daemon stopping", err=True)
+
+    app.add_typer(daemon_app, name="daemon")
+
+
+def _echo_result(result: Dict[str, Any], exit_code: int) -> None:
+    summary = result.get("summary") or {}
+    if summary:
+        typer.secho(
+            f"{summary.get('book', '?')} {summary.get('chapter', '?')}: "
+            f"coverage {summary.get('coverage_pct', 0.0):.2f}% "
+            f"({summary.get('aligned_words', 0)}/{summary.get('expected_words', 0)} words aligned) "
+            f"in {result.get('runtime_ms', 0)} ms",
+            fg=typer.colors.GREEN if exit_code == 0 else typer.colors.YELLOW,
+        )
+    artifacts = result.get("artifacts") or {}
+    if artifacts:
+        typer.secho("Artifacts:", fg=typer.colors.BLUE)
+        for name, path in artifacts.items():
+            typer.secho(f"  {name}: {path}")
+
+
+__all__ = ["register"]
@@ -0,0 +1,77 @@
+"""Lazily imported top-level commands.
+
+Each command module pulls in its own dependency tree (the aligner pipeline,
+WLC loader, YAML profiles, pandas, ...), so the root group only knows command
+names and their one-line help up front. `hb-align --help` renders placeholder
+commands built from that static text; the implementing module is imported and
+registered the first time a command is actually resolved for invocation (which
+includes `hb-align <command> --help`).
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Tuple
+
+import click
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+@dataclass(frozen=True)
+class LazyCommand:
+    module_path: str
+    help: str
+    registrar_name: str = "register"
+
+
+class LazyGroup(TyperGroup):
+    """`TyperGroup` that imports a command's module only when the command is resolved."""
+
+    lazy_commands: Mapping[str, LazyCommand] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        loaded = [name for name in super().list_commands(ctx) if name not in self.lazy_commands]
+        return [*self.lazy_commands, *loaded]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Return the loaded command, or a help-only placeholder for listings."""
+
+        command = self.commands.get(cmd_name)
+        if command is not None:
+            return command
+        spec = self.lazy_commands.get(cmd_name)
+        if spec is None:
+            return None
+        return TyperCommand(name=cmd_name, help=spec.help, callback=None)
+
+    def resolve_command(
+        self, ctx: click.Context, args: List[str]
+    ) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
+        if args and args[0] in self.lazy_commands:
+            self.load_command(args[0])
+        return super().resolve_command(ctx, args)
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        """Import the command's module, register it on a scratch app and cache the result."""
+
+        command = self.commands.get(cmd_name)
+        if command is not None:
+            return command
+        spec = self.lazy_commands[cmd_name]
+        module = importlib.import_module(spec.module_path)
+        scratch = typer.Typer()
+        getattr(module, spec.registrar_name)(scratch)
+        command = typer.main.get_group(scratch).commands[cmd_name]
+        self.add_command(command, cmd_name)
+        return command
+
+
+def lazy_group(commands: Mapping[str, LazyCommand]) -> type[LazyGroup]:
+    """Build a `LazyGroup` subclass bound to *commands* (Typer instantiates `cls` itself)."""
+
+    return type("HbAlignLazyGroup", (LazyGroup,), {"lazy_commands": dict(commands)})
+
+
+__all__ = ["LazyCommand", "LazyGroup", "lazy_group"]
@@ -0,0 +1,148 @@
+"""`hb-align lookup` command: verse/time queries against alignment outputs."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, NoReturn, Optional
+
+import typer
+
+from hb_align.index.timeline import BookIndex, VerseSpan
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("lookup")
+    def lookup_command(
+        input_path: Path = typer.Option(
+            ...,
+            "--input",
+            help="Chapter output directory, book output directory or alignment export.",
+        ),
+        at: Optional[float] = typer.Option(
+            None, "--at", help="Seconds into the chapter recording."
+        ),
+        verse: Optional[str] = typer.Option(
+            None, "--verse", help="Verse reference, e.g. 1:27 or 'Genesis 1:27'."
+        ),
+        start: Optional[float] = typer.Option(
+            None, "--from", help="Start of a time range in seconds."
+        ),
+        end: Optional[float] = typer.Option(None, "--to", help="End of a time range in seconds."),
+        chapter: Optional[int] = typer.Option(
+            None,
+            "--chapter",
+            help="Chapter for --at/--from (required when the input holds several).",
+        ),
+        as_json: bool = typer.Option(False, "--json", help="Print the result as JSON."),
+    ) -> None:
+        """Find the verse and word at a timestamp, or where a verse starts."""
+
+        queries = sum(value is not None for value in (at, verse, start))
+        if queries != 1 or (start is None) != (end is None):
+            raise typer.BadParameter(
+                "pass exactly one of --at, --verse or --from/--to", param_hint="--at"
+            )
+
+        started = time.perf_counter()
+        try:
+            index = BookIndex.load(input_path)
+        except FileNotFoundError as exc:
+            _fail(f"LOOKUP_INPUT_NOT_FOUND: {exc}")
+        except ValueError as exc:  # unreadable export (ColumnarFormatError) or several books
+            _fail(f"INVALID_ALIGNMENT_SCHEMA: {exc}")
+        load_ms = (time.perf_counter() - started) * 1000
+
+        result: Dict[str, Any] = {"book": index.book}
+        started = time.perf_counter()
+        if verse is not None:
+            try:
+                span: Optional[VerseSpan] = index.verse(verse)
+            except KeyError as exc:
+                span = None
+                result["error"] = exc.args[0]
+            result["verse"] = None if span is None else asdict(span)
+            found = span is not None and span.start_ms is not None
+        else:
+            number = _chapter(index, chapter)
+            result["chapter"] = number
+            if at is not None:
+                ms = round(at * 1000)
+                word = index.word_at(number, ms)
+                span = index.verse_at(number, ms)
+                result.update(
+                    at_ms=ms,
+                    word=None if word is None else asdict(word),
+                    verse=None if span is None else asdict(span),
+                )
+                found = word is not None or span is not None
+            else:
+                words = index.words_between(number, round(start * 1000), round(end * 1000))
+                result["words"] = [asdict(word) for word in words]
+                found = bool(words)
+        query_us = (time.perf_counter() - started) * 1_000_000
+
+        if as_json:
+            typer.echo(json.dumps(result, ensure_ascii=False))
+        else:
+            _print_result(result)
+        typer.secho(
+            f"Indexed {len(index.chapters)} chapter(s) in {load_ms:.1f} ms; query took {query_us:.0f} µs",
+            err=True,
+        )
+        raise typer.Exit(code=0 if found else 4)
+
+
+def _chapter(index: BookIndex, chapter: Optional[int]) -> int:
+    if chapter is None:
+        if len(index.chapters) != 1:
+            raise typer.BadParameter("the input holds several chapters", param_hint="--chapter")
+        return index.chapters[0]
+    if chapter not in index.chapters:
+        _fail(f"LOOKUP_INPUT_NOT_FOUND: {index.book} {chapter} is not in the index")
+    return chapter
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    span = result.get("verse")
+    if result.get("error"):
+        typer.secho(result["error"], fg=typer.colors.YELLOW)
+    if "at_ms" in result:
+        word = result["word"]
+        if word is not None:
+            typer.secho(
+                f"{word['book']} {word['verse']} word {word['word_index']} {word['word_text']} "
+                f"{_seconds(word['start_ms'])}–{_seconds(word['end_ms'])} (confidence {word['confidence']:.2f})"
+            )
+        elif span is None:
+            typer.secho(f"Nothing aligned at {_seconds(result['at_ms'])}", fg=typer.colors.YELLOW)
+    if span is not None:
+        timing = (
+            "not aligned"
+            if span["start_ms"] is None
+            else f"{_seconds(span['start_ms'])}–{_seconds(span['end_ms'])}"
+        )
+        last = span["first_word"] + span["word_count"] - 1
+        typer.secho(f"{span['book']} {span['verse']}: {timing}, words {span['first_word']}–{last}")
+    words: List[Dict[str, Any]] = result.get("words", [])
+    for word in words:
+        typer.secho(
+            f"{word['verse']} {word['word_index']} {word['word_text']} "
+            f"{_seconds(word['start_ms'])}–{_seconds(word['end_ms'])}"
+        )
+    if "words" in result and not words:
+        typer.secho("No words aligned in that range", fg=typer.colors.YELLOW)
+
+
+def _seconds(ms: int) -> str:
+    return f"{ms / 1000:.2f}s"
+
+
+def _fail(message: str) -> NoReturn:
+    typer.secho(message, fg=typer.colors.RED, err=True)
+    raise typer.Exit(code=3)
+
+
+__all__ = ["register"]
@@ -0,0 +1,46 @@
+"""`hb-align merge` command: combine `batch --shard` manifests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from hb_align.batch.manifest import ManifestError, load_manifest, merge_manifests
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("merge")
+    def merge_command(
+        shard_manifests: List[Path] = typer.Argument(
+            ..., help="Shard manifests written by `hb-align batch --shard I/N`."
+        ),
+        output: Optional[Path] = typer.Option(
+            None, "--output", help="Merged manifest path (default: manifest.json next to the first shard)."
+        ),
+        allow_partial: bool = typer.Option(
+            False, "--allow-partial", help="Merge even if some shards are missing (recorded in the manifest)."
+        ),
+    ) -> None:
+        """Combine batch shard manifests into one manifest.json."""
+
+        try:
+            merged = merge_manifests(
+                [load_manifest(path) for path in shard_manifests], allow_partial=allow_partial
+            )
+        except ManifestError as exc:
+            typer.secho(f"INVALID_MANIFEST: {exc}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+
+        target = merged.write(output or shard_manifests[0].with_name("manifest.json"))
+        summary = merged.summary()
+        typer.secho(
+            f"Merged {len(shard_manifests)} shards: total={summary['total']} "
+            f"success={summary['success']} failed={summary['failed']} pending={summary['pending']}"
+        )
+        typer.secho(f"Manifest: {target}")
+        raise typer.Exit(code=5 if summary["failed"] or summary["pending"] else 0)
+
+
+__all__ = ["register"]
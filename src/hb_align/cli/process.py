@@ -3,19 +3,38 @@
 from __future__ import annotations
 
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional
 
 import typer
+from rich.console import Console
 
-from hb_align.aligner import pipeline, validators
+from hb_align.aligner import pipeline, prep, validators, writers
+from hb_align.aligner.mfa_runner import MfaRunnerError
+from hb_align.audio import chunker
 from hb_align.text import wlc_loader
-from hb_align.text.wlc_loader import TextChapter
-from hb_align.utils import load_config
+from hb_align.text.references import chapter_output_dir, resolve_reference
+from hb_align.utils import (
+    AppConfig,
+    CacheManager,
+    CacheStats,
+    QueueLogSink,
+    StructuredLogger,
+    SummaryWriter,
+    events,
+    load_config,
+    tracing,
+)
+from hb_align.utils.prometheus import AlignmentMetricsExporter
+from hb_align.utils.resources import ResourceSampler
+from hb_align.utils.tracing import Tracer
 
 DEFAULT_CHUNK_SIZE = 50
 DEFAULT_CHUNK_OVERLAP = 5
 DEFAULT_COVERAGE_THRESHOLD = 95.0
+RUN_LOG_NAME = "hb-align.log"
 
 
 def register(app: typer.Typer) -> None:
@@ -55,7 +74,24 @@ def register(app: typer.Typer) -> None:
             max=99.0,
             help="Coverage % required for success (default 95).",
         ),
+        cache_dir: Optional[Path] = typer.Option(
+            None, "--cache-dir", help="Cache root (default ~/.hb-align/cache)."
+        ),
         dry_run: bool = typer.Option(False, "--dry-run", help="Validate inputs without MFA."),
+        trace: bool = typer.Option(
+            False, "--trace", help="Write a Chrome trace-event file (trace.json) for the run."
+        ),
+        prom_file: Optional[Path] = typer.Option(
+            None,
+            "--prom-file",
+            help="Update a Prometheus textfile-collector .prom file (default $HB_ALIGN_PROM_TEXTFILE).",
+        ),
+        json_events: bool = typer.Option(
+            False, "--json", help="Stream NDJSON progress events to stdout (human output goes to stderr)."
+        ),
+        events_path: Optional[str] = typer.Option(
+            None, "--events", help="Stream NDJSON progress events to a file or unix socket (unix:/path)."
+        ),
     ) -> None:
         """Align a single chapter recording to the canonical WLC text."""
 
@@ -70,38 +106,42 @@ def register(app: typer.Typer) -> None:
             raise typer.Exit(code=3)
 
         try:
-            resolved_book, resolved_chapter = _resolve_reference(input_path, book, chapter)
+            resolved_book, resolved_chapter = resolve_reference(input_path, book, chapter)
         except ValueError as exc:  # pragma: no cover - simple validation guard
             typer.secho(str(exc), fg=typer.colors.RED, err=True)
             raise typer.Exit(code=3)
 
-        try:
-            run_result = _run_process_pipeline(
-                input_path=input_path,
-                book=resolved_book,
-                chapter=resolved_chapter,
-                tradition=tradition,
-                output_dir=output_dir,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                coverage_threshold=coverage_threshold,
-                dry_run=dry_run,
-            )
-        except FileNotFoundError as exc:
-            typer.secho(str(exc), fg=typer.colors.RED, err=True)
-            raise typer.Exit(code=3)
-        except Exception as exc:  # pragma: no cover - defensive
-            typer.secho(str(exc), fg=typer.colors.RED, err=True)
-            raise typer.Exit(code=3)
-
-        summary = run_result.get("summary") or run_result.get("metrics") or {}
-        _echo_summary(summary, run_result.get("exit_code", 0))
-
-        artifacts = run_result.get("artifacts", {})
-        if artifacts:
-            typer.secho("Artifacts:", fg=typer.colors.BLUE)
-            for name, path in artifacts.items():
-                typer.secho(f"  {name}: {path}")
+        with events.event_output(json_stdout=json_events, destination=events_path):
+            try:
+                run_result = _run_process_pipeline(
+                    input_path=input_path,
+                    book=resolved_book,
+                    chapter=resolved_chapter,
+                    tradition=tradition,
+                    output_dir=output_dir,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    coverage_threshold=coverage_threshold,
+                    dry_run=dry_run,
+                    cache_dir=cache_dir,
+                    trace=trace,
+                    prom_file=prom_file,
+                )
+            except FileNotFoundError as exc:
+                typer.secho(str(exc), fg=typer.colors.RED, err=True)
+                raise typer.Exit(code=3)
+            except Exception as exc:  # pragma: no cover - defensive
+                typer.secho(str(exc), fg=typer.colors.RED, err=True)
+                raise typer.Exit(code=3)
+
+            summary = run_result.get("summary") or run_result.get("metrics") or {}
+            _echo_summary(summary, run_result.get("exit_code", 0))
+
+            artifacts = run_result.get("artifacts", {})
+            if artifacts:
+                typer.secho("Artifacts:", fg=typer.colors.BLUE)
+                for name, path in artifacts.items():
+                    typer.secho(f"  {name}: {path}")
 
         raise typer.Exit(code=run_result.get("exit_code", 0))
 
@@ -117,12 +157,21 @@ def _run_process_pipeline(
     chunk_overlap: int,
     coverage_threshold: float,
     dry_run: bool,
+    cache_dir: Path | None = None,
+    trace: bool = False,
+    prom_file: Path | None = None,
+    export_metrics: bool = True,
+    mfa_jobs: int | None = None,
+    text_chapter: wlc_loader.TextChapter | None = None,
 ) -> Dict[str, object]:
     if not input_path.exists():
         raise FileNotFoundError(f"Input audio file not found: {input_path}")
 
-    text_chapter = wlc_loader.load_chapter(book, chapter)
-    chapter_dir = _chapter_output_dir(output_dir, book, chapter)
+    config = load_config()
+    config.ensure_directories()
+    if text_chapter is None:  # the daemon passes chapters from its warm cache
+        text_chapter = wlc_loader.load_chapter(book, chapter, root=config.wlc_root)
+    chapter_dir = chapter_output_dir(output_dir, book, chapter)
     chapter_dir.mkdir(parents=True, exist_ok=True)
 
     if dry_run:
@@ -136,19 +185,111 @@ def _run_process_pipeline(
         }
         return {"exit_code": 0, "summary": summary, "artifacts": {}}
 
-    audio_duration_ms = _estimate_audio_duration(input_path, text_chapter)
-    pipeline_result = pipeline.run_alignment_pipeline(
-        text_chapter=text_chapter,
-        audio_duration_ms=audio_duration_ms,
-        chunk_size_sec=chunk_size,
-        chunk_overlap_sec=chunk_overlap,
-        profile=tradition,
-        mfa_runner=None,
-        cache_manager=None,
-        working_dir=chapter_dir,
-    )
+    prom_path = (prom_file or config.prom_textfile) if export_metrics else None
+    exporter = AlignmentMetricsExporter(prom_path, job="process") if prom_path else None
+    tracer = Tracer()
+    sampler = _start_resource_sampler(config, tracer)
+    context = {"book": book, "chapter": chapter, "file_name": input_path.name}
+    try:
+        with _run_logger(config) as logger, tracer.activate(), events.bind(**context):
+            logger.info("chapter started", tradition=tradition, **context)
+            events.emit("chapter_started", tradition=tradition)
+            cache_manager = CacheManager.from_config(config, root=cache_dir)
+            with tracing.span("prepare"):
+                prepared = prep.prepare_chapter(
+                    audio_path=input_path,
+                    text_chapter=text_chapter,
+                    tradition=tradition,
+                    chunk_size_sec=chunk_size,
+                    chunk_overlap_sec=chunk_overlap,
+                    cache_manager=cache_manager,
+                    normalize=False,  # nothing downstream reads it; `cache warm` can still add it
+                )
+            events.emit("cache", status=prepared.cache_status)
+            try:
+                pipeline_result = pipeline.run_alignment_pipeline(
+                    text_chapter=text_chapter,
+                    audio_duration_ms=prepared.duration_ms,
+                    chunk_size_sec=chunk_size,
+                    chunk_overlap_sec=chunk_overlap,
+                    profile=tradition,
+                    mfa_runner=None,
+                    cache_manager=cache_manager,
+                    working_dir=chapter_dir,
+                    mfa_jobs=mfa_jobs,
+                )
+            except Exception as exc:
+                events.emit("chapter_failed", error=str(exc) or type(exc).__name__)
+                logger.error("chapter failed", error=str(exc) or type(exc).__name__, **context)
+                if exporter is not None:
+                    exporter.observe_failure("mfa" if isinstance(exc, MfaRunnerError) else "error")
+                    exporter.flush()
+                raise
+
+            result = _finalize_chapter(
+                text_chapter=text_chapter,
+                prepared=prepared,
+                pipeline_result=pipeline_result,
+                chapter_dir=chapter_dir,
+                coverage_threshold=coverage_threshold,
+                tracer=tracer,
+                trace=trace,
+                sampler=sampler,
+                exporter=exporter,
+                cache_stats=cache_manager.stats,
+            )
+            logger.info(
+                "chapter done",
+                exit_code=result["exit_code"],
+                cache_status=prepared.cache_status,
+                **context,
+            )
+    finally:
+        if sampler is not None:
+            sampler.stop()
+    return result
+
+
+@contextmanager
+def _run_logger(config: AppConfig) -> Iterator[StructuredLogger]:
+    """Append this run's log to `logs_dir`, as text or `HB_ALIGN_LOG_FORMAT=json`.
+
+    JSON records go through a `QueueLogSink`, so serializing and flushing them
+    happens on the sink's thread rather than the alignment thread.
+    """
+
+    with (config.logs_dir / RUN_LOG_NAME).open("a", encoding="utf-8") as handle:
+        if config.log_format == "json":
+            logger = StructuredLogger(log_format="json", sink=QueueLogSink(handle))
+        else:
+            logger = StructuredLogger(console=Console(file=handle, soft_wrap=True))
+        try:
+            yield logger
+        finally:
+            logger.close()
+
+
+def _finalize_chapter(
+    *,
+    text_chapter: wlc_loader.TextChapter,
+    prepared: prep.PreparedChapter,
+    pipeline_result: Dict[str, Any],
+    chapter_dir: Path,
+    coverage_threshold: float,
+    tracer: Tracer,
+    trace: bool = False,
+    sampler: ResourceSampler | None = None,
+    exporter: AlignmentMetricsExporter | None = None,
+    cache_stats: CacheStats | None = None,
+) -> Dict[str, object]:
+    """Coverage gate, summary.json and artifacts for an aligned chapter.
+
+    Shared with the staged batch pipeline, which runs it on a finalize thread
+    after alignment completed in a worker process.
+    """
 
     summary = dict(pipeline_result.get("summary", {}))
+    summary["cache_key"] = prepared.cache_key
     coverage_status = validators.evaluate_coverage(
         expected_words=summary.get("expected_words", text_chapter.word_count),
         aligned_words=summary.get("aligned_words", 0),
@@ -158,79 +299,105 @@ def _run_process_pipeline(
     summary["coverage_threshold"] = coverage_threshold
     summary["coverage_passed"] = coverage_status.passed
 
-    artifacts = _write_artifacts(chapter_dir, summary, pipeline_result.get("chunk_map", []))
+    writer = SummaryWriter()
+    writer.set_reference(book=text_chapter.book, chapter=text_chapter.chapter)
+    writer.set_alignment_counts(
+        aligned=int(summary.get("aligned_words", 0)),
+        expected=int(summary.get("expected_words", text_chapter.word_count)),
+    )
+    writer.set_chunk_count(len(pipeline_result.get("chunks", [])))
+    writer.set_cache_status(prepared.cache_status)
+    confidences = chunker.as_timeline(pipeline_result.get("aligned_words", [])).confidence.tolist()
+    if confidences:
+        writer.set_confidence(avg=sum(confidences) / len(confidences), minimum=min(confidences))
+    for note in prepared.notes:
+        writer.add_note(note)
+    writer.update_extra(summary)
+    if cache_stats is not None and (cache_stats.reads or cache_stats.writes):
+        writer.update_extra({"cache_io": cache_stats.to_dict()})
+
+    if sampler is not None:
+        sampler.stop()
+        writer.record_resources(sampler)
+    alignments = writers.build_alignment_table(text_chapter, pipeline_result.get("aligned_words", []))
+    artifacts = _write_artifacts(
+        chapter_dir,
+        writer,
+        pipeline_result.get("chunk_map", []),
+        alignments=alignments,
+        tracer=tracer,
+        trace=trace,
+    )
+    if exporter is not None:
+        artifacts["prometheus"] = writer.write_prometheus(exporter)
+
     exit_code = validators.determine_exit_code(coverage_status)
+    metrics = writer.metrics.to_dict()
+    events.emit(
+        "coverage",
+        coverage_pct=coverage_status.coverage_pct,
+        threshold=coverage_threshold,
+        passed=coverage_status.passed,
+    )
+    events.emit(
+        "chapter_done",
+        exit_code=exit_code,
+        aligned_words=metrics.get("aligned_words"),
+        expected_words=metrics.get("expected_words"),
+        avg_confidence=metrics.get("avg_confidence"),
+        durations_ms=metrics.get("durations_ms"),
+    )
+    return {"exit_code": exit_code, "summary": metrics, "artifacts": artifacts}
 
-    return {
-        "exit_code": exit_code,
-        "summary": summary,
-        "artifacts": artifacts,
-    }
+
+def _start_resource_sampler(config: AppConfig, tracer: Tracer) -> ResourceSampler | None:
+    interval_ms = config.resource_sample_interval_ms
+    if interval_ms <= 0:
+        return None
+    run_thread = threading.get_ident()
+    return ResourceSampler(
+        interval_s=interval_ms / 1000,
+        stage_provider=lambda: tracer.current_stage(run_thread),
+    ).start()
 
 
 def _write_artifacts(
     chapter_dir: Path,
-    summary: Dict[str, object],
+    writer: SummaryWriter,
     chunk_map: List[Dict[str, Any]],
+    *,
+    alignments: writers.AlignmentTable,
+    tracer: Tracer,
+    trace: bool = False,
 ) -> Dict[str, Path]:
-    summary_path = chapter_dir / "summary.json"
-    summary_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    with tracing.span("artifact_writing"):
+        alignment_paths = writers.write_alignment_outputs(alignments, chapter_dir)
+
+        chunk_map_path = chapter_dir / "chunk-map.json"
+        chunk_map_path.write_text(json.dumps(chunk_map, indent=2, ensure_ascii=False), encoding="utf-8")
 
-    chunk_map_path = chapter_dir / "chunk-map.json"
-    chunk_map_path.write_text(json.dumps(chunk_map, indent=2, ensure_ascii=False), encoding="utf-8")
+        log_path = chapter_dir / "log.txt"
+        log_path.write_text("Alignment pipeline execution log placeholder\n", encoding="utf-8")
 
-    log_path = chapter_dir / "log.txt"
-    log_path.write_text("Alignment pipeline execution log placeholder\n", encoding="utf-8")
+    writer.record_spans(tracer)
+    summary_path = writer.write(chapter_dir / "summary.json")
 
-    return {
+    artifacts = {
+        **alignment_paths,
         "summary_json": summary_path,
         "chunk_map": chunk_map_path,
         "log_path": log_path,
     }
-
-
-def _resolve_reference(input_path: Path, book: Optional[str], chapter: Optional[int]) -> Tuple[str, int]:
-    inferred_book, inferred_chapter = _infer_reference_from_filename(input_path)
-    resolved_book = book or inferred_book
-    resolved_chapter = chapter or inferred_chapter
-    if not resolved_book or resolved_chapter is None:
-        raise ValueError(
-            "Unable to determine book/chapter. Use --book/--chapter or follow <book>-<chapter>.mp3 naming."
+    if trace:
+        artifacts["trace"] = tracer.write_chrome_trace(
+            chapter_dir / "trace.json",
+            metadata={
+                "run_id": writer.metrics.run_id,
+                "book": writer.metrics.book,
+                "chapter": writer.metrics.chapter,
+            },
         )
-    return resolved_book, resolved_chapter
-
-
-def _infer_reference_from_filename(path: Path) -> Tuple[Optional[str], Optional[int]]:
-    stem = path.stem
-    if "-" not in stem:
-        return None, None
-    book_slug, chapter_str = stem.rsplit("-", 1)
-    try:
-        chapter = int(chapter_str)
-    except ValueError:
-        return None, None
-    book = book_slug.replace("_", " ").replace("-", " ").title()
-    return book, chapter
-
-
-def _chapter_output_dir(root: Path, book: str, chapter: int) -> Path:
-    slug = book.lower().replace(" ", "-")
-    return root / slug / f"{chapter:03d}"
-
-
-def _estimate_audio_duration(input_path: Path, text_chapter: TextChapter) -> int:
-    """Fallback heuristic until real audio probing (T018/T019)."""
-
-    words = max(text_chapter.word_count, 1)
-    base_estimate = words * 500  # ≈0.5s per word
-    min_duration = 60_000  # 60 seconds safety net
-    try:
-        size_bytes = input_path.stat().st_size
-        # Assume ~32 KB per minute @128 kbps. Convert bytes to ms heuristically.
-        approx_from_size = int((size_bytes / 4096) * 1000)
-    except OSError:
-        approx_from_size = 0
-    return max(base_estimate, approx_from_size, min_duration)
+    return artifacts
 
 
 def _echo_summary(summary: Dict[str, object], exit_code: int) -> None:
@@ -1,23 +1,249 @@
-"""Stub `hb-align review` command wiring."""
+"""`hb-align review` command (T023, contracts/review.md)."""
 
 from __future__ import annotations
 
+import os
+import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import NoReturn, Optional
 
+import pandas as pd
 import typer
 
-_NOT_IMPLEMENTED_MSG = (
-    "`hb-align review` will arrive with User Story 2 (tasks T021–T026)."
+from hb_align.review.aggregator import (
+    GROUP_LEVELS,
+    MAX_THRESHOLD,
+    MIN_THRESHOLD,
+    AlignmentSchemaError,
+    ReviewResult,
+    load_alignments,
+    review_alignments,
+)
+from hb_align.review.exporters import (
+    FORMATS,
+    ReportStream,
+    log_review,
+    report_metadata,
+    write_report,
+)
+from hb_align.review.streaming import (
+    DEFAULT_TOP_K,
+    TreeReview,
+    discover_alignment_files,
+    review_tree,
 )
 
 
 def register(app: typer.Typer) -> None:
     @app.command("review")
-    def review_command(  # pragma: no cover - stub command
-        input_path: Path = typer.Argument(..., help="Alignment CSV/JSON to inspect."),
-        threshold: float = typer.Option(0.9, "--threshold", min=0.5, max=0.99),
-        output: Optional[Path] = typer.Option(None, "--output", help="Optional export path."),
+    def review_command(
+        input_spec: str = typer.Option(
+            ..., "--input", help="Alignment CSV/JSON to inspect, or a directory/glob of chapter outputs."
+        ),
+        threshold: float = typer.Option(0.9, "--threshold", help="Confidence threshold (0.5–0.99)."),
+        fmt: str = typer.Option("csv", "--format", help="Report format: csv, json, md or stdout."),
+        group_by: str = typer.Option("word", "--group-by", help="Aggregation level: word, verse or chapter."),
+        limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Maximum rows to emit."),
+        output: Optional[Path] = typer.Option(None, "--output", help="Report path (default: stdout)."),
+        notes: Optional[str] = typer.Option(None, "--notes", help="Note added to the report metadata."),
+        workers: Optional[int] = typer.Option(
+            None, "--workers", min=1, help="Chapter readers for a directory/glob (default: min(4, CPUs))."
+        ),
+        top_k: int = typer.Option(
+            DEFAULT_TOP_K, "--top", min=1, help="Worst verses and lowest words listed for a directory/glob."
+        ),
     ) -> None:
-        typer.secho(_NOT_IMPLEMENTED_MSG, fg=typer.colors.YELLOW)
-        raise typer.Exit(code=1)
+        """Summarize low-confidence words in an alignment export."""
+
+        if not MIN_THRESHOLD <= threshold <= MAX_THRESHOLD:
+            _fail(f"INVALID_THRESHOLD: --threshold must be between {MIN_THRESHOLD} and {MAX_THRESHOLD}")
+        if fmt not in FORMATS:
+            raise typer.BadParameter(f"expected one of {', '.join(FORMATS)}", param_hint="--format")
+        if group_by not in GROUP_LEVELS:
+            raise typer.BadParameter(f"expected one of {', '.join(GROUP_LEVELS)}", param_hint="--group-by")
+
+        input_path = Path(input_spec)
+        if not input_path.is_file():
+            _review_tree(
+                input_spec,
+                threshold=threshold,
+                fmt=fmt,
+                group_by=group_by,
+                limit=limit,
+                output=output,
+                notes=notes,
+                workers=workers or min(4, os.cpu_count() or 1),
+                top_k=top_k,
+            )
+
+        started = time.perf_counter()
+        try:
+            frame = load_alignments(input_path)
+        except FileNotFoundError as exc:
+            _fail(f"REVIEW_INPUT_NOT_FOUND: {exc}")
+        except AlignmentSchemaError as exc:
+            _fail(f"INVALID_ALIGNMENT_SCHEMA: {exc}")
+        result = review_alignments(frame, threshold=threshold, group_by=group_by, limit=limit)
+
+        # With the report on stdout, keep stdout parseable and print stats to stderr.
+        to_stderr = output is None and fmt != "stdout"
+        if result.flagged:
+            metadata = report_metadata(str(input_path), threshold, notes=notes)
+            if fmt == "stdout":
+                _print_table(result.findings)
+            else:
+                if output is not None:
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                    target = output.open("w", encoding="utf-8", newline="")
+                else:
+                    target = nullcontext(sys.stdout)
+                with target as stream:
+                    write_report(result, fmt, stream, metadata=metadata)
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        _echo_stats(result, err=to_stderr)
+        summary_path = log_review(
+            input_path,
+            threshold=threshold,
+            flagged=result.flagged,
+            total_words=result.total_words,
+            duration_ms=duration_ms,
+        )
+        typer.secho(f"Review completed in {duration_ms:g} ms", err=to_stderr)
+        if summary_path is not None:
+            typer.secho(f"Duration logged: {summary_path}", err=to_stderr)
+        if output is not None and result.flagged:
+            typer.secho(f"Report saved: {output}", err=to_stderr)
+        raise typer.Exit(code=0 if result.flagged else 4)
+
+
+def _fail(message: str) -> NoReturn:
+    typer.secho(message, fg=typer.colors.RED, err=True)
+    raise typer.Exit(code=3)
+
+
+def _echo_stats(result: ReviewResult, *, err: bool) -> None:
+    color = typer.colors.YELLOW if result.flagged else typer.colors.GREEN
+    typer.secho(
+        f"Low-confidence words (<{result.threshold:g}): {result.flagged} of {result.total_words}",
+        fg=color,
+        err=err,
+    )
+    if result.min_confidence is not None:
+        typer.secho(
+            f"Confidence: min {result.min_confidence:.2f}, avg {result.avg_confidence:.2f}", err=err
+        )
+    scope = "chapter" if result.group_by == "chapter" else "verse"
+    worst = result.worst_scope()
+    if worst is not None:
+        typer.secho(f"Worst {scope}: {worst['scope_id']} (avg {worst['avg_confidence']:.2f})", err=err)
+    needs_review = result.profiles[result.profiles["flagged"] > 0]
+    if not needs_review.empty:
+        top = needs_review.nlargest(5, "flagged")
+        distribution = ", ".join(f"{row.scope_id}: {row.flagged}" for row in top.itertuples(index=False))
+        typer.secho(f"Flagged by {scope}: {distribution}", err=err)
+
+
+def _print_table(findings: pd.DataFrame, *, title: Optional[str] = None) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title=title)
+    for column in ("verse", "word", "idx", "start_ms", "end_ms", "confidence", "reason"):
+        table.add_column(column)
+    for row in findings.itertuples(index=False):
+        style = "red" if row.reason == "missing_timestamp" else "yellow"
+        table.add_row(
+            f"{row.book} {row.verse}",
+            str(row.word_text),
+            str(row.word_index),
+            "" if pd.isna(row.start_ms) else str(int(row.start_ms)),
+            "" if pd.isna(row.end_ms) else str(int(row.end_ms)),
+            "" if pd.isna(row.confidence) else f"{row.confidence:.2f}",
+            str(row.reason),
+            style=style,
+        )
+    Console().print(table)
+
+
+def _review_tree(
+    spec: str,
+    *,
+    threshold: float,
+    fmt: str,
+    group_by: str,
+    limit: Optional[int],
+    output: Optional[Path],
+    notes: Optional[str],
+    workers: int,
+    top_k: int,
+) -> NoReturn:
+    """Directory/glob input: stream chapter findings into the report as they are reviewed."""
+
+    paths = discover_alignment_files(spec)
+    if not paths:
+        _fail(f"REVIEW_INPUT_NOT_FOUND: no alignment exports under {spec}")
+    started = time.perf_counter()
+    tree = TreeReview(threshold=threshold, group_by=group_by, top_k=top_k)
+    to_stderr = output is None and fmt != "stdout"
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+    target = output.open("w", encoding="utf-8", newline="") if output is not None else nullcontext(sys.stdout)
+    with target as stream:
+        report = None
+        remaining = limit  # the table rows still allowed by --limit (stdout only)
+        if fmt != "stdout":
+            metadata = report_metadata(spec, threshold, notes=notes)
+            report = ReportStream(fmt, stream, metadata=metadata, limit=limit)
+        chapters = review_tree(paths, threshold=threshold, group_by=group_by, workers=workers, top_k=top_k)
+        for chapter in chapters:
+            tree.add(chapter)
+            if chapter.error is not None:
+                typer.secho(f"Skipping {chapter.source}: {chapter.error}", fg=typer.colors.YELLOW, err=True)
+                continue
+            if report is not None:
+                report.add(chapter.findings, title=chapter.source)
+            elif chapter.flagged and remaining != 0:
+                findings = chapter.findings if remaining is None else chapter.findings.head(remaining)
+                _print_table(findings, title=chapter.source)
+                if remaining is not None:
+                    remaining -= len(findings)
+            typer.secho(
+                f"{chapter.source}: {chapter.flagged}/{chapter.total_words} flagged", err=to_stderr
+            )
+        summary = tree.summary()
+        if report is not None:
+            report.finish(summary)
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    typer.secho(
+        f"Low-confidence words (<{threshold:g}): {tree.flagged} of {tree.total_words} "
+        f"in {tree.chapters} chapters",
+        fg=typer.colors.YELLOW if tree.flagged else typer.colors.GREEN,
+        err=to_stderr,
+    )
+    if tree.min_confidence is not None:
+        typer.secho(f"Confidence: min {tree.min_confidence:.2f}, avg {tree.avg_confidence:.2f}", err=to_stderr)
+    scope = "chapters" if group_by == "chapter" else "verses"
+    if summary["worst"]:
+        worst = ", ".join(
+            f"{item['scope_id']} (avg {item['avg_confidence']:.2f})" for item in summary["worst"]
+        )
+        typer.secho(f"Worst {scope}: {worst}", err=to_stderr)
+    if summary["lowest_words"]:
+        lowest = ", ".join(
+            f"{word['book']} {word['verse']} #{word['word_index']} ({word['confidence']:.2f})"
+            for word in summary["lowest_words"]
+        )
+        typer.secho(f"Lowest words: {lowest}", err=to_stderr)
+    typer.secho(f"Review completed in {duration_ms:g} ms", err=to_stderr)
+    if output is not None and tree.flagged:
+        typer.secho(f"Report saved: {output}", err=to_stderr)
+    if not tree.chapters:
+        _fail("INVALID_ALIGNMENT_SCHEMA: no readable alignment exports")
+    raise typer.Exit(code=0 if tree.flagged else 4)
+
+
+__all__ = ["register"]
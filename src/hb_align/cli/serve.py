@@ -0,0 +1,58 @@
+"""`hb-align serve` command: a warm query server over alignment outputs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from hb_align.index.server import DEFAULT_CACHE_SIZE, DEFAULT_PORT, serve
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("serve")
+    def serve_command(
+        root: Path = typer.Option(
+            ...,
+            "--root",
+            exists=True,
+            file_okay=False,
+            help="Output directory holding <book>/<chapter>/ results.",
+        ),
+        host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on."),
+        port: int = typer.Option(DEFAULT_PORT, "--port", help="TCP port (0 picks a free one)."),
+        socket_path: Optional[Path] = typer.Option(
+            None, "--socket", help="Listen on this unix socket instead of TCP."
+        ),
+        cache_size: int = typer.Option(
+            DEFAULT_CACHE_SIZE, "--cache-size", min=1, help="Chapter indexes kept open (LRU)."
+        ),
+    ) -> None:
+        """Answer verse/timestamp queries over HTTP from one warm process."""
+
+        def ready(address: str) -> None:
+            typer.secho(f"Serving {root} on {address} (Ctrl-C to stop)", err=True)
+
+        try:
+            stats = serve(
+                root,
+                host=host,
+                port=port,
+                socket_path=socket_path,
+                cache_size=cache_size,
+                on_ready=ready,
+            )
+        except OSError as exc:
+            typer.secho(f"SERVE_BIND_FAILED: {exc}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(code=3)
+
+        latency, cache = stats["latency"], stats["cache"]
+        typer.secho(
+            f"Served {latency['requests']} requests: p50 {latency['p50_ms']} ms, p99 {latency['p99_ms']} ms; "
+            f"cache hits {cache['hits']}, misses {cache['misses']}, evictions {cache['evictions']}",
+            err=True,
+        )
+
+
+__all__ = ["register"]
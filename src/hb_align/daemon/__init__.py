@@ -0,0 +1 @@
+"""Warm alignment job server and its client."""
@@ -0,0 +1,99 @@
+"""Thin client for `hb-align daemon` (standard library only, so submitting stays cheap).
+
+Requests and replies are newline-delimited JSON over the daemon's unix
+socket: the client sends one request object and reads replies until the
+daemon closes the connection. Replies with an `event` key are progress events
+(the same objects `process --json` prints); the last reply has an `op` key
+(`result`, `status`, `shutdown` or `error`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+SOCKET_ENV_VAR = "HB_ALIGN_DAEMON_SOCKET"
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+
+class DaemonError(RuntimeError):
+    """The daemon is unreachable or rejected the request."""
+
+    def __init__(self, message: str, code: str = "DAEMON_UNAVAILABLE") -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def default_socket_path() -> Path:
+    """`$HB_ALIGN_DAEMON_SOCKET`, else `~/.hb-align/daemon.sock`."""
+
+    value = os.environ.get(SOCKET_ENV_VAR)
+    return Path(value) if value else Path.home() / ".hb-align" / "daemon.sock"
+
+
+def request(
+    socket_path: Path, payload: Mapping[str, Any], *, on_event: Optional[EventCallback] = None
+) -> Dict[str, Any]:
+    """Send one request and return the final reply; earlier events go to *on_event*.
+
+    Raises `DaemonError` when the daemon cannot be reached, hangs up without
+    a reply, or answers with an `error` reply.
+    """
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError as exc:
+        sock.close()
+        raise DaemonError(f"No daemon listening on {socket_path}: {exc}") from exc
+    final: Optional[Dict[str, Any]] = None
+    with sock, sock.makefile("rb") as replies:
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        for line in replies:
+            message = json.loads(line)
+            if "event" in message:
+                if on_event is not None:
+                    on_event(message)
+                continue
+            final = message
+            break  # the final reply; don't wait for the daemon to hang up
+    if final is None:
+        raise DaemonError(f"Daemon at {socket_path} closed the connection without a reply")
+    if final.get("op") == "error":
+        raise DaemonError(
+            final.get("message", "request failed"), code=final.get("code", "DAEMON_ERROR")
+        )
+    return final
+
+
+def submit(
+    socket_path: Path, job: Mapping[str, Any], *, on_event: Optional[EventCallback] = None
+) -> Dict[str, Any]:
+    """Run one chapter job on the daemon and return its `result` reply."""
+
+    return request(socket_path, {"op": "submit", "job": dict(job)}, on_event=on_event)
+
+
+def status(socket_path: Path) -> Dict[str, Any]:
+    return request(socket_path, {"op": "status"})
+
+
+def shutdown(socket_path: Path) -> Dict[str, Any]:
+    """Ask the daemon to stop once running jobs finish."""
+
+    return request(socket_path, {"op": "shutdown"})
+
+
+__all__ = [
+    "SOCKET_ENV_VAR",
+    "DaemonError",
+    "default_socket_path",
+    "request",
+    "shutdown",
+    "status",
+    "submit",
+]
@@ -0,0 +1,489 @@
+"""Long-running alignment job server (`hb-align daemon start`).
+
+A one-chapter `hb-align process` run spends a good share of its wall time
+before alignment begins: interpreter start-up, CLI and pipeline imports,
+config resolution, the YAML pronunciation profiles and WLC parsing. The
+daemon pays for that once. The parent resolves the config, loads the profiles
+and imports the pipeline, then forks `workers` pool processes that inherit all
+of it and stay up between jobs. The pool is a `WorkerPool`: if a worker dies,
+only the job that killed it is answered WORKER_CRASHED, and the jobs running
+beside it are rerun on a fresh pool. Parsed chapters are kept in an LRU in the
+parent (`TextCache`) and shipped to the worker with the job; lexicons,
+normalized audio and MFA results come from the artifact cache as usual.
+
+Clients talk newline-delimited JSON over a unix socket (see
+`hb_align.daemon.client`). Workers stream each job's progress events to a
+second socket, `<socket>.events`, tagged with the job id, and the daemon
+relays them to the submitting client ahead of the job's `result` reply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import signal
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Set, Tuple
+
+from hb_align.batch.pool import WorkerPool
+from hb_align.batch.runner import init_worker, mfa_jobs_for
+from hb_align.daemon.client import DaemonError, status
+from hb_align.index.server import LatencyStats
+from hb_align.text import transliterator, wlc_loader
+from hb_align.text.references import resolve_reference
+from hb_align.utils import events, load_config
+
+DEFAULT_WORKERS = 2
+DEFAULT_TEXT_CACHE_SIZE = 256
+EVENTS_SUFFIX = ".events"
+# How long a finished job waits for its worker's event stream to drain.
+EVENT_DRAIN_TIMEOUT_S = 2.0
+
+JOB_DEFAULTS: Mapping[str, Any] = {
+    "tradition": "modern",
+    "chunk_size": 50,
+    "chunk_overlap": 5,
+    "coverage_threshold": 95.0,
+    "cache_dir": None,
+}
+# Accepted job fields and their JSON types; any of them may be null.
+JOB_FIELDS: Mapping[str, Tuple[type, ...]] = {
+    "input_path": (str,),
+    "output_dir": (str,),
+    "book": (str,),
+    "chapter": (int,),
+    "tradition": (str,),
+    "chunk_size": (int,),
+    "chunk_overlap": (int,),
+    "coverage_threshold": (int, float),
+    "cache_dir": (str,),
+}
+
+
+class JobRejected(Exception):
+    """A submit request the daemon refuses before running it."""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class TextCache:
+    """LRU of parsed WLC chapters keyed by (book, chapter).
+
+    `get` runs on the event loop's default executor, so lookups are locked.
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_TEXT_CACHE_SIZE, *, root: Optional[Path] = None
+    ) -> None:
+        self.capacity = capacity
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int], wlc_loader.TextChapter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, book: str, chapter: int) -> wlc_loader.TextChapter:
+        key = (book, chapter)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+            self.misses += 1
+            entry = self._entries[key] = wlc_loader.load_chapter(book, chapter, root=self.root)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            return entry
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@dataclass
+class _Job:
+    job_id: str
+    queue: "asyncio.Queue[bytes]"
+    events_done: asyncio.Event
+
+
+def run_job(
+    job: Mapping[str, Any], text_chapter: wlc_loader.TextChapter, events_destination: str
+) -> Dict[str, Any]:
+    """Pool worker: run the `process` pipeline for one chapter; never raises."""
+
+    from hb_align.aligner.mfa_runner import MfaRunnerError
+    from hb_align.cli import process as process_cli
+
+    started = time.perf_counter()
+    stream = events.EventStream(events_destination)
+    with stream.activate(), events.bind(job_id=job["job_id"]):
+        events.emit("job_started", book=job["book"], chapter=job["chapter"])
+        try:
+            result = process_cli._run_process_pipeline(
+                input_path=Path(job["input_path"]),
+                book=job["book"],
+                chapter=job["chapter"],
+                tradition=job["tradition"],
+                output_dir=Path(job["output_dir"]),
+                chunk_size=job["chunk_size"],
+                chunk_overlap=job["chunk_overlap"],
+                coverage_threshold=job["coverage_threshold"],
+                dry_run=False,
+                cache_dir=Path(job["cache_dir"]) if job["cache_dir"] else None,
+                export_metrics=False,
+                mfa_jobs=job["mfa_jobs"],
+                text_chapter=text_chapter,
+            )
+        except Exception as exc:  # noqa: BLE001 - reported to the client as the job result
+            return {
+                "exit_code": 3,
+                "error_code": "MFA_FAILED" if isinstance(exc, MfaRunnerError) else "PROCESS_ERROR",
+                "error": str(exc) or type(exc).__name__,
+                "runtime_ms": round((time.perf_counter() - started) * 1000),
+            }
+    return {
+        "exit_code": int(result.get("exit_code", 0)),
+        "summary": dict(result.get("summary") or {}),
+        "artifacts": {name: str(path) for name, path in (result.get("artifacts") or {}).items()},
+        "runtime_ms": round((time.perf_counter() - started) * 1000),
+    }
+
+
+def _init_daemon_worker(daemon_fds: Set[int], *initargs: Any) -> None:
+    """Pool initializer: close the daemon's sockets, then set up as a batch worker.
+
+    A replacement pool is forked while clients are connected, and a worker
+    holding a copy of a listener or client socket would keep it open after
+    the daemon closed it. *daemon_fds* is `JobServer`'s set of those fds as
+    it was at the fork.
+    """
+
+    for fd in daemon_fds:
+        with suppress(OSError):
+            os.close(fd)
+    init_worker(*initargs)
+
+
+def _warm_worker() -> int:
+    return 0
+
+
+class JobServer:
+    """Accepts chapter jobs on a unix socket and runs them on a warm process pool."""
+
+    def __init__(
+        self,
+        socket_path: Path,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        text_cache_size: int = DEFAULT_TEXT_CACHE_SIZE,
+    ) -> None:
+        self.socket_path = socket_path
+        self.events_path = socket_path.with_name(socket_path.name + EVENTS_SUFFIX)
+        self.workers = workers
+        self.config = load_config()
+        self.texts = TextCache(text_cache_size, root=self.config.wlc_root)
+        self.latency = LatencyStats()
+        self.running = 0
+        self.failed = 0
+        self.stop = asyncio.Event()
+        self._started = time.monotonic()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[str, _Job] = {}
+        self._pool: Optional[WorkerPool] = None
+        # Listener and connection fds that forked workers close (`_init_daemon_worker`).
+        self._socket_fds: Set[int] = set()
+
+    def _warm_up(self) -> WorkerPool:
+        # Everything loaded here is inherited by the forked workers.
+        from hb_align.cli import process  # noqa: F401 - imports the aligner pipeline
+
+        transliterator.load_pronunciation_profiles()
+        pool = WorkerPool(
+            self.workers,
+            initializer=_init_daemon_worker,
+            initargs=(self._socket_fds, self.config.to_snapshot(), None),
+        )
+        # The pool forks lazily; start every worker now rather than on the first jobs.
+        for future in [pool.submit(_warm_worker) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def _track(self, writer: asyncio.StreamWriter) -> int:
+        fd = writer.get_extra_info("socket").fileno()
+        self._socket_fds.add(fd)
+        return fd
+
+    def _untrack_listener(self, listener: asyncio.AbstractServer) -> None:
+        self._socket_fds.difference_update(sock.fileno() for sock in listener.sockets)
+
+    async def start(self) -> Tuple[asyncio.AbstractServer, asyncio.AbstractServer]:
+        _remove_stale_socket(self.socket_path)
+        _remove_stale_socket(self.events_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Forking and waiting for the workers blocks; keep it off the event loop.
+        self._pool = await asyncio.get_running_loop().run_in_executor(None, self._warm_up)
+        events_server = await asyncio.start_unix_server(
+            self._handle_events, path=str(self.events_path)
+        )
+        server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        for listener in (server, events_server):
+            self._socket_fds.update(sock.fileno() for sock in listener.sockets)
+        return server, events_server
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.socket_path.unlink(missing_ok=True)
+        self.events_path.unlink(missing_ok=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "uptime_s": round(time.monotonic() - self._started, 1),
+            "jobs": {
+                "completed": self.latency.count,
+                "failed": self.failed,
+                "running": self.running,
+            },
+            "runtime": self.latency.snapshot(),
+            "text_cache": self.texts.snapshot(),
+        }
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        fd = self._track(writer)
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                op = request["op"]
+            except (ValueError, KeyError, TypeError):
+                await _send(writer, _error("BAD_REQUEST", "Expected one JSON object with an 'op'"))
+                return
+            if op == "submit":
+                await self._submit(request.get("job") or {}, writer)
+            elif op == "status":
+                await _send(writer, {"op": "status", **self.snapshot()})
+            elif op == "shutdown":
+                await _send(writer, {"op": "shutdown", **self.snapshot()})
+                self.stop.set()
+            else:
+                await _send(writer, _error("BAD_REQUEST", f"Unknown op {op!r}"))
+        except ConnectionError:
+            pass
+        finally:
+            self._socket_fds.discard(fd)  # before the fd number can be reused
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _submit(self, request: Mapping[str, Any], writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            job = self._job_spec(request)
+            text_chapter = await loop.run_in_executor(
+                None, self.texts.get, job["book"], job["chapter"]
+            )
+        except JobRejected as exc:
+            await _send(writer, _error(exc.code, exc.message))
+            return
+        except (FileNotFoundError, ValueError) as exc:
+            await _send(writer, _error("TEXT_NOT_FOUND", str(exc)))
+            return
+
+        state = _Job(job["job_id"], asyncio.Queue(), asyncio.Event())
+        self._jobs[state.job_id] = state
+        self.running += 1
+        relay = asyncio.ensure_future(_relay(state, writer))
+        try:
+            await _send(
+                writer, {"event": "job_accepted", "job_id": state.job_id, "running": self.running}
+            )
+            assert self._pool is not None
+            try:
+                result = await asyncio.wrap_future(
+                    self._pool.submit(
+                        run_job, job, text_chapter, f"{events.SOCKET_PREFIX}{self.events_path}"
+                    )
+                )
+            except Exception as exc:  # noqa: BLE001 - reported to the client as the job result
+                crashed = isinstance(exc, BrokenProcessPool)
+                result = {
+                    "exit_code": 3,
+                    "error_code": "WORKER_CRASHED" if crashed else "PROCESS_ERROR",
+                    "error": str(exc) or type(exc).__name__,
+                }
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(state.events_done.wait(), EVENT_DRAIN_TIMEOUT_S)
+        finally:
+            relay.cancel()
+            with suppress(asyncio.CancelledError):
+                await relay
+            self.running -= 1
+            del self._jobs[state.job_id]
+        if result["exit_code"] == 3:
+            self.failed += 1
+        else:
+            self.latency.record(result["runtime_ms"])
+        with suppress(ConnectionError):
+            while not state.queue.empty():
+                writer.write(state.queue.get_nowait())
+            await _send(writer, {"op": "result", "job_id": state.job_id, **result})
+
+    def _job_spec(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, Mapping):
+            raise JobRejected("BAD_REQUEST", "'job' must be an object")
+        unknown = sorted(set(request) - set(JOB_FIELDS))
+        if unknown:
+            raise JobRejected("BAD_REQUEST", f"Unknown job fields: {', '.join(unknown)}")
+        for key, value in request.items():
+            # bool is an int subclass; `"chunk_size": true` is still a bad request.
+            if value is not None and (
+                isinstance(value, bool) or not isinstance(value, JOB_FIELDS[key])
+            ):
+                raise JobRejected("BAD_REQUEST", f"Invalid {key!r}: {value!r}")
+        if not request.get("input_path") or not request.get("output_dir"):
+            raise JobRejected("BAD_REQUEST", "A job needs 'input_path' and 'output_dir'")
+        input_path = Path(request["input_path"])
+        if not input_path.exists():
+            raise JobRejected("INPUT_NOT_FOUND", f"Input audio file not found: {input_path}")
+        try:
+            book, chapter = resolve_reference(
+                input_path, request.get("book"), request.get("chapter")
+            )
+        except ValueError as exc:
+            raise JobRejected("BAD_REQUEST", str(exc))
+        job = {
+            **JOB_DEFAULTS,
+            **{key: value for key, value in request.items() if value is not None},
+        }
+        if job["chunk_size"] < 1 or job["chunk_overlap"] < 0:
+            raise JobRejected(
+                "BAD_REQUEST", "chunk_size must be positive, chunk_overlap not negative"
+            )
+        if job["chunk_overlap"] >= job["chunk_size"]:
+            raise JobRejected("BAD_REQUEST", "chunk_overlap must be smaller than chunk_size")
+        job["coverage_threshold"] = float(job["coverage_threshold"])
+        job.update(
+            job_id=f"job-{next(self._ids):06d}",
+            input_path=str(input_path),
+            book=book,
+            chapter=chapter,
+            mfa_jobs=mfa_jobs_for(self.workers),
+        )
+        return job
+
+    async def _handle_events(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """One connection per job: route its event lines to the submitting client."""
+
+        state: Optional[_Job] = None
+        fd = self._track(writer)
+        try:
+            async for line in reader:
+                if state is None:
+                    with suppress(ValueError):
+                        state = self._jobs.get(json.loads(line).get("job_id"))
+                    if state is None:
+                        continue
+                state.queue.put_nowait(line)
+        except ConnectionError:
+            pass
+        finally:
+            if state is not None:
+                state.events_done.set()
+            self._socket_fds.discard(fd)
+            writer.close()
+
+
+async def _relay(state: _Job, writer: asyncio.StreamWriter) -> None:
+    with suppress(ConnectionError):
+        while True:
+            writer.write(await state.queue.get())
+            await writer.drain()
+
+
+async def _send(writer: asyncio.StreamWriter, message: Mapping[str, Any]) -> None:
+    writer.write(json.dumps(message, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+    await writer.drain()
+
+
+def _error(code: str, message: str) -> Dict[str, Any]:
+    return {"op": "error", "code": code, "message": message}
+
+
+def _remove_stale_socket(path: Path) -> None:
+    with suppress(FileNotFoundError):
+        if not stat.S_ISSOCK(path.stat().st_mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        if not path.name.endswith(EVENTS_SUFFIX):
+            with suppress(DaemonError):
+                status(path)
+                raise FileExistsError(f"A daemon is already listening on {path}")
+        path.unlink()  # left behind by a daemon that did not shut down
+
+
+def run_daemon(
+    socket_path: Path,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    text_cache_size: int = DEFAULT_TEXT_CACHE_SIZE,
+    on_ready: Optional[Callable[[JobServer], None]] = None,
+) -> Dict[str, Any]:
+    """Serve jobs until SIGINT/SIGTERM or a `shutdown` request; returns the final status."""
+
+    async def main() -> JobServer:
+        server = JobServer(socket_path, workers=workers, text_cache_size=text_cache_size)
+        try:
+            listener, events_listener = await server.start()
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                with suppress(NotImplementedError, RuntimeError):
+                    loop.add_signal_handler(signum, server.stop.set)
+            if on_ready is not None:
+                on_ready(server)
+            async with listener, events_listener:
+                await server.stop.wait()
+                server._untrack_listener(listener)
+                listener.close()
+                # Let jobs already submitted finish and answer their clients.
+                while server.running:
+                    await asyncio.sleep(0.05)
+        finally:
+            server.close()
+        return server
+
+    return asyncio.run(main()).snapshot()
+
+
+__all__ = [
+    "DEFAULT_TEXT_CACHE_SIZE",
+    "DEFAULT_WORKERS",
+    "JobRejected",
+    "JobServer",
+    "TextCache",
+    "run_daemon",
+    "run_job",
+]
@@ -0,0 +1 @@
+"""Verse/time lookup indexes over alignment outputs."""
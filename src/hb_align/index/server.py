@@ -0,0 +1,376 @@
+"""Local query server over alignment indexes (`hb-align serve`).
+
+One asyncio process answers verse/timestamp and low-confidence queries for
+every chapter under an output root. Chapter indexes are opened on first use
+(memory-mapping `alignments.hbcol` when it is fresh) and kept in an LRU of
+`cache_size` entries; an entry is reopened when its exports change on disk.
+Loads run in the default thread pool, so a cold chapter does not stall
+requests for warm ones, and concurrent requests for the same cold chapter
+share one load.
+
+The protocol is HTTP/1.1 `GET` with query parameters and JSON responses,
+over TCP or a unix socket (times in seconds, or `ms=` for `/at`):
+
+    /at?book=Genesis&chapter=1&t=93.4
+    /verse?book=Genesis&ref=1:27
+    /range?book=Genesis&chapter=1&from=10&to=20
+    /low-confidence?book=Genesis&chapter=1&threshold=0.9&limit=50
+    /stats
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import signal
+import stat
+import time
+from collections import OrderedDict, deque
+from contextlib import suppress
+from dataclasses import asdict
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from hb_align.aligner.writers import ColumnarFormatError
+from hb_align.index.timeline import INDEX_SOURCES, ChapterIndex, parse_reference
+from hb_align.text.references import chapter_output_dir
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 64
+LATENCY_WINDOW = 10_000
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+class QueryError(Exception):
+    """A request the server answers with an HTTP error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class LatencyStats:
+    """Request latencies over the last `window` requests."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.count = 0
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, duration_ms: float) -> None:
+        self.count += 1
+        self._samples.append(duration_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (0 < q <= 100) of the window, in ms."""
+
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))
+        return round(ordered[rank], 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.count,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(max(self._samples), 3) if self._samples else None,
+        }
+
+
+class IndexCache:
+    """LRU of open chapter indexes under an output root."""
+
+    def __init__(self, root: Path, capacity: int = DEFAULT_CACHE_SIZE) -> None:
+        self.root = root
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Path, Tuple[Signature, ChapterIndex]]" = OrderedDict()
+        self._loading: Dict[Path, "asyncio.Future[ChapterIndex]"] = {}
+        self._resolved_root = root.resolve()
+
+    async def get(self, book: str, chapter: int) -> ChapterIndex:
+        directory = chapter_output_dir(self.root, book, chapter)
+        if not directory.resolve().is_relative_to(self._resolved_root):
+            raise QueryError(400, f"Invalid book: {book!r}")
+        signature = _signature(directory)
+        if not signature:
+            raise FileNotFoundError(f"No alignment exports for {book} {chapter}")
+        entry = self._entries.get(directory)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            self._entries.move_to_end(directory)
+            return entry[1]
+        self.misses += 1
+        pending = self._loading.get(directory)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = self._loading[directory] = loop.run_in_executor(
+                None, ChapterIndex.load, directory
+            )
+            try:
+                index = await pending
+            finally:
+                del self._loading[directory]
+            self._entries[directory] = (signature, index)
+            self._entries.move_to_end(directory)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return index
+        return await pending
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class QueryServer:
+    """Routes query strings to cached chapter indexes and records request latency."""
+
+    def __init__(self, root: Path, *, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.cache = IndexCache(root, cache_size)
+        self.latency = LatencyStats()
+        self._routes: Dict[str, Callable[[Mapping[str, str]], Awaitable[Dict[str, Any]]]] = {
+            "/at": self._at,
+            "/verse": self._verse,
+            "/range": self._range,
+            "/low-confidence": self._low_confidence,
+        }
+
+    async def query(self, target: str) -> Tuple[int, Dict[str, Any]]:
+        """Answer one request target (`/at?book=...`); returns status and JSON payload."""
+
+        started = time.perf_counter()
+        url = urlsplit(target)
+        route = url.path.rstrip("/") or "/"
+        if route == "/stats":
+            return 200, self.snapshot()
+        try:
+            handler = self._routes.get(route)
+            if handler is None:
+                raise QueryError(404, f"Unknown endpoint {route}")
+            status, payload = 200, await handler(dict(parse_qsl(url.query)))
+        except QueryError as exc:
+            status, payload = exc.status, {"error": exc.message}
+        except (FileNotFoundError, KeyError) as exc:
+            status, payload = 404, {"error": str(exc.args[0] if exc.args else exc)}
+        except ColumnarFormatError as exc:
+            status, payload = 500, {"error": str(exc)}
+        self.latency.record((time.perf_counter() - started) * 1000)
+        return status, payload
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"latency": self.latency.snapshot(), "cache": self.cache.snapshot()}
+
+    async def _at(self, params: Mapping[str, str]) -> Dict[str, Any]:
+        index = await self.cache.get(_required(params, "book"), _number(params, "chapter", int))
+        if "ms" in params:
+            ms = _number(params, "ms", int)
+        else:
+            ms = _milliseconds(params, "t")
+        word = index.word_at(ms)
+        span = index.verse_at(ms)
+        return {
+            "book": index.book,
+            "chapter": index.chapter,
+            "at_ms": ms,
+            "word": None if word is None else asdict(word),
+            "verse": None if span is None else asdict(span),
+        }
+
+    async def _verse(self, params: Mapping[str, str]) -> Dict[str, Any]:
+        try:
+            book, chapter, verse = parse_reference(_required(params, "ref"))
+        except KeyError as exc:
+            raise QueryError(400, exc.args[0])
+        book = params.get("book") or book
+        if not book:
+            raise QueryError(400, "Missing parameter: book")
+        index = await self.cache.get(book, chapter)
+        return {"verse": asdict(index.verse(verse))}
+
+    async def _range(self, params: Mapping[str, str]) -> Dict[str, Any]:
+        index = await self.cache.get(_required(params, "book"), _number(params, "chapter", int))
+        start_ms = _milliseconds(params, "from")
+        end_ms = _milliseconds(params, "to")
+        words = index.words_between(start_ms, end_ms)
+        return {
+            "book": index.book,
+            "chapter": index.chapter,
+            "words": [asdict(word) for word in words],
+        }
+
+    async def _low_confidence(self, params: Mapping[str, str]) -> Dict[str, Any]:
+        index = await self.cache.get(_required(params, "book"), _number(params, "chapter", int))
+        threshold = _number(params, "threshold", float) if "threshold" in params else 0.9
+        limit = _number(params, "limit", int) if "limit" in params else None
+        if limit is not None and limit < 0:
+            raise QueryError(400, f"Invalid limit: {limit}")
+        words = index.low_confidence(threshold, limit=limit)
+        return {
+            "book": index.book,
+            "chapter": index.chapter,
+            "threshold": threshold,
+            "words": [asdict(word) for word in words],
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    status, payload, keep_alive = 400, {"error": "Malformed request line"}, False
+                else:
+                    method, target, version = parts
+                    default = "close" if version == "HTTP/1.0" else "keep-alive"
+                    keep_alive = headers.get("connection", default).lower() != "close"
+                    if method == "GET":
+                        try:
+                            status, payload = await self.query(target)
+                        except Exception as exc:  # noqa: BLE001 - answer 500 rather than drop the connection
+                            status, payload = 500, {"error": f"Internal error: {type(exc).__name__}"}
+                    else:
+                        status, payload = 405, {"error": f"{method} not allowed"}
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode(
+                        "latin-1"
+                    )
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def start(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        socket_path: Optional[Path] = None,
+    ) -> asyncio.AbstractServer:
+        if socket_path is not None:
+            with suppress(FileNotFoundError):
+                if stat.S_ISSOCK(socket_path.stat().st_mode):
+                    socket_path.unlink()  # left behind by a server that did not shut down
+            return await asyncio.start_unix_server(self.handle, path=str(socket_path))
+        return await asyncio.start_server(self.handle, host, port)
+
+
+def serve(
+    root: Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[Path] = None,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    on_ready: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Run a `QueryServer` until SIGINT/SIGTERM; returns its final `/stats` snapshot."""
+
+    server = QueryServer(root, cache_size=cache_size)
+
+    async def main() -> None:
+        listener = await server.start(host=host, port=port, socket_path=socket_path)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            with suppress(NotImplementedError, RuntimeError):
+                loop.add_signal_handler(signum, stop.set)
+        if on_ready is not None:
+            if socket_path is not None:
+                on_ready(f"unix:{socket_path}")
+            else:
+                bound = listener.sockets[0].getsockname()
+                on_ready(f"http://{bound[0]}:{bound[1]}")
+        async with listener:
+            await stop.wait()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(main())
+    return server.snapshot()
+
+
+def _signature(directory: Path) -> Signature:
+    signature = []
+    for name in INDEX_SOURCES:
+        try:
+            info = (directory / name).stat()
+        except OSError:
+            continue
+        signature.append((name, info.st_mtime_ns, info.st_size))
+    return tuple(signature)
+
+
+def _required(params: Mapping[str, str], name: str) -> str:
+    value = params.get(name)
+    if not value:
+        raise QueryError(400, f"Missing parameter: {name}")
+    return value
+
+
+def _number(params: Mapping[str, str], name: str, kind: Callable[[str], Any]) -> Any:
+    value = _required(params, name)
+    try:
+        number = kind(value)
+    except ValueError:
+        raise QueryError(400, f"Invalid {name}: {value!r}")
+    if not math.isfinite(number):
+        raise QueryError(400, f"Invalid {name}: {value!r}")
+    return number
+
+
+def _milliseconds(params: Mapping[str, str], name: str) -> int:
+    """Parse a seconds parameter as whole milliseconds."""
+
+    scaled = _number(params, name, float) * 1000
+    if not math.isfinite(scaled):  # finite seconds can still overflow once scaled, e.g. 1e308
+        raise QueryError(400, f"Invalid {name}: {params[name]!r}")
+    return round(scaled)
+
+
+__all__ = [
+    "DEFAULT_CACHE_SIZE",
+    "DEFAULT_PORT",
+    "IndexCache",
+    "LatencyStats",
+    "QueryError",
+    "QueryServer",
+    "serve",
+]
@@ -0,0 +1,280 @@
+"""Verse/time lookup indexes over stitched alignments.
+
+A `ChapterIndex` keeps the placed words (valid `start_ms`/`end_ms`) sorted
+by start time, with a running maximum of their end times, so "which word is
+at 93.4 s" and "which words overlap 10–20 s" are a bisect each. Verses map to
+a `VerseSpan` (word range plus first start/last end), so "where does 1:27
+start" is a dict lookup. Words the aligner did not place still count towards
+their verse's word range but never answer a time query.
+
+A `BookIndex` groups chapter indexes; time queries need the chapter because
+every chapter is its own recording.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hb_align.aligner import writers
+from hb_align.audio.chunker import AlignedWord
+from hb_align.text.wlc_loader import TextChapter
+
+# Export looked up per chapter directory; a fresh sidecar next to the CSV/JSON is used instead.
+INDEX_SOURCES = ("alignments.csv", "alignments.json", writers.SIDECAR_NAME)
+
+_REFERENCE = re.compile(r"^\s*(?:(?P<book>.*?)\s+)?(?P<chapter>\d+):(?P<verse>\d+)\s*$")
+
+
+@dataclass(frozen=True)
+class WordHit:
+    book: str
+    chapter: int
+    verse: str
+    word_index: int
+    word_text: str
+    start_ms: int
+    end_ms: int
+    confidence: float
+
+
+@dataclass(frozen=True)
+class VerseSpan:
+    """A verse's word range (`first_word` .. `first_word + word_count - 1`) and audio span.
+
+    `start_ms`/`end_ms` are None when none of the verse's words were placed.
+    """
+
+    book: str
+    chapter: int
+    verse: str
+    first_word: int
+    word_count: int
+    start_ms: Optional[int]
+    end_ms: Optional[int]
+
+
+class ChapterIndex:
+    """Point, range and verse queries over one chapter's alignment rows."""
+
+    def __init__(self, table: writers.AlignmentTable) -> None:
+        self.book = table.book
+        self.chapter = int(table.chapter)
+        columns = table.columns
+        starts = np.asarray(columns["start_ms"], dtype=np.int64)
+        ends = np.asarray(columns["end_ms"], dtype=np.int64)
+        placed = np.flatnonzero((starts >= 0) & (ends >= starts))
+        order = placed[np.argsort(starts[placed], kind="stable")]
+        # Plain lists: `bisect` on a list beats numpy scalar indexing for single lookups.
+        self._rows: List[int] = order.tolist()
+        self._starts: List[int] = starts[order].tolist()
+        self._ends: List[int] = ends[order].tolist()
+        self._max_end: List[int] = np.maximum.accumulate(ends[order]).tolist() if len(order) else []
+        self._word_index: List[int] = np.asarray(columns["word_index"]).tolist()
+        # float32 in the sidecar; rounding restores the scores written to the CSV.
+        self._confidence_array = np.round(np.asarray(columns["confidence"], dtype=np.float64), 6)
+        self._confidence: List[float] = self._confidence_array.tolist()
+        self._row_starts = starts
+        self._row_ends = ends
+        self._verse_ids: List[int] = np.asarray(columns["verse"]).tolist()
+        self._text_ids: List[int] = np.asarray(columns["word_text"]).tolist()
+        self._strings = list(table.strings)
+        self._verses: Dict[str, VerseSpan] = self._build_verses(starts, ends)
+
+    def _build_verses(self, starts: np.ndarray, ends: np.ndarray) -> Dict[str, VerseSpan]:
+        verse_ids = np.asarray(self._verse_ids, dtype=np.int64)
+        if not len(verse_ids):
+            return {}
+        # Rows are in text order, so each verse is one contiguous run.
+        boundaries = np.flatnonzero(np.diff(verse_ids)) + 1
+        firsts = np.concatenate(([0], boundaries))
+        lasts = np.concatenate((boundaries, [len(verse_ids)]))
+        valid = (starts >= 0) & (ends >= starts)
+        spans: Dict[str, VerseSpan] = {}
+        for first, last in zip(firsts.tolist(), lasts.tolist(), strict=True):
+            mask = valid[first:last]
+            verse = self._strings[self._verse_ids[first]]
+            spans[verse] = VerseSpan(
+                book=self.book,
+                chapter=self.chapter,
+                verse=verse,
+                first_word=self._word_index[first],
+                word_count=last - first,
+                start_ms=int(starts[first:last][mask].min()) if mask.any() else None,
+                end_ms=int(ends[first:last][mask].max()) if mask.any() else None,
+            )
+        return spans
+
+    @classmethod
+    def build(
+        cls, text_chapter: TextChapter, aligned_words: Sequence[AlignedWord]
+    ) -> "ChapterIndex":
+        """Index a stitched timeline directly, without writing it out first."""
+
+        return cls(writers.build_alignment_table(text_chapter, aligned_words))
+
+    @classmethod
+    def load(cls, path: Path) -> "ChapterIndex":
+        """Index a chapter directory or one of its alignment exports."""
+
+        return cls(writers.read_alignment_table(_chapter_source(path)))
+
+    def __len__(self) -> int:
+        return len(self._word_index)
+
+    @property
+    def verses(self) -> List[VerseSpan]:
+        return list(self._verses.values())
+
+    def verse(self, verse: str) -> VerseSpan:
+        """Span of a verse id such as `"1:27"`; raises `KeyError` if the chapter has no such verse."""
+
+        return self._verses[verse]
+
+    def word_at(self, ms: int) -> Optional[WordHit]:
+        """The word sounding at *ms* (start inclusive, end exclusive), or None in a gap."""
+
+        position = bisect_right(self._starts, ms) - 1
+        # Stitched words may overlap slightly: step back while an earlier word still covers ms.
+        while position >= 0 and self._max_end[position] > ms:
+            if self._ends[position] > ms:
+                return self._hit(position)
+            position -= 1
+        return None
+
+    def verse_at(self, ms: int) -> Optional[VerseSpan]:
+        """The verse whose audio span contains *ms*, or None outside every verse."""
+
+        position = bisect_right(self._starts, ms) - 1
+        if position < 0:
+            return None
+        span = self._verses[self._strings[self._verse_ids[self._rows[position]]]]
+        return span if span.end_ms is not None and ms < span.end_ms else None
+
+    def words_between(self, start_ms: int, end_ms: int) -> List[WordHit]:
+        """Words overlapping `[start_ms, end_ms)`, in start order."""
+
+        first = bisect_right(self._max_end, start_ms)
+        last = bisect_left(self._starts, end_ms)
+        return [
+            self._hit(position)
+            for position in range(first, last)
+            if self._ends[position] > start_ms
+        ]
+
+    def low_confidence(self, threshold: float, *, limit: Optional[int] = None) -> List[WordHit]:
+        """Words below *threshold* or without timestamps (`-1`), in text order."""
+
+        with np.errstate(invalid="ignore"):
+            unplaced = (self._row_starts < 0) | (self._row_ends < self._row_starts)
+            flagged = np.flatnonzero(unplaced | ~(self._confidence_array >= threshold))
+        return [self._row_hit(row) for row in flagged[:limit].tolist()]
+
+    def _hit(self, position: int) -> WordHit:
+        row = self._rows[position]
+        return WordHit(
+            book=self.book,
+            chapter=self.chapter,
+            verse=self._strings[self._verse_ids[row]],
+            word_index=self._word_index[row],
+            word_text=self._strings[self._text_ids[row]],
+            start_ms=self._starts[position],
+            end_ms=self._ends[position],
+            confidence=self._confidence[row],
+        )
+
+    def _row_hit(self, row: int) -> WordHit:
+        return WordHit(
+            book=self.book,
+            chapter=self.chapter,
+            verse=self._strings[self._verse_ids[row]],
+            word_index=self._word_index[row],
+            word_text=self._strings[self._text_ids[row]],
+            start_ms=int(self._row_starts[row]),
+            end_ms=int(self._row_ends[row]),
+            confidence=self._confidence[row],
+        )
+
+
+class BookIndex:
+    """Chapter indexes of one book, addressed by chapter number or `chapter:verse` reference."""
+
+    def __init__(self, chapters: Iterable[ChapterIndex]) -> None:
+        self._chapters: Dict[int, ChapterIndex] = {}
+        for index in chapters:
+            if self._chapters and index.book != self.book:
+                raise ValueError(f"Cannot mix {index.book} into a {self.book} index")
+            self._chapters[index.chapter] = index
+
+    @classmethod
+    def load(cls, root: Path) -> "BookIndex":
+        """Index every chapter directory under *root* (a book, a chapter or a single export)."""
+
+        if root.is_file():
+            return cls([ChapterIndex.load(root)])
+        chapter_dirs = sorted({path.parent for name in INDEX_SOURCES for path in root.rglob(name)})
+        if not chapter_dirs:
+            raise FileNotFoundError(f"No alignment exports under {root}")
+        return cls(ChapterIndex.load(path) for path in chapter_dirs)
+
+    @property
+    def book(self) -> str:
+        return next(iter(self._chapters.values())).book if self._chapters else ""
+
+    @property
+    def chapters(self) -> List[int]:
+        return sorted(self._chapters)
+
+    def chapter(self, chapter: int) -> ChapterIndex:
+        return self._chapters[chapter]
+
+    def verse(self, reference: str) -> VerseSpan:
+        """Span for `"1:27"`, `"Genesis 1:27"` or `"Gen 1:27"`; raises `KeyError` for unknown references."""
+
+        book, chapter, verse = parse_reference(reference)
+        if book and not self.book.lower().startswith(book.lower().rstrip(".")):
+            raise KeyError(f"{reference!r} is not in {self.book}")
+        if chapter not in self._chapters:
+            raise KeyError(f"{self.book} {chapter} is not indexed")
+        return self._chapters[chapter].verse(verse)
+
+    def word_at(self, chapter: int, ms: int) -> Optional[WordHit]:
+        return self._chapters[chapter].word_at(ms)
+
+    def verse_at(self, chapter: int, ms: int) -> Optional[VerseSpan]:
+        return self._chapters[chapter].verse_at(ms)
+
+    def words_between(self, chapter: int, start_ms: int, end_ms: int) -> List[WordHit]:
+        return self._chapters[chapter].words_between(start_ms, end_ms)
+
+
+def parse_reference(reference: str) -> Tuple[Optional[str], int, str]:
+    """`"Genesis 1:27"` -> `("Genesis", 1, "1:27")`; the book is None for a bare `"1:27"`.
+
+    Raises `KeyError` when *reference* is not a `chapter:verse` reference.
+    """
+
+    match = _REFERENCE.match(reference)
+    if match is None:
+        raise KeyError(f"Not a chapter:verse reference: {reference!r}")
+    chapter = int(match.group("chapter"))
+    return match.group("book") or None, chapter, f"{chapter}:{int(match.group('verse'))}"
+
+
+def _chapter_source(path: Path) -> Path:
+    if not path.is_dir():
+        if not path.exists():
+            raise FileNotFoundError(f"Alignment export not found: {path}")
+        return path
+    for name in INDEX_SOURCES:
+        if (path / name).exists():
+            return path / name
+    raise FileNotFoundError(f"No alignment exports in {path}")
+
+
+__all__ = ["INDEX_SOURCES", "BookIndex", "ChapterIndex", "VerseSpan", "WordHit", "parse_reference"]
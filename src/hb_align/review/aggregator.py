@@ -0,0 +1,281 @@
+"""Vectorized review engine for `hb-align review` (T024, NFR-002).
+
+An alignment export is loaded once into typed pandas columns; flagging,
+missing-timestamp detection and the verse/chapter `ConfidenceProfile`
+aggregates are all column operations, so a whole book reviews in roughly the
+time it takes to parse the file. Findings keep the export's row order.
+
+Reasons (data-model.md §ReviewFinding):
+
+* `missing_timestamp`: `start_ms`/`end_ms` absent or `-1`, or the word ends
+  before it starts; takes precedence over a low score;
+* `low_confidence`: `confidence` below the threshold (or absent).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from hb_align.aligner import writers
+
+REQUIRED_COLUMNS = (
+    "book",
+    "chapter",
+    "verse",
+    "word_index",
+    "word_text",
+    "start_ms",
+    "end_ms",
+    "confidence",
+)
+FINDING_COLUMNS = REQUIRED_COLUMNS + ("reason",)
+GROUP_LEVELS = ("word", "verse", "chapter")
+MIN_THRESHOLD = 0.5
+MAX_THRESHOLD = 0.99
+
+_DTYPES: Dict[str, Any] = {
+    "book": "category",
+    "chapter": "int32",
+    "verse": "category",
+    "word_index": "int64",
+    "word_text": "category",
+    "start_ms": "float64",
+    "end_ms": "float64",
+    "confidence": "float64",
+}
+_GROUP_KEYS = {"verse": ["book", "chapter", "verse"], "chapter": ["book", "chapter"]}
+
+
+class AlignmentSchemaError(ValueError):
+    """The input is not an alignment export (`INVALID_ALIGNMENT_SCHEMA`)."""
+
+
+def load_alignments(path: Path) -> pd.DataFrame:
+    """Read `alignments.csv`/`alignments.json` (or `alignments.hbcol`) into typed columns.
+
+    A text export with an up-to-date columnar sidecar next to it is read from
+    the sidecar instead. Extra columns (`translit`, `chunk_id`, ...) are
+    dropped; missing required ones raise `AlignmentSchemaError`. Raises
+    `FileNotFoundError` for a missing path.
+    """
+
+    frames = list(iter_alignments(path))
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def iter_alignments(path: Path, *, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """`load_alignments` in slices of at most *chunk_rows* rows (one frame when None).
+
+    CSV is read incrementally and sidecar slices are taken before any column
+    is converted, so peak memory follows the slice size; JSON arrays have to
+    be parsed whole first.
+    """
+
+    if not path.exists():
+        raise FileNotFoundError(f"Alignment export not found: {path}")
+    sidecar = path if path.suffix == writers.SIDECAR_SUFFIX else writers.sidecar_for(path)
+    if sidecar is not None:
+        try:
+            table = writers.read_columnar(sidecar)
+        except writers.ColumnarFormatError as exc:
+            if sidecar == path:
+                raise AlignmentSchemaError(str(exc)) from exc
+        else:
+            step = chunk_rows or max(1, len(table))
+            for start in range(0, max(1, len(table)), step):
+                yield frame_from_table(table, slice(start, start + step))
+            return
+    try:
+        if path.suffix.lower() == ".json":
+            records = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(records, list):
+                raise AlignmentSchemaError(f"{path}: expected a JSON array of word rows")
+            frame = pd.DataFrame.from_records(records)
+            step = chunk_rows or max(1, len(frame))
+            for start in range(0, max(1, len(frame)), step):
+                yield coerce_alignments(frame.iloc[start : start + step], source=str(path))
+            return
+        dtypes = {"verse": "string", "word_text": "string"}
+        if chunk_rows is None:
+            yield coerce_alignments(pd.read_csv(path, comment="#", dtype=dtypes), source=str(path))
+            return
+        with pd.read_csv(path, comment="#", dtype=dtypes, chunksize=chunk_rows) as reader:
+            for frame in reader:
+                yield coerce_alignments(frame, source=str(path))
+    except (ValueError, pd.errors.ParserError) as exc:
+        if isinstance(exc, AlignmentSchemaError):
+            raise
+        raise AlignmentSchemaError(f"{path}: {exc}") from exc
+
+
+def coerce_alignments(frame: pd.DataFrame, *, source: str = "<frame>") -> pd.DataFrame:
+    """Validate and cast an alignment frame to the engine's column types."""
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise AlignmentSchemaError(f"{source}: missing columns {', '.join(missing)}")
+    frame = frame.loc[:, list(REQUIRED_COLUMNS)]
+    try:
+        return frame.astype(_DTYPES)
+    except (TypeError, ValueError) as exc:
+        raise AlignmentSchemaError(f"{source}: {exc}") from exc
+
+
+def frame_from_table(table: writers.AlignmentTable, rows: slice = slice(None)) -> pd.DataFrame:
+    """Engine frame straight from sidecar columns; strings become categoricals over the string table."""
+
+    strings = pd.Index(table.strings, dtype=object)
+
+    def column(name: str, dtype: str) -> np.ndarray:
+        return np.asarray(table.columns[name][rows], dtype=dtype)
+
+    def categorical(name: str) -> pd.Categorical:
+        return pd.Categorical.from_codes(column(name, "int32"), categories=strings)
+
+    word_index = column("word_index", "int64")
+    count = len(word_index)
+    return pd.DataFrame(
+        {
+            "book": pd.Categorical.from_codes(np.zeros(count, dtype="int8"), categories=[table.book]),
+            "chapter": np.full(count, table.chapter, dtype="int32"),
+            "verse": categorical("verse"),
+            "word_index": word_index,
+            "word_text": categorical("word_text"),
+            "start_ms": column("start_ms", "float64"),
+            "end_ms": column("end_ms", "float64"),
+            # float32 on disk; rounding restores the decimal scores so thresholds compare as in the CSV.
+            "confidence": np.round(column("confidence", "float64"), 6),
+        }
+    )
+
+
+def flag_reasons(frame: pd.DataFrame, threshold: float) -> pd.Series:
+    """Per-row reason (`missing_timestamp`, `low_confidence`) or `<NA>` when the word passes."""
+
+    start = frame["start_ms"].to_numpy()
+    end = frame["end_ms"].to_numpy()
+    confidence = frame["confidence"].to_numpy()
+    with np.errstate(invalid="ignore"):
+        missing = np.isnan(start) | np.isnan(end) | (start < 0) | (end < 0) | (end < start)
+        low = ~(confidence >= threshold)
+    reasons = np.select([missing, low], ["missing_timestamp", "low_confidence"], default="")
+    return pd.Series(reasons, index=frame.index, dtype="string").replace("", pd.NA)
+
+
+def confidence_profiles(
+    frame: pd.DataFrame, reasons: pd.Series, *, scope: str, threshold: float
+) -> pd.DataFrame:
+    """`ConfidenceProfile` rows per verse or chapter, in first-appearance order."""
+
+    keys = _GROUP_KEYS[scope]
+    grouped = frame.assign(_flagged=reasons.notna()).groupby(keys, observed=True, sort=False)
+    profiles = grouped.agg(
+        word_count=("confidence", "size"),
+        flagged=("_flagged", "sum"),
+        min_confidence=("confidence", "min"),
+        avg_confidence=("confidence", "mean"),
+    ).reset_index()
+    label = profiles["book"].astype(str) + " "
+    if scope == "verse":
+        profiles["scope_id"] = label + profiles["verse"].astype(str)
+    else:
+        profiles["scope_id"] = label + profiles["chapter"].astype(str)
+    profiles["status"] = np.where(profiles["flagged"] > 0, "needs_review", "pass")
+    profiles["threshold"] = threshold
+    return profiles
+
+
+@dataclass
+class ReviewResult:
+    """Findings plus verse/chapter profiles for one alignment export."""
+
+    findings: pd.DataFrame
+    profiles: pd.DataFrame
+    total_words: int
+    threshold: float
+    group_by: str
+    min_confidence: Optional[float]
+    avg_confidence: Optional[float]
+
+    @property
+    def flagged(self) -> int:
+        return len(self.findings)
+
+    def worst_scope(self) -> Optional[Dict[str, Any]]:
+        """The flagged profile with the lowest average confidence."""
+
+        scores = self.profiles.loc[self.profiles["flagged"] > 0, "avg_confidence"].dropna()
+        if scores.empty:  # nothing flagged, or no flagged scope has any confidence
+            return None
+        worst = scores.idxmin()
+        return {"scope_id": self.profiles.at[worst, "scope_id"], "avg_confidence": float(scores[worst])}
+
+    def reason_counts(self) -> Dict[str, int]:
+        return {str(key): int(value) for key, value in self.findings["reason"].value_counts().items()}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "group_by": self.group_by,
+            "total_words": self.total_words,
+            "flagged_words": self.flagged,
+            "reasons": self.reason_counts(),
+            "min_confidence": self.min_confidence,
+            "avg_confidence": self.avg_confidence,
+            "worst": self.worst_scope(),
+        }
+
+
+def review_alignments(
+    frame: pd.DataFrame,
+    *,
+    threshold: float = 0.9,
+    group_by: str = "word",
+    limit: Optional[int] = None,
+) -> ReviewResult:
+    """Flag low-confidence/missing words and aggregate per `group_by` (verse for `word`)."""
+
+    if not MIN_THRESHOLD <= threshold <= MAX_THRESHOLD:
+        raise ValueError(f"threshold must be between {MIN_THRESHOLD} and {MAX_THRESHOLD}")
+    if group_by not in GROUP_LEVELS:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_LEVELS)}")
+    reasons = flag_reasons(frame, threshold)
+    mask = reasons.notna().to_numpy()
+    findings = frame.loc[mask].assign(reason=reasons[mask])
+    if limit is not None:
+        findings = findings.head(limit)
+    scope = "chapter" if group_by == "chapter" else "verse"
+    confidence = frame["confidence"]
+    return ReviewResult(
+        findings=findings,
+        profiles=confidence_profiles(frame, reasons, scope=scope, threshold=threshold),
+        total_words=len(frame),
+        threshold=threshold,
+        group_by=group_by,
+        min_confidence=None if confidence.isna().all() else float(confidence.min()),
+        avg_confidence=None if confidence.isna().all() else round(float(confidence.mean()), 4),
+    )
+
+
+__all__ = [
+    "FINDING_COLUMNS",
+    "GROUP_LEVELS",
+    "MAX_THRESHOLD",
+    "MIN_THRESHOLD",
+    "REQUIRED_COLUMNS",
+    "AlignmentSchemaError",
+    "ReviewResult",
+    "coerce_alignments",
+    "confidence_profiles",
+    "flag_reasons",
+    "frame_from_table",
+    "iter_alignments",
+    "load_alignments",
+    "review_alignments",
+]
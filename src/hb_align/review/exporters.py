@@ -0,0 +1,225 @@
+"""CSV/JSON/Markdown writers for review findings (T025, contracts/review.md Outputs).
+
+Rows are written to the stream in slices of `CHUNK_ROWS` straight from the
+findings frame, so memory stays flat however many words a book flags.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional
+
+import pandas as pd
+
+from hb_align import __version__
+from hb_align.review.aggregator import FINDING_COLUMNS, ReviewResult
+
+FORMATS = ("csv", "json", "md", "stdout")
+CHUNK_ROWS = 5_000
+
+
+def report_metadata(source: str, threshold: float, *, notes: Optional[str] = None) -> Dict[str, Any]:
+    """Traceability header shared by every format."""
+
+    metadata: Dict[str, Any] = {
+        "source": source,
+        "threshold": threshold,
+        "hb_align_version": __version__,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if notes:
+        metadata["notes"] = notes
+    return metadata
+
+
+def write_report(result: ReviewResult, fmt: str, stream: IO[str], *, metadata: Dict[str, Any]) -> None:
+    if fmt == "csv":
+        write_csv(result, stream, metadata=metadata)
+    elif fmt == "json":
+        write_json(result, stream, metadata=metadata)
+    elif fmt == "md":
+        write_markdown(result, stream, metadata=metadata)
+    else:
+        raise ValueError(f"Unsupported report format: {fmt}")
+
+
+def write_csv(result: ReviewResult, stream: IO[str], *, metadata: Dict[str, Any]) -> None:
+    for key, value in metadata.items():
+        stream.write(f"# {key}: {value}\n")
+    _typed(result.findings).to_csv(stream, index=False, chunksize=CHUNK_ROWS, lineterminator="\n")
+
+
+def write_json(result: ReviewResult, stream: IO[str], *, metadata: Dict[str, Any]) -> None:
+    notes = metadata.get("notes")
+    stream.write("[")
+    first = True
+    for record in records(result.findings):
+        record["notes"] = notes
+        stream.write("\n  " if first else ",\n  ")
+        stream.write(json.dumps(record, ensure_ascii=False))
+        first = False
+    stream.write("\n]\n" if not first else "]\n")
+
+
+def write_markdown(result: ReviewResult, stream: IO[str], *, metadata: Dict[str, Any]) -> None:
+    stream.write("<!--\n")
+    for key, value in metadata.items():
+        stream.write(f"{key}: {value}\n")
+    stream.write("-->\n")
+    stream.write(
+        f"# Low-confidence review (<{result.threshold:g})\n\n"
+        f"Flagged {result.flagged} of {result.total_words} words"
+    )
+    reasons = result.reason_counts()
+    if reasons:
+        stream.write(" (" + ", ".join(f"{reason}: {count}" for reason, count in sorted(reasons.items())) + ")")
+    stream.write(".\n")
+    if result.group_by == "word":
+        _markdown_table(result.findings, stream)
+        return
+    keys = ["book", "chapter"] if result.group_by == "chapter" else ["book", "chapter", "verse"]
+    profiles = result.profiles.set_index(keys)
+    for key, group in result.findings.groupby(keys, observed=True, sort=False):
+        profile = profiles.loc[key]
+        stream.write(
+            f"\n## {profile['scope_id']}: {profile['flagged']}/{profile['word_count']} flagged, "
+            f"min {profile['min_confidence']:.2f}, avg {profile['avg_confidence']:.2f}\n"
+        )
+        _markdown_table(group, stream)
+
+
+def _markdown_table(findings: pd.DataFrame, stream: IO[str], *, typed: bool = True) -> None:
+    columns = ["verse", "word_index", "word_text", "start_ms", "end_ms", "confidence", "reason"]
+    stream.write("\n| " + " | ".join(columns) + " |\n")
+    stream.write("|" + "---|" * len(columns) + "\n")
+    rows = records(findings) if typed else findings.to_dict("records")
+    for record in rows:
+        cells = ["" if record[column] is None else str(record[column]) for column in columns]
+        stream.write("| " + " | ".join(cells) + " |\n")
+
+
+def records(findings: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """Plain-Python row dicts (ints for timestamps, None for missing), a slice at a time."""
+
+    for offset in range(0, len(findings), CHUNK_ROWS):
+        chunk = _typed(findings.iloc[offset : offset + CHUNK_ROWS])
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.to_dict("records")
+
+
+def _typed(findings: pd.DataFrame) -> pd.DataFrame:
+    """Output columns with timestamps as nullable ints (the engine keeps them as floats)."""
+
+    return findings.loc[:, list(FINDING_COLUMNS)].astype(
+        {"book": "string", "verse": "string", "start_ms": "Int64", "end_ms": "Int64"}
+    )
+
+
+class ReportStream:
+    """Incremental report for tree reviews: findings are appended chapter by chapter.
+
+    CSV and JSON keep the single-file layout (one header, one array); Markdown
+    gets a section per chapter and the tree totals at the end. `limit` caps
+    the rows written across all chapters.
+    """
+
+    def __init__(
+        self, fmt: str, stream: IO[str], *, metadata: Dict[str, Any], limit: Optional[int] = None
+    ) -> None:
+        if fmt not in ("csv", "json", "md"):
+            raise ValueError(f"Unsupported report format: {fmt}")
+        self.fmt = fmt
+        self.stream = stream
+        self.rows = 0
+        self._limit = limit
+        self._notes = metadata.get("notes")
+        if fmt == "csv":
+            for key, value in metadata.items():
+                stream.write(f"# {key}: {value}\n")
+            stream.write(",".join(FINDING_COLUMNS) + "\n")
+        elif fmt == "json":
+            stream.write("[")
+        else:
+            stream.write("<!--\n" + "".join(f"{key}: {value}\n" for key, value in metadata.items()) + "-->\n")
+            stream.write(f"# Low-confidence review (<{metadata['threshold']:g})\n")
+
+    def add(self, findings: pd.DataFrame, *, title: str) -> int:
+        """Append one chapter's findings; returns the number of rows written."""
+
+        if self._limit is not None:
+            findings = findings.head(max(0, self._limit - self.rows))
+        if findings.empty:
+            return 0
+        if self.fmt == "csv":
+            _typed(findings).to_csv(
+                self.stream, index=False, header=False, chunksize=CHUNK_ROWS, lineterminator="\n"
+            )
+        elif self.fmt == "json":
+            for index, record in enumerate(records(findings)):
+                record["notes"] = self._notes
+                self.stream.write(",\n  " if self.rows or index else "\n  ")
+                self.stream.write(json.dumps(record, ensure_ascii=False))
+        else:
+            self.stream.write(f"\n## {title}: {len(findings)} flagged\n")
+            _markdown_table(findings, self.stream)
+        self.rows += len(findings)
+        self.stream.flush()
+        return len(findings)
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        if self.fmt == "json":
+            self.stream.write("\n]\n" if self.rows else "]\n")
+        elif self.fmt == "md":
+            self.stream.write(
+                f"\n## Summary\n\nFlagged {summary['flagged_words']} of {summary['total_words']} words "
+                f"in {summary['chapters']} chapters.\n"
+            )
+            if summary["worst"]:
+                self.stream.write("\n### Worst scopes\n\n| scope | flagged | words | min | avg |\n")
+                self.stream.write("|---|---|---|---|---|\n")
+                for scope in summary["worst"]:
+                    self.stream.write(
+                        f"| {scope['scope_id']} | {scope['flagged']} | {scope['word_count']} "
+                        f"| {scope['min_confidence']:.2f} | {scope['avg_confidence']:.2f} |\n"
+                    )
+            if summary["lowest_words"]:
+                self.stream.write("\n### Lowest-confidence words\n")
+                _markdown_table(pd.DataFrame(summary["lowest_words"]), self.stream, typed=False)
+        self.stream.flush()
+
+
+def log_review(
+    input_path: Path, *, threshold: float, flagged: int, total_words: int, duration_ms: float
+) -> Optional[Path]:
+    """Record a review's duration in the chapter's summary.json, when there is one."""
+
+    summary_path = input_path.with_name("summary.json")
+    try:
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    summary.setdefault("durations_ms", {})["review"] = duration_ms
+    summary["review"] = {
+        "input": input_path.name,
+        "threshold": threshold,
+        "flagged_words": flagged,
+        "total_words": total_words,
+        "duration_ms": duration_ms,
+    }
+    summary_path.write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+    return summary_path
+
+
+__all__ = [
+    "FORMATS",
+    "ReportStream",
+    "log_review",
+    "records",
+    "report_metadata",
+    "write_csv",
+    "write_json",
+    "write_markdown",
+    "write_report",
+]
@@ -0,0 +1,320 @@
+"""Bounded-memory review of a whole output tree (`hb-align review --input DIR|GLOB`).
+
+Each chapter export is reviewed in a worker process, reading it in slices of
+`chunk_rows` and folding per-slice verse/chapter aggregates (count, flagged,
+min, sum) together, so a worker never holds more than one chapter's findings.
+The parent consumes chapters in path order through a window of at most
+`2 × workers` in flight, writes each chapter's findings to the report as soon
+as it arrives and folds the rest into `TreeReview`: running totals plus
+bounded heaps for the worst verses and the lowest-confidence words. Memory
+therefore depends on the window and `top_k`, not on how many chapters the
+tree holds.
+"""
+
+from __future__ import annotations
+
+import glob
+import heapq
+import itertools
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+import pandas as pd
+
+from hb_align.aligner import writers
+from hb_align.review import exporters
+from hb_align.review.aggregator import AlignmentSchemaError, flag_reasons, iter_alignments
+
+ALIGNMENT_FILES = ("alignments.csv", "alignments.json", writers.SIDECAR_NAME)
+DEFAULT_CHUNK_ROWS = 20_000
+DEFAULT_TOP_K = 10
+_GROUP_KEYS = {"verse": ["book", "chapter", "verse"], "chapter": ["book", "chapter"]}
+
+T = TypeVar("T")
+
+
+def discover_alignment_files(spec: str) -> List[Path]:
+    """One alignment export per chapter directory under a directory or glob, sorted.
+
+    A glob may match files or directories; directories are searched
+    recursively. Where a chapter has several exports the CSV is used (the
+    loader switches to a fresh sidecar by itself).
+    """
+
+    root = Path(spec)
+    matches = [root] if root.exists() else [Path(path) for path in glob.glob(spec, recursive=True)]
+    by_dir: Dict[Path, Path] = {}
+    for match in matches:
+        candidates = (
+            (path for name in ALIGNMENT_FILES for path in match.rglob(name)) if match.is_dir() else [match]
+        )
+        for path in candidates:
+            if path.suffix not in (".csv", ".json", writers.SIDECAR_SUFFIX):
+                continue
+            current = by_dir.get(path.parent)
+            if current is None or _preference(path) < _preference(current):
+                by_dir[path.parent] = path
+    return sorted(by_dir.values())
+
+
+def _preference(path: Path) -> int:
+    return ALIGNMENT_FILES.index(path.name) if path.name in ALIGNMENT_FILES else len(ALIGNMENT_FILES)
+
+
+class BoundedHeap(Generic[T]):
+    """Keeps the `k` smallest items by key seen so far."""
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self._heap: List[Tuple[float, int, T]] = []
+        self._counter = itertools.count()
+
+    def push(self, key: float, item: T) -> None:
+        if self.k <= 0:
+            return
+        # Max-heap on key via negation: the root is the current worst of the best k.
+        entry = (-key, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def items(self) -> List[T]:
+        """Smallest key first; ties keep insertion order."""
+
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))]
+
+
+@dataclass
+class ChapterReview:
+    """One chapter's review, as shipped back from a worker."""
+
+    source: str
+    findings: pd.DataFrame
+    profiles: pd.DataFrame
+    total_words: int = 0
+    confidence_sum: float = 0.0
+    confidence_count: int = 0
+    min_confidence: Optional[float] = None
+    reasons: Dict[str, int] = field(default_factory=dict)
+    lowest_words: List[Dict[str, Any]] = field(default_factory=list)
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def flagged(self) -> int:
+        return int(sum(self.reasons.values()))
+
+
+def review_chapter_file(
+    path: Path,
+    *,
+    threshold: float,
+    scope: str = "verse",
+    top_k: int = DEFAULT_TOP_K,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    log_duration: bool = True,
+) -> ChapterReview:
+    """Worker body: review one export slice by slice; never raises for bad input."""
+
+    started = time.perf_counter()
+    findings: List[pd.DataFrame] = []
+    partials: List[pd.DataFrame] = []
+    review = ChapterReview(source=str(path), findings=pd.DataFrame(), profiles=pd.DataFrame())
+    lowest: BoundedHeap[Dict[str, Any]] = BoundedHeap(top_k)
+    reasons: Counter[str] = Counter()
+    keys = _GROUP_KEYS[scope]
+    try:
+        for frame in iter_alignments(path, chunk_rows=chunk_rows):
+            flags = flag_reasons(frame, threshold)
+            mask = flags.notna().to_numpy()
+            if mask.any() or not findings:
+                findings.append(frame.loc[mask].assign(reason=flags[mask]))
+            reasons.update(flags[mask].value_counts().to_dict())
+            confidence = frame["confidence"]
+            review.total_words += len(frame)
+            review.confidence_sum += float(confidence.sum())
+            review.confidence_count += int(confidence.count())
+            if confidence.count():
+                low = float(confidence.min())
+                review.min_confidence = _min(review.min_confidence, low)
+            for record in exporters.records(frame.nsmallest(top_k, "confidence").assign(reason=flags)):
+                lowest.push(record["confidence"], record)
+            partials.append(
+                frame.assign(_flagged=mask, _sum=confidence)
+                .groupby(keys, observed=True, sort=False)
+                .agg(
+                    word_count=("confidence", "size"),
+                    flagged=("_flagged", "sum"),
+                    min_confidence=("confidence", "min"),
+                    confidence_sum=("_sum", "sum"),
+                )
+                .reset_index()
+            )
+    except (OSError, AlignmentSchemaError) as exc:  # e.g. unreadable: skip the chapter
+        review.error = str(exc)
+        return review
+    if findings:
+        review.findings = pd.concat(findings, ignore_index=True) if len(findings) > 1 else findings[0]
+    if partials:
+        review.profiles = _merge_partials(partials, keys, threshold)
+    review.reasons = {str(reason): int(count) for reason, count in reasons.items()}
+    review.lowest_words = lowest.items()
+    review.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    if log_duration:
+        exporters.log_review(
+            path,
+            threshold=threshold,
+            flagged=review.flagged,
+            total_words=review.total_words,
+            duration_ms=review.duration_ms,
+        )
+    return review
+
+
+def _min(current: Optional[float], value: float) -> float:
+    return value if current is None else min(current, value)
+
+
+def _merge_partials(partials: Sequence[pd.DataFrame], keys: List[str], threshold: float) -> pd.DataFrame:
+    combined = pd.concat(partials, ignore_index=True) if len(partials) > 1 else partials[0]
+    for key in keys:
+        combined[key] = combined[key].astype(str)
+    profiles = (
+        combined.groupby(keys, sort=False)
+        .agg(
+            word_count=("word_count", "sum"),
+            flagged=("flagged", "sum"),
+            min_confidence=("min_confidence", "min"),
+            confidence_sum=("confidence_sum", "sum"),
+        )
+        .reset_index()
+    )
+    profiles["avg_confidence"] = profiles["confidence_sum"] / profiles["word_count"]
+    profiles["scope_id"] = profiles["book"] + " " + profiles[keys[-1]]
+    profiles["status"] = (profiles["flagged"] > 0).map({True: "needs_review", False: "pass"})
+    profiles["threshold"] = threshold
+    return profiles.drop(columns="confidence_sum")
+
+
+class TreeReview:
+    """Running totals and top-k heaps over every chapter folded in so far."""
+
+    def __init__(self, *, threshold: float, group_by: str, top_k: int = DEFAULT_TOP_K) -> None:
+        self.threshold = threshold
+        self.group_by = group_by
+        self.top_k = top_k
+        self.chapters = 0
+        self.total_words = 0
+        self.flagged = 0
+        self.reasons: Counter[str] = Counter()
+        self.errors: List[str] = []
+        self._confidence_sum = 0.0
+        self._confidence_count = 0
+        self.min_confidence: Optional[float] = None
+        self._worst_scopes: BoundedHeap[Dict[str, Any]] = BoundedHeap(top_k)
+        self._lowest_words: BoundedHeap[Dict[str, Any]] = BoundedHeap(top_k)
+
+    def add(self, chapter: ChapterReview) -> None:
+        if chapter.error is not None:
+            self.errors.append(chapter.error)
+            return
+        self.chapters += 1
+        self.total_words += chapter.total_words
+        self.flagged += chapter.flagged
+        self.reasons.update(chapter.reasons)
+        self._confidence_sum += chapter.confidence_sum
+        self._confidence_count += chapter.confidence_count
+        if chapter.min_confidence is not None:
+            self.min_confidence = _min(self.min_confidence, chapter.min_confidence)
+        profiles = chapter.profiles
+        flagged = profiles[profiles["flagged"] > 0] if not profiles.empty else profiles
+        for profile in flagged.itertuples(index=False):
+            self._worst_scopes.push(
+                float(profile.avg_confidence),
+                {
+                    "scope_id": profile.scope_id,
+                    "word_count": int(profile.word_count),
+                    "flagged": int(profile.flagged),
+                    "min_confidence": round(float(profile.min_confidence), 4),
+                    "avg_confidence": round(float(profile.avg_confidence), 4),
+                },
+            )
+        for word in chapter.lowest_words:
+            self._lowest_words.push(word["confidence"], word)
+
+    @property
+    def avg_confidence(self) -> Optional[float]:
+        if not self._confidence_count:
+            return None
+        return round(self._confidence_sum / self._confidence_count, 4)
+
+    def worst_scopes(self) -> List[Dict[str, Any]]:
+        return self._worst_scopes.items()
+
+    def lowest_words(self) -> List[Dict[str, Any]]:
+        return self._lowest_words.items()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "group_by": self.group_by,
+            "chapters": self.chapters,
+            "total_words": self.total_words,
+            "flagged_words": self.flagged,
+            "reasons": dict(self.reasons),
+            "min_confidence": self.min_confidence,
+            "avg_confidence": self.avg_confidence,
+            "worst": self.worst_scopes(),
+            "lowest_words": self.lowest_words(),
+            "errors": list(self.errors),
+        }
+
+
+def review_tree(
+    paths: Sequence[Path],
+    *,
+    threshold: float,
+    group_by: str = "word",
+    workers: int = 1,
+    top_k: int = DEFAULT_TOP_K,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[ChapterReview]:
+    """Yield chapter reviews in *paths* order while at most `2 × workers` are in flight."""
+
+    scope = "chapter" if group_by == "chapter" else "verse"
+    options = {"threshold": threshold, "scope": scope, "top_k": top_k, "chunk_rows": chunk_rows}
+    if workers <= 1:
+        for path in paths:
+            yield review_chapter_file(path, **options)
+        return
+    pending = iter(paths)
+    window: Deque[Future[ChapterReview]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path in itertools.islice(pending, 2 * workers):
+            window.append(executor.submit(review_chapter_file, path, **options))
+        while window:
+            chapter = window.popleft().result()
+            next_path = next(pending, None)
+            if next_path is not None:
+                window.append(executor.submit(review_chapter_file, next_path, **options))
+            yield chapter
+
+
+__all__ = [
+    "DEFAULT_CHUNK_ROWS",
+    "DEFAULT_TOP_K",
+    "BoundedHeap",
+    "ChapterReview",
+    "TreeReview",
+    "discover_alignment_files",
+    "review_chapter_file",
+    "review_tree",
+]
@@ -0,0 +1,40 @@
+"""Book/chapter reference helpers shared by `process`, `batch` and cache tooling."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def infer_reference_from_filename(path: Path) -> Tuple[Optional[str], Optional[int]]:
+    """Parse `<book>-<chapter>.<ext>` style filenames (e.g. `genesis-001.mp3`)."""
+
+    stem = Path(path).stem
+    if "-" not in stem:
+        return None, None
+    book_slug, chapter_str = stem.rsplit("-", 1)
+    try:
+        chapter = int(chapter_str)
+    except ValueError:
+        return None, None
+    book = book_slug.replace("_", " ").replace("-", " ").title()
+    return book, chapter
+
+
+def resolve_reference(input_path: Path, book: Optional[str], chapter: Optional[int]) -> Tuple[str, int]:
+    inferred_book, inferred_chapter = infer_reference_from_filename(input_path)
+    resolved_book = book or inferred_book
+    resolved_chapter = chapter or inferred_chapter
+    if not resolved_book or resolved_chapter is None:
+        raise ValueError(
+            "Unable to determine book/chapter. Use --book/--chapter or follow <book>-<chapter>.mp3 naming."
+        )
+    return resolved_book, resolved_chapter
+
+
+def chapter_output_dir(root: Path, book: str, chapter: int) -> Path:
+    slug = book.lower().replace(" ", "-")
+    return root / slug / f"{chapter:03d}"
+
+
+__all__ = ["infer_reference_from_filename", "resolve_reference", "chapter_output_dir"]
@@ -1,18 +1,56 @@
-"""Utility helpers shared across hb_align modules."""
+"""Utility helpers shared across hb_align modules.
+
+Exports resolve lazily (PEP 562) so that importing a light helper such as
+`load_config` does not drag in `rich` via the logging module.
+"""
 
 from __future__ import annotations
 
-from .cache import CacheEntry, CacheManager, build_cache_key
-from .config import AppConfig, load_config
-from .logging import StructuredLogger, SummaryMetrics, SummaryWriter
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from .cache import CacheEntry, CacheManager, CacheStats, CompressionPolicy, build_cache_key
+	from .config import AppConfig, load_config
+	from .logging import QueueLogSink, StructuredLogger, SummaryMetrics, SummaryWriter
+
+_EXPORTS = {
+	"AppConfig": ".config",
+	"load_config": ".config",
+	"CacheEntry": ".cache",
+	"CacheManager": ".cache",
+	"CacheStats": ".cache",
+	"CompressionPolicy": ".cache",
+	"build_cache_key": ".cache",
+	"QueueLogSink": ".logging",
+	"StructuredLogger": ".logging",
+	"SummaryMetrics": ".logging",
+	"SummaryWriter": ".logging",
+}
 
 __all__ = [
 	"AppConfig",
 	"load_config",
 	"CacheEntry",
 	"CacheManager",
+	"CacheStats",
+	"CompressionPolicy",
 	"build_cache_key",
+	"QueueLogSink",
 	"StructuredLogger",
 	"SummaryMetrics",
 	"SummaryWriter",
 ]
+
+
+def __getattr__(name: str) -> Any:
+	module_name = _EXPORTS.get(name)
+	if module_name is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module(module_name, __name__), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__() -> list[str]:
+	return sorted({*globals(), *__all__})
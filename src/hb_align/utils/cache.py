@@ -4,22 +4,140 @@ The cache groups artifacts by a deterministic key derived from
 (audio checksum, text version, pronunciation tradition, and chunking config).
 It stores each key in its own directory so command invocations can quickly
 reuse normalized audio, dictionaries, or prior alignment outputs.
+
+Text artifacts (TextGrids, alignment JSON, metadata) can optionally be stored
+compressed with a stdlib codec chosen per artifact type; see
+`CompressionPolicy`. Compression is off by default. Text artifacts are written
+to a temporary sibling and renamed into place, so a worker killed mid-write
+never leaves a truncated artifact for the next run to read.
 """
 
 from __future__ import annotations
 
+import gzip
 import hashlib
+import io
 import json
+import lzma
+import os
 import shutil
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable, Mapping, MutableMapping
+from typing import IO, Callable, Dict, Mapping, MutableMapping
 
 from hb_align.utils.config import AppConfig
 
 _METADATA_FILENAME = "metadata.json"
 
+# codec name -> (stored suffix, binary opener)
+_CODECS: Mapping[str, tuple[str, Callable[..., IO[bytes]]]] = {
+    "zlib": (".gz", gzip.open),
+    "lzma": (".xz", lzma.open),
+}
+_DEFAULT_TEXT_TYPES = ("json", "textgrid", "txt", "csv", "lab", "dict")
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Maps text artifact types (file suffixes) to a compression codec.
+
+    Specs accepted by `parse`: ``off``, a bare codec (``zlib`` applies it to every
+    text artifact type) or a comma-separated mapping such as
+    ``json=zlib,textgrid=lzma``.
+    """
+
+    codecs: Mapping[str, str] = field(default_factory=dict)
+    level: int = 6
+
+    @classmethod
+    def parse(cls, spec: str | None, *, level: int = 6) -> "CompressionPolicy":
+        spec = (spec or "").strip().lower()
+        if spec in {"", "off", "none", "false", "0"}:
+            return cls(level=level)
+        codecs: Dict[str, str] = {}
+        for raw_part in spec.split(","):
+            part = raw_part.strip()
+            if not part:
+                continue
+            if "=" in part:
+                artifact_type, codec = (value.strip() for value in part.split("=", 1))
+                codecs[artifact_type.lstrip(".")] = codec
+            else:
+                for artifact_type in _DEFAULT_TEXT_TYPES:
+                    codecs[artifact_type] = part
+        for codec in codecs.values():
+            if codec not in _CODECS and codec != "off":
+                raise ValueError(f"Unknown cache compression codec: {codec}")
+        if not 0 <= level <= 9:
+            raise ValueError("Compression level must be between 0 and 9")
+        return cls(codecs={k: v for k, v in codecs.items() if v != "off"}, level=level)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.codecs)
+
+    def codec_for(self, relative_name: str) -> str | None:
+        suffix = Path(relative_name).suffix.lower().lstrip(".")
+        return self.codecs.get(suffix)
+
+
+@dataclass
+class CacheStats:
+    """Running counters for compressed artifact I/O.
+
+    CPU times are per-thread (`time.thread_time`) and cover only the codec
+    work, so other threads in the process are not charged to the cache.
+    """
+
+    writes: int = 0
+    reads: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+    compress_cpu_s: float = 0.0
+    decompress_cpu_s: float = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        return (self.raw_bytes / self.stored_bytes) if self.stored_bytes else 1.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "writes": self.writes,
+            "reads": self.reads,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "compression_ratio": round(self.compression_ratio, 3),
+            "compress_cpu_ms": round(self.compress_cpu_s * 1000, 3),
+            "decompress_cpu_ms": round(self.decompress_cpu_s * 1000, 3),
+        }
+
+
+class _MeteredReader(io.RawIOBase):
+    """Raw stream that charges decompression CPU time to `CacheStats`."""
+
+    def __init__(self, inner: IO[bytes], stats: CacheStats) -> None:
+        super().__init__()
+        self._inner = inner
+        self._stats = stats
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # noqa: ANN001 - memoryview from io machinery
+        started = time.thread_time()
+        data = self._inner.read(len(buffer))
+        self._stats.decompress_cpu_s += time.thread_time() - started
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._inner.close()
+        super().close()
+
 
 @dataclass(frozen=True)
 class CacheEntry:
@@ -57,18 +175,31 @@ def build_cache_key(
 
 
 class CacheManager:
-    def __init__(self, root: Path) -> None:
+    def __init__(self, root: Path, *, compression: CompressionPolicy | None = None) -> None:
         self._root = Path(root)
         self._root.mkdir(parents=True, exist_ok=True)
+        self._compression = compression or CompressionPolicy()
+        self._stats = CacheStats()
 
     @classmethod
-    def from_config(cls, config: AppConfig) -> "CacheManager":
-        return cls(config.cache_dir)
+    def from_config(cls, config: AppConfig, *, root: Path | None = None) -> "CacheManager":
+        compression = CompressionPolicy.parse(
+            config.cache_compression, level=config.cache_compression_level
+        )
+        return cls(root or config.cache_dir, compression=compression)
 
     @property
     def root(self) -> Path:
         return self._root
 
+    @property
+    def compression(self) -> CompressionPolicy:
+        return self._compression
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
     def ensure_entry(self, key: str) -> CacheEntry:
         path = self._root / key
         path.mkdir(parents=True, exist_ok=True)
@@ -83,16 +214,79 @@ class CacheManager:
             return entry.artifact_path(relative_name)
         return (self._root / key) / relative_name
 
+    def stored_artifact_path(self, key: str, relative_name: str) -> Path | None:
+        """Return the on-disk path of an artifact, whichever codec stored it."""
+
+        base = (self._root / key) / relative_name
+        if base.exists():
+            return base
+        for suffix, _ in _CODECS.values():
+            candidate = base.with_name(base.name + suffix)
+            if candidate.exists():
+                return candidate
+        return None
+
+    def write_text_artifact(self, key: str, relative_name: str, text: str) -> Path:
+        """Write a text artifact, compressing it when the policy covers its type."""
+
+        target = self.artifact_path(key, relative_name, ensure=True)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        raw = text.encode("utf-8")
+        codec = self._compression.codec_for(relative_name)
+        if codec is None:
+            stored = target
+            partial = _partial_path(stored)
+            partial.write_bytes(raw)
+        else:
+            suffix, opener = _CODECS[codec]
+            stored = target.with_name(target.name + suffix)
+            partial = _partial_path(stored)
+            started = time.thread_time()
+            with opener(partial, "wb", **_level_kwargs(codec, self._compression.level)) as handle:
+                handle.write(raw)
+            self._stats.compress_cpu_s += time.thread_time() - started
+        os.replace(partial, stored)
+        self._discard_stale_variants(target, keep=stored)
+        self._stats.writes += 1
+        self._stats.raw_bytes += len(raw)
+        self._stats.stored_bytes += stored.stat().st_size
+        return stored
+
+    def open_text_artifact(self, key: str, relative_name: str) -> IO[str]:
+        """Open a text artifact for streaming reads, decompressing transparently."""
+
+        stored = self.stored_artifact_path(key, relative_name)
+        if stored is None:
+            raise FileNotFoundError(f"Cache artifact not found: {key}/{relative_name}")
+        self._stats.reads += 1
+        for suffix, opener in _CODECS.values():
+            if stored.name.endswith(suffix) and not relative_name.endswith(suffix):
+                raw = _MeteredReader(opener(stored, "rb"), self._stats)
+                buffered = io.BufferedReader(raw, buffer_size=_STREAM_CHUNK_BYTES)
+                return io.TextIOWrapper(buffered, encoding="utf-8")
+        return stored.open("r", encoding="utf-8")
+
+    def read_text_artifact(self, key: str, relative_name: str) -> str | None:
+        if self.stored_artifact_path(key, relative_name) is None:
+            return None
+        with self.open_text_artifact(key, relative_name) as handle:
+            return handle.read()
+
     def read_metadata(self, key: str) -> MutableMapping[str, object] | None:
-        path = (self._root / key) / _METADATA_FILENAME
-        if not path.exists():
+        if self.stored_artifact_path(key, _METADATA_FILENAME) is None:
             return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        with self.open_text_artifact(key, _METADATA_FILENAME) as handle:
+            return json.load(handle)
 
     def write_metadata(self, key: str, payload: Mapping[str, object]) -> Path:
-        entry = self.ensure_entry(key)
-        entry.metadata_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
-        return entry.metadata_path
+        return self.write_text_artifact(
+            key, _METADATA_FILENAME, json.dumps(payload, indent=2, sort_keys=True)
+        )
+
+    def _discard_stale_variants(self, target: Path, *, keep: Path) -> None:
+        for candidate in [target] + [target.with_name(target.name + s) for s, _ in _CODECS.values()]:
+            if candidate != keep and candidate.exists():
+                candidate.unlink()
 
     def purge_older_than(self, days: int) -> list[str]:
         """Delete cache entries whose directories are older than the threshold."""
@@ -111,4 +305,20 @@ class CacheManager:
         return removed
 
 
-__all__ = ["CacheEntry", "CacheManager", "build_cache_key"]
+def _partial_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.partial")
+
+
+def _level_kwargs(codec: str, level: int) -> Dict[str, int]:
+    if codec == "lzma":
+        return {"preset": level}
+    return {"compresslevel": level}
+
+
+__all__ = [
+    "CacheEntry",
+    "CacheManager",
+    "CacheStats",
+    "CompressionPolicy",
+    "build_cache_key",
+]
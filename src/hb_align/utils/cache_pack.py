@@ -0,0 +1,211 @@
+"""Portable cache packs for pre-warming worker hosts.
+
+A pack is a single tar stream: a JSON manifest member first, followed by every
+file of the selected cache entries. The manifest lists each file's size and
+SHA256 so `import_pack` can verify integrity while it streams, without
+extracting to a scratch area first. Entries that already exist on the target
+host are skipped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import IO, Dict, Iterator, List, Mapping
+
+from hb_align.utils.cache import CacheManager
+
+PACK_FORMAT_VERSION = 1
+_MANIFEST_NAME = "hb-align-pack.json"
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class CachePackError(RuntimeError):
+    """Raised when a cache pack is malformed or fails verification."""
+
+
+@dataclass(frozen=True)
+class PackSelector:
+    """Filters cache entries by metadata (book/tradition) and key prefix."""
+
+    book: str | None = None
+    tradition: str | None = None
+    key_prefix: str | None = None
+
+    def matches(self, key: str, metadata: Mapping[str, object] | None) -> bool:
+        if self.key_prefix and not key.startswith(self.key_prefix):
+            return False
+        if self.book is None and self.tradition is None:
+            return True
+        if not metadata:
+            return False
+        if self.book and str(metadata.get("book", "")).lower() != self.book.lower():
+            return False
+        if self.tradition and str(metadata.get("tradition", "")).lower() != self.tradition.lower():
+            return False
+        return True
+
+
+@dataclass
+class PackReport:
+    entries: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    files: int = 0
+    bytes: int = 0
+
+
+def iter_selected_keys(manager: CacheManager, selector: PackSelector) -> Iterator[str]:
+    for candidate in sorted(manager.root.iterdir()):
+        if not candidate.is_dir() or candidate.name.startswith("."):
+            continue
+        if selector.matches(candidate.name, manager.read_metadata(candidate.name)):
+            yield candidate.name
+
+
+def export_pack(manager: CacheManager, stream: IO[bytes], selector: PackSelector) -> PackReport:
+    """Write the selected cache entries to *stream* as a streaming tar pack."""
+
+    report = PackReport()
+    files: Dict[str, Dict[str, Dict[str, object]]] = {}
+    for key in iter_selected_keys(manager, selector):
+        entry_files: Dict[str, Dict[str, object]] = {}
+        for path in sorted(p for p in (manager.root / key).rglob("*") if p.is_file()):
+            relative = path.relative_to(manager.root / key).as_posix()
+            entry_files[relative] = {"size": path.stat().st_size, "sha256": _file_sha256(path)}
+        files[key] = entry_files
+        report.entries.append(key)
+
+    manifest = {
+        "format": PACK_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "selector": {
+            "book": selector.book,
+            "tradition": selector.tradition,
+            "key_prefix": selector.key_prefix,
+        },
+        "entries": files,
+    }
+    with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as archive:
+        payload = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        info = tarfile.TarInfo(_MANIFEST_NAME)
+        info.size = len(payload)
+        archive.addfile(info, io.BytesIO(payload))
+        for key, entry_files in files.items():
+            for relative in entry_files:
+                path = manager.root / key / relative
+                archive.add(path, arcname=f"{key}/{relative}", recursive=False)
+                report.files += 1
+                report.bytes += int(entry_files[relative]["size"])
+    return report
+
+
+def import_pack(manager: CacheManager, stream: IO[bytes]) -> PackReport:
+    """Stream a pack into the cache, verifying checksums and skipping existing entries."""
+
+    report = PackReport()
+    staging = manager.root / f".import-{uuid.uuid4().hex}"
+    try:
+        with tarfile.open(fileobj=stream, mode="r|*") as archive:
+            manifest = _read_manifest(archive)
+            entries: Mapping[str, Mapping[str, Mapping[str, object]]] = manifest["entries"]
+            existing = {key for key in entries if manager.entry_exists(key)}
+            report.skipped.extend(sorted(existing))
+            pending = {key: set(entry_files) for key, entry_files in entries.items()}
+            for key in list(pending):
+                if not pending[key] and key not in existing:
+                    manager.ensure_entry(key)
+                    report.entries.append(key)
+                    del pending[key]
+
+            for member in archive:
+                if member.name == _MANIFEST_NAME:
+                    continue
+                key, relative = _split_member_name(member.name)
+                if key not in entries or relative not in entries[key]:
+                    raise CachePackError(f"Pack member not listed in manifest: {member.name}")
+                if key in existing:
+                    continue
+                if not member.isfile():
+                    raise CachePackError(f"Unsupported pack member type: {member.name}")
+                expected = entries[key][relative]
+                target = staging / key / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                source = archive.extractfile(member)
+                if source is None:  # pragma: no cover - guarded by isfile()
+                    raise CachePackError(f"Unreadable pack member: {member.name}")
+                digest, size = _copy_with_digest(source, target)
+                if size != int(expected["size"]) or digest != expected["sha256"]:
+                    raise CachePackError(f"Checksum mismatch for {member.name}")
+                report.files += 1
+                report.bytes += size
+                pending[key].discard(relative)
+                if not pending[key]:
+                    (staging / key).rename(manager.root / key)
+                    report.entries.append(key)
+                    del pending[key]
+
+            incomplete = sorted(key for key in pending if key not in existing)
+            if incomplete:
+                raise CachePackError(f"Pack truncated; incomplete entries: {', '.join(incomplete)}")
+    except tarfile.TarError as exc:
+        raise CachePackError(f"Invalid cache pack: {exc}") from exc
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return report
+
+
+def _read_manifest(archive: tarfile.TarFile) -> Mapping[str, object]:
+    first = archive.next()
+    if first is None or first.name != _MANIFEST_NAME:
+        raise CachePackError("Cache pack must start with its manifest")
+    handle = archive.extractfile(first)
+    if handle is None:
+        raise CachePackError("Cache pack manifest is unreadable")
+    manifest = json.loads(handle.read().decode("utf-8"))
+    if manifest.get("format") != PACK_FORMAT_VERSION:
+        raise CachePackError(f"Unsupported cache pack format: {manifest.get('format')}")
+    return manifest
+
+
+def _split_member_name(name: str) -> tuple[str, str]:
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts or len(path.parts) < 2:
+        raise CachePackError(f"Unsafe pack member path: {name}")
+    return path.parts[0], PurePosixPath(*path.parts[1:]).as_posix()
+
+
+def _copy_with_digest(source: IO[bytes], target: Path) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with target.open("wb") as handle:
+        while chunk := source.read(_COPY_CHUNK_BYTES):
+            digest.update(chunk)
+            handle.write(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_COPY_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+__all__ = [
+    "PACK_FORMAT_VERSION",
+    "CachePackError",
+    "PackReport",
+    "PackSelector",
+    "export_pack",
+    "import_pack",
+    "iter_selected_keys",
+]
@@ -7,16 +7,32 @@ order of precedence:
 1. Environment variables
 2. A project-level `.env` file (optional)
 3. Safe defaults that match the repository layout
+
+Resolution is memoized per (env file, relevant environment variables) and has
+no filesystem side effects beyond a `stat` of the env file; directories are
+created on demand via `AppConfig.ensure_directories`. A resolved config can be
+serialized with `AppConfig.to_snapshot` and handed to worker processes, either
+through `HB_ALIGN_CONFIG_SNAPSHOT` or `install_config_snapshot`, so they skip
+resolution entirely.
 """
 
 from __future__ import annotations
 
+import json
 import os
-from dataclasses import dataclass
+import threading
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
-from typing import Dict, Mapping
+from typing import Dict, Mapping, Optional, Tuple
 
 _ENV_FILE_NAME = ".env"
+SNAPSHOT_ENV_VAR = "HB_ALIGN_CONFIG_SNAPSHOT"
+_ENV_PREFIXES = ("HB_ALIGN_", "MFA_BIN")
+_PATH_FIELDS = ("project_root", "wlc_root", "cache_dir", "output_root", "logs_dir", "prom_textfile")
+
+_CacheKey = Tuple[str, Optional[Tuple[int, int]], Tuple[Tuple[str, str], ...]]
+_CONFIG_CACHE: Dict[_CacheKey, "AppConfig"] = {}
+_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True, slots=True)
@@ -30,19 +46,108 @@ class AppConfig:
     logs_dir: Path
     mfa_executable: str
     log_format: str
+    cache_compression: str = "off"
+    cache_compression_level: int = 6
+    resource_sample_interval_ms: int = 500
+    prom_textfile: Path | None = None
 
     def ensure_directories(self) -> None:
-        """Create directories that should always exist before running commands."""
+        """Create the cache/output/log directories; run by commands before they write.
+
+        Not memoized: a directory removed while a long-lived process (the
+        daemon, `batch --watch`) is running is recreated on its next run.
+        """
 
         for candidate in (self.cache_dir, self.output_root, self.logs_dir):
             candidate.mkdir(parents=True, exist_ok=True)
 
+    def to_snapshot(self) -> str:
+        """Serialize to JSON for worker processes (see `from_snapshot`)."""
+
+        payload = {
+            key: str(value) if isinstance(value, Path) else value for key, value in asdict(self).items()
+        }
+        return json.dumps(payload, sort_keys=True)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: str) -> "AppConfig":
+        payload = json.loads(snapshot)
+        known = {item.name for item in fields(cls)}
+        values = {key: value for key, value in payload.items() if key in known}
+        for key in _PATH_FIELDS:
+            if values.get(key) is not None:
+                values[key] = Path(values[key])
+        return cls(**values)
+
 
 def load_config(env_file: str | Path | None = None) -> AppConfig:
-    """Load configuration using the precedence rules documented above."""
+    """Load configuration using the precedence rules documented above.
+
+    Results are memoized; a change to the env file (size/mtime) or to any
+    `HB_ALIGN_*`/`MFA_BIN` variable produces a fresh resolution. When
+    `HB_ALIGN_CONFIG_SNAPSHOT` is set (and no explicit env file is given) the
+    snapshot is used as-is.
+    """
 
     project_root = Path(__file__).resolve().parents[3]
-    env_map = _read_env_file(project_root, env_file)
+    env_path = Path(env_file) if env_file else project_root / _ENV_FILE_NAME
+    key = _cache_key(env_path)
+    with _LOCK:
+        cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    snapshot = os.environ.get(SNAPSHOT_ENV_VAR)
+    if snapshot and env_file is None:
+        config = AppConfig.from_snapshot(snapshot)
+    else:
+        config = _resolve(project_root, env_path)
+    with _LOCK:
+        _CONFIG_CACHE[key] = config
+    return config
+
+
+def install_config_snapshot(snapshot: str) -> AppConfig:
+    """Seed this process's config cache from a snapshot.
+
+    Intended as a `ProcessPoolExecutor` initializer so workers never resolve
+    configuration themselves.
+    """
+
+    config = AppConfig.from_snapshot(snapshot)
+    os.environ[SNAPSHOT_ENV_VAR] = snapshot
+    with _LOCK:
+        _CONFIG_CACHE.clear()
+    return config
+
+
+def snapshot_environ(config: AppConfig, base: Mapping[str, str] | None = None) -> Dict[str, str]:
+    """Environment for a child process that inherits *config* instead of re-resolving."""
+
+    env = dict(os.environ if base is None else base)
+    env[SNAPSHOT_ENV_VAR] = config.to_snapshot()
+    return env
+
+
+def clear_config_cache() -> None:
+    """Forget memoized configs (tests and long-lived processes that edit `.env`)."""
+
+    with _LOCK:
+        _CONFIG_CACHE.clear()
+
+
+def _cache_key(env_path: Path) -> _CacheKey:
+    try:
+        stat = env_path.stat()
+        signature: Optional[Tuple[int, int]] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    relevant = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith(_ENV_PREFIXES)))
+    return str(env_path), signature, relevant
+
+
+def _resolve(project_root: Path, env_path: Path) -> AppConfig:
+    env_map = _read_env_file(env_path)
 
     def read(key: str, default: str) -> str:
         return os.environ.get(key, env_map.get(key, default))
@@ -56,8 +161,12 @@ def load_config(env_file: str | Path | None = None) -> AppConfig:
     logs_dir = resolve_path(read("HB_ALIGN_LOG_DIR", str(output_root / "logs")))
     mfa_executable = read("MFA_BIN", "mfa")
     log_format = read("HB_ALIGN_LOG_FORMAT", "text")
+    cache_compression = read("HB_ALIGN_CACHE_COMPRESSION", "off")
+    cache_compression_level = int(read("HB_ALIGN_CACHE_COMPRESSION_LEVEL", "6"))
+    resource_sample_interval_ms = int(read("HB_ALIGN_SAMPLE_INTERVAL_MS", "500"))
+    prom_textfile_value = read("HB_ALIGN_PROM_TEXTFILE", "")
 
-    config = AppConfig(
+    return AppConfig(
         project_root=project_root,
         wlc_root=wlc_root,
         cache_dir=cache_dir,
@@ -65,16 +174,16 @@ def load_config(env_file: str | Path | None = None) -> AppConfig:
         logs_dir=logs_dir,
         mfa_executable=mfa_executable,
         log_format=log_format,
+        cache_compression=cache_compression,
+        cache_compression_level=cache_compression_level,
+        resource_sample_interval_ms=resource_sample_interval_ms,
+        prom_textfile=resolve_path(prom_textfile_value) if prom_textfile_value else None,
     )
 
-    config.ensure_directories()
-    return config
-
 
-def _read_env_file(project_root: Path, env_file: str | Path | None) -> Mapping[str, str]:
+def _read_env_file(path: Path) -> Mapping[str, str]:
     """Parse KEY=VALUE lines from an env file without mutating os.environ."""
 
-    path = Path(env_file) if env_file else project_root / _ENV_FILE_NAME
     if not path.exists():
         return {}
 
@@ -0,0 +1,290 @@
+"""Streaming NDJSON progress events for `process` and `batch` (`--json`/`--events`).
+
+Code paths call the module-level `emit(event, **fields)`, which is a no-op
+unless an `EventStream` is installed for the process, so the pipeline stays
+instrumented at the cost of one global lookup. `bind(book=..., chapter=...)`
+adds context fields to every event emitted inside it on the current thread or
+task.
+
+An `EventStream` serializes and writes on a background thread
+(`QueueLogSink`, drop-on-full) so a slow or absent consumer never stalls
+alignment; `dropped` counts what was shed. Destinations:
+
+* `-`: standard output (one JSON object per line);
+* `unix:/path` or the path of an existing unix socket: a stream socket,
+  reconnected every second while the listener is away (events meanwhile lost);
+* any other path: a file opened for appending.
+
+Batch pool workers install their own stream from the same destination (see
+`install_event_stream`), so chunk-level events from worker processes reach the
+consumer as they happen. Every event carries `event`, `ts`, `pid` and a
+per-process `seq`. Since those processes share one file or pipe, each event is
+written on its own and kept within `PIPE_BUF` bytes, which the OS writes
+without interleaving; a larger event is cut down to its identifying fields
+plus `truncated_bytes`.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import multiprocessing.util
+import os
+import select
+import socket
+import stat
+import sys
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import IO, Any, Dict, Iterator, Mapping, Optional
+
+from hb_align.utils.logging import QueueLogSink
+
+STDOUT = "-"
+SOCKET_PREFIX = "unix:"
+_RECONNECT_INTERVAL_S = 1.0
+# Pipe writes up to PIPE_BUF bytes are atomic (POSIX guarantees at least 512).
+MAX_EVENT_BYTES = getattr(select, "PIPE_BUF", 512)
+_TRUNCATED_FIELDS = ("event", "ts", "pid", "seq", "job_id", "book", "chapter", "file", "chunk_id")
+
+_BOUND: contextvars.ContextVar[Mapping[str, object]] = contextvars.ContextVar(
+    "hb_align_event_context", default=MappingProxyType({})
+)
+_ACTIVE: Optional["EventStream"] = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+class _EventSink(QueueLogSink):
+    def _format(self, record: Any) -> str:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        size = len(line.encode("utf-8"))
+        if size <= MAX_EVENT_BYTES:
+            return line
+        # Keep what identifies the event; those fields are short by construction.
+        stub = {key: record[key] for key in _TRUNCATED_FIELDS if key in record}
+        stub["truncated_bytes"] = size
+        return json.dumps(stub, ensure_ascii=False, default=str) + "\n"
+
+    def _write(self, records: Any) -> None:
+        # One write (and flush) per event: a batch could exceed PIPE_BUF and be
+        # split around another worker's events.
+        for record in records:
+            super()._write([record])
+
+    def _dropped_record(self, dropped: int) -> Any:
+        return {"event": "events_dropped", "ts": _utc_now(), "pid": os.getpid(), "dropped": dropped}
+
+
+class _SocketWriter:
+    """File-like adapter over a unix stream socket that never raises on write."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lost = 0
+        self._sock: Optional[socket.socket] = None
+        self._retry_at = 0.0
+
+    def write(self, text: str) -> int:
+        if self._sock is None and not self._connect():
+            self.lost += text.count("\n")
+            return 0
+        try:
+            assert self._sock is not None
+            self._sock.sendall(text.encode("utf-8"))
+        except OSError:
+            self._disconnect()
+            self.lost += text.count("\n")
+            return 0
+        return len(text)
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self._disconnect()
+
+    def _connect(self) -> bool:
+        if time.monotonic() < self._retry_at:
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            self._retry_at = time.monotonic() + _RECONNECT_INTERVAL_S
+            return False
+        self._sock = sock
+        return True
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._retry_at = time.monotonic() + _RECONNECT_INTERVAL_S
+
+
+def _socket_path(destination: str) -> Optional[str]:
+    if destination.startswith(SOCKET_PREFIX):
+        return destination[len(SOCKET_PREFIX) :]
+    try:
+        return destination if stat.S_ISSOCK(os.stat(destination).st_mode) else None
+    except OSError:
+        return None
+
+
+class EventStream:
+    """Non-blocking NDJSON event writer for one destination."""
+
+    def __init__(
+        self,
+        destination: str | IO[str],
+        *,
+        max_queue: int = 10_000,
+        flush_interval_s: float = 0.0,
+    ) -> None:
+        self.destination = destination if isinstance(destination, str) else "<stream>"
+        self._owned: Optional[Any] = None
+        if not isinstance(destination, str):
+            stream: Any = destination
+        elif destination == STDOUT:
+            stream = sys.stdout
+        elif (path := _socket_path(destination)) is not None:
+            stream = self._owned = _SocketWriter(path)
+        else:
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+            stream = self._owned = open(destination, "a", encoding="utf-8")  # noqa: SIM115
+        self._seq = itertools.count(1)
+        self._closed = False
+        self._sink = _EventSink(
+            stream, flush_interval_s=flush_interval_s, max_queue=max_queue, overflow="drop"
+        )
+
+    @property
+    def dropped(self) -> int:
+        lost = getattr(self._owned, "lost", 0)
+        return self._sink.dropped + lost
+
+    def emit(self, event: str, **fields: object) -> None:
+        if self._closed:
+            return
+        record: Dict[str, object] = {"event": event, "ts": _utc_now(), "pid": os.getpid()}
+        record["seq"] = next(self._seq)
+        record.update(_BOUND.get())
+        record.update(fields)
+        self._sink.submit(record)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._sink.close()
+        if self._owned is not None:
+            self._owned.close()
+
+    @contextmanager
+    def activate(self) -> Iterator["EventStream"]:
+        """Install as the process-wide stream for the duration of the block, then close."""
+
+        previous = _swap(self)
+        try:
+            yield self
+        finally:
+            _swap(previous)
+            self.close()
+
+
+def _swap(stream: Optional[EventStream]) -> Optional[EventStream]:
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        previous, _ACTIVE = _ACTIVE, stream
+    return previous
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def active_stream() -> Optional[EventStream]:
+    return _ACTIVE
+
+
+def emit(event: str, **fields: object) -> None:
+    stream = _ACTIVE
+    if stream is not None:
+        stream.emit(event, **fields)
+
+
+@contextmanager
+def bind(**fields: object) -> Iterator[None]:
+    """Attach *fields* to every event emitted inside the block."""
+
+    token = _BOUND.set({**_BOUND.get(), **fields})
+    try:
+        yield
+    finally:
+        _BOUND.reset(token)
+
+
+def active_destination() -> Optional[str]:
+    """Destination for pool workers to reopen, or None when events are off."""
+
+    stream = _ACTIVE
+    return stream.destination if stream is not None else None
+
+
+@contextmanager
+def event_output(
+    *, json_stdout: bool = False, destination: Optional[str] = None
+) -> Iterator[Optional[EventStream]]:
+    """CLI helper for `--json` / `--events DEST`.
+
+    With `json_stdout`, events own standard output and human-readable output
+    is redirected to standard error for the duration of the block.
+    """
+
+    if not json_stdout and destination is None:
+        yield None
+        return
+    stream = EventStream(STDOUT if json_stdout else destination)  # type: ignore[arg-type]
+    with stream.activate():
+        if json_stdout:
+            with redirect_stdout(sys.stderr):
+                yield stream
+        else:
+            yield stream
+
+
+def install_event_stream(destination: Optional[str]) -> None:
+    """Pool-worker initializer: open this process's own stream (or none).
+
+    Forked workers inherit the parent's stream object but not its writer
+    thread, so it is always replaced. `-` means the worker's file descriptor 1.
+    """
+
+    stream = None
+    if destination == STDOUT:
+        stream = EventStream(sys.__stdout__)
+    elif destination is not None:
+        stream = EventStream(destination)
+    if stream is not None:
+        # Pool workers leave through os._exit, which skips atexit; multiprocessing
+        # still runs its own finalizers, so drain the stream there.
+        multiprocessing.util.Finalize(stream, stream.close, exitpriority=10)
+    _swap(stream)
+
+
+__all__ = [
+    "STDOUT",
+    "EventStream",
+    "active_destination",
+    "active_stream",
+    "bind",
+    "emit",
+    "event_output",
+    "install_event_stream",
+]
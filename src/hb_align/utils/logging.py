@@ -2,22 +2,180 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import queue
+import threading
 import time
 import uuid
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Mapping, MutableMapping, Optional
+from typing import TYPE_CHECKING, Dict, List, Mapping, MutableMapping, Optional, Tuple
 
 from rich.console import Console
 from rich.text import Text
 
+if TYPE_CHECKING:
+    from hb_align.utils.prometheus import AlignmentMetricsExporter
+    from hb_align.utils.resources import ResourceSampler
+    from hb_align.utils.tracing import Tracer
+
 DEFAULT_LOG_FORMAT = "text"
+OVERFLOW_POLICIES = ("block", "drop")
+
+_LogRecord = Tuple[str, str, float, Mapping[str, object]]
+_LIVE_SINKS: "weakref.WeakSet[QueueLogSink]" = weakref.WeakSet()
+_TICK = object()
+
+
+def _format_json_record(record: _LogRecord) -> str:
+    level, message, created, fields = record
+    payload = {
+        "level": level,
+        "message": message,
+        "ts": datetime.fromtimestamp(created, timezone.utc).isoformat(),
+    }
+    payload.update(fields)
+    return json.dumps(payload, default=str) + "\n"
+
+
+class QueueLogSink:
+    """Queue-backed JSON log writer that batches serialization and flushes off-thread.
+
+    `submit` only enqueues a raw record; a background thread formats records and
+    writes them in batches, flushing once `max_batch` records are pending or
+    `flush_interval_s` has elapsed. When the queue is full the `overflow` policy
+    either blocks the caller (backpressure) or drops the record and counts it.
+    Every live sink is drained at interpreter exit, including after an unhandled
+    exception; call `close()` to drain earlier.
+    """
+
+    def __init__(
+        self,
+        stream,
+        *,
+        max_batch: int = 256,
+        flush_interval_s: float = 0.25,
+        max_queue: int = 10_000,
+        overflow: str = "block",
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self._stream = stream
+        self._max_batch = max(1, max_batch)
+        self._flush_interval = max(0.0, flush_interval_s)
+        self._overflow = overflow
+        self._queue: "queue.Queue[_LogRecord | None]" = queue.Queue(maxsize=max_queue)
+        self._dropped = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="hb-align-log-sink", daemon=True)
+        self._thread.start()
+        _LIVE_SINKS.add(self)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def submit(self, record: _LogRecord) -> bool:
+        """Enqueue *record*; returns False when it was dropped."""
+
+        # Under the lock so no record lands behind the sentinel `close` enqueues.
+        with self._lock:
+            if self._closed:
+                self._write([record])
+                return True
+            if self._overflow == "block":
+                self._queue.put(record)
+                return True
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._dropped += 1
+                return False
+        return True
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Drain pending records, flush the stream and stop the writer thread."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        _LIVE_SINKS.discard(self)
+
+    def _run(self) -> None:
+        pending: List[_LogRecord] = []
+        deadline: float | None = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _TICK
+            while item is not _TICK:
+                if item is None:
+                    stopping = True
+                    break
+                pending.append(item)
+                if len(pending) >= self._max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = _TICK
+            if pending and deadline is None:
+                deadline = time.monotonic() + self._flush_interval
+            if pending and (
+                stopping or len(pending) >= self._max_batch or time.monotonic() >= (deadline or 0.0)
+            ):
+                self._write(pending)
+                pending = []
+                deadline = None
+        leftovers: List[_LogRecord] = []  # anything queued behind the sentinel is still written
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+        if leftovers:
+            self._write(leftovers)
+        if self._dropped:
+            self._write([self._dropped_record(self._dropped)])
+
+    def _format(self, record: _LogRecord) -> str:
+        return _format_json_record(record)
+
+    def _dropped_record(self, dropped: int) -> _LogRecord:
+        return ("warning", "log-records-dropped", time.time(), {"dropped": dropped})
+
+    def _write(self, records: List[_LogRecord]) -> None:
+        try:
+            self._stream.write("".join(self._format(record) for record in records))
+            self._stream.flush()
+        except ValueError:  # pragma: no cover - stream closed underneath us at shutdown
+            pass
+
+
+@atexit.register
+def _drain_live_sinks() -> None:
+    for sink in list(_LIVE_SINKS):
+        sink.close()
 
 
 class StructuredLogger:
-    """Small wrapper that emits either text or JSON logs."""
+    """Small wrapper that emits either text or JSON logs.
+
+    Pass a `QueueLogSink` as *sink* to move JSON serialization and flushing off
+    the calling thread.
+    """
 
     def __init__(
         self,
@@ -25,10 +183,12 @@ class StructuredLogger:
         log_format: str = DEFAULT_LOG_FORMAT,
         console: Console | None = None,
         json_stream=None,
+        sink: QueueLogSink | None = None,
     ) -> None:
         self._format = log_format
         self._console = console or Console()
         self._json_stream = json_stream
+        self._sink = sink
 
     def info(self, message: str, **fields) -> None:
         self._emit("info", message, fields)
@@ -42,7 +202,14 @@ class StructuredLogger:
     def debug(self, message: str, **fields) -> None:
         self._emit("debug", message, fields)
 
+    def close(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+
     def _emit(self, level: str, message: str, fields: Mapping[str, object]) -> None:
+        if self._sink is not None and self._format == "json":
+            self._sink.submit((level, message, time.time(), fields))
+            return
         payload = {
             "level": level,
             "message": message,
@@ -75,9 +242,11 @@ class SummaryMetrics:
     cache_status: Optional[str] = None
     created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     notes: list[str] = field(default_factory=list)
+    resources: MutableMapping[str, object] = field(default_factory=dict)
+    extra: MutableMapping[str, object] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, object]:
-        return {
+        payload: Dict[str, object] = {
             "run_id": self.run_id,
             "book": self.book,
             "chapter": self.chapter,
@@ -92,6 +261,10 @@ class SummaryMetrics:
             "created_at": self.created_at,
             "notes": list(self.notes),
         }
+        if self.resources:
+            payload["resources"] = dict(self.resources)
+        payload.update(self.extra)
+        return payload
 
 
 class SummaryWriter:
@@ -121,6 +294,22 @@ class SummaryWriter:
     def record_duration(self, stage: str, duration_ms: int) -> None:
         self._metrics.durations_ms[stage] = duration_ms
 
+    def record_spans(self, tracer: "Tracer") -> None:
+        """Roll span timings up into `durations_ms` (total ms per span name)."""
+
+        for stage, duration_ms in tracer.rollup().items():
+            self.record_duration(stage, duration_ms)
+
+    def record_resources(self, sampler: "ResourceSampler") -> None:
+        """Store the sampler's peak/percentile/per-stage summary under `resources`."""
+
+        self._metrics.resources = sampler.summary()
+
+    def update_extra(self, values: Mapping[str, object]) -> None:
+        """Attach additional top-level fields to the written summary."""
+
+        self._metrics.extra.update(values)
+
     def set_cache_status(self, status: str) -> None:
         self._metrics.cache_status = status
 
@@ -133,8 +322,15 @@ class SummaryWriter:
         target.write_text(json.dumps(self._metrics.to_dict(), indent=2, sort_keys=True), encoding="utf-8")
         return target
 
+    def write_prometheus(self, exporter: "AlignmentMetricsExporter") -> Path:
+        """Fold this summary into a Prometheus textfile and rewrite it atomically."""
+
+        exporter.observe_summary(self._metrics.to_dict())
+        return exporter.flush()
+
 
 __all__ = [
+    "QueueLogSink",
     "StructuredLogger",
     "SummaryWriter",
     "SummaryMetrics",
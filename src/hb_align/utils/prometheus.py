@@ -0,0 +1,351 @@
+"""Prometheus textfile-collector exporter for process and batch runs.
+
+node_exporter's textfile collector scrapes `*.prom` files from a directory, so
+every write goes to a temporary file in the same directory followed by an
+atomic `os.replace`. Separate `hb-align process` invocations, batch hosts and
+watchers share one file: on every flush the exporter reloads the values on
+disk under a lock and adds only what it recorded since its previous flush,
+keeping counters and histograms monotonic across all writers.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+STAGE_BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+COVERAGE_BUCKETS_PCT = (50, 80, 90, 95, 97, 98, 99, 99.5, 100)
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(.*)\})?\s+(\S+)$")
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def _label_key(labels: Mapping[str, object]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def _render_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    items = list(key) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+@dataclass
+class _Metric:
+    name: str
+    help: str
+    kind: str
+    values: Dict[LabelKey, float] = field(default_factory=dict)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key in sorted(self.values):
+            lines.append(f"{self.name}{_render_labels(key)} {_format_value(self.values[key])}")
+        return lines
+
+
+class Counter(_Metric):
+    def __init__(self, name: str, help: str) -> None:
+        super().__init__(name=name, help=help, kind="counter")
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    def __init__(self, name: str, help: str) -> None:
+        super().__init__(name=name, help=help, kind="gauge")
+
+    def set(self, value: float, **labels: object) -> None:
+        self.values[_label_key(labels)] = float(value)
+
+
+class Histogram(_Metric):
+    def __init__(self, name: str, help: str, buckets: Sequence[float]) -> None:
+        super().__init__(name=name, help=help, kind="histogram")
+        self.buckets = tuple(sorted(float(b) for b in buckets)) + (float("inf"),)
+        self.bucket_counts: Dict[LabelKey, List[float]] = {}
+        self.sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _label_key(labels)
+        counts = self.bucket_counts.setdefault(key, [0.0] * len(self.buckets))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self.sums[key] = self.sums.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key in sorted(self.bucket_counts):
+            counts = self.bucket_counts[key]
+            for bound, count in zip(self.buckets, counts, strict=True):
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_render_labels(key, [('le', le)])} {_format_value(count)}")
+            lines.append(f"{self.name}_sum{_render_labels(key)} {_format_value(self.sums.get(key, 0.0))}")
+            lines.append(f"{self.name}_count{_render_labels(key)} {_format_value(counts[-1])}")
+        return lines
+
+    def _load(self, suffix: str, labels: Dict[str, str], value: float) -> None:
+        le = labels.pop("le", None)
+        key = _label_key(labels)
+        counts = self.bucket_counts.setdefault(key, [0.0] * len(self.buckets))
+        if suffix == "_sum":
+            self.sums[key] = value
+        elif suffix == "_bucket" and le is not None:
+            bound = float("inf") if le == "+Inf" else float(le)
+            if bound in self.buckets:
+                counts[self.buckets.index(bound)] = value
+
+
+class PromRegistry:
+    """Thread-safe collection of metrics rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(name, lambda: Counter(name, help))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._register(name, lambda: Gauge(name, help))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float]) -> Histogram:
+        return self._register(name, lambda: Histogram(name, help, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            lines: List[str] = []
+            for name in sorted(self._metrics):
+                lines.extend(self._metrics[name].render())
+            return "\n".join(lines) + "\n"
+
+    def load_text(self, text: str) -> None:
+        """Restore values for registered metrics from a previously rendered file."""
+
+        with self._lock:
+            for raw_line in text.splitlines():
+                match = _SAMPLE_RE.match(raw_line.strip())
+                if not match or raw_line.startswith("#"):
+                    continue
+                name, _, label_text, raw_value = match.groups()
+                labels = {k: _unescape(v) for k, v in _LABEL_RE.findall(label_text or "")}
+                value = float("inf") if raw_value == "+Inf" else float(raw_value)
+                metric = self._metrics.get(name)
+                if metric is not None and not isinstance(metric, Histogram):
+                    metric.values[_label_key(labels)] = value
+                    continue
+                for suffix in ("_bucket", "_sum", "_count"):
+                    base = self._metrics.get(name[: -len(suffix)]) if name.endswith(suffix) else None
+                    if isinstance(base, Histogram):
+                        base._load(suffix, labels, value)
+                        break
+
+    def write_textfile(self, path: Path | str) -> Path:
+        """Atomically replace *path* with the current rendering."""
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp.write_text(self.render(), encoding="utf-8")
+        os.chmod(temp, 0o644)
+        os.replace(temp, target)
+        return target
+
+    def _register(self, name: str, factory) -> _Metric:  # noqa: ANN001
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+
+class AlignmentMetricsExporter:
+    """Standard hb-align metrics backed by one `.prom` textfile."""
+
+    def __init__(self, path: Path | str, *, job: str = "process", resume: bool = True) -> None:
+        self.path = Path(path)
+        self.job = job
+        self.registry = PromRegistry()
+        r = self.registry
+        self.chapters = r.counter("hb_align_chapters_processed_total", "Chapters processed by status.")
+        self.words = r.counter("hb_align_words_aligned_total", "Words aligned across processed chapters.")
+        self.expected_words = r.counter("hb_align_words_expected_total", "Words expected from the WLC text.")
+        self.stage_latency = r.histogram(
+            "hb_align_stage_duration_seconds", "Per-stage latency of alignment runs.", STAGE_BUCKETS_S
+        )
+        self.cache_lookups = r.counter("hb_align_cache_lookups_total", "Chapter cache lookups by result.")
+        self.mfa_failures = r.counter("hb_align_mfa_failures_total", "Chapters that failed inside MFA or I/O.")
+        self.coverage = r.histogram(
+            "hb_align_coverage_pct", "Distribution of chapter coverage percentages.", COVERAGE_BUCKETS_PCT
+        )
+        self.last_update = r.gauge("hb_align_last_update_timestamp_seconds", "Unix time of the last update.")
+        self.queue_depth = r.gauge("hb_align_batch_queue_depth", "Current depth of a staged-batch queue.")
+        self.queue_max_depth = r.gauge(
+            "hb_align_batch_queue_max_depth", "Deepest a staged-batch queue got during the current batch."
+        )
+        self.queue_stall = r.gauge(
+            "hb_align_batch_queue_stall_seconds",
+            "Time blocked on a staged-batch queue this batch (side=put: full, side=get: empty).",
+        )
+        self.stage_busy = r.gauge(
+            "hb_align_batch_stage_busy_seconds", "Worker time spent inside each batch stage this batch."
+        )
+        self._flushed = PromRegistry()
+        _mirror(self.registry, self._flushed)
+        self._merge_disk = resume
+
+    def observe_summary(self, summary: Mapping[str, object]) -> None:
+        """Fold one chapter's `summary.json` payload into the metrics."""
+
+        with self.registry.lock:
+            status = "success" if summary.get("coverage_passed", True) else "coverage_failed"
+            self.chapters.inc(job=self.job, status=status)
+            self.words.inc(float(summary.get("aligned_words", 0) or 0), job=self.job)
+            self.expected_words.inc(float(summary.get("expected_words", 0) or 0), job=self.job)
+            durations = summary.get("durations_ms") or {}
+            if isinstance(durations, Mapping):
+                for stage, duration_ms in durations.items():
+                    self.stage_latency.observe(float(duration_ms) / 1000, job=self.job, stage=stage)
+            cache_status = summary.get("cache_status")
+            if cache_status:
+                self.cache_lookups.inc(job=self.job, result=str(cache_status))
+            if "coverage_pct" in summary:
+                self.coverage.observe(float(summary["coverage_pct"]), job=self.job)
+
+    def observe_pipeline(self, stats: Mapping[str, object]) -> None:
+        """Publish `StagedBatch.stats()`; gauges, since they describe the current batch only."""
+
+        with self.registry.lock:
+            queues = stats.get("queues") or {}
+            if isinstance(queues, Mapping):
+                for name, queue_stats in queues.items():
+                    self.queue_depth.set(float(queue_stats.get("depth", 0)), job=self.job, queue=name)
+                    self.queue_max_depth.set(float(queue_stats.get("max_depth", 0)), job=self.job, queue=name)
+                    for side in ("put", "get"):
+                        key = "put_stall_ms" if side == "put" else "get_wait_ms"
+                        self.queue_stall.set(
+                            float(queue_stats.get(key, 0)) / 1000, job=self.job, queue=name, side=side
+                        )
+            busy = stats.get("busy_ms") or {}
+            if isinstance(busy, Mapping):
+                for stage, busy_ms in busy.items():
+                    self.stage_busy.set(float(busy_ms) / 1000, job=self.job, stage=stage)
+
+    def observe_failure(self, reason: str = "mfa") -> None:
+        with self.registry.lock:
+            self.chapters.inc(job=self.job, status="failed")
+            self.mfa_failures.inc(job=self.job, reason=reason)
+
+    def flush(self) -> Path:
+        """Write the textfile atomically: the totals on disk plus this exporter's delta.
+
+        `registry` holds only this exporter's own totals. Each flush re-reads the
+        file under the lock, so counts other writers flushed in between are kept;
+        with `resume=False` the first flush starts the file over instead.
+        """
+
+        with self.registry.lock, _file_lock(self.path):
+            self.last_update.set(time.time(), job=self.job)
+            combined = PromRegistry()
+            _mirror(self.registry, combined)
+            if self._merge_disk and self.path.exists():
+                combined.load_text(self.path.read_text(encoding="utf-8"))
+            _fold_delta(combined, self.registry, self._flushed)
+            written = combined.write_textfile(self.path)
+            _copy_values(self.registry, self._flushed)
+            self._merge_disk = True
+            return written
+
+
+def _mirror(source: PromRegistry, target: PromRegistry) -> None:
+    for name, metric in source._metrics.items():
+        if isinstance(metric, Histogram):
+            target.histogram(name, metric.help, metric.buckets[:-1])
+        elif isinstance(metric, Counter):
+            target.counter(name, metric.help)
+        else:
+            target.gauge(name, metric.help)
+
+
+def _fold_delta(target: PromRegistry, live: PromRegistry, flushed: PromRegistry) -> None:
+    """Add what *live* gained since *flushed* to *target*; gauges take *live*'s values."""
+
+    for name, metric in live._metrics.items():
+        out, before = target._metrics[name], flushed._metrics[name]
+        if isinstance(metric, Histogram) and isinstance(out, Histogram) and isinstance(before, Histogram):
+            for key, counts in metric.bucket_counts.items():
+                base = before.bucket_counts.get(key, [0.0] * len(counts))
+                mine = out.bucket_counts.setdefault(key, [0.0] * len(counts))
+                out.bucket_counts[key] = [
+                    total + now - then for total, now, then in zip(mine, counts, base, strict=True)
+                ]
+                gained = metric.sums.get(key, 0.0) - before.sums.get(key, 0.0)
+                out.sums[key] = out.sums.get(key, 0.0) + gained
+        elif isinstance(metric, Counter):
+            for key, value in metric.values.items():
+                out.values[key] = out.values.get(key, 0.0) + value - before.values.get(key, 0.0)
+        else:
+            out.values.update(metric.values)
+
+
+def _copy_values(source: PromRegistry, target: PromRegistry) -> None:
+    for name, metric in source._metrics.items():
+        copy = target._metrics[name]
+        copy.values = dict(metric.values)
+        if isinstance(metric, Histogram) and isinstance(copy, Histogram):
+            copy.bucket_counts = {key: list(counts) for key, counts in metric.bucket_counts.items()}
+            copy.sums = dict(metric.sums)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = path.with_name(f".{path.name}.lock")
+    with lock_path.open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+__all__ = [
+    "AlignmentMetricsExporter",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "PromRegistry",
+]
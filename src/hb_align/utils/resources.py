@@ -0,0 +1,334 @@
+"""Background CPU/memory/I/O sampler for alignment runs.
+
+`ResourceSampler` runs a daemon thread that periodically reads `/proc/<pid>`
+for the current process and all live descendants (MFA subprocesses included)
+and keeps a compact list of samples. `summary()` reduces them to peak RSS, CPU
+seconds, I/O bytes, CPU% percentiles and per-stage averages for `summary.json`.
+On platforms without `/proc` it falls back to `resource.getrusage`, which only
+provides CPU time and peak RSS.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_PROC = Path("/proc")
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+DEFAULT_INTERVAL_S = 0.5
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    elapsed_s: float
+    rss_bytes: int
+    cpu_seconds: float
+    read_bytes: int
+    write_bytes: int
+    system_cpu_pct: Optional[float]
+    stage: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class _ProcStat:
+    ppid: int
+    cpu_ticks: int
+    rss_pages: int
+
+
+def read_system_cpu_times() -> Optional[Tuple[int, int]]:
+    """Return (busy, total) jiffies from /proc/stat, or None when unavailable."""
+
+    try:
+        with (_PROC / "stat").open(encoding="ascii") as handle:
+            fields = handle.readline().split()[1:]
+    except OSError:
+        return None
+    values = [int(value) for value in fields]
+    idle = values[3] + (values[4] if len(values) > 4 else 0)
+    total = sum(values[:8])
+    return total - idle, total
+
+
+def system_cpu_pct(previous: Tuple[int, int] | None, current: Tuple[int, int] | None) -> Optional[float]:
+    if previous is None or current is None:
+        return None
+    busy = current[0] - previous[0]
+    total = current[1] - previous[1]
+    return (busy / total) * 100 if total > 0 else None
+
+
+def _read_proc_stat(pid: int) -> Optional[_ProcStat]:
+    try:
+        raw = (_PROC / str(pid) / "stat").read_text(encoding="ascii", errors="replace")
+    except OSError:
+        return None
+    # The command name may contain spaces; fields resume after the last ')'.
+    fields = raw[raw.rfind(")") + 2 :].split()
+    try:
+        utime, stime, cutime, cstime = (int(fields[i]) for i in (11, 12, 13, 14))
+        return _ProcStat(
+            ppid=int(fields[1]),
+            cpu_ticks=utime + stime + cutime + cstime,
+            rss_pages=int(fields[21]),
+        )
+    except (IndexError, ValueError):
+        return None
+
+
+def _read_proc_io(pid: int) -> Tuple[int, int]:
+    read_bytes = write_bytes = 0
+    try:
+        with (_PROC / str(pid) / "io").open(encoding="ascii") as handle:
+            for line in handle:
+                key, _, value = line.partition(":")
+                if key == "read_bytes":
+                    read_bytes = int(value)
+                elif key == "write_bytes":
+                    write_bytes = int(value)
+    except (OSError, ValueError):
+        pass
+    return read_bytes, write_bytes
+
+
+def _descendants(root_pid: int) -> List[int]:
+    """Live descendants of *root_pid*, via task children files or a /proc scan."""
+
+    children_files = list((_PROC / str(root_pid) / "task").glob("*/children"))
+    if children_files:
+        found: List[int] = []
+        frontier = [root_pid]
+        while frontier:
+            pid = frontier.pop()
+            for children_file in (_PROC / str(pid) / "task").glob("*/children"):
+                try:
+                    kids = [int(value) for value in children_file.read_text().split()]
+                except (OSError, ValueError):
+                    continue
+                found.extend(kids)
+                frontier.extend(kids)
+        return found
+
+    parents: Dict[int, int] = {}
+    for entry in _PROC.iterdir():
+        if entry.name.isdigit():
+            stat = _read_proc_stat(int(entry.name))
+            if stat is not None:
+                parents[int(entry.name)] = stat.ppid
+    found = []
+    frontier = [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        kids = [child for child, parent in parents.items() if parent == pid]
+        found.extend(kids)
+        frontier.extend(kids)
+    return found
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class ResourceSampler:
+    """Samples the process tree's resource usage on a background thread."""
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = DEFAULT_INTERVAL_S,
+        stage_provider: Callable[[], Optional[str]] | None = None,
+        pid: int | None = None,
+        include_children: bool = True,
+    ) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive")
+        self._interval = interval_s
+        self._stage_provider = stage_provider
+        self._pid = pid or os.getpid()
+        self._include_children = include_children
+        self._samples: List[ResourceSample] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at = 0.0
+        self._use_proc = (_PROC / str(self._pid) / "stat").exists()
+        self._last_system: Optional[Tuple[int, int]] = None
+        # Last counters of each child seen, dropped once /proc shows it reaped.
+        self._child_totals: Dict[int, Tuple[int, int, int]] = {}
+
+    @property
+    def samples(self) -> List[ResourceSample]:
+        with self._lock:
+            return list(self._samples)
+
+    def start(self) -> "ResourceSampler":
+        self._started_at = time.monotonic()
+        self._last_system = read_system_cpu_times()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="hb-align-resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+
+    def __getstate__(self) -> Dict[str, object]:
+        # A stopped sampler is shipped back from pool workers: keep the samples only.
+        state = dict(self.__dict__)
+        for name in ("_lock", "_stop", "_thread", "_stage_provider"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stage_provider = None
+
+    def __enter__(self) -> "ResourceSampler":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def sample(self) -> ResourceSample:
+        stage = self._stage_provider() if self._stage_provider else None
+        if self._use_proc:
+            rss, cpu, read_bytes, write_bytes = self._read_tree()
+        else:
+            rss, cpu, read_bytes, write_bytes = self._read_rusage()
+        current_system = read_system_cpu_times()
+        sample = ResourceSample(
+            elapsed_s=time.monotonic() - self._started_at,
+            rss_bytes=rss,
+            cpu_seconds=cpu,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            system_cpu_pct=system_cpu_pct(self._last_system, current_system),
+            stage=stage,
+        )
+        self._last_system = current_system
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def summary(self) -> Dict[str, object]:
+        samples = self.samples
+        if not samples:
+            return {}
+        cpu_pct: List[float] = []
+        per_stage: Dict[str, Dict[str, List[float]]] = {}
+        for previous, current in pairwise(samples):
+            wall = current.elapsed_s - previous.elapsed_s
+            if wall <= 0:
+                continue
+            pct = max(0.0, (current.cpu_seconds - previous.cpu_seconds) / wall * 100)
+            cpu_pct.append(pct)
+            if current.stage:
+                bucket = per_stage.setdefault(current.stage, {"cpu_pct": [], "rss_bytes": []})
+                bucket["cpu_pct"].append(pct)
+                bucket["rss_bytes"].append(current.rss_bytes)
+        rss_values = [float(item.rss_bytes) for item in samples]
+        system_values = [item.system_cpu_pct for item in samples if item.system_cpu_pct is not None]
+        first, last = samples[0], samples[-1]
+        return {
+            "interval_ms": round(self._interval * 1000),
+            "samples": len(samples),
+            "wall_seconds": round(last.elapsed_s - first.elapsed_s, 3),
+            "cpu_seconds": round(last.cpu_seconds - first.cpu_seconds, 3),
+            "peak_rss_bytes": int(max(rss_values)),
+            "io_read_bytes": last.read_bytes - first.read_bytes,
+            "io_write_bytes": last.write_bytes - first.write_bytes,
+            "cpu_count": os.cpu_count() or 1,
+            "cpu_pct": _summarize(cpu_pct),
+            "system_cpu_pct": _summarize(system_values),
+            "rss_bytes": _summarize(rss_values, as_int=True),
+            "per_stage": {
+                stage: {
+                    "samples": len(values["cpu_pct"]),
+                    "avg_cpu_pct": round(sum(values["cpu_pct"]) / len(values["cpu_pct"]), 2),
+                    "avg_rss_bytes": int(sum(values["rss_bytes"]) / len(values["rss_bytes"])),
+                }
+                for stage, values in per_stage.items()
+            },
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.sample()
+
+    def _read_tree(self) -> Tuple[int, float, int, int]:
+        own = _read_proc_stat(self._pid)
+        rss_pages = own.rss_pages if own else 0
+        ticks = own.cpu_ticks if own else 0
+        read_bytes, write_bytes = _read_proc_io(self._pid)
+        if self._include_children:
+            for child in _descendants(self._pid):
+                stat = _read_proc_stat(child)
+                if stat is None:
+                    continue
+                child_read, child_write = _read_proc_io(child)
+                rss_pages += stat.rss_pages
+                self._child_totals[child] = (stat.cpu_ticks, child_read, child_write)
+        # Reaped children are already folded into our cutime/cstime and our own
+        # I/O counters; only add the children that are still alive to avoid
+        # double counting them.
+        for pid in [pid for pid in self._child_totals if not (_PROC / str(pid)).exists()]:
+            del self._child_totals[pid]
+        for child_ticks, child_read, child_write in self._child_totals.values():
+            ticks += child_ticks
+            read_bytes += child_read
+            write_bytes += child_write
+        return rss_pages * _PAGE_SIZE, ticks / _CLK_TCK, read_bytes, write_bytes
+
+    @staticmethod
+    def _read_rusage() -> Tuple[int, float, int, int]:
+        import resource  # Unix-only; imported lazily for portability.
+
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+        return int(own.ru_maxrss * 1024), cpu, 0, 0
+
+
+def _summarize(values: Iterable[float], *, as_int: bool = False) -> Dict[str, float]:
+    data = list(values)
+    if not data:
+        return {}
+    result = {
+        "avg": sum(data) / len(data),
+        "p50": _percentile(data, 50),
+        "p90": _percentile(data, 90),
+        "p99": _percentile(data, 99),
+        "max": max(data),
+    }
+    if as_int:
+        return {key: int(value) for key, value in result.items()}
+    return {key: round(value, 2) for key, value in result.items()}
+
+
+__all__ = [
+    "DEFAULT_INTERVAL_S",
+    "ResourceSample",
+    "ResourceSampler",
+    "read_system_cpu_times",
+    "system_cpu_pct",
+]
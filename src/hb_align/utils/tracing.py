@@ -0,0 +1,206 @@
+"""Hierarchical timing spans with Chrome trace-event export.
+
+A `Tracer` records nested spans (name, start, duration, pid/tid, parent). Code
+paths open spans through the module-level `span` context manager or the
+`traced` decorator, which record on the tracer activated for the current
+context and are no-ops otherwise, so library code can stay instrumented
+without threading a tracer argument everywhere.
+
+`Tracer.rollup()` sums span durations per name for `SummaryMetrics.durations_ms`;
+`Tracer.write_chrome_trace()` writes a file loadable in chrome://tracing or
+Perfetto for a flamegraph-style view of a run.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_ACTIVE_TRACER: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar(
+    "hb_align_active_tracer", default=None
+)
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    start_ns: int
+    duration_ns: int
+    pid: int
+    tid: int
+    depth: int
+    parent: Optional[str] = None
+    args: Mapping[str, object] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1_000_000
+
+
+class Tracer:
+    """Collects spans for one run; safe to share across threads."""
+
+    def __init__(self) -> None:
+        self._origin_ns = time.perf_counter_ns()
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._stacks: Dict[int, List[str]] = {}
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    @property
+    def origin_ns(self) -> int:
+        return self._origin_ns
+
+    def add_spans(self, spans: Iterable[Span], origin_ns: int) -> None:
+        """Adopt spans recorded by another tracer (e.g. in a worker process).
+
+        `perf_counter_ns` is system-wide monotonic on Linux, so rebasing by the
+        difference in origins puts them on this tracer's timeline.
+        """
+
+        shift = origin_ns - self._origin_ns
+        rebased = [replace(item, start_ns=item.start_ns + shift) for item in spans]
+        with self._lock:
+            self._spans.extend(rebased)
+
+    def current_stage(self, thread_ident: Optional[int] = None) -> Optional[str]:
+        """Name of the outermost open span on a thread (default: the calling thread).
+
+        Samplers running on their own thread pass the ident of the thread being
+        traced to attribute their samples to its current stage.
+        """
+
+        ident = threading.get_ident() if thread_ident is None else thread_ident
+        stack = self._stacks.get(ident)
+        return stack[0] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **args: object) -> Iterator[None]:
+        stack = self._stacks.setdefault(threading.get_ident(), [])
+        parent = stack[-1] if stack else None
+        depth = len(stack)
+        stack.append(name)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            stack.pop()
+            record = Span(
+                name=name,
+                start_ns=start - self._origin_ns,
+                duration_ns=duration,
+                pid=os.getpid(),
+                tid=threading.get_native_id(),
+                depth=depth,
+                parent=parent,
+                args=dict(args),
+            )
+            with self._lock:
+                self._spans.append(record)
+
+    def traced(self, name: Optional[str] = None) -> Callable[[F], F]:
+        def decorator(func: F) -> F:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*a: Any, **kw: Any) -> Any:
+                with self.span(span_name):
+                    return func(*a, **kw)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this tracer the target of module-level `span`/`traced` calls."""
+
+        token = _ACTIVE_TRACER.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_TRACER.reset(token)
+
+    def rollup(self) -> Dict[str, int]:
+        """Total milliseconds per span name (repeated spans such as per-chunk work add up)."""
+
+        totals: Dict[str, int] = {}
+        for item in self.spans:
+            totals[item.name] = totals.get(item.name, 0) + item.duration_ns
+        return {name: round(total / 1_000_000) for name, total in totals.items()}
+
+    def to_chrome_trace(self, *, metadata: Mapping[str, object] | None = None) -> Dict[str, object]:
+        events: List[Dict[str, object]] = [
+            {
+                "name": item.name,
+                "cat": item.parent or "run",
+                "ph": "X",
+                "ts": item.start_ns / 1000,
+                "dur": item.duration_ns / 1000,
+                "pid": item.pid,
+                "tid": item.tid,
+                "args": dict(item.args),
+            }
+            for item in sorted(self.spans, key=lambda s: (s.start_ns, s.depth))
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": dict(metadata or {}),
+        }
+
+    def write_chrome_trace(self, path: Path | str, *, metadata: Mapping[str, object] | None = None) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.to_chrome_trace(metadata=metadata), default=str), encoding="utf-8")
+        return target
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _ACTIVE_TRACER.get()
+
+
+@contextmanager
+def span(name: str, **args: object) -> Iterator[None]:
+    """Record a span on the active tracer (no-op when none is active)."""
+
+    tracer = _ACTIVE_TRACER.get()
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, **args):
+        yield
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator form of `span`, resolved against the active tracer at call time."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*a: Any, **kw: Any) -> Any:
+            with span(span_name):
+                return func(*a, **kw)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+__all__ = ["Span", "Tracer", "active_tracer", "span", "traced"]
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from hb_align.aligner import pipeline
+from hb_align.audio import chunker
+from hb_align.cli import app as cli_app
+
+RUNNER = CliRunner(mix_stderr=False)
+WLC_SAMPLE = Path("resources/wlc/sample_genesis-001.jsonl")
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(16_000)
+        handle.writeframes(b"\x00\x00" * int(16_000 * seconds))
+
+
+def _fake_run_mfa(*, chunk_window, chunk_index, text_chapter, **_):
+    # Chapter 3 "loses" half its words so it fails the coverage gate.
+    words = list(text_chapter.iter_words()) if chunk_index == 0 else []
+    if text_chapter.chapter == 3:
+        words = words[: len(words) // 2]
+    segments = tuple(
+        chunker.WordSegment(text=word.hebrew, start_ms=i * 100, end_ms=i * 100 + 80, confidence=0.9)
+        for i, word in enumerate(words)
+    )
+    return chunker.ChunkAlignment(chunk=chunk_window, words=segments)
+
+
+@pytest.fixture
+def batch_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    wlc_root = tmp_path / "wlc"
+    wlc_root.mkdir()
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    lines = WLC_SAMPLE.read_text(encoding="utf-8").splitlines()
+    for chapter, seconds in ((1, 40), (2, 130), (3, 70)):
+        records = [{**json.loads(line), "chapter": chapter} for line in lines]
+        (wlc_root / f"genesis-{chapter:03d}.jsonl").write_text(
+            "\n".join(json.dumps(record, ensure_ascii=False) for record in records), encoding="utf-8"
+        )
+        _write_wav(audio_dir / f"genesis-{chapter:03d}.wav", seconds)
+    monkeypatch.setenv("HB_ALIGN_WLC_DIR", str(wlc_root))
+    monkeypatch.setenv("HB_ALIGN_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("HB_ALIGN_OUTPUT_ROOT", str(tmp_path / "outputs"))
+    monkeypatch.setenv("HB_ALIGN_SAMPLE_INTERVAL_MS", "0")
+    monkeypatch.setattr(pipeline, "_run_mfa_for_chunk", _fake_run_mfa)
+    monkeypatch.setattr("os.cpu_count", lambda: 4)
+    return tmp_path
+
+
+def test_batch_writes_manifest_and_exits_5_on_failure(batch_env: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HB_ALIGN_SAMPLE_INTERVAL_MS", "50")
+    output_dir = batch_env / "out"
+    result = RUNNER.invoke(
+        cli_app,
+        [
+            "batch",
+            "--input-dir",
+            str(batch_env / "audio"),
+            "--pattern",
+            "*.wav",
+            "--parallel",
+            "2",
+            "--output-dir",
+            str(output_dir),
+            "--prom-file",
+            str(batch_env / "batch.prom"),
+        ],
+    )
+
+    assert result.exit_code == 5, result.stdout + result.stderr
+    manifest = json.loads((output_dir / "genesis" / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["summary"]["total"] == 3
+    assert manifest["summary"]["success"] == 2
+    assert manifest["summary"]["failed"] == 1
+    assert manifest["scheduling"]["order"] == ["genesis-002.wav", "genesis-003.wav", "genesis-001.wav"]
+    items = {item["file_name"]: item for item in manifest["items"]}
+    assert items["genesis-003.wav"]["exit_code"] == 2
+    assert items["genesis-003.wav"]["error_code"] == "COVERAGE_BELOW_THRESHOLD"
+    assert Path(items["genesis-001.wav"]["artifacts"]["summary_json"]).exists()
+    assert Path(items["genesis-001.wav"]["artifacts"]["alignments_columnar"]).exists()
+    assert items["genesis-002.wav"]["estimated_chunks"] == 3
+    prom_text = (batch_env / "batch.prom").read_text(encoding="utf-8")
+    assert 'hb_align_chapters_processed_total{job="batch",status="success"} 2' in prom_text
+    assert manifest["scheduling"]["engine"] == "staged"
+    queues = manifest["pipeline"]["queues"]
+    assert queues["prep_to_align"]["items"] == 3
+    assert queues["align_to_finalize"]["items"] == 3
+    assert set(manifest["pipeline"]["busy_ms"]) == {"prep", "align", "finalize"}
+    assert 'hb_align_batch_queue_max_depth{job="batch",queue="prep_to_align"}' in prom_text
+    summary = json.loads(Path(items["genesis-002.wav"]["artifacts"]["summary_json"]).read_text(encoding="utf-8"))
+    assert {"prepare", "align", "stitching"} <= set(summary["durations_ms"])
+    assert summary["cache_io"]["writes"] > 0
+    assert summary["resources"]["samples"] >= 2  # sampled in the align worker
+
+
+def test_batch_without_pipeline_uses_per_chapter_engine(batch_env: Path) -> None:
+    result = RUNNER.invoke(cli_app, _batch_args(batch_env, "--no-pipeline"))
+
+    assert result.exit_code == 5, result.stdout + result.stderr
+    manifest = json.loads((batch_env / "out" / "genesis" / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["scheduling"]["engine"] == "per-chapter"
+    assert "pipeline" not in manifest
+    assert manifest["summary"]["success"] == 2
+    item = next(item for item in manifest["items"] if item["file_name"] == "genesis-001.wav")
+    summary = json.loads(Path(item["artifacts"]["summary_json"]).read_text(encoding="utf-8"))
+    assert summary["cache_io"]["writes"] > 0
+
+
+def test_batch_rejects_missing_input_dir(batch_env: Path) -> None:
+    result = RUNNER.invoke(cli_app, ["batch", "--input-dir", str(batch_env / "missing")])
+    assert result.exit_code == 3
+    assert "INPUT_DIR_NOT_FOUND" in result.stderr
+
+
+def _batch_args(batch_env: Path, *extra: str) -> list[str]:
+    return [
+        "batch",
+        "--input-dir",
+        str(batch_env / "audio"),
+        "--pattern",
+        "*.wav",
+        "--parallel",
+        "1",
+        "--output-dir",
+        str(batch_env / "out"),
+        *extra,
+    ]
+
+
+@pytest.mark.parametrize("engine", ["--pipeline", "--no-pipeline"])
+def test_batch_streams_events_from_workers(batch_env: Path, engine: str) -> None:
+    events_path = batch_env / "events.ndjson"
+    args = _batch_args(batch_env, engine, "--events", str(events_path))
+    args[args.index("--parallel") + 1] = "2"
+    result = RUNNER.invoke(cli_app, args)
+
+    assert result.exit_code == 5, result.stdout + result.stderr
+    records = [json.loads(line) for line in events_path.read_text(encoding="utf-8").splitlines()]
+    kinds = [record["event"] for record in records]
+    assert kinds[0] == "batch_started" and kinds[-1] == "batch_completed"
+    assert kinds.count("item_finished") == 3
+    assert kinds.count("chapter_done") == 3
+    aligned = [record for record in records if record["event"] == "chunk_aligned"]
+    assert len(aligned) == 1 + 3 + 2
+    assert {record["chapter"] for record in aligned} == {1, 2, 3}
+    assert all("duration_ms" in record for record in aligned)
+    coverage = {record["chapter"]: record["passed"] for record in records if record["event"] == "coverage"}
+    assert coverage == {1: True, 2: True, 3: False}
+    assert records[-1]["failed"] == 1
+
+
+def test_batch_cpu_target_records_concurrency_timeline(batch_env: Path) -> None:
+    args = _batch_args(batch_env, "--cpu-target", "80")
+    args[args.index("--parallel") + 1] = "3"
+    result = RUNNER.invoke(cli_app, args)
+
+    assert result.exit_code == 5, result.stdout + result.stderr
+    manifest = json.loads((batch_env / "out" / "genesis" / "manifest.json").read_text(encoding="utf-8"))
+    admission = manifest["admission"]
+    assert admission["cpu_target_pct"] == 80.0
+    assert admission["max_limit"] == 3
+    assert admission["timeline"][0] == {**admission["timeline"][0], "reason": "initial", "limit": 2}
+    assert manifest["summary"]["success"] == 2
+
+
+def test_shards_cover_the_batch_and_merge_into_one_manifest(batch_env: Path) -> None:
+    book_dir = batch_env / "out" / "genesis"
+    for shard in ("1/2", "2/2"):
+        result = RUNNER.invoke(cli_app, _batch_args(batch_env, "--shard", shard))
+        assert result.exit_code in (0, 5), result.stdout + result.stderr
+
+    shard_paths = sorted(book_dir.glob("manifest.shard-*-of-2.json"))
+    assert [path.name for path in shard_paths] == ["manifest.shard-1-of-2.json", "manifest.shard-2-of-2.json"]
+    shards = [json.loads(path.read_text(encoding="utf-8")) for path in shard_paths]
+    # 130 s × 3 chunks outweighs 70 s × 2 + 40 s × 1, so chapter 2 runs alone.
+    assert [[item["file_name"] for item in shard["items"]] for shard in shards] == [
+        ["genesis-002.wav"],
+        ["genesis-001.wav", "genesis-003.wav"],
+    ]
+    plans = [shard["scheduling"]["shard"] for shard in shards]
+    assert plans[0]["plan_digest"] == plans[1]["plan_digest"]
+    assert plans[0]["plan_files"] == ["genesis-001.wav", "genesis-002.wav", "genesis-003.wav"]
+
+    merged = RUNNER.invoke(cli_app, ["merge", *map(str, shard_paths)])
+    assert merged.exit_code == 5, merged.stdout + merged.stderr
+    manifest = json.loads((book_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["summary"] == {**manifest["summary"], "total": 3, "success": 2, "failed": 1}
+    assert [shard["index"] for shard in manifest["shards"]] == [1, 2]
+
+    partial = RUNNER.invoke(cli_app, ["merge", str(shard_paths[0])])
+    assert partial.exit_code == 3
+    assert "Missing shard(s) [2] of 2" in partial.stderr
+
+
+def test_batch_rejects_malformed_shard(batch_env: Path) -> None:
+    result = RUNNER.invoke(cli_app, _batch_args(batch_env, "--shard", "3/2"))
+    assert result.exit_code == 2
+    assert "I/N" in result.stderr
+
+
+def _invoke_worker(args: list[str]) -> None:
+    result = RUNNER.invoke(cli_app, args)
+    sys.exit(result.exit_code)
+
+
+def test_workers_drain_a_shared_queue_exactly_once(batch_env: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls_log = batch_env / "mfa-calls.txt"
+
+    def logging_mfa(**kwargs):
+        with calls_log.open("a", encoding="utf-8") as handle:
+            handle.write(f"{kwargs['text_chapter'].chapter}\n")
+        return _fake_run_mfa(**kwargs)
+
+    monkeypatch.setattr(pipeline, "_run_mfa_for_chunk", logging_mfa)
+    args = _batch_args(batch_env, "--worker", "--no-pipeline")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_invoke_worker, args=(args,)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+
+    assert [worker.exitcode for worker in workers] == [5, 5, 5]
+    manifest = json.loads((batch_env / "out" / "genesis" / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["summary"] == {**manifest["summary"], "total": 3, "success": 2, "failed": 1, "pending": 0}
+    assert manifest["scheduling"]["engine"] == "work-queue"
+    assert manifest["completed_at"]
+    # One MFA call per planned chunk: every chapter was aligned by exactly one worker.
+    calls = calls_log.read_text(encoding="utf-8").split()
+    expected = {str(item["chapter"]): item["estimated_chunks"] for item in manifest["items"]}
+    assert {chapter: calls.count(chapter) for chapter in expected} == expected
+    queue_dir = batch_env / "out" / "genesis" / "queue"
+    assert sorted(p.name for p in (queue_dir / "done").iterdir()) == [
+        "genesis-001.wav.json",
+        "genesis-002.wav.json",
+        "genesis-003.wav.json",
+    ]
+
+
+def test_worker_rejects_resume(batch_env: Path) -> None:
+    result = RUNNER.invoke(cli_app, _batch_args(batch_env, "--worker", "--resume", str(batch_env / "m.json")))
+    assert result.exit_code == 3
+    assert "--worker cannot be combined with --resume" in result.stderr
+
+
+def test_resume_reruns_only_failed_or_stale_chapters(
+    batch_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = RUNNER.invoke(cli_app, _batch_args(batch_env))
+    assert first.exit_code == 5, first.stdout + first.stderr
+    manifest_path = batch_env / "out" / "genesis" / "manifest.json"
+    batch_id = json.loads(manifest_path.read_text(encoding="utf-8"))["batch_id"]
+
+    seen_log = batch_env / "mfa-calls.txt"  # MFA runs in pool workers; record calls on disk
+
+    def healthy_mfa(*, chunk_window, chunk_index, text_chapter, **_):
+        with seen_log.open("a", encoding="utf-8") as handle:
+            handle.write(f"{text_chapter.chapter}\n")
+        words = list(text_chapter.iter_words()) if chunk_index == 0 else []
+        segments = tuple(
+            chunker.WordSegment(text=w.hebrew, start_ms=i * 100, end_ms=i * 100 + 80, confidence=0.9)
+            for i, w in enumerate(words)
+        )
+        return chunker.ChunkAlignment(chunk=chunk_window, words=segments)
+
+    monkeypatch.setattr(pipeline, "_run_mfa_for_chunk", healthy_mfa)
+    _write_wav(batch_env / "audio" / "genesis-001.wav", 41)  # new audio → stale cache key
+
+    second = RUNNER.invoke(cli_app, _batch_args(batch_env, "--resume", str(manifest_path)))
+
+    assert second.exit_code == 0, second.stdout + second.stderr
+    assert "1 chapters still valid, 2 to run" in second.stdout
+    seen = {int(line) for line in seen_log.read_text(encoding="utf-8").split()}
+    assert sorted(seen) == [1, 3]
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert manifest["batch_id"] == batch_id
+    assert manifest["summary"] == {**manifest["summary"], "total": 3, "success": 3, "failed": 0}
+
+
+def test_resume_after_crash_replays_journal(batch_env: Path) -> None:
+    from hb_align.batch.journal import journal_path_for
+
+    manifest_path = batch_env / "out" / "genesis" / "manifest.json"
+    result = RUNNER.invoke(cli_app, _batch_args(batch_env))
+    assert result.exit_code == 5
+    # Simulate a crash: no compacted manifest, and a torn final journal line.
+    manifest_path.unlink()
+    journal = journal_path_for(manifest_path)
+    with journal.open("a", encoding="utf-8") as handle:
+        handle.write('{"event": "item", "file_name": "genesis-00')
+
+    resumed = RUNNER.invoke(cli_app, _batch_args(batch_env, "--resume", str(manifest_path)))
+
+    assert "2 chapters still valid, 1 to run" in resumed.stdout
+    assert resumed.exit_code == 5
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert manifest["summary"]["total"] == 3
+
+
+def test_resume_rejects_missing_manifest(batch_env: Path) -> None:
+    result = RUNNER.invoke(cli_app, _batch_args(batch_env, "--resume", str(batch_env / "nope.json")))
+    assert result.exit_code == 3
+    assert "INVALID_MANIFEST" in result.stderr
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from typer.testing import CliRunner
+
+from hb_align.cli import app as cli_app
+from hb_align.daemon import client, server
+
+from .test_batch_cli import batch_env  # noqa: F401 - fixture
+
+RUNNER = CliRunner(mix_stderr=False)
+
+
+@pytest.fixture
+def job_server(batch_env: Path) -> Iterator[server.JobServer]:  # noqa: F811
+    socket_path = batch_env / "d.sock"
+    started: List[server.JobServer] = []
+    ready = threading.Event()
+    final: Dict[str, Any] = {}
+
+    def on_ready(job_server: server.JobServer) -> None:
+        started.append(job_server)
+        ready.set()
+
+    def run() -> None:
+        final.update(server.run_daemon(socket_path, workers=2, on_ready=on_ready))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(30), "daemon did not start"
+    yield started[0]
+    RUNNER.invoke(cli_app, ["daemon", "stop", "--socket", str(socket_path)])
+    thread.join(30)
+    assert not thread.is_alive()
+    assert not socket_path.exists()
+
+
+@pytest.fixture
+def daemon(job_server: server.JobServer) -> Path:
+    return job_server.socket_path
+
+
+def _submit(socket_path: Path, audio: Path, output_dir: Path, *extra: str):
+    return RUNNER.invoke(
+        cli_app,
+        [
+            "daemon",
+            "submit",
+            str(audio),
+            "--output-dir",
+            str(output_dir),
+            "--socket",
+            str(socket_path),
+            *extra,
+        ],
+    )
+
+
+def test_daemon_runs_jobs_and_streams_events(daemon: Path) -> None:
+    root = daemon.parent
+    output_dir = root / "out"
+
+    result = _submit(daemon, root / "audio" / "genesis-001.wav", output_dir, "--json")
+
+    assert result.exit_code == 0, result.stdout + result.stderr
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    final = lines[-1]
+    assert final["op"] == "result"
+    assert final["summary"]["book"] == "Genesis"
+    assert Path(final["artifacts"]["summary_json"]).exists()
+    names = [line["event"] for line in lines[:-1]]
+    assert names[:2] == ["job_accepted", "job_started"]
+    assert "chapter_started" in names
+    assert all(line["job_id"] == final["job_id"] for line in lines[:-1])
+
+    # Chapter 3 fails the coverage gate; the client exits with the job's code.
+    result = _submit(daemon, root / "audio" / "genesis-003.wav", output_dir)
+    assert result.exit_code == 2, result.stdout + result.stderr
+    assert "Genesis 3: coverage" in result.stdout
+
+    result = _submit(daemon, root / "audio" / "genesis-001.wav", output_dir)
+    assert result.exit_code == 0
+
+    status = RUNNER.invoke(cli_app, ["daemon", "status", "--socket", str(daemon)])
+    assert status.exit_code == 0
+    stats = json.loads(status.stdout)
+    assert stats["workers"] == 2
+    assert stats["jobs"] == {"completed": 3, "failed": 0, "running": 0}
+    assert stats["text_cache"]["hits"] == 1
+    assert stats["text_cache"]["misses"] == 2
+
+
+def test_daemon_replaces_its_pool_after_a_worker_dies(job_server: server.JobServer) -> None:
+    root = job_server.socket_path.parent
+    assert job_server._pool is not None
+    for process in list(job_server._pool.executor._processes.values()):  # what an OOM kill does
+        process.kill()
+        process.join()
+
+    # Whenever the pool notices, the job did not kill a worker itself: it reruns.
+    first = _submit(job_server.socket_path, root / "audio" / "genesis-001.wav", root / "out")
+    assert first.exit_code == 0, first.stdout + first.stderr
+    assert job_server._pool.replacements == 1
+    if Path("/proc").is_dir():  # the replacement was forked while a client was connected
+        daemon_sockets = {os.fstat(fd).st_ino for fd in job_server._socket_fds}
+        for pid in job_server._pool.executor._processes:
+            held = {os.stat(fd).st_ino for fd in Path(f"/proc/{pid}/fd").iterdir()}
+            assert not held & daemon_sockets
+
+    result = _submit(job_server.socket_path, root / "audio" / "genesis-002.wav", root / "out")
+    assert result.exit_code == 0, result.stdout + result.stderr
+
+
+def test_daemon_rejects_missing_input(daemon: Path) -> None:
+    result = _submit(daemon, daemon.parent / "audio" / "genesis-009.wav", daemon.parent / "out")
+
+    assert result.exit_code == 3
+    assert "INPUT_NOT_FOUND" in result.stderr
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [{"chunk_size": "50"}, {"chapter": 1.5}, {"chunk_overlap": True}, {"chunk_sise": 40}],
+)
+def test_daemon_rejects_malformed_jobs(daemon: Path, fields: Dict[str, Any]) -> None:
+    job = {
+        "input_path": str(daemon.parent / "audio" / "genesis-001.wav"),
+        "output_dir": str(daemon.parent / "out"),
+        **fields,
+    }
+
+    with pytest.raises(client.DaemonError) as excinfo:
+        client.submit(daemon, job)
+
+    assert excinfo.value.code == "BAD_REQUEST"
+
+
+def test_submit_without_daemon_exits_3(tmp_path: Path) -> None:
+    result = _submit(tmp_path / "missing.sock", tmp_path / "genesis-001.wav", tmp_path / "out")
+
+    assert result.exit_code == 3
+    assert "DAEMON_UNAVAILABLE" in result.stderr
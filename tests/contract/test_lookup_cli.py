@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from hb_align.aligner import writers
+from hb_align.audio.chunker import AlignedWord
+from hb_align.cli import app as cli_app
+from hb_align.text.wlc_loader import TextChapter, VerseTokens, WordToken
+
+RUNNER = CliRunner(mix_stderr=False)
+
+
+@pytest.fixture
+def book_dir(tmp_path: Path) -> Path:
+    for chapter in (1, 2):
+        text = TextChapter(
+            book="Genesis",
+            chapter=chapter,
+            verses=tuple(
+                VerseTokens(
+                    verse=f"{chapter}:{verse}",
+                    tokens=(
+                        WordToken(0, "בראשית", "bereshit", "", "", ""),
+                        WordToken(1, "ברא", "bara", "", "", ""),
+                    ),
+                )
+                for verse in (1, 2)
+            ),
+        )
+        words = [
+            AlignedWord(
+                text="w",
+                start_ms=index * 1_000,
+                end_ms=index * 1_000 + 800,
+                confidence=0.9,
+                chunk_id="c",
+            )
+            for index in range(3)
+        ]
+        table = writers.build_alignment_table(text, words)
+        writers.write_alignment_outputs(table, tmp_path / "genesis" / f"{chapter:03d}")
+    return tmp_path / "genesis"
+
+
+def test_lookup_at_timestamp_reports_word_and_verse(book_dir: Path) -> None:
+    result = RUNNER.invoke(
+        cli_app, ["lookup", "--input", str(book_dir / "002"), "--at", "2.4", "--json"]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    payload = json.loads(result.stdout)
+    assert payload["word"]["verse"] == "2:2"
+    assert payload["word"]["word_index"] == 2
+    assert payload["verse"]["start_ms"] == 2_000
+    assert "query took" in result.stderr
+
+
+def test_lookup_verse_across_a_book(book_dir: Path) -> None:
+    result = RUNNER.invoke(cli_app, ["lookup", "--input", str(book_dir), "--verse", "Genesis 1:2"])
+
+    assert result.exit_code == 0, result.stderr
+    assert "Genesis 1:2: 2.00s–2.80s, words 2–3" in result.stdout
+
+
+@pytest.mark.parametrize(
+    ("args", "code"),
+    [
+        (["--verse", "3:1"], 4),
+        (["--at", "2.9", "--chapter", "1"], 4),
+        (["--from", "0.5", "--to", "1.2", "--chapter", "1"], 0),
+        (["--at", "1.0"], 2),  # several chapters and no --chapter
+    ],
+)
+def test_lookup_exit_codes(book_dir: Path, args: list[str], code: int) -> None:
+    result = RUNNER.invoke(cli_app, ["lookup", "--input", str(book_dir), *args])
+
+    assert result.exit_code == code, result.stdout + result.stderr
+
+
+def test_lookup_missing_input_exits_3(tmp_path: Path) -> None:
+    result = RUNNER.invoke(cli_app, ["lookup", "--input", str(tmp_path / "none"), "--at", "1"])
+
+    assert result.exit_code == 3
+    assert "LOOKUP_INPUT_NOT_FOUND" in result.stderr
@@ -10,6 +10,7 @@ from typer.testing import CliRunner
 
 from hb_align.cli import app as cli_app
 from hb_align.cli import process as process_module
+from hb_align.utils import events
 
 RUNNER = CliRunner(mix_stderr=False)
 SAMPLE_AUDIO = Path("samples/genesis-001.mp3")
@@ -178,4 +179,24 @@ def test_process_cli_fatal_error(monkeypatch: pytest.MonkeyPatch, sample_audio_p
     result = _run_cli(["process", str(sample_audio_path)])
 
     assert result.exit_code == 3
-    assert "MFA_NOT_AVAILABLE" in result.stderr
\ No newline at end of file
+    assert "MFA_NOT_AVAILABLE" in result.stderr
+
+
+def test_process_cli_json_streams_events_to_stdout(
+    monkeypatch: pytest.MonkeyPatch, sample_audio_path: Path
+) -> None:
+    def fake_pipeline(**kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        with events.bind(book=kwargs["book"], chapter=kwargs["chapter"]):
+            events.emit("chunk_aligned", chunk_id="c0", duration_ms=5.0)
+            events.emit("chapter_done", exit_code=0)
+        return {"exit_code": 0, "metrics": {"coverage_pct": 99.0}}
+
+    monkeypatch.setattr(process_module, "_run_process_pipeline", fake_pipeline, raising=False)
+
+    result = _run_cli(["process", str(sample_audio_path), "--book", "Genesis", "--chapter", "1", "--json"])
+
+    assert result.exit_code == 0, result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["event"] for record in records] == ["chunk_aligned", "chapter_done"]
+    assert records[0]["book"] == "Genesis"
+    assert "99.0" in result.stderr
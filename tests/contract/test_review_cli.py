@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from hb_align.cli import app as cli_app
+
+RUNNER = CliRunner(mix_stderr=False)
+FIELDS = ["book", "chapter", "verse", "word_index", "word_text", "start_ms", "end_ms", "confidence"]
+
+
+@pytest.fixture
+def chapter_dir(tmp_path: Path) -> Path:
+    chapter_dir = tmp_path / "genesis" / "001"
+    chapter_dir.mkdir(parents=True)
+    rows = [
+        ("Genesis", 1, "1:1", 0, "בראשית", 0, 420, 0.99),
+        ("Genesis", 1, "1:1", 1, "ברא", 420, 800, 0.74),
+        ("Genesis", 1, "1:2", 2, "והארץ", -1, -1, 0.93),
+        ("Genesis", 1, "1:2", 3, "היתה", 1000, 1300, 0.95),
+    ]
+    with (chapter_dir / "alignments.csv").open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    (chapter_dir / "summary.json").write_text(
+        json.dumps({"book": "Genesis", "chapter": 1, "durations_ms": {"align": 1200}}), encoding="utf-8"
+    )
+    return chapter_dir
+
+
+def test_review_writes_csv_report_and_logs_duration(chapter_dir: Path, tmp_path: Path) -> None:
+    report = tmp_path / "reports" / "genesis-001.csv"
+    result = RUNNER.invoke(
+        cli_app,
+        ["review", "--input", str(chapter_dir / "alignments.csv"), "--output", str(report), "--notes", "qa"],
+    )
+
+    assert result.exit_code == 0, result.stdout + result.stderr
+    assert "Low-confidence words (<0.9): 2 of 4" in result.stdout
+    lines = report.read_text(encoding="utf-8").splitlines()
+    assert "# notes: qa" in lines
+    rows = list(csv.DictReader(line for line in lines if not line.startswith("#")))
+    assert [(row["word_index"], row["reason"]) for row in rows] == [
+        ("1", "low_confidence"),
+        ("2", "missing_timestamp"),
+    ]
+    summary = json.loads((chapter_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["durations_ms"]["align"] == 1200
+    assert summary["durations_ms"]["review"] >= 0
+    assert summary["review"]["flagged_words"] == 2
+
+
+def test_review_streams_json_to_stdout(chapter_dir: Path) -> None:
+    result = RUNNER.invoke(
+        cli_app, ["review", "--input", str(chapter_dir / "alignments.csv"), "--format", "json"]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    records = json.loads(result.stdout)
+    assert [record["word_text"] for record in records] == ["ברא", "והארץ"]
+    assert "Review completed" in result.stderr
+
+
+def test_review_exits_4_when_nothing_is_flagged(chapter_dir: Path, tmp_path: Path) -> None:
+    report = tmp_path / "empty.csv"
+    result = RUNNER.invoke(
+        cli_app,
+        ["review", "--input", str(chapter_dir / "alignments.csv"), "--threshold", "0.5", "--output", str(report)],
+    )
+
+    # The -1 timestamps are still flagged at any threshold.
+    assert result.exit_code == 0
+    (chapter_dir / "alignments.csv").write_text(
+        ",".join(FIELDS) + "\nGenesis,1,1:1,0,בראשית,0,420,0.99\n", encoding="utf-8"
+    )
+    result = RUNNER.invoke(
+        cli_app, ["review", "--input", str(chapter_dir / "alignments.csv"), "--output", str(report)]
+    )
+    assert result.exit_code == 4
+    assert "0 of 1" in result.stdout
+
+
+@pytest.mark.parametrize(
+    ("file_name", "content", "extra", "code"),
+    [
+        ("alignments.csv", None, ["--threshold", "0.3"], "INVALID_THRESHOLD"),
+        ("missing.csv", None, [], "REVIEW_INPUT_NOT_FOUND"),
+        ("bad.csv", "book,chapter\nGenesis,1\n", [], "INVALID_ALIGNMENT_SCHEMA"),
+    ],
+)
+def test_review_fatal_errors_exit_3(
+    chapter_dir: Path, file_name: str, content: str | None, extra: list[str], code: str
+) -> None:
+    target = chapter_dir / file_name
+    if content is not None:
+        target.write_text(content, encoding="utf-8")
+    result = RUNNER.invoke(cli_app, ["review", "--input", str(target), *extra])
+
+    assert result.exit_code == 3
+    assert code in result.stderr
+
+
+@pytest.fixture
+def output_tree(chapter_dir: Path, tmp_path: Path) -> Path:
+    second = tmp_path / "genesis" / "002"
+    second.mkdir()
+    (second / "alignments.csv").write_text(
+        ",".join(FIELDS) + "\nGenesis,2,2:1,0,ויכלו,0,300,0.52\nGenesis,2,2:1,1,השמים,300,600,0.96\n",
+        encoding="utf-8",
+    )
+    return tmp_path / "genesis"
+
+
+def test_review_streams_a_directory_with_parallel_workers(output_tree: Path, tmp_path: Path) -> None:
+    report = tmp_path / "tree.csv"
+    result = RUNNER.invoke(
+        cli_app, ["review", "--input", str(output_tree), "--workers", "2", "--output", str(report)]
+    )
+
+    assert result.exit_code == 0, result.stdout + result.stderr
+    assert "Low-confidence words (<0.9): 3 of 6 in 2 chapters" in result.stdout
+    assert "Worst verses: Genesis 2:1" in result.stdout
+    rows = list(csv.DictReader(line for line in report.open(encoding="utf-8") if not line.startswith("#")))
+    assert [(row["chapter"], row["word_index"]) for row in rows] == [("1", "1"), ("1", "2"), ("2", "0")]
+    summary = json.loads((output_tree / "001" / "summary.json").read_text(encoding="utf-8"))
+    assert summary["review"]["flagged_words"] == 2
+
+
+def test_review_glob_streams_json_and_markdown_summary(output_tree: Path) -> None:
+    spec = str(output_tree / "00*")
+    as_json = RUNNER.invoke(cli_app, ["review", "--input", spec, "--format", "json", "--workers", "1"])
+    as_md = RUNNER.invoke(cli_app, ["review", "--input", spec, "--format", "md", "--top", "1"])
+
+    assert as_json.exit_code == 0, as_json.stderr
+    assert [record["word_text"] for record in json.loads(as_json.stdout)] == ["ברא", "והארץ", "ויכלו"]
+    assert as_md.exit_code == 0, as_md.stderr
+    summary = as_md.stdout.split("## Summary", 1)[1]
+    assert "Flagged 3 of 6 words in 2 chapters." in summary
+    assert "| Genesis 2:1 | 1 | 2 | 0.52 | 0.74 |" in summary
+
+
+def test_review_directory_prints_a_table_per_chapter(output_tree: Path) -> None:
+    result = RUNNER.invoke(cli_app, ["review", "--input", str(output_tree), "--format", "stdout"])
+    limited = RUNNER.invoke(
+        cli_app, ["review", "--input", str(output_tree), "--format", "stdout", "--limit", "2"]
+    )
+
+    assert result.exit_code == 0, result.stderr
+    assert all(word in result.stdout for word in ("ברא", "והארץ", "ויכלו"))
+    assert "Low-confidence words (<0.9): 3 of 6 in 2 chapters" in result.stdout
+    assert limited.exit_code == 0, limited.stderr
+    assert "והארץ" in limited.stdout and "ויכלו" not in limited.stdout
+
+
+def test_review_directory_without_exports_exits_3(tmp_path: Path) -> None:
+    result = RUNNER.invoke(cli_app, ["review", "--input", str(tmp_path)])
+
+    assert result.exit_code == 3
+    assert "REVIEW_INPUT_NOT_FOUND" in result.stderr
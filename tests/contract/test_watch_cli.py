@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from typer.testing import CliRunner
+
+from hb_align.batch import watch
+from hb_align.batch.manifest import BatchItem
+from hb_align.batch.runner import BatchSettings, ChapterJob, run_chapter
+from hb_align.batch.watch import watch_folder
+from hb_align.cli import app as cli_app
+
+from .test_batch_cli import _write_wav, batch_env  # noqa: F401 - fixture
+
+RUNNER = CliRunner(mix_stderr=False)
+
+
+def _watch_once(batch_env: Path, *extra: str):  # noqa: F811
+    return RUNNER.invoke(
+        cli_app,
+        [
+            "watch",
+            "--input-dir",
+            str(batch_env / "audio"),
+            "--pattern",
+            "*.wav",
+            "--output-dir",
+            str(batch_env / "out"),
+            "--settle",
+            "0",
+            "--interval",
+            "0.05",
+            "--once",
+            *extra,
+        ],
+    )
+
+
+def test_watch_once_processes_then_skips_unchanged_files(batch_env: Path) -> None:  # noqa: F811
+    result = _watch_once(batch_env, "--parallel", "2", "--json")
+
+    assert result.exit_code == 5, result.stdout + result.stderr  # chapter 3 fails coverage
+    events = [json.loads(line) for line in result.stdout.splitlines()]
+    finished = {event["file_name"]: event for event in events if event["event"] == "item_finished"}
+    assert sorted(finished) == ["genesis-001.wav", "genesis-002.wav", "genesis-003.wav"]
+    assert finished["genesis-003.wav"]["error_code"] == "COVERAGE_BELOW_THRESHOLD"
+    assert events[-1]["event"] == "watch_stopped"
+    assert (batch_env / "out" / "genesis" / "001" / "alignments.csv").exists()
+
+    result = _watch_once(batch_env)
+    assert result.exit_code == 0, result.stdout + result.stderr
+    assert "Summary: processed=0 success=0 failed=0 skipped=3" in result.stdout
+    assert "Skipping genesis-001.wav: outputs are current" in result.stderr
+
+    _write_wav(batch_env / "audio" / "genesis-001.wav", 45)  # re-uploaded recording
+    result = _watch_once(batch_env)
+    assert result.exit_code == 0, result.stdout + result.stderr
+    assert "Summary: processed=1 success=1 failed=0 skipped=2" in result.stdout
+
+
+def test_watch_picks_up_new_uploads_until_stopped(batch_env: Path) -> None:  # noqa: F811
+    drop = batch_env / "drop"
+    drop.mkdir()
+    settings = BatchSettings(output_dir=batch_env / "out")
+    stop = threading.Event()
+    ready = threading.Event()
+    results: List[BatchItem] = []
+
+    def run() -> None:
+        watch_folder(
+            drop,
+            settings,
+            pattern="*.wav",
+            settle_s=0.2,
+            interval_s=0.05,
+            stop=stop,
+            on_ready=lambda _: ready.set(),
+            on_result=results.append,
+        )
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    try:
+        assert ready.wait(10)
+        _write_wav(drop / "upload.tmp", 40)
+        (drop / "upload.tmp").rename(drop / "genesis-002.wav")
+        deadline = time.monotonic() + 30
+        while not results and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join(30)
+    assert [item.file_name for item in results] == ["genesis-002.wav"]
+    assert results[0].status == "success"
+
+
+def _die_on_chapter_1(job: ChapterJob, settings: BatchSettings) -> BatchItem:
+    if job.file_name == "genesis-001.wav":
+        os._exit(137)  # what an OOM kill looks like to the pool
+    return run_chapter(job, settings)
+
+
+def test_watch_replaces_a_pool_broken_by_a_dead_worker(batch_env: Path, monkeypatch) -> None:  # noqa: F811
+    monkeypatch.setattr(watch, "run_chapter", _die_on_chapter_1)
+    drop = batch_env / "drop"
+    drop.mkdir()
+    stop = threading.Event()
+    ready = threading.Event()
+    results: List[BatchItem] = []
+
+    def run() -> None:
+        watch_folder(
+            drop,
+            BatchSettings(output_dir=batch_env / "out"),
+            pattern="*.wav",
+            parallel=2,
+            settle_s=0.2,
+            interval_s=0.05,
+            stop=stop,
+            on_ready=lambda _: ready.set(),
+            on_result=results.append,
+        )
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    try:
+        assert ready.wait(10)
+        for name in ("genesis-001.wav", "genesis-002.wav"):
+            _write_wav(drop / "upload.tmp", 40)
+            (drop / "upload.tmp").rename(drop / name)
+        deadline = time.monotonic() + 30
+        while len(results) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join(30)
+    assert not thread.is_alive()
+    outcomes = {item.file_name: (item.status, item.error_code) for item in results}
+    assert outcomes == {
+        "genesis-001.wav": ("failed", "WORKER_CRASHED"),
+        "genesis-002.wav": ("success", None),
+    }
+
+
+def test_watch_missing_directory_exits_3(tmp_path: Path) -> None:
+    result = RUNNER.invoke(cli_app, ["watch", "--input-dir", str(tmp_path / "missing")])
+
+    assert result.exit_code == 3
+    assert "INPUT_DIR_NOT_FOUND" in result.stderr
@@ -148,3 +148,51 @@ def test_alignment_pipeline_detects_low_coverage(monkeypatch: pytest.MonkeyPatch
     assert summary["aligned_words"] == len(stitched_words) == 2
     assert summary["coverage_pct"] == pytest.approx(50.0)
     assert result["chunk_map"] == chunk_map
+
+
+def test_process_pipeline_records_stage_spans(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    import json
+
+    from hb_align.cli import process as process_module
+
+    monkeypatch.setenv("HB_ALIGN_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("HB_ALIGN_OUTPUT_ROOT", str(tmp_path / "outputs"))
+    monkeypatch.setenv("HB_ALIGN_LOG_FORMAT", "json")
+
+    def fake_run_mfa(*, chunk_window, **kwargs):
+        return _make_chunk_alignment(chunk_window, ["w"])
+
+    monkeypatch.setattr(pipeline, "_run_mfa_for_chunk", fake_run_mfa)
+    audio = tmp_path / "genesis-001.mp3"
+    audio.write_bytes(b"\x00" * 2048)
+
+    result = process_module._run_process_pipeline(
+        input_path=audio,
+        book="Genesis",
+        chapter=1,
+        tradition="modern",
+        output_dir=tmp_path / "out",
+        chunk_size=50,
+        chunk_overlap=5,
+        coverage_threshold=95.0,
+        dry_run=False,
+        trace=True,
+        prom_file=tmp_path / "hb_align.prom",
+    )
+
+    summary = json.loads(result["artifacts"]["summary_json"].read_text(encoding="utf-8"))
+    for stage in ("prepare", "chunk_planning", "align", "mfa_chunk", "stitching", "artifact_writing"):
+        assert stage in summary["durations_ms"]
+    assert summary["cache_status"] == "miss"
+    assert summary["resources"]["peak_rss_bytes"] > 0
+    assert summary["resources"]["samples"] >= 2
+    trace = json.loads(result["artifacts"]["trace"].read_text(encoding="utf-8"))
+    chunk_events = [e for e in trace["traceEvents"] if e["name"] == "mfa_chunk"]
+    assert len(chunk_events) == summary["chunk_count"]
+    assert all(e["cat"] == "align" for e in chunk_events)
+    prom_text = result["artifacts"]["prometheus"].read_text(encoding="utf-8")
+    assert 'hb_align_stage_duration_seconds_count{job="process",stage="mfa_chunk"} 1' in prom_text
+    log = tmp_path / "outputs" / "logs" / process_module.RUN_LOG_NAME
+    records = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert [record["message"] for record in records] == ["chapter started", "chapter done"]
+    assert records[1]["book"] == "Genesis" and records[1]["cache_status"] == "miss"
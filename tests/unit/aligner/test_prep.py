@@ -0,0 +1,76 @@
+import json
+import wave
+from pathlib import Path
+
+from hb_align.aligner import lexicon, prep
+from hb_align.text.wlc_loader import TextChapter, VerseTokens, WordToken
+from hb_align.utils.cache import CacheManager
+
+
+def _chapter() -> TextChapter:
+    tokens = (
+        WordToken(0, "בראשית", "bereshit", "beʁeʃit", "bəreʃis", "bereʃit"),
+        WordToken(1, "ברא", "bara", "baʁa", "bɔra", "bara"),
+        WordToken(2, "ברא", "bara", "baʁa", "bɔra", "bara"),
+    )
+    return TextChapter(book="Genesis", chapter=1, verses=(VerseTokens(verse="1:1", tokens=tokens),))
+
+
+def _write_wav(path: Path, seconds: float) -> Path:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(16_000)
+        handle.writeframes(b"\x00\x00" * int(16_000 * seconds))
+    return path
+
+
+def test_ipa_to_phones_keeps_length_marks():
+    assert lexicon.ipa_to_phones("vəhaːʁets") == ["v", "ə", "h", "aː", "ʁ", "e", "t", "s"]
+    assert lexicon.ipa_to_phones("eloˈhim") == ["e", "l", "o", "h", "i", "m"]
+
+
+def test_build_lexicon_deduplicates_entries():
+    entries = lexicon.build_lexicon(_chapter(), "ashkenazi")
+    assert entries == [("bereshit", "b ə r e ʃ i s"), ("bara", "b ɔ r a")]
+
+
+def test_prepare_chapter_populates_and_reuses_cache(tmp_path):
+    audio = _write_wav(tmp_path / "genesis-001.wav", 120)
+    manager = CacheManager(tmp_path / "cache")
+    kwargs = dict(
+        audio_path=audio,
+        text_chapter=_chapter(),
+        tradition="modern",
+        chunk_size_sec=50,
+        chunk_overlap_sec=5,
+        cache_manager=manager,
+        normalize=False,
+    )
+
+    first = prep.prepare_chapter(**kwargs)
+    assert first.cache_status == "miss"
+    assert first.duration_ms == 120_000
+    assert first.duration_source == "probe"
+    assert len(first.chunks) == 3
+    assert manager.read_metadata(first.cache_key)["tradition"] == "modern"
+    chunk_map = json.loads(manager.read_text_artifact(first.cache_key, prep.CHUNK_MAP_NAME))
+    assert chunk_map[-1]["end_ms"] == 120_000
+
+    second = prep.prepare_chapter(**kwargs)
+    assert second.cache_status == "hit"
+    assert second.chunks == first.chunks
+    assert second.cache_key == first.cache_key
+
+    other = prep.prepare_chapter(**{**kwargs, "tradition": "sephardi"})
+    assert other.cache_key != first.cache_key
+    assert other.cache_status == "partial"
+
+
+def test_cached_checksum_recomputes_after_change(tmp_path):
+    audio = _write_wav(tmp_path / "genesis-001.wav", 1)
+    manager = CacheManager(tmp_path / "cache")
+    first = prep.cached_checksum(audio, manager)
+    assert prep.cached_checksum(audio, manager) == first
+    _write_wav(audio, 2)
+    assert prep.cached_checksum(audio, manager) != first
@@ -0,0 +1,130 @@
+import csv
+import json
+import os
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hb_align.aligner import writers
+from hb_align.audio.chunker import AlignedWord, StitchedTimeline
+from hb_align.review.aggregator import load_alignments
+from hb_align.text.wlc_loader import TextChapter, VerseTokens, WordToken
+
+
+def _chapter() -> TextChapter:
+    first = (
+        WordToken(0, "בראשית", "bereshit", "", "", ""),
+        WordToken(1, "ברא", "bara", "", "", ""),
+    )
+    second = (
+        WordToken(0, "והארץ", "vehaaretz", "", "", ""),
+        WordToken(1, "ברא", "bara", "", "", ""),
+    )
+    return TextChapter(
+        book="Genesis",
+        chapter=1,
+        verses=(VerseTokens(verse="1:1", tokens=first), VerseTokens(verse="1:2", tokens=second)),
+    )
+
+
+def _words() -> list:
+    return [
+        AlignedWord(text="בראשית", start_ms=0, end_ms=420, confidence=0.9, chunk_id="chunk-001"),
+        AlignedWord(text="ברא", start_ms=420, end_ms=800, confidence=0.74, chunk_id="chunk-001"),
+        AlignedWord(text="והארץ", start_ms=900, end_ms=1300, confidence=0.95, chunk_id="chunk-002"),
+    ]
+
+
+def _table() -> writers.AlignmentTable:
+    return writers.build_alignment_table(_chapter(), _words())
+
+
+def test_table_has_a_row_per_text_word_with_missing_timings() -> None:
+    rows = list(_table().iter_rows())
+
+    assert [row["word_index"] for row in rows] == [0, 1, 2, 3]
+    assert [row["verse"] for row in rows] == ["1:1", "1:1", "1:2", "1:2"]
+    assert rows[3]["start_ms"] == -1 and rows[3]["chunk_id"] is None
+    assert rows[2]["chunk_id"] == "chunk-002"
+
+
+def test_table_from_a_stitched_timeline_matches_the_word_list() -> None:
+    timeline = StitchedTimeline.from_words(_words())
+
+    table = writers.build_alignment_table(_chapter(), timeline)
+
+    assert list(table.iter_rows()) == list(_table().iter_rows())
+    assert table.strings == _table().strings
+
+
+def test_words_stitched_against_the_text_land_on_their_own_rows() -> None:
+    first, _, third = _words()
+    words = [replace(first, word_index=0), replace(third, word_index=2)]
+
+    rows = list(writers.build_alignment_table(_chapter(), words).iter_rows())
+
+    assert [row["start_ms"] for row in rows] == [0, -1, 900, -1]
+    assert rows[2]["chunk_id"] == "chunk-002"
+
+
+def test_outputs_round_trip_through_the_memory_mapped_sidecar(tmp_path: Path) -> None:
+    paths = writers.write_alignment_outputs(_table(), tmp_path)
+
+    with paths["alignments_csv"].open(encoding="utf-8", newline="") as handle:
+        csv_rows = list(csv.DictReader(handle))
+    json_rows = json.loads(paths["alignments_json"].read_text(encoding="utf-8"))
+    assert csv_rows[1]["word_text"] == json_rows[1]["word_text"] == "ברא"
+    assert csv_rows[1]["confidence"] == "0.74"
+
+    table = writers.read_columnar(paths["alignments_columnar"])
+    assert isinstance(table.columns["start_ms"], np.memmap)
+    assert table.columns["start_ms"].dtype == np.dtype("<i4")
+    assert list(table.iter_rows()) == json_rows
+    assert list(table.text("word_text")) == ["בראשית", "ברא", "והארץ", "ברא"]
+    assert len(table.strings) == len(set(table.strings))
+
+
+def test_read_columnar_rejects_foreign_or_newer_files(tmp_path: Path) -> None:
+    bogus = tmp_path / "bogus.hbcol"
+    bogus.write_bytes(b"not a sidecar at all")
+    with pytest.raises(writers.ColumnarFormatError, match="not an alignment sidecar"):
+        writers.read_columnar(bogus)
+
+    path = writers.write_columnar(_table(), tmp_path / writers.SIDECAR_NAME)
+    data = bytearray(path.read_bytes())
+    data[8:12] = (writers.SCHEMA_VERSION + 1).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+    with pytest.raises(writers.ColumnarFormatError, match="schema version"):
+        writers.read_columnar(path)
+
+
+def test_review_loader_prefers_a_fresh_sidecar(tmp_path: Path) -> None:
+    paths = writers.write_alignment_outputs(_table(), tmp_path)
+    csv_path = paths["alignments_csv"]
+    assert writers.sidecar_for(csv_path) == paths["alignments_columnar"]
+
+    frame = load_alignments(csv_path)
+    assert list(frame["start_ms"]) == [0, 420, 900, -1]
+    assert frame["confidence"].tolist()[1] == 0.74
+    assert str(frame["verse"].iloc[2]) == "1:2"
+
+    # A CSV edited after the sidecar was written wins.
+    stat = paths["alignments_columnar"].stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert writers.sidecar_for(csv_path) is None
+    assert list(load_alignments(csv_path)["start_ms"]) == [0, 420, 900, -1]
+
+
+@pytest.mark.parametrize(
+    ("name", "writer"),
+    [("alignments.csv", writers.write_alignments_csv), ("alignments.json", writers.write_alignments_json)],
+)
+def test_read_alignment_table_parses_text_exports(tmp_path: Path, name: str, writer) -> None:
+    path = writer(_table(), tmp_path / name)
+
+    table = writers.read_alignment_table(path)
+
+    assert (table.book, table.chapter, len(table)) == ("Genesis", 1, 4)
+    assert list(table.iter_rows()) == list(_table().iter_rows())
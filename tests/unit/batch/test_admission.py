@@ -0,0 +1,89 @@
+import pytest
+
+from hb_align.batch.admission import AdmissionController
+
+
+class FakeCpu:
+    """Feeds /proc/stat-style (busy, total) jiffies that yield the queued percentages."""
+
+    def __init__(self) -> None:
+        self.busy = 0
+        self.total = 0
+        self.queued: list[float] = []
+
+    def __call__(self):
+        if self.queued:
+            pct = self.queued.pop(0)
+            self.busy += int(pct)
+            self.total += 100
+        return self.busy, self.total
+
+
+def _controller(cpu: FakeCpu, **kwargs) -> AdmissionController:
+    options = dict(target_pct=80.0, max_limit=6, initial=2, cpu_count=12, settle_samples=0)
+    options.update(kwargs)
+    return AdmissionController(cpu_reader=cpu, load_reader=lambda: 1.0, **options)
+
+
+def _saturate(controller: AdmissionController) -> None:
+    while controller.try_acquire():
+        pass
+
+
+def test_grows_one_slot_at_a_time_while_saturated_and_under_target():
+    cpu = FakeCpu()
+    controller = _controller(cpu)
+    _saturate(controller)
+    cpu.queued = [30.0]
+    controller.sample()
+    assert controller.limit == 3
+    assert controller.mfa_jobs() == 4
+
+    controller.release()  # one slot idle → no demand for more
+    cpu.queued = [30.0]
+    controller.sample()
+    assert controller.limit == 3
+
+
+def test_backs_off_multiplicatively_above_target():
+    cpu = FakeCpu()
+    controller = _controller(cpu, initial=6)
+    _saturate(controller)
+    cpu.queued = [97.0]
+    controller.sample()
+    assert controller.limit == 4
+    assert not controller.try_acquire()  # six running, limit four: wait for releases
+
+    timeline = controller.summary()["timeline"]
+    assert [entry["reason"] for entry in timeline] == ["initial", "decrease"]
+    assert timeline[-1]["cpu_pct"] == 97.0
+
+
+def test_does_not_grow_when_one_more_chapter_would_break_the_budget():
+    cpu = FakeCpu()
+    controller = _controller(cpu, initial=2)
+    _saturate(controller)
+    cpu.queued = [60.0]  # 30% per chapter → a third would reach 90%
+    controller.sample()
+    assert controller.limit == 2
+
+
+def test_settle_samples_delay_the_next_change():
+    cpu = FakeCpu()
+    controller = _controller(cpu, initial=1, settle_samples=1)
+    _saturate(controller)
+    cpu.queued = [10.0, 10.0, 10.0]
+    controller.sample()
+    _saturate(controller)
+    controller.sample()
+    assert controller.limit == 2
+    controller.sample()
+    assert controller.limit == 3
+    summary = controller.summary()
+    assert summary["peak_limit"] == 3
+    assert summary["avg_cpu_pct"] == 10.0
+
+
+def test_rejects_invalid_target():
+    with pytest.raises(ValueError):
+        AdmissionController(target_pct=0, max_limit=2)
@@ -0,0 +1,27 @@
+from hb_align.batch.journal import BatchJournal, journal_path_for, replay_journal
+from hb_align.batch.manifest import BatchItem
+
+
+def test_replay_folds_transitions_and_ignores_torn_line(tmp_path):
+    path = journal_path_for(tmp_path / "manifest.json")
+    assert path.name == "manifest.journal.ndjson"
+    with BatchJournal(path, truncate=True) as journal:
+        journal.record("batch_started", batch_id="b-1", input_dir="audio", extra={"scheduling": {"parallel": 2}})
+        for chapter in (1, 2):
+            journal.record_item(BatchItem(f"genesis-00{chapter}.mp3", "Genesis", chapter, estimated_chunks=3))
+        journal.record("item", file_name="genesis-001.mp3", status="running")
+        journal.record("item", file_name="genesis-002.mp3", status="running")
+        done = BatchItem("genesis-001.mp3", "Genesis", 1, status="success", exit_code=0, coverage_pct=99.0)
+        journal.record_item(done)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"event": "item", "file_na')
+
+    replay = replay_journal(path)
+
+    assert replay.batch_id == "b-1" and replay.completed_at is None
+    assert replay.items["genesis-001.mp3"].status == "success"
+    assert replay.items["genesis-002.mp3"].status == "running"
+    assert replay.items["genesis-002.mp3"].estimated_chunks == 3
+    manifest = replay.to_manifest()
+    assert manifest.extra["scheduling"] == {"parallel": 2}
+    assert manifest.summary()["success"] == 1 and manifest.summary()["pending"] == 1
@@ -0,0 +1,25 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from hb_align.batch.pool import WorkerPool
+
+
+def _work(value: int) -> int:
+    if value == 3:
+        os._exit(137)
+    time.sleep(0.05)
+    return value * 10
+
+
+def test_only_the_job_that_kills_its_worker_fails():
+    with WorkerPool(3) as pool:
+        futures = {value: pool.submit(_work, value) for value in range(6)}
+        with pytest.raises(BrokenProcessPool):
+            futures[3].result(timeout=60)
+        results = {value: future.result(timeout=60) for value, future in futures.items() if value != 3}
+        assert results == {0: 0, 1: 10, 2: 20, 4: 40, 5: 50}
+        assert pool.replacements >= 1
+        assert pool.submit(_work, 7).result(timeout=60) == 70
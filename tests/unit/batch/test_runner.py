@@ -0,0 +1,172 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hb_align.batch import runner
+from hb_align.batch.discovery import ChapterFile
+from hb_align.batch.manifest import (
+    BatchItem,
+    BatchManifest,
+    ManifestError,
+    load_manifest,
+    merge_manifests,
+)
+from hb_align.batch.runner import BatchSettings, ChapterJob
+
+
+def _job(name: str, duration_ms: int, chunks: int) -> ChapterJob:
+    chapter = int(name.split("-")[1])
+    return ChapterJob(ChapterFile(Path(f"{name}.wav"), "Genesis", chapter), duration_ms, chunks)
+
+
+def test_schedule_is_longest_processing_time_first():
+    jobs = [_job("genesis-001", 60_000, 2), _job("genesis-002", 300_000, 7), _job("genesis-003", 120_000, 3)]
+    ordered = runner.schedule_longest_first(jobs)
+    assert [job.file_name for job in ordered] == ["genesis-002.wav", "genesis-003.wav", "genesis-001.wav"]
+
+
+def test_mfa_jobs_share_cores_between_parallel_chapters():
+    assert runner.mfa_jobs_for(3, cpu_count=12) == 4
+    assert runner.mfa_jobs_for(8, cpu_count=4) == 1
+    assert runner.default_parallel(cpu_count=16) == 3
+    assert runner.default_parallel(cpu_count=1) == 1
+
+
+def test_estimate_job_falls_back_to_file_size(tmp_path):
+    audio = tmp_path / "genesis-004.mp3"
+    audio.write_bytes(b"\x00" * 16 * 120_000)  # ~120 s at 128 kbps
+    job = runner.estimate_job(
+        ChapterFile(audio, "Genesis", 4), BatchSettings(output_dir=tmp_path, ffprobe="missing-ffprobe")
+    )
+    assert job.duration_ms == 120_000
+    assert job.chunk_count == 3
+    assert job.cost == 360_000
+
+
+def test_run_batch_stop_on_fail_leaves_rest_pending(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_run_chapter(job, settings):
+        calls.append(job.file_name)
+        item = job.pending_item()
+        item.status = "failed" if job.chapter_file.chapter == 2 else "success"
+        return item
+
+    monkeypatch.setattr(runner, "run_chapter", fake_run_chapter)
+    jobs = [_job("genesis-001", 1_000, 1), _job("genesis-002", 9_000, 1), _job("genesis-003", 5_000, 1)]
+    items = runner.run_batch(jobs, BatchSettings(output_dir=tmp_path), parallel=1, stop_on_fail=True)
+
+    assert calls == ["genesis-002.wav"]
+    assert [(item.file_name, item.status) for item in items] == [
+        ("genesis-002.wav", "failed"),
+        ("genesis-003.wav", "pending"),
+        ("genesis-001.wav", "pending"),
+    ]
+
+
+def _die_on_chapter_2(job, settings):
+    if job.chapter_file.chapter == 2:
+        os._exit(137)
+    item = job.pending_item()
+    item.status = "success"
+    return item
+
+
+def test_run_batch_survives_a_worker_killed_mid_chapter(monkeypatch, tmp_path):
+    monkeypatch.setattr(runner, "run_chapter", _die_on_chapter_2)
+    jobs = [_job(f"genesis-{chapter:03d}", chapter * 1_000, 1) for chapter in range(1, 6)]
+    items = runner.run_batch(jobs, BatchSettings(output_dir=tmp_path), parallel=3)
+
+    statuses = {item.file_name: (item.status, item.error_code) for item in items}
+    assert statuses.pop("genesis-002.wav") == ("failed", "WORKER_CRASHED")
+    assert set(statuses.values()) == {("success", None)}
+    assert len(statuses) == 4
+
+
+def test_manifest_round_trip_and_summary(tmp_path):
+    manifest = BatchManifest(input_dir="audio")
+    manifest.items = [
+        BatchItem("genesis-001.mp3", "Genesis", 1, status="success", coverage_pct=98.0, runtime_ms=100),
+        BatchItem("genesis-002.mp3", "Genesis", 2, status="failed", exit_code=2, runtime_ms=300),
+    ]
+    manifest.extra["scheduling"] = {"parallel": 2}
+    path = manifest.write(tmp_path / "manifest.json")
+
+    loaded = load_manifest(path)
+    assert loaded.batch_id == manifest.batch_id
+    assert loaded.extra["scheduling"] == {"parallel": 2}
+    assert loaded.summary()["success"] == 1
+    assert loaded.summary()["avg_runtime_ms"] == 200
+
+
+def test_shards_are_cost_balanced_disjoint_and_stable():
+    costs = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+    jobs = [_job(f"genesis-{i:03d}", cost * 1_000, 1) for i, cost in enumerate(costs, start=1)]
+    shards = runner.partition_longest_first(jobs, 3)
+
+    # Greedy LPT: 9+4+3, 8+5+2, 7+6+1 (a filename hash could put 9, 8 and 7 together).
+    assert [sum(job.cost for job in shard) for shard in shards] == [16_000, 15_000, 14_000]
+    names = [job.file_name for shard in shards for job in shard]
+    assert sorted(names) == sorted(job.file_name for job in jobs)
+    assert runner.shard_jobs(list(reversed(jobs)), 2, 3) == shards[1]
+    with pytest.raises(ValueError):
+        runner.shard_jobs(jobs, 4, 3)
+
+
+def _shard_manifest(index: int, count: int, *items: BatchItem) -> BatchManifest:
+    manifest = BatchManifest(input_dir="audio", items=list(items))
+    manifest.extra["scheduling"] = {"shard": {"index": index, "count": count}}
+    manifest.completed_at = f"2026-01-0{index}T00:00:00+00:00"
+    return manifest
+
+
+def test_merge_manifests_combines_shards_and_checks_coverage():
+    first = _shard_manifest(1, 2, BatchItem("genesis-002.mp3", "Genesis", 2, status="success"))
+    second = _shard_manifest(
+        2, 2, BatchItem("genesis-001.mp3", "Genesis", 1, status="failed"), BatchItem("genesis-003.mp3", "Genesis", 3)
+    )
+
+    merged = merge_manifests([second, first])
+    assert [item.file_name for item in merged.items] == ["genesis-001.mp3", "genesis-002.mp3", "genesis-003.mp3"]
+    assert merged.summary() == {**merged.summary(), "total": 3, "success": 1, "failed": 1, "pending": 1}
+    assert [shard["index"] for shard in merged.extra["shards"]] == [1, 2]
+    assert merged.completed_at == second.completed_at
+
+    with pytest.raises(ManifestError, match="Missing shard"):
+        merge_manifests([first])
+    assert merge_manifests([first], allow_partial=True).extra["missing_shards"] == [2]
+    with pytest.raises(ManifestError, match="more than one shard"):
+        merge_manifests([first, _shard_manifest(2, 2, BatchItem("genesis-002.mp3", "Genesis", 2))])
+
+
+def test_merge_manifests_checks_shards_share_one_plan():
+    plan = {"plan_digest": "a1", "plan_files": ["genesis-001.mp3", "genesis-002.mp3", "genesis-003.mp3"]}
+    first = _shard_manifest(1, 2, BatchItem("genesis-002.mp3", "Genesis", 2))
+    second = _shard_manifest(2, 2, BatchItem("genesis-001.mp3", "Genesis", 1))
+    for manifest in (first, second):
+        manifest.extra["scheduling"]["shard"].update(plan)
+
+    with pytest.raises(ManifestError, match=r"No shard lists \['genesis-003.mp3'\]"):
+        merge_manifests([first, second])
+    assert "plan_files" not in merge_manifests([first], allow_partial=True).extra["shards"][0]
+    second.extra["scheduling"]["shard"]["plan_digest"] = "b2"  # estimated from other files
+    with pytest.raises(ManifestError, match="different files or estimates"):
+        merge_manifests([first, second])
+
+
+def test_plan_digest_depends_on_files_and_estimates_not_order():
+    jobs = [_job("genesis-001", 1_000, 1), _job("genesis-002", 2_000, 1)]
+
+    assert runner.plan_digest(jobs) == runner.plan_digest(list(reversed(jobs)))
+    assert runner.plan_digest(jobs) != runner.plan_digest([jobs[0], _job("genesis-002", 2_000, 2)])
+    assert runner.plan_digest(jobs) != runner.plan_digest(jobs[:1])
+
+
+def test_load_manifest_rejects_totals_that_do_not_match_items(tmp_path):
+    path = BatchManifest(input_dir="audio", items=[BatchItem("genesis-001.mp3", "Genesis", 1)]).write(
+        tmp_path / "manifest.json"
+    )
+    path.write_text(path.read_text(encoding="utf-8").replace('"total": 1', '"total": 2'), encoding="utf-8")
+    with pytest.raises(ManifestError, match="summary.total"):
+        load_manifest(path)
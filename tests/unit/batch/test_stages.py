@@ -0,0 +1,130 @@
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from hb_align.aligner import pipeline
+from hb_align.batch import stages
+from hb_align.batch.discovery import ChapterFile
+from hb_align.batch.runner import BatchSettings, ChapterJob
+from hb_align.batch.stages import AlignOutcome, StagedBatch, StageQueue, _ChapterWork
+from hb_align.utils import events
+from hb_align.utils.tracing import Tracer
+
+
+def _job(chapter: int, duration_ms: int) -> ChapterJob:
+    return ChapterJob(ChapterFile(Path(f"genesis-{chapter:03d}.wav"), "Genesis", chapter), duration_ms, 1)
+
+
+def test_stage_queue_records_put_stalls_and_get_waits():
+    stage_queue = StageQueue("prep_to_align", 1)
+    stage_queue.put("a")
+
+    def slow_consumer():
+        time.sleep(0.05)
+        stage_queue.get()
+        stage_queue.get()
+
+    consumer = threading.Thread(target=slow_consumer)
+    consumer.start()
+    stage_queue.put("b")  # blocks until the consumer frees the single slot
+    consumer.join()
+
+    stats = stage_queue.stats()
+    assert stats["items"] == 2
+    assert stats["max_depth"] == 1
+    assert stats["depth"] == 0
+    assert stats["put_stall_ms"] >= 30
+
+
+def test_prep_failure_with_stop_on_fail_leaves_rest_pending(monkeypatch, tmp_path):
+    prepared = []
+
+    def failing_prepare(self, job):
+        prepared.append(job.file_name)
+        raise OSError("ffmpeg exploded")
+
+    monkeypatch.setattr(StagedBatch, "_prepare", failing_prepare)
+    engine = StagedBatch(BatchSettings(output_dir=tmp_path), parallel=1, prep_workers=1)
+    jobs = [_job(1, 1_000), _job(2, 9_000), _job(3, 5_000)]
+
+    items = engine.run(jobs, stop_on_fail=True)
+
+    assert prepared == ["genesis-002.wav"]
+    assert [(item.file_name, item.status) for item in items] == [
+        ("genesis-002.wav", "failed"),
+        ("genesis-003.wav", "pending"),
+        ("genesis-001.wav", "pending"),
+    ]
+    assert items[0].error_code == "PROCESS_ERROR"
+    stats = engine.stats()
+    assert stats["workers"] == {"prep": 1, "align": 1, "finalize": 2}
+    assert stats["queues"]["prep_to_align"]["items"] == 0
+
+
+def test_a_raising_result_callback_does_not_stall_the_batch(monkeypatch, tmp_path):
+    def failing_prepare(self, job):
+        raise OSError("ffmpeg exploded")
+
+    def journal_full(item):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(StagedBatch, "_prepare", failing_prepare)
+    engine = StagedBatch(BatchSettings(output_dir=tmp_path), parallel=1, prep_workers=1)
+
+    items = engine.run([_job(1, 1_000), _job(2, 2_000)], on_result=journal_full)
+
+    assert [item.status for item in items] == ["failed", "failed"]
+    errors = engine.stats()["callback_errors"]
+    assert errors == [
+        "genesis-002.wav: OSError: No space left on device",
+        "genesis-001.wav: OSError: No space left on device",
+    ]
+
+
+def _align_or_die(text_chapter, chunk_windows, settings, working_dir):
+    if text_chapter == 2:
+        os._exit(137)
+    return AlignOutcome(chunk_alignments=[], spans=[], origin_ns=0)
+
+
+def test_a_dead_align_worker_fails_only_its_own_chapter(monkeypatch, tmp_path):
+    def fake_prepare(self, job):
+        chapter = job.chapter_file.chapter
+        return _ChapterWork(job, chapter, None, [], tmp_path, Tracer())
+
+    def fake_finalize(self, work):
+        return {"exit_code": 0, "summary": {"coverage_pct": 100.0}}
+
+    monkeypatch.setattr(StagedBatch, "_prepare", fake_prepare)
+    monkeypatch.setattr(StagedBatch, "_finalize", fake_finalize)
+    monkeypatch.setattr(stages, "align_prepared", _align_or_die)
+    engine = StagedBatch(BatchSettings(output_dir=tmp_path), parallel=2)
+
+    items = engine.run([_job(chapter, chapter * 1_000) for chapter in range(1, 6)])
+
+    statuses = {item.file_name: (item.status, item.error_code) for item in items}
+    assert statuses.pop("genesis-002.wav") == ("failed", "WORKER_CRASHED")
+    assert set(statuses.values()) == {("success", None)}
+    assert len(statuses) == 4
+
+
+def test_prepare_announces_the_prepared_chunk_plan(monkeypatch, tmp_path):
+    def replan(*args, **kwargs):
+        raise AssertionError("the prepared chunk plan should be reused")
+
+    monkeypatch.setattr(pipeline, "plan_chapter_chunks", replan)
+    audio = tmp_path / "genesis-001.wav"
+    audio.write_bytes(b"\x00" * 2048)
+    engine = StagedBatch(BatchSettings(output_dir=tmp_path / "out", cache_dir=tmp_path / "cache"), parallel=1)
+    stream = io.StringIO()
+
+    with events.EventStream(stream).activate():
+        work = engine._prepare(ChapterJob(ChapterFile(audio, "Genesis", 1), 60_000, 2))
+
+    planned = [record for record in map(json.loads, stream.getvalue().splitlines()) if record["event"] == "chunk_planned"]
+    assert [record["chunk_id"] for record in planned] == [window.chunk_id for window in work.prepared.chunks]
+    assert work.chunk_windows == list(work.prepared.chunks)
+    assert work.prepared.normalized_audio is None  # left to `cache warm`
@@ -0,0 +1,72 @@
+import shutil
+import wave
+from pathlib import Path
+
+from hb_align.batch.discovery import discover_chapter_files
+from hb_align.batch.warmup import WarmSettings, warm_cache
+from hb_align.utils.cache import CacheManager
+
+WLC_SAMPLE = Path("resources/wlc/sample_genesis-001.jsonl")
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(16_000)
+        handle.writeframes(b"\x00\x00" * int(16_000 * seconds))
+
+
+def test_discover_chapter_files_reports_unresolved(tmp_path):
+    (tmp_path / "genesis-001.mp3").write_bytes(b"x")
+    (tmp_path / "intro.mp3").write_bytes(b"x")
+    files, unresolved = discover_chapter_files(tmp_path)
+    assert [(f.book, f.chapter) for f in files] == [("Genesis", 1)]
+    assert [p.name for p in unresolved] == ["intro.mp3"]
+
+
+def test_warm_cache_prepares_every_tradition(tmp_path):
+    wlc_root = tmp_path / "wlc"
+    wlc_root.mkdir()
+    shutil.copy(WLC_SAMPLE, wlc_root / WLC_SAMPLE.name)
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    _write_wav(audio_dir / "genesis-001.wav", 75)
+    files, _ = discover_chapter_files(audio_dir, pattern="*.wav")
+
+    settings = WarmSettings(
+        cache_dir=tmp_path / "cache",
+        traditions=("modern", "ashkenazi"),
+        chunk_size_sec=50,
+        chunk_overlap_sec=5,
+        normalize=False,
+        wlc_root=wlc_root,
+    )
+    results = warm_cache(files, settings, workers=2)
+    assert [r.status for r in results] == ["success"]
+    assert len(results[0].cache_keys) == 2
+    assert results[0].chunk_count == 2
+
+    manager = CacheManager(tmp_path / "cache")
+    for key in results[0].cache_keys:
+        assert manager.read_text_artifact(key, "lexicon.dict")
+
+    again = warm_cache(files, settings)
+    assert again[0].cache_status == ["hit", "hit"]
+
+
+def test_warm_cache_reports_failures(tmp_path):
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    _write_wav(audio_dir / "exodus-040.wav", 1)
+    files, _ = discover_chapter_files(audio_dir, pattern="*.wav")
+    settings = WarmSettings(
+        cache_dir=tmp_path / "cache",
+        traditions=("modern",),
+        chunk_size_sec=50,
+        chunk_overlap_sec=5,
+        wlc_root=tmp_path,
+    )
+    results = warm_cache(files, settings)
+    assert results[0].status == "failed"
+    assert "Exodus" in results[0].error_message
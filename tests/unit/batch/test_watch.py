@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+from hb_align.batch.watch import InotifyWatcher, PollWatcher, SettleTracker
+
+
+def test_tracker_waits_for_the_signature_to_settle(tmp_path):
+    tracker = SettleTracker(tmp_path, pattern="*.wav", settle_s=5)
+    upload = tmp_path / "genesis-001.wav"
+    upload.write_bytes(b"\x00" * 10)
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    tracker.observe(["genesis-001.wav", "notes.txt"], now=0)
+    assert tracker.pending == 1
+    assert tracker.settled(now=3) == []
+
+    with upload.open("ab") as handle:  # still uploading: the clock restarts
+        handle.write(b"\x00" * 10)
+    assert tracker.settled(now=4) == []
+    assert tracker.settled(now=8) == []
+    assert tracker.settled(now=9) == ["genesis-001.wav"]
+    assert tracker.pending == 0
+
+    tracker.observe(["genesis-001.wav"], now=10)  # same signature: already handled
+    assert tracker.pending == 0
+
+    os.utime(upload, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    tracker.observe(["genesis-001.wav"], now=11)
+    assert tracker.pending == 1
+
+    upload.unlink()
+    assert tracker.settled(now=20) == []
+    assert tracker.pending == 0
+
+
+def test_tracker_defers_a_file_settling_while_it_runs(tmp_path):
+    tracker = SettleTracker(tmp_path, pattern="*.wav", settle_s=0)
+    (tmp_path / "genesis-001.wav").write_bytes(b"\x00")
+    tracker.observe(["genesis-001.wav"], now=0)
+    assert tracker.settled(now=0) == ["genesis-001.wav"]
+
+    tracker.defer("genesis-001.wav", now=1)
+    assert tracker.settled(now=1) == ["genesis-001.wav"]
+
+
+def test_poll_watcher_lists_only_when_the_directory_changes(tmp_path):
+    watcher = PollWatcher(tmp_path, rescan_s=3600)
+    assert watcher.changes(0) == set()
+
+    (tmp_path / "genesis-002.wav").write_bytes(b"\x00")
+    os.utime(tmp_path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert watcher.changes(0) == {"genesis-002.wav"}
+    assert watcher.changes(0) == set()
+
+
+def test_inotify_watcher_reports_writes_and_renames(tmp_path):
+    try:
+        watcher = InotifyWatcher(tmp_path)
+    except OSError:
+        pytest.skip("inotify not available")
+    try:
+        assert watcher.changes(0) == set()
+        (tmp_path / "upload.part").write_bytes(b"\x00")
+        (tmp_path / "upload.part").rename(tmp_path / "genesis-003.wav")
+        assert watcher.changes(1) == {"upload.part", "genesis-003.wav"}
+        assert watcher.changes(0) == set()
+    finally:
+        watcher.close()
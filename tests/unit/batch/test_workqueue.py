@@ -0,0 +1,131 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from hb_align.batch import workqueue
+from hb_align.batch.discovery import ChapterFile
+from hb_align.batch.runner import BatchSettings, ChapterJob
+from hb_align.batch.workqueue import WorkQueue
+
+
+def _job(chapter: int, duration_ms: int) -> ChapterJob:
+    return ChapterJob(ChapterFile(Path(f"/audio/genesis-{chapter:03d}.wav"), "Genesis", chapter), duration_ms, 1)
+
+
+def _queue(root: Path, worker: str, **kwargs) -> WorkQueue:
+    return WorkQueue(root, worker_id=worker, lease_ttl_s=30, **kwargs)
+
+
+def _published(tmp_path: Path, **kwargs) -> Path:
+    root = tmp_path / "queue"
+    jobs = [_job(1, 1_000), _job(2, 9_000), _job(3, 5_000)]
+    assert _queue(root, "init", **kwargs).initialize(jobs, batch_id="b-1", input_dir="/audio")
+    return root
+
+
+def test_initialize_publishes_once_and_claims_are_exclusive_longest_first(tmp_path):
+    root = _published(tmp_path)
+    assert not _queue(root, "late").initialize([_job(4, 1)], batch_id="b-2", input_dir="/audio")
+    assert _queue(root, "late").meta()["batch_id"] == "b-1"
+
+    a, b = _queue(root, "a"), _queue(root, "b")
+    first, second, third = a.claim(), b.claim(), a.claim()
+    assert [lease.job.file_name for lease in (first, second, third)] == [
+        "genesis-002.wav",
+        "genesis-003.wav",
+        "genesis-001.wav",
+    ]
+    assert first.path.name.endswith("@a")
+    assert b.claim() is None
+    assert a.counts() == {"pending": 0, "leased": 3, "done": 0}
+
+
+def test_expired_lease_is_reclaimed_then_failed_after_max_attempts(tmp_path):
+    root = _published(tmp_path, max_attempts=2)
+    dead, alive = _queue(root, "dead", max_attempts=2), _queue(root, "alive", max_attempts=2)
+    lease = dead.claim()
+
+    assert alive.reap_expired() == []  # still within the TTL
+    assert alive.reap_expired(now=time.time() + 31) == [lease.name]
+    retried = alive.claim()
+    assert retried.job.file_name == lease.job.file_name
+    assert retried.attempts == 1
+
+    alive.reap_expired(now=time.time() + 31)  # the retry "died" too
+    manifest = alive.to_manifest()
+    items = {item.file_name: item for item in manifest.items}
+    assert items["genesis-002.wav"].status == "failed"
+    assert items["genesis-002.wav"].error_code == "WORKER_CRASHED"
+    assert items["genesis-003.wav"].status == "pending"
+    assert manifest.batch_id == "b-1"
+
+
+def test_result_of_a_reclaimed_lease_is_kept_and_not_rerun(tmp_path):
+    root = _published(tmp_path)
+    slow, other = _queue(root, "slow"), _queue(root, "other")
+    lease = slow.claim()
+    other.reap_expired(now=time.time() + 31)
+
+    item = lease.job.pending_item()
+    item.status = "success"
+    item.exit_code = 0
+    assert slow.complete(lease, item) is False  # lease was gone, result still recorded
+
+    assert other.claim().job.file_name == "genesis-003.wav"  # genesis-002 skipped: already done
+    done = json.loads((root / "done" / "genesis-002.wav.json").read_text(encoding="utf-8"))
+    assert done["status"] == "success"
+    assert done["worker"] == "slow"
+
+
+def test_lease_staged_by_a_reaper_that_died_is_reclaimed(tmp_path):
+    root = _published(tmp_path)
+    lease = _queue(root, "dead").claim()
+    staged = root / "pending" / f".reap-{lease.name}@crashed-reaper"
+    lease.path.rename(staged)  # the reaper died before moving it back
+    alive = _queue(root, "alive")
+    assert alive.counts()["pending"] == 3  # still counted, so the queue is not drained
+
+    assert alive.reap_expired() == []  # still within the TTL
+    assert alive.reap_expired(now=time.time() + 31) == [lease.name]
+    assert not staged.exists()
+    retried = alive.claim()
+    assert retried.job.file_name == lease.job.file_name
+    assert retried.attempts == 1
+
+
+def test_claim_skips_a_lease_reaped_before_it_was_touched(tmp_path, monkeypatch):
+    root = _published(tmp_path)
+    queue = _queue(root, "a")
+    real_utime = os.utime
+
+    def reaped_first(path, *args, **kwargs):
+        if Path(path).name.startswith("00000-"):
+            Path(path).rename(root / "pending" / f".reap-{Path(path).name}")
+        return real_utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(workqueue.os, "utime", reaped_first)
+    assert queue.claim().job.file_name == "genesis-003.wav"
+
+
+def _die_on_chapter_2(job, settings):
+    if job.chapter_file.chapter == 2:
+        os._exit(137)
+    item = job.pending_item()
+    item.status = "success"
+    item.exit_code = 0
+    return item
+
+
+def test_drain_completes_the_crashed_lease_and_keeps_going(tmp_path, monkeypatch):
+    monkeypatch.setattr(workqueue, "run_chapter", _die_on_chapter_2)
+    queue = _queue(_published(tmp_path), "a")
+    items = workqueue.drain(queue, BatchSettings(output_dir=tmp_path / "out"), parallel=2, poll_s=0.05)
+
+    statuses = {item.file_name: (item.status, item.error_code) for item in items}
+    assert statuses == {
+        "genesis-001.wav": ("success", None),
+        "genesis-002.wav": ("failed", "WORKER_CRASHED"),
+        "genesis-003.wav": ("success", None),
+    }
+    assert queue.is_drained()
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from hb_align.aligner import writers
+from hb_align.audio.chunker import AlignedWord
+from hb_align.index.server import LatencyStats, QueryServer
+from hb_align.text.wlc_loader import TextChapter, VerseTokens, WordToken
+
+
+def _write_chapter(
+    root: Path, chapter: int, confidences: tuple[float, ...] = (0.95, 0.6, 0.92)
+) -> Path:
+    text = TextChapter(
+        book="Genesis",
+        chapter=chapter,
+        verses=tuple(
+            VerseTokens(
+                verse=f"{chapter}:{verse}",
+                tokens=(
+                    WordToken(0, "בראשית", "bereshit", "", "", ""),
+                    WordToken(1, "ברא", "bara", "", "", ""),
+                ),
+            )
+            for verse in (1, 2)
+        ),
+    )
+    words = [
+        AlignedWord(
+            text="w",
+            start_ms=index * 1_000,
+            end_ms=index * 1_000 + 800,
+            confidence=score,
+            chunk_id="c",
+        )
+        for index, score in enumerate(confidences)
+    ]
+    directory = root / "genesis" / f"{chapter:03d}"
+    writers.write_alignment_outputs(writers.build_alignment_table(text, words), directory)
+    return directory
+
+
+def test_queries_answer_from_cached_indexes(tmp_path: Path) -> None:
+    _write_chapter(tmp_path, 1)
+    server = QueryServer(tmp_path)
+
+    async def run() -> list[tuple[int, dict]]:
+        return [
+            await server.query("/at?book=Genesis&chapter=1&t=1.2"),
+            await server.query("/verse?ref=Genesis%201:2"),
+            await server.query("/range?book=genesis&chapter=1&from=0.5&to=1.1"),
+            await server.query("/low-confidence?book=Genesis&chapter=1&threshold=0.9"),
+            await server.query("/at?book=Genesis&chapter=2&ms=10"),
+            await server.query("/at?book=Genesis&chapter=one&t=1"),
+            await server.query("/nowhere"),
+        ]
+
+    at, verse, words, low, missing, invalid, unknown = asyncio.run(run())
+
+    assert at[0] == 200 and at[1]["word"]["word_index"] == 1 and at[1]["verse"]["verse"] == "1:1"
+    assert verse[1]["verse"]["start_ms"] == 2_000 and verse[1]["verse"]["end_ms"] == 2_800
+    assert [word["word_index"] for word in words[1]["words"]] == [0, 1]
+    assert [(word["word_index"], word["start_ms"]) for word in low[1]["words"]] == [
+        (1, 1_000),
+        (3, -1),
+    ]
+    assert (missing[0], invalid[0], unknown[0]) == (404, 400, 404)
+    assert server.cache.snapshot()["misses"] == 1 and server.cache.hits == 3
+    assert server.latency.count == 7
+
+
+def test_cache_evicts_least_recently_used_and_reloads_changed_exports(tmp_path: Path) -> None:
+    for chapter in (1, 2, 3):
+        _write_chapter(tmp_path, chapter)
+    server = QueryServer(tmp_path, cache_size=2)
+
+    async def low(chapter: int) -> list[int]:
+        status, payload = await server.query(f"/low-confidence?book=Genesis&chapter={chapter}")
+        assert status == 200
+        return [word["word_index"] for word in payload["words"]]
+
+    async def run() -> list[int]:
+        for chapter in (1, 2, 1, 3):  # 3 evicts 2, the least recently used
+            await low(chapter)
+        await low(2)
+        # Rewrite chapter 2; bump the mtime in case the filesystem clock is coarse.
+        sidecar = _write_chapter(tmp_path, 2, (0.95, 0.95, 0.95, 0.95)) / writers.SIDECAR_NAME
+        os.utime(
+            sidecar, ns=(sidecar.stat().st_atime_ns, sidecar.stat().st_mtime_ns + 1_000_000_000)
+        )
+        return await low(2)
+
+    assert asyncio.run(run()) == []
+    assert server.cache.snapshot() == {
+        "size": 2,
+        "capacity": 2,
+        "hits": 1,
+        "misses": 5,
+        "evictions": 2,
+    }
+
+
+def test_unix_socket_serves_keep_alive_requests(tmp_path: Path) -> None:
+    _write_chapter(tmp_path, 1)
+    server = QueryServer(tmp_path)
+    socket_path = tmp_path / "serve.sock"
+
+    async def run() -> list[bytes]:
+        listener = await server.start(socket_path=socket_path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            writer.write(b"GET /verse?book=Genesis&ref=1:1 HTTP/1.1\r\nHost: x\r\n\r\n")
+            writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response.split(b"HTTP/1.1 ")[1:]
+
+    first, second = asyncio.run(run())
+    assert first.startswith(b"200 OK")
+    assert json.loads(first.split(b"\r\n\r\n", 1)[1])["verse"]["word_count"] == 2
+    assert b"Connection: close" in second
+    assert json.loads(second.split(b"\r\n\r\n", 1)[1])["latency"]["requests"] == 1
+
+
+def test_unexpected_errors_answer_500_and_keep_the_connection(tmp_path: Path, monkeypatch) -> None:
+    _write_chapter(tmp_path, 1)
+    server = QueryServer(tmp_path)
+    socket_path = tmp_path / "serve.sock"
+
+    async def broken_at(params):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(server._routes, "/at", broken_at)
+
+    async def run() -> list[bytes]:
+        listener = await server.start(socket_path=socket_path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            writer.write(b"GET /at?book=Genesis&chapter=1&t=0 HTTP/1.1\r\nHost: x\r\n\r\n")
+            writer.write(b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response.split(b"HTTP/1.1 ")[1:]
+
+    first, second = asyncio.run(run())
+    assert first.startswith(b"500 Internal Server Error")
+    assert json.loads(first.split(b"\r\n\r\n", 1)[1]) == {"error": "Internal error: RuntimeError"}
+    assert second.startswith(b"200 OK")
+
+
+def test_latency_percentiles_use_nearest_rank() -> None:
+    stats = LatencyStats(window=100)
+    for value in range(1, 201):
+        stats.record(float(value))
+
+    assert stats.snapshot() == {"requests": 200, "p50_ms": 150.0, "p99_ms": 199.0, "max_ms": 200.0}
+    assert LatencyStats().percentile(50) is None
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        "/at?book=Genesis&chapter=1",
+        "/verse?ref=1:1",
+        "/verse?ref=Genesis",
+        "/low-confidence?book=../outside/genesis&chapter=1",
+        "/at?book=Genesis&chapter=1&t=nan",
+        "/range?book=Genesis&chapter=1&from=0&to=inf",
+        "/at?book=Genesis&chapter=1&t=1e308",
+        "/range?book=Genesis&chapter=1&from=0&to=1e308",
+        "/low-confidence?book=Genesis&chapter=1&limit=-1",
+    ],
+)
+def test_bad_requests_are_rejected(tmp_path: Path, target: str) -> None:
+    root = tmp_path / "out"
+    _write_chapter(root, 1)
+    _write_chapter(tmp_path / "outside", 1)  # a sibling of the root, never served
+
+    status, payload = asyncio.run(QueryServer(root).query(target))
+
+    assert status == 400
+    assert payload["error"]
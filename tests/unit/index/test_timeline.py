@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from hb_align.aligner import writers
+from hb_align.audio.chunker import AlignedWord
+from hb_align.index.timeline import BookIndex, ChapterIndex
+from hb_align.text.wlc_loader import TextChapter, VerseTokens, WordToken
+
+
+def _chapter(chapter: int = 1, verses: int = 3, words_per_verse: int = 2) -> TextChapter:
+    return TextChapter(
+        book="Genesis",
+        chapter=chapter,
+        verses=tuple(
+            VerseTokens(
+                verse=f"{chapter}:{verse}",
+                tokens=tuple(
+                    WordToken(token, f"מלה{token}", f"w{token}", "", "", "")
+                    for token in range(words_per_verse)
+                ),
+            )
+            for verse in range(1, verses + 1)
+        ),
+    )
+
+
+def _words(count: int, *, step: int = 500, length: int = 400) -> list[AlignedWord]:
+    return [
+        AlignedWord(
+            text="מלה",
+            start_ms=index * step,
+            end_ms=index * step + length,
+            confidence=0.9,
+            chunk_id="c1",
+        )
+        for index in range(count)
+    ]
+
+
+def test_point_queries_find_the_covering_word_and_verse() -> None:
+    index = ChapterIndex.build(_chapter(), _words(6))
+
+    hit = index.word_at(2_100)
+    assert (hit.verse, hit.word_index, hit.start_ms, hit.end_ms) == ("1:3", 4, 2_000, 2_400)
+    assert index.word_at(2_450) is None  # gap between words
+    assert index.verse_at(2_450).verse == "1:3"
+    assert index.verse_at(950) is None  # between verses 1:1 and 1:2
+    assert index.word_at(-5) is None and index.word_at(10_000) is None
+
+
+def test_verse_spans_and_range_queries() -> None:
+    index = ChapterIndex.build(_chapter(), _words(5))  # the last word is not placed
+
+    span = index.verse("1:2")
+    assert (span.first_word, span.word_count, span.start_ms, span.end_ms) == (2, 2, 1_000, 1_900)
+    assert index.verse("1:3").end_ms == 2_400
+    assert [word.word_index for word in index.words_between(850, 2_050)] == [1, 2, 3, 4]
+    assert index.words_between(2_450, 2_480) == []
+    with pytest.raises(KeyError):
+        index.verse("1:9")
+
+
+def test_overlapping_words_are_still_found() -> None:
+    words = [
+        AlignedWord(text="a", start_ms=0, end_ms=1_000, confidence=0.9, chunk_id="c1"),
+        AlignedWord(text="b", start_ms=300, end_ms=500, confidence=0.9, chunk_id="c1"),
+    ]
+    index = ChapterIndex.build(_chapter(verses=1), words)
+
+    assert index.word_at(700).word_index == 0
+    assert [word.word_index for word in index.words_between(600, 900)] == [0]
+
+
+def test_book_index_loads_sidecars_and_text_exports(tmp_path: Path) -> None:
+    first = writers.build_alignment_table(_chapter(1), _words(6))
+    second = writers.build_alignment_table(_chapter(2), _words(6, step=1_000))
+    writers.write_alignment_outputs(first, tmp_path / "genesis" / "001")
+    writers.write_alignments_csv(second, tmp_path / "genesis" / "002" / "alignments.csv")
+
+    book = BookIndex.load(tmp_path / "genesis")
+
+    assert book.chapters == [1, 2]
+    assert book.verse("Gen 2:3").start_ms == 4_000
+    assert book.verse("1:2") == ChapterIndex.load(tmp_path / "genesis" / "001").verse("1:2")
+    assert book.word_at(2, 4_200).word_text == "מלה0"
+    with pytest.raises(KeyError):
+        book.verse("Exodus 1:1")
+    with pytest.raises(FileNotFoundError):
+        BookIndex.load(tmp_path / "missing")
+
+
+def test_lookups_over_a_whole_book_are_sub_millisecond() -> None:
+    chapters = [
+        ChapterIndex.build(
+            _chapter(number, verses=30, words_per_verse=20), _words(600, step=300, length=250)
+        )
+        for number in range(1, 51)
+    ]
+    book = BookIndex(chapters)
+    queries = 20_000
+
+    started = time.perf_counter()
+    for query in range(queries):
+        book.word_at(query % 50 + 1, (query * 37) % 180_000)
+        book.verse(f"{query % 50 + 1}:{query % 30 + 1}")
+    per_query_ms = (time.perf_counter() - started) * 1000 / (2 * queries)
+    assert per_query_ms < 1.0
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import io
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hb_align.review.aggregator import (
+    AlignmentSchemaError,
+    coerce_alignments,
+    load_alignments,
+    review_alignments,
+)
+from hb_align.review.exporters import report_metadata, write_csv, write_json, write_markdown
+
+
+def _frame(rows: list[tuple]) -> pd.DataFrame:
+    columns = ["book", "chapter", "verse", "word_index", "word_text", "start_ms", "end_ms", "confidence"]
+    return coerce_alignments(pd.DataFrame(rows, columns=columns))
+
+
+ROWS = [
+    ("Genesis", 1, "1:1", 0, "בראשית", 0, 400, 0.99),
+    ("Genesis", 1, "1:1", 1, "ברא", 400, 700, 0.72),
+    ("Genesis", 1, "1:2", 2, "והארץ", -1, -1, 0.95),
+    ("Genesis", 1, "1:2", 3, "היתה", 900, 1200, 0.61),
+    ("Genesis", 1, "1:3", 4, "ויאמר", 1200, 1500, 0.97),
+]
+
+
+def test_review_flags_low_confidence_and_missing_timestamps() -> None:
+    result = review_alignments(_frame(ROWS), threshold=0.9)
+
+    assert list(result.findings["word_index"]) == [1, 2, 3]
+    assert list(result.findings["reason"]) == ["low_confidence", "missing_timestamp", "low_confidence"]
+    assert result.reason_counts() == {"low_confidence": 2, "missing_timestamp": 1}
+    assert result.total_words == 5
+    assert result.min_confidence == pytest.approx(0.61)
+
+
+def test_verse_profiles_aggregate_in_document_order() -> None:
+    result = review_alignments(_frame(ROWS), threshold=0.9, group_by="verse")
+
+    profiles = result.profiles.set_index("scope_id")
+    assert list(profiles.index) == ["Genesis 1:1", "Genesis 1:2", "Genesis 1:3"]
+    assert profiles.loc["Genesis 1:2", "word_count"] == 2
+    assert profiles.loc["Genesis 1:2", "flagged"] == 2
+    assert profiles.loc["Genesis 1:2", "min_confidence"] == pytest.approx(0.61)
+    assert profiles.loc["Genesis 1:1", "avg_confidence"] == pytest.approx((0.99 + 0.72) / 2)
+    assert profiles.loc["Genesis 1:3", "status"] == "pass"
+    assert result.worst_scope() == {"scope_id": "Genesis 1:2", "avg_confidence": pytest.approx(0.78)}
+
+
+def test_worst_scope_skips_verses_without_any_confidence() -> None:
+    blank = [
+        ("Genesis", 1, "1:4", 5, "אור", -1, -1, None),
+        ("Genesis", 1, "1:4", 6, "יהי", -1, -1, None),
+    ]
+    result = review_alignments(_frame(ROWS + blank), threshold=0.9, group_by="verse")
+
+    assert result.profiles.set_index("scope_id").loc["Genesis 1:4", "flagged"] == 2
+    assert result.worst_scope() == {"scope_id": "Genesis 1:2", "avg_confidence": pytest.approx(0.78)}
+    assert review_alignments(_frame(blank), threshold=0.9).worst_scope() is None
+
+
+def test_chapter_profiles_and_limit() -> None:
+    result = review_alignments(_frame(ROWS), threshold=0.9, group_by="chapter", limit=2)
+
+    assert len(result.findings) == 2
+    assert list(result.profiles["scope_id"]) == ["Genesis 1"]
+    assert int(result.profiles.loc[0, "flagged"]) == 3
+
+
+def test_review_rejects_threshold_outside_range() -> None:
+    with pytest.raises(ValueError):
+        review_alignments(_frame(ROWS), threshold=0.3)
+
+
+def test_load_alignments_reads_json_and_rejects_bad_schema(tmp_path: Path) -> None:
+    path = tmp_path / "alignments.json"
+    columns = ["book", "chapter", "verse", "word_index", "word_text", "start_ms", "end_ms", "confidence"]
+    path.write_text(json.dumps([dict(zip(columns, row, strict=True)) for row in ROWS]), encoding="utf-8")
+    frame = load_alignments(path)
+    assert frame["confidence"].dtype == np.float64
+    assert len(frame) == 5
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("book,chapter\nGenesis,1\n", encoding="utf-8")
+    with pytest.raises(AlignmentSchemaError, match="word_index"):
+        load_alignments(bad)
+
+
+def test_exporters_write_metadata_and_rows() -> None:
+    result = review_alignments(_frame(ROWS), threshold=0.9, group_by="verse")
+    metadata = report_metadata("alignments.csv", 0.9, notes="second pass")
+
+    csv_out = io.StringIO()
+    write_csv(result, csv_out, metadata=metadata)
+    lines = csv_out.getvalue().splitlines()
+    assert lines[0] == "# source: alignments.csv"
+    header = next(line for line in lines if not line.startswith("#"))
+    assert header.endswith("confidence,reason")
+    assert "Genesis,1,1:2,2,והארץ,-1,-1,0.95,missing_timestamp" in lines
+
+    json_out = io.StringIO()
+    write_json(result, json_out, metadata=metadata)
+    records = json.loads(json_out.getvalue())
+    assert [record["word_index"] for record in records] == [1, 2, 3]
+    assert records[0]["notes"] == "second pass"
+    assert records[1]["start_ms"] == -1
+
+    md_out = io.StringIO()
+    write_markdown(result, md_out, metadata=metadata)
+    text = md_out.getvalue()
+    assert "## Genesis 1:2: 2/2 flagged" in text
+    assert "## Genesis 1:3" not in text
+
+
+def test_review_meets_latency_budget_for_a_large_chapter() -> None:
+    # NFR-002: 1,500 words in under 5 seconds; a 30k-word book should be far inside it.
+    rng = np.random.default_rng(7)
+    count = 30_000
+    frame = coerce_alignments(
+        pd.DataFrame(
+            {
+                "book": "Genesis",
+                "chapter": np.repeat(np.arange(1, 51), count // 50),
+                "verse": [f"{i // 600 + 1}:{(i % 600) // 20 + 1}" for i in range(count)],
+                "word_index": np.arange(count),
+                "word_text": "דבר",
+                "start_ms": np.arange(count) * 300,
+                "end_ms": np.arange(count) * 300 + 250,
+                "confidence": rng.uniform(0.5, 1.0, count),
+            }
+        )
+    )
+    started = time.perf_counter()
+    result = review_alignments(frame, threshold=0.9, group_by="verse")
+    write_csv(result, io.StringIO(), metadata=report_metadata("book.csv", 0.9))
+    assert time.perf_counter() - started < 5.0
+    assert 0 < result.flagged < count
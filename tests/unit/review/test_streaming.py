@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from hb_align.review.aggregator import load_alignments, review_alignments
+from hb_align.review.streaming import (
+    BoundedHeap,
+    TreeReview,
+    discover_alignment_files,
+    review_chapter_file,
+    review_tree,
+)
+
+FIELDS = ["book", "chapter", "verse", "word_index", "word_text", "start_ms", "end_ms", "confidence"]
+
+
+def _write_chapter(root: Path, chapter: int, confidences: list[float]) -> Path:
+    path = root / "psalms" / f"{chapter:03d}" / "alignments.csv"
+    path.parent.mkdir(parents=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for index, confidence in enumerate(confidences):
+            start = index * 300 if confidence > 0 else -1
+            writer.writerow(
+                ["Psalms", chapter, f"{chapter}:{index // 3 + 1}", index, "שיר", start, start + 250, confidence]
+            )
+    return path
+
+
+def test_bounded_heap_keeps_k_smallest_in_order() -> None:
+    heap: BoundedHeap[str] = BoundedHeap(3)
+    for key, item in [(0.9, "a"), (0.2, "b"), (0.7, "c"), (0.2, "d"), (0.95, "e"), (0.1, "f")]:
+        heap.push(key, item)
+
+    assert len(heap) == 3
+    assert heap.items() == ["f", "b", "d"]
+
+
+def test_chunked_chapter_review_matches_whole_file_review(tmp_path: Path) -> None:
+    confidences = [0.99, 0.72, 0.95, 0.61, 0.97, 0.0, 0.88, 0.93, 0.55, 0.99, 0.91]
+    path = _write_chapter(tmp_path, 23, confidences)
+    whole = review_alignments(load_alignments(path), threshold=0.9, group_by="verse")
+
+    chunked = review_chapter_file(path, threshold=0.9, top_k=2, chunk_rows=4)
+
+    assert chunked.error is None
+    assert chunked.total_words == whole.total_words
+    assert list(chunked.findings["word_index"]) == list(whole.findings["word_index"])
+    assert chunked.reasons == whole.reason_counts()
+    assert chunked.min_confidence == pytest.approx(whole.min_confidence)
+    expected = whole.profiles.set_index("scope_id")
+    for profile in chunked.profiles.itertuples(index=False):
+        assert profile.word_count == expected.loc[profile.scope_id, "word_count"]
+        assert profile.flagged == expected.loc[profile.scope_id, "flagged"]
+        assert profile.avg_confidence == pytest.approx(expected.loc[profile.scope_id, "avg_confidence"])
+    assert [word["word_index"] for word in chunked.lowest_words] == [5, 8]
+
+
+def test_unreadable_chapter_is_reported_not_raised(tmp_path: Path) -> None:
+    path = tmp_path / "alignments.csv"
+    path.mkdir()  # reading a directory raises IsADirectoryError, an OSError
+
+    review = review_chapter_file(path, threshold=0.9, log_duration=False)
+
+    assert review.error is not None
+    assert review.total_words == 0
+
+
+def test_tree_review_merges_chapters_into_top_k(tmp_path: Path) -> None:
+    _write_chapter(tmp_path, 1, [0.99, 0.95, 0.97, 0.6, 0.98, 0.99])
+    _write_chapter(tmp_path, 2, [0.5, 0.52, 0.99, 0.99, 0.99, 0.99])
+    (tmp_path / "psalms" / "003").mkdir()
+    (tmp_path / "psalms" / "003" / "alignments.csv").write_text("book,chapter\nPsalms,3\n", encoding="utf-8")
+    paths = discover_alignment_files(str(tmp_path))
+    tree = TreeReview(threshold=0.9, group_by="verse", top_k=2)
+
+    for chapter in review_tree(paths, threshold=0.9, group_by="verse", top_k=2, chunk_rows=4):
+        tree.add(chapter)
+
+    summary = tree.summary()
+    assert summary["chapters"] == 2
+    assert summary["total_words"] == 12
+    assert summary["flagged_words"] == 3
+    assert [scope["scope_id"] for scope in summary["worst"]] == ["Psalms 2:1", "Psalms 1:2"]
+    assert [word["confidence"] for word in summary["lowest_words"]] == [0.5, 0.52]
+    assert len(summary["errors"]) == 1 and "missing columns" in summary["errors"][0]
+
+
+def test_discovery_prefers_csv_per_chapter_and_expands_globs(tmp_path: Path) -> None:
+    first = _write_chapter(tmp_path, 1, [0.99])
+    second = _write_chapter(tmp_path, 2, [0.99])
+    first.with_name("alignments.json").write_text("[]", encoding="utf-8")
+    second.with_name("alignments.hbcol").write_bytes(b"")
+    second.unlink()
+
+    assert discover_alignment_files(str(tmp_path)) == [first, second.with_name("alignments.hbcol")]
+    assert discover_alignment_files(str(tmp_path / "psalms" / "00[1]")) == [first]
+    assert discover_alignment_files(str(tmp_path / "missing")) == []
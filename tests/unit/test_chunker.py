@@ -1,8 +1,11 @@
+import numpy as np
 import pytest
 
 from hb_align.audio.chunker import (
+    AlignedWord,
     ChunkAlignment,
     ChunkWindow,
+    StitchedTimeline,
     WordSegment,
     chunk_map_to_dict,
     plan_chunks,
@@ -69,4 +72,128 @@ def test_stitch_chunk_alignments_handles_non_overlap():
     result = merged[0]
     assert result.text == "solo"
     assert result.start_ms == 0
-    assert result.end_ms == 1000
\ No newline at end of file
+    assert result.end_ms == 1000
+
+
+def _segments(entries, length_ms=400):
+    return [
+        WordSegment(text=text, start_ms=start, end_ms=start + length_ms, confidence=conf)
+        for text, start, conf in entries
+    ]
+
+
+def test_stitch_resolves_the_whole_overlap_zone():
+    first = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-001", start_ms=0, end_ms=10_000, overlap_ms=0),
+        words=_segments([("a", 7_000, 0.9), ("b", 8_000, 0.6), ("c", 8_500, 0.9), ("d", 9_000, 0.5)]),
+    )
+    second = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-002", start_ms=8_000, end_ms=18_000, overlap_ms=2_000),
+        words=_segments([("b", 50, 0.8), ("c", 520, 0.7), ("d", 1_010, 0.95), ("e", 2_500, 0.9)]),
+    )
+
+    # Out of order on purpose: chunks are stitched in start order.
+    merged = stitch_chunk_alignments([second, first])
+
+    assert [word.text for word in merged] == ["a", "b", "c", "d", "e"]
+    assert [word.chunk_id for word in merged] == [
+        "chunk-001",
+        "chunk-002",
+        "chunk-001",
+        "chunk-002",
+        "chunk-002",
+    ]
+    assert merged[3] == AlignedWord(
+        text="d", start_ms=9_010, end_ms=9_410, confidence=0.95, chunk_id="chunk-002"
+    )
+
+
+def test_stitched_timeline_is_columnar_with_views_on_demand():
+    # A Psalm 119-sized chapter (~2.5k words), one word every 400 ms, 50 s chunks.
+    total, word_ms = 2_500, 400
+    windows = plan_chunks(total * word_ms, chunk_size_sec=50, overlap_sec=5)
+    alignments = [
+        ChunkAlignment(
+            chunk=window,
+            words=_segments(
+                [
+                    (f"w{n}", n * word_ms - window.start_ms, 0.9)
+                    for n in range(-(-window.start_ms // word_ms), total)
+                    if n * word_ms + 300 <= window.end_ms
+                ],
+                length_ms=300,
+            ),
+        )
+        for window in windows
+    ]
+
+    timeline = stitch_chunk_alignments(alignments)
+
+    assert isinstance(timeline, StitchedTimeline)
+    assert len(timeline) == total
+    assert timeline.text[:3] == ["w0", "w1", "w2"]
+    assert timeline[-1].text == f"w{total - 1}"
+    assert np.array_equal(timeline.start_ms, np.arange(total) * word_ms)
+    window = timeline[10:12]
+    assert isinstance(window, StitchedTimeline)
+    assert [word.text for word in window] == ["w10", "w11"]
+    assert StitchedTimeline.from_words(list(window))[1] == window[1]
+
+    indexed = stitch_chunk_alignments(alignments, tokens=[f"w{n}" for n in range(total)])
+    assert np.array_equal(indexed.word_index, np.arange(total))
+    assert indexed.unmatched == 0
+
+
+def test_token_alignment_tells_a_repeated_word_from_a_duplicate():
+    tokens = ["a", "b", "b", "c"]
+    first = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-001", start_ms=0, end_ms=1_000, overlap_ms=0),
+        words=_segments([("a", 0, 0.9), ("b", 450, 0.9)], length_ms=350),
+    )
+    # The second "b" starts 250 ms after the first: one word by timing alone.
+    second = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-002", start_ms=700, end_ms=2_000, overlap_ms=300),
+        words=_segments([("b", 0, 0.8), ("c", 350, 0.9)], length_ms=300),
+    )
+
+    assert [word.text for word in stitch_chunk_alignments([first, second])] == ["a", "b", "c"]
+
+    merged = stitch_chunk_alignments([first, second], tokens=tokens)
+    assert [word.text for word in merged] == tokens
+    assert merged.word_index.tolist() == [0, 1, 2, 3]
+    assert merged[2].chunk_id == "chunk-002"
+
+
+def test_token_alignment_merges_drifted_duplicates_and_drops_strays():
+    tokens = ["a", "b", "c", "d"]
+    first = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-001", start_ms=0, end_ms=2_000, overlap_ms=0),
+        words=_segments([("a", 0, 0.9), ("b", 500, 0.6), ("c", 1_000, 0.9)]),
+    )
+    # This chunk hears "b" a second late and a stray "x" no token accounts for.
+    second = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-002", start_ms=400, end_ms=3_000, overlap_ms=1_600),
+        words=_segments([("b", 1_100, 0.8), ("x", 1_500, 0.9), ("c", 1_900, 0.5), ("d", 2_300, 0.9)]),
+    )
+
+    merged = stitch_chunk_alignments([first, second], tokens=tokens)
+
+    assert [word.text for word in merged] == tokens
+    assert [word.word_index for word in merged] == [0, 1, 2, 3]
+    assert [word.chunk_id for word in merged][1:] == ["chunk-002", "chunk-001", "chunk-002"]
+    assert merged.unmatched == 1
+
+
+def test_token_alignment_drops_an_outro_past_the_last_token():
+    tokens = [f"t{n}" for n in range(5)]
+    # The recording reads the chapter, then announces it again: 30 words for 5 tokens.
+    alignment = ChunkAlignment(
+        chunk=ChunkWindow(chunk_id="chunk-001", start_ms=0, end_ms=30_000, overlap_ms=0),
+        words=_segments([(f"t{n % 5}", n * 1_000, 0.9) for n in range(30)]),
+    )
+
+    merged = stitch_chunk_alignments([alignment], tokens=tokens)
+
+    assert merged.word_index.tolist() == [0, 1, 2, 3, 4]
+    assert merged.start_ms.tolist() == [0, 1_000, 2_000, 3_000, 4_000]
+    assert merged.unmatched == 25
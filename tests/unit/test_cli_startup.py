@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import typer
+
+from hb_align.cli.app import LAZY_COMMANDS, app
+
+SRC_ROOT = Path(__file__).resolve().parents[2] / "src"
+
+# Modules that only specific commands need; none may load for `--help`.
+HEAVY_MODULES = (
+    "hb_align.cli.process",
+    "hb_align.cli.batch",
+    "hb_align.cli.review",
+    "hb_align.cli.cache",
+    "hb_align.cli.lookup",
+    "hb_align.cli.serve",
+    "hb_align.cli.daemon",
+    "hb_align.daemon.server",
+    "hb_align.aligner.pipeline",
+    "hb_align.text.wlc_loader",
+    "hb_align.text.transliterator",
+    "yaml",
+    "pandas",
+)
+
+
+def _run(*args: str) -> subprocess.CompletedProcess[str]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(SRC_ROOT), os.environ.get("PYTHONPATH", "")]))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=False)
+
+
+def _importtime_modules(*args: str) -> set[str]:
+    """Module names reported by `python -X importtime` for a CLI invocation."""
+
+    result = _run("-X", "importtime", "-m", "hb_align", *args)
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def _loaded_modules(*args: str) -> set[str]:
+    """`sys.modules` after a CLI invocation (also covers `importlib.import_module` loads,
+    which `-X importtime` does not report)."""
+
+    script = (
+        "import sys\n"
+        "from hb_align.cli.app import app\n"
+        "try:\n"
+        f"    app({list(args)!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.stderr.write('\\n'.join(sys.modules))\n"
+    )
+    return set(_run("-c", script).stderr.splitlines())
+
+
+def test_root_help_does_not_import_command_modules() -> None:
+    modules = _importtime_modules("--help")
+    assert "hb_align.cli.app" in modules
+    assert not modules.intersection(HEAVY_MODULES)
+    assert not _loaded_modules("--help").intersection(HEAVY_MODULES)
+
+
+def test_invoking_a_command_imports_only_that_command() -> None:
+    modules = _loaded_modules("review", "--help")
+    assert "hb_align.cli.review" in modules
+    assert "hb_align.cli.process" not in modules
+    assert "hb_align.aligner.pipeline" not in modules
+
+
+def test_daemon_client_does_not_import_the_pipeline() -> None:
+    modules = _loaded_modules("daemon", "submit", "--help")
+    assert "hb_align.cli.daemon" in modules
+    assert not modules.intersection(set(HEAVY_MODULES) - {"hb_align.cli.daemon"})
+
+
+def test_utils_package_does_not_import_rich_for_config() -> None:
+    script = "import sys\nfrom hb_align.utils import load_config\nprint('\\n'.join(sys.modules))"
+    modules = set(_run("-c", script).stdout.splitlines())
+    assert "hb_align.utils.config" in modules
+    assert "rich" not in modules
+
+
+def test_utils_all_lists_every_lazy_export() -> None:
+    import hb_align.utils as utils
+
+    assert sorted(utils.__all__) == sorted(utils._EXPORTS)
+
+
+@pytest.mark.parametrize("name", list(LAZY_COMMANDS))
+def test_static_help_matches_command(name: str) -> None:
+    group = typer.main.get_command(app)
+    command = group.load_command(name)  # type: ignore[attr-defined]
+    assert command.help is not None
+    assert command.help.strip().splitlines()[0] == LAZY_COMMANDS[name].help
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from hb_align.utils.cache import CacheManager, build_cache_key
+from hb_align.utils.cache import CacheManager, CompressionPolicy, build_cache_key
 from hb_align.utils.config import AppConfig
 
 
@@ -72,3 +72,50 @@ def test_purge_older_than_rejects_invalid(tmp_path):
     manager = CacheManager.from_config(_config(tmp_path))
     with pytest.raises(ValueError):
         manager.purge_older_than(0)
+
+
+def test_compression_policy_parse():
+    assert not CompressionPolicy.parse("off").enabled
+    policy = CompressionPolicy.parse("json=zlib,textgrid=lzma", level=3)
+    assert policy.codec_for("alignments.json") == "zlib"
+    assert policy.codec_for("chunk-001.TextGrid") == "lzma"
+    assert policy.codec_for("audio.wav") is None
+    assert CompressionPolicy.parse("lzma").codec_for("lexicon.dict") == "lzma"
+    with pytest.raises(ValueError):
+        CompressionPolicy.parse("json=brotli")
+
+
+def test_uncompressed_by_default(tmp_path):
+    manager = CacheManager.from_config(_config(tmp_path))
+    stored = manager.write_text_artifact("key", "alignments.json", '{"words": []}')
+    assert stored.name == "alignments.json"
+    assert manager.read_text_artifact("key", "alignments.json") == '{"words": []}'
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_compressed_text_artifacts_round_trip(tmp_path, codec):
+    manager = CacheManager(tmp_path / "cache", compression=CompressionPolicy.parse(codec))
+    text = "\n".join(f'item [{i}]: text = "בראשית" xmin = {i * 0.4:.2f}' for i in range(500))
+    stored = manager.write_text_artifact("key", "chunk-001.textgrid", text)
+    assert stored.name != "chunk-001.textgrid"
+    with manager.open_text_artifact("key", "chunk-001.textgrid") as handle:
+        assert handle.readline().startswith("item [0]")
+    assert manager.read_text_artifact("key", "chunk-001.textgrid") == text
+
+    manager.write_metadata("key", {"status": "ok"})
+    assert manager.read_metadata("key") == {"status": "ok"}
+    assert not (tmp_path / "cache" / "key" / "metadata.json").exists()
+
+    stats = manager.stats.to_dict()
+    assert stats["writes"] == 2
+    assert stats["compression_ratio"] > 3
+    assert manager.stats.stored_bytes < manager.stats.raw_bytes
+
+
+def test_switching_codec_replaces_stale_variant(tmp_path):
+    plain = CacheManager(tmp_path / "cache")
+    plain.write_metadata("key", {"v": 1})
+    compressed = CacheManager(tmp_path / "cache", compression=CompressionPolicy.parse("zlib"))
+    compressed.write_metadata("key", {"v": 2})
+    assert plain.read_metadata("key") == {"v": 2}
+    assert len(list((tmp_path / "cache" / "key").iterdir())) == 1
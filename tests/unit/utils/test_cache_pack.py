@@ -0,0 +1,68 @@
+import io
+import tarfile
+
+import pytest
+
+from hb_align.utils.cache import CacheManager, CompressionPolicy
+from hb_align.utils.cache_pack import CachePackError, PackSelector, export_pack, import_pack
+
+
+def _seed(manager: CacheManager, key: str, book: str, tradition: str) -> None:
+    manager.write_metadata(key, {"book": book, "tradition": tradition})
+    manager.write_text_artifact(key, "lexicon.dict", f"{key}\tipa\n")
+    wav = manager.artifact_path(key, "audio/normalized.wav", ensure=True)
+    wav.parent.mkdir(parents=True, exist_ok=True)
+    wav.write_bytes(b"RIFF" + bytes(range(256)) * 8)
+
+
+def test_export_import_round_trip_with_selector(tmp_path):
+    source = CacheManager(tmp_path / "src", compression=CompressionPolicy.parse("zlib"))
+    _seed(source, "aaa1", "Genesis", "modern")
+    _seed(source, "aaa2", "Genesis", "sephardi")
+    _seed(source, "bbb1", "Exodus", "modern")
+
+    buffer = io.BytesIO()
+    report = export_pack(source, buffer, PackSelector(book="genesis"))
+    assert report.entries == ["aaa1", "aaa2"]
+
+    target = CacheManager(tmp_path / "dst", compression=CompressionPolicy.parse("zlib"))
+    _seed(target, "aaa2", "Genesis", "sephardi")
+    buffer.seek(0)
+    imported = import_pack(target, buffer)
+    assert imported.entries == ["aaa1"]
+    assert imported.skipped == ["aaa2"]
+    assert target.read_metadata("aaa1") == {"book": "Genesis", "tradition": "modern"}
+    assert target.read_text_artifact("aaa1", "lexicon.dict") == "aaa1\tipa\n"
+    assert not target.entry_exists("bbb1")
+    assert not [p for p in target.root.iterdir() if p.name.startswith(".import-")]
+
+
+def test_key_prefix_selector(tmp_path):
+    source = CacheManager(tmp_path / "src")
+    _seed(source, "aaa1", "Genesis", "modern")
+    _seed(source, "bbb1", "Exodus", "modern")
+    report = export_pack(source, io.BytesIO(), PackSelector(key_prefix="bbb", tradition="modern"))
+    assert report.entries == ["bbb1"]
+
+
+def test_import_rejects_corrupted_member(tmp_path):
+    source = CacheManager(tmp_path / "src")
+    _seed(source, "aaa1", "Genesis", "modern")
+    buffer = io.BytesIO()
+    export_pack(source, buffer, PackSelector())
+
+    # Rewrite the pack with one member's payload flipped while keeping its size.
+    buffer.seek(0)
+    tampered = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="r") as src, tarfile.open(fileobj=tampered, mode="w") as dst:
+        for member in src.getmembers():
+            data = src.extractfile(member).read()
+            if member.name.endswith("normalized.wav"):
+                data = data[:-1] + b"\x00"
+            dst.addfile(member, io.BytesIO(data))
+    tampered.seek(0)
+
+    target = CacheManager(tmp_path / "dst")
+    with pytest.raises(CachePackError):
+        import_pack(target, tampered)
+    assert not target.entry_exists("aaa1")
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hb_align.utils import config as config_module
+from hb_align.utils.config import (
+    SNAPSHOT_ENV_VAR,
+    AppConfig,
+    clear_config_cache,
+    install_config_snapshot,
+    load_config,
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_config(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv(SNAPSHOT_ENV_VAR, raising=False)
+    monkeypatch.setenv("HB_ALIGN_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("HB_ALIGN_OUTPUT_ROOT", str(tmp_path / "out"))
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def _worker_cache_dir() -> str:
+    return str(load_config().cache_dir)
+
+
+def test_load_config_is_memoized_and_side_effect_free(tmp_path: Path) -> None:
+    first = load_config()
+    assert load_config() is first
+    assert not (tmp_path / "cache").exists()
+    first.ensure_directories()
+    assert (tmp_path / "cache").is_dir() and (tmp_path / "out" / "logs").is_dir()
+    (tmp_path / "cache").rmdir()  # removed mid-run: the next command recreates it
+    first.ensure_directories()
+    assert (tmp_path / "cache").is_dir()
+
+
+def test_environment_change_invalidates_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    first = load_config()
+    monkeypatch.setenv("HB_ALIGN_CACHE_DIR", str(tmp_path / "other"))
+    second = load_config()
+    assert second is not first
+    assert second.cache_dir == (tmp_path / "other").resolve()
+
+
+def test_env_file_edits_are_picked_up(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HB_ALIGN_CACHE_DIR")
+    env_file = tmp_path / "settings.env"
+    env_file.write_text(f"HB_ALIGN_CACHE_DIR={tmp_path / 'a'}\n", encoding="utf-8")
+    assert load_config(env_file).cache_dir == (tmp_path / "a").resolve()
+    env_file.write_text(f"HB_ALIGN_CACHE_DIR={tmp_path / 'bb'}\n", encoding="utf-8")
+    assert load_config(env_file).cache_dir == (tmp_path / "bb").resolve()
+
+
+def test_snapshot_round_trip_and_env_inheritance(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    resolved = load_config()
+    restored = AppConfig.from_snapshot(resolved.to_snapshot())
+    assert restored == resolved
+
+    monkeypatch.setenv(SNAPSHOT_ENV_VAR, resolved.to_snapshot())
+    monkeypatch.setenv("HB_ALIGN_CACHE_DIR", str(tmp_path / "ignored"))
+    monkeypatch.setattr(config_module, "_resolve", lambda *a: pytest.fail("snapshot should skip resolution"))
+    assert load_config().cache_dir == resolved.cache_dir
+
+
+def test_pool_workers_use_installed_snapshot(tmp_path: Path) -> None:
+    custom = replace(load_config(), cache_dir=tmp_path / "pool")
+    with ProcessPoolExecutor(
+        max_workers=1, initializer=install_config_snapshot, initargs=(custom.to_snapshot(),)
+    ) as pool:
+        assert pool.submit(_worker_cache_dir).result() == str(tmp_path / "pool")
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import io
+import json
+import socket
+import threading
+from pathlib import Path
+
+from hb_align.utils import events
+
+
+def _lines(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_emit_is_a_no_op_without_an_active_stream() -> None:
+    assert events.active_stream() is None
+    events.emit("chunk_planned", chunk_id="c0")
+
+
+def test_stream_writes_bound_fields_in_order(tmp_path: Path) -> None:
+    destination = tmp_path / "events" / "run.ndjson"
+    with events.EventStream(str(destination)).activate():
+        assert events.active_destination() == str(destination)
+        events.emit("chapter_started")
+        with events.bind(book="Genesis", chapter=1):
+            events.emit("chunk_aligned", chunk_id="c0", duration_ms=12.5)
+        events.emit("chapter_done", exit_code=0)
+    assert events.active_stream() is None
+
+    records = _lines(destination.read_text(encoding="utf-8"))
+    assert [record["event"] for record in records] == ["chapter_started", "chunk_aligned", "chapter_done"]
+    assert [record["seq"] for record in records] == [1, 2, 3]
+    assert records[1]["book"] == "Genesis" and records[1]["chunk_id"] == "c0"
+    assert "book" not in records[2]
+    assert {"ts", "pid"} <= set(records[0])
+
+
+class _RecordingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return super().write(text)
+
+
+def test_stream_writes_each_event_whole_and_within_pipe_buf() -> None:
+    target = _RecordingStream()
+    with events.EventStream(target, flush_interval_s=1.0).activate():
+        with events.bind(book="Genesis", chapter=1):
+            events.emit("chunk_planned", chunk_id="c0")
+            events.emit("chunk_aligned", chunk_id="c0", words=["בראשית"] * 2_000)
+
+    assert len(target.writes) == 2
+    assert all(len(text.encode("utf-8")) <= events.MAX_EVENT_BYTES for text in target.writes)
+    planned, aligned = _lines(target.getvalue())
+    assert planned["chunk_id"] == "c0"
+    assert aligned["event"] == "chunk_aligned" and aligned["book"] == "Genesis"
+    assert aligned["truncated_bytes"] > events.MAX_EVENT_BYTES
+    assert "words" not in aligned
+
+
+def test_stream_sends_to_unix_socket(tmp_path: Path) -> None:
+    path = tmp_path / "events.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+    received: list[bytes] = []
+
+    def _accept() -> None:
+        conn, _ = server.accept()
+        with conn:
+            while chunk := conn.recv(4096):
+                received.append(chunk)
+
+    reader = threading.Thread(target=_accept)
+    reader.start()
+    stream = events.EventStream(str(path))
+    with stream.activate():
+        events.emit("cache", status="hit")
+    reader.join(timeout=5)
+    server.close()
+
+    assert _lines(b"".join(received).decode("utf-8"))[0]["status"] == "hit"
+    assert stream.dropped == 0
+
+
+def test_stream_counts_events_lost_without_a_listener(tmp_path: Path) -> None:
+    stream = events.EventStream(f"unix:{tmp_path / 'absent.sock'}")
+    with stream.activate():
+        events.emit("chunk_planned", chunk_id="c0")
+        events.emit("chunk_planned", chunk_id="c1")
+    assert stream.dropped == 2
+
+
+def test_stream_drops_instead_of_blocking_when_full() -> None:
+    gate = threading.Event()
+
+    class _Stalled(io.StringIO):
+        def write(self, text: str) -> int:
+            gate.wait(5)
+            return super().write(text)
+
+    target = _Stalled()
+    stream = events.EventStream(target, max_queue=2)
+    for index in range(50):
+        stream.emit("chunk_aligned", index=index)
+    gate.set()
+    stream.close()
+
+    assert stream.dropped > 0
+    records = _lines(target.getvalue())
+    assert records[-1]["event"] == "events_dropped"
+
+
+def test_event_output_json_reserves_stdout(capsys) -> None:
+    with events.event_output(json_stdout=True):
+        print("human summary")
+        events.emit("chapter_done", exit_code=0)
+
+    captured = capsys.readouterr()
+    assert _lines(captured.out)[0]["event"] == "chapter_done"
+    assert "human summary" in captured.err
+
+
+def test_install_event_stream_none_clears_inherited_stream(tmp_path: Path) -> None:
+    stream = events.EventStream(str(tmp_path / "parent.ndjson"))
+    with stream.activate():
+        events.install_event_stream(None)
+        assert events.active_stream() is None
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import io
 import json
+import threading
 from pathlib import Path
 
-from hb_align.utils.logging import StructuredLogger, SummaryWriter
+import pytest
+
+from hb_align.utils.logging import QueueLogSink, StructuredLogger, SummaryWriter
 from rich.console import Console
 
 
@@ -23,6 +26,79 @@ def test_structured_logger_json_mode(tmp_path: Path) -> None:
     assert first["duration_ms"] == 1250
 
 
+def test_queue_sink_batches_and_drains_on_close() -> None:
+    stream = io.StringIO()
+    sink = QueueLogSink(stream, max_batch=50, flush_interval_s=60)
+    logger = StructuredLogger(log_format="json", sink=sink)
+    for index in range(120):
+        logger.debug("chunk-aligned", chunk=index)
+    logger.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["chunk"] for line in lines] == list(range(120))
+    assert lines[0]["level"] == "debug"
+    assert "ts" in lines[0]
+
+
+def test_queue_sink_keeps_records_submitted_while_closing() -> None:
+    stream = io.StringIO()
+    sink = QueueLogSink(stream, max_batch=8, flush_interval_s=60)
+    accepted = [0] * 4
+
+    def produce(slot: int) -> None:
+        for index in range(500):
+            if sink.submit(("info", "tick", 0.0, {"slot": slot, "index": index})):
+                accepted[slot] += 1
+
+    threads = [threading.Thread(target=produce, args=(slot,)) for slot in range(4)]
+    for thread in threads:
+        thread.start()
+    sink.close()
+    for thread in threads:
+        thread.join()
+
+    assert len(stream.getvalue().splitlines()) == sum(accepted) == 2_000
+
+
+def test_queue_sink_flushes_on_interval() -> None:
+    flushed = threading.Event()
+
+    class _Stream(io.StringIO):
+        def flush(self) -> None:
+            super().flush()
+            flushed.set()
+
+    stream = _Stream()
+    sink = QueueLogSink(stream, max_batch=1000, flush_interval_s=0.01)
+    sink.submit(("info", "tick", 0.0, {}))
+    assert flushed.wait(2.0)
+    assert "tick" in stream.getvalue()
+    sink.close()
+
+
+def test_queue_sink_drop_policy_counts_drops() -> None:
+    gate = threading.Event()
+
+    class _BlockingStream(io.StringIO):
+        def write(self, text: str) -> int:
+            gate.wait(2.0)
+            return super().write(text)
+
+    stream = _BlockingStream()
+    sink = QueueLogSink(stream, max_batch=1, flush_interval_s=0, max_queue=2, overflow="drop")
+    accepted = [sink.submit(("info", f"m{i}", 0.0, {})) for i in range(20)]
+    gate.set()
+    sink.close()
+    assert not all(accepted)
+    assert sink.dropped == accepted.count(False)
+    assert "log-records-dropped" in stream.getvalue()
+
+
+def test_queue_sink_rejects_unknown_policy() -> None:
+    with pytest.raises(ValueError):
+        QueueLogSink(io.StringIO(), overflow="spill")
+
+
 def test_structured_logger_text_mode() -> None:
     sink = io.StringIO()
     logger = StructuredLogger(log_format="text", console=Console(file=sink))
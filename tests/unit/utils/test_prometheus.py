@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from hb_align.utils.logging import SummaryWriter
+from hb_align.utils.prometheus import AlignmentMetricsExporter, PromRegistry
+
+
+def _samples(path: Path) -> dict[str, float]:
+    values = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def test_registry_renders_counters_and_histograms(tmp_path: Path) -> None:
+    registry = PromRegistry()
+    registry.counter("jobs_total", "Jobs.").inc(2, status="ok")
+    histogram = registry.histogram("latency_seconds", "Latency.", (0.5, 1))
+    histogram.observe(0.2)
+    histogram.observe(0.7)
+
+    target = registry.write_textfile(tmp_path / "metrics.prom")
+
+    text = target.read_text(encoding="utf-8")
+    assert "# TYPE jobs_total counter" in text
+    assert 'jobs_total{status="ok"} 2' in text
+    assert 'latency_seconds_bucket{le="0.5"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_exporter_accumulates_across_runs(tmp_path: Path) -> None:
+    path = tmp_path / "hb_align.prom"
+    for coverage in (99.0, 90.0):
+        writer = SummaryWriter()
+        writer.set_alignment_counts(aligned=int(coverage), expected=100)
+        writer.set_cache_status("miss")
+        writer.record_duration("align", 1500)
+        writer.update_extra({"coverage_passed": coverage >= 95})
+        writer.write_prometheus(AlignmentMetricsExporter(path))
+    failure = AlignmentMetricsExporter(path)
+    failure.observe_failure("mfa")
+    failure.flush()
+
+    values = _samples(path)
+    assert values['hb_align_chapters_processed_total{job="process",status="success"}'] == 1
+    assert values['hb_align_chapters_processed_total{job="process",status="coverage_failed"}'] == 1
+    assert values['hb_align_chapters_processed_total{job="process",status="failed"}'] == 1
+    assert values['hb_align_words_aligned_total{job="process"}'] == 189
+    assert values['hb_align_cache_lookups_total{job="process",result="miss"}'] == 2
+    assert values['hb_align_mfa_failures_total{job="process",reason="mfa"}'] == 1
+    assert values['hb_align_stage_duration_seconds_count{job="process",stage="align"}'] == 2
+    assert values['hb_align_coverage_pct_bucket{job="process",le="95"}'] == 1
+    assert values['hb_align_coverage_pct_bucket{job="process",le="99"}'] == 2
+
+
+def test_exporter_incremental_flushes_do_not_double_count(tmp_path: Path) -> None:
+    path = tmp_path / "batch.prom"
+    exporter = AlignmentMetricsExporter(path, job="batch")
+    for _ in range(3):
+        exporter.observe_summary({"aligned_words": 10, "coverage_pct": 100.0, "coverage_passed": True})
+        exporter.flush()
+
+    values = _samples(path)
+    assert values['hb_align_words_aligned_total{job="batch"}'] == 30
+    assert values['hb_align_chapters_processed_total{job="batch",status="success"}'] == 3
+
+
+def test_exporters_sharing_a_file_keep_each_others_counts(tmp_path: Path) -> None:
+    path = tmp_path / "shared.prom"
+    first = AlignmentMetricsExporter(path, job="batch")
+    second = AlignmentMetricsExporter(path, job="batch")
+    key = 'hb_align_chapters_processed_total{job="batch",status="failed"}'
+
+    first.observe_failure("mfa")
+    first.flush()
+    second.observe_failure("mfa")
+    second.flush()
+    assert _samples(path)[key] == 2
+
+    first.observe_failure("mfa")
+    first.flush()
+    first.flush()
+    assert _samples(path)[key] == 3
+    assert _samples(path)['hb_align_mfa_failures_total{job="batch",reason="mfa"}'] == 3
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from hb_align.utils import resources
+from hb_align.utils.logging import SummaryWriter
+from hb_align.utils.resources import ResourceSampler
+from hb_align.utils.tracing import Tracer
+
+pytestmark = pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+
+
+def test_sampler_counts_child_process_cpu() -> None:
+    with ResourceSampler(interval_s=0.05) as sampler:
+        child = subprocess.Popen(
+            [sys.executable, "-c", "import time\nend = time.time() + 0.6\nwhile time.time() < end: pass"]
+        )
+        time.sleep(0.3)
+        live = sampler.sample()
+        child.wait()
+    summary = sampler.summary()
+
+    assert live.cpu_seconds > 0
+    assert summary["cpu_seconds"] >= 0.3
+    assert summary["peak_rss_bytes"] > 0
+    assert summary["samples"] >= 3
+    assert {"p50", "p90", "p99", "max", "avg"} <= set(summary["cpu_pct"])
+
+
+def test_sampler_attributes_samples_to_tracer_stage() -> None:
+    tracer = Tracer()
+    run_thread = threading.get_ident()
+    sampler = ResourceSampler(interval_s=0.02, stage_provider=lambda: tracer.current_stage(run_thread))
+    with sampler:
+        with tracer.span("align"):
+            end = time.time() + 0.2
+            while time.time() < end:
+                pass
+    summary = sampler.summary()
+    assert summary["per_stage"]["align"]["samples"] >= 2
+    assert summary["per_stage"]["align"]["avg_cpu_pct"] > 0
+
+    writer = SummaryWriter()
+    writer.record_resources(sampler)
+    assert writer.metrics.to_dict()["resources"]["per_stage"]["align"]
+
+
+def test_sampler_rejects_invalid_interval() -> None:
+    with pytest.raises(ValueError):
+        ResourceSampler(interval_s=0)
+
+
+def test_sampler_counts_a_reaped_child_io_once(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    own_pid, child_pid = 4000, 4001
+    (tmp_path / str(child_pid)).mkdir()
+    own_io = {"value": (100, 10)}
+    monkeypatch.setattr(resources, "_PROC", tmp_path)
+    monkeypatch.setattr(resources, "_read_proc_stat", lambda pid: resources._ProcStat(1, 0, 1))
+    monkeypatch.setattr(
+        resources, "_read_proc_io", lambda pid: own_io["value"] if pid == own_pid else (50, 5)
+    )
+    monkeypatch.setattr(
+        resources, "_descendants", lambda pid: [child_pid] if (tmp_path / str(child_pid)).exists() else []
+    )
+    sampler = ResourceSampler(pid=own_pid)
+
+    assert sampler._read_tree()[2:] == (150, 15)
+    # Reaping folds the child's counters into the parent's own /proc/<pid>/io.
+    (tmp_path / str(child_pid)).rmdir()
+    own_io["value"] = (150, 15)
+    assert sampler._read_tree()[2:] == (150, 15)
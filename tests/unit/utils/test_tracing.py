@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from hb_align.utils import tracing
+from hb_align.utils.logging import SummaryWriter
+from hb_align.utils.tracing import Tracer
+
+
+def test_nested_spans_record_parent_and_depth() -> None:
+    tracer = Tracer()
+    with tracer.span("align"):
+        assert tracer.current_stage() == "align"
+        for chunk in ("chunk-001", "chunk-002"):
+            with tracer.span("mfa_chunk", chunk_id=chunk):
+                time.sleep(0.001)
+    spans = {(s.name, s.args.get("chunk_id")): s for s in tracer.spans}
+    child = spans[("mfa_chunk", "chunk-001")]
+    parent = spans[("align", None)]
+    assert child.parent == "align" and child.depth == 1
+    assert parent.depth == 0 and parent.duration_ns >= child.duration_ns
+    assert tracer.current_stage() is None
+
+
+def test_module_level_span_is_noop_without_active_tracer() -> None:
+    with tracing.span("orphan"):
+        pass
+
+    tracer = Tracer()
+
+    @tracing.traced("decorated")
+    def work() -> int:
+        return 42
+
+    assert work() == 42
+    with tracer.activate():
+        assert work() == 42
+    assert [s.name for s in tracer.spans] == ["decorated"]
+
+
+def test_spans_from_threads_keep_their_own_stack() -> None:
+    tracer = Tracer()
+
+    def worker() -> None:
+        with tracer.span("stitching"):
+            pass
+
+    with tracer.span("align"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    stitched = next(s for s in tracer.spans if s.name == "stitching")
+    assert stitched.parent is None
+    assert len({s.tid for s in tracer.spans}) == 2
+
+
+def test_rollup_feeds_summary_and_chrome_trace(tmp_path: Path) -> None:
+    tracer = Tracer()
+    for _ in range(3):
+        with tracer.span("mfa_chunk"):
+            time.sleep(0.002)
+    writer = SummaryWriter()
+    writer.record_spans(tracer)
+    assert writer.metrics.durations_ms["mfa_chunk"] >= 6
+
+    trace_path = tracer.write_chrome_trace(tmp_path / "trace.json", metadata={"run_id": "r1"})
+    payload = json.loads(trace_path.read_text(encoding="utf-8"))
+    events = payload["traceEvents"]
+    assert len(events) == 3
+    assert {e["ph"] for e in events} == {"X"}
+    assert all(e["dur"] > 0 and "pid" in e and "tid" in e for e in events)
+    assert payload["otherData"]["run_id"] == "r1"